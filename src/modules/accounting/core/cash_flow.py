@@ -4,8 +4,15 @@ Simplified cash flow statement generation
 Based on the example implementation with straightforward activity categorization.
 """
 
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
 from .models import Transaction, CategoryMapper, REVENUE_CATEGORIES
+from ..models.business.transaction_classifier import (
+    encode, select_encoded, sum_entity_line_items, sum_line_items, transactions_to_table
+)
 
 
 class CashFlowStatementGenerator:
@@ -14,75 +21,64 @@ class CashFlowStatementGenerator:
     def __init__(self, category_mapper: CategoryMapper):
         self.category_mapper = category_mapper
     
-    def generate_statement(self, transactions: List[Transaction], entity_name: str) -> Dict:
-        """Generate cash flow statement for given transactions"""
+    def generate_statement(self, transactions: Union[pd.DataFrame, List[Transaction]], entity_name: str) -> Dict:
+        """Generate cash flow statement for a transactions table or list, with one grouped sum"""
         
-        operating_activities = 0
-        investing_activities = 0
-        financing_activities = 0
+        sections = sum_line_items(*self._line_items(transactions_to_table(transactions)))
+        return self._statement(entity_name, sections)
+    
+    def generate_statements(self, transactions: Union[pd.DataFrame, List[Transaction]],
+                            combined_name: str = "Combined", entity_label: str = "{}") -> Dict[str, Dict]:
+        """
+        Generate cash flow statements for every user plus the combined statement
+        from one grouped sum over (user, activity, line)
         
-        activity_details = {
-            'Operating Activities': {},
-            'Investing Activities': {},
-            'Financing Activities': {}
-        }
+        Returns {user: statement, ..., combined_name: statement}; entity_label
+        formats each user's entity name (e.g. "User: {}")
+        """
         
-        for transaction in transactions:
-            # Skip transactions with zero amounts
-            if transaction.amount == 0:
-                continue
-            
-            # Determine transaction type and cash flow impact - prioritize analysis over stored defaults
-            if hasattr(transaction, 'affects_cash_flow') and hasattr(transaction, 'transaction_type') and transaction.transaction_type in ["prepaid_asset"]:
-                # Trust specific transaction types from CSV processing
-                transaction_type = transaction.transaction_type
-                affects_cash_flow = transaction.affects_cash_flow
-            else:
-                # Backward compatibility and analysis-based determination
-                affects_cash_flow = True  # Assume all transactions affect cash flow in old format
-                if transaction.debit_category in REVENUE_CATEGORIES and transaction.amount > 0:
-                    transaction_type = "revenue"
-                elif transaction.amount < 0:
-                    transaction_type = "expense"
-                else:
-                    transaction_type = "expense"
-            
-            # Skip transactions that don't affect cash flow
-            if not affects_cash_flow:
-                continue
-            
-            # Determine cash flow direction based on transaction type
-            if transaction_type == "revenue":
-                # Revenue: positive cash flow (cash coming in)
-                cash_flow_amount = abs(transaction.amount)
-                category_name = transaction.debit_category
-            elif transaction_type == "prepaid_asset":
-                # Prepaid asset purchase: negative cash flow (cash going out for future benefit)
-                cash_flow_amount = -abs(transaction.amount)
-                category_name = f"Prepaid: {transaction.debit_category}"
-            else:
-                # Expense: negative cash flow (cash going out)  
-                cash_flow_amount = -abs(transaction.amount)
-                category_name = self.category_mapper.get_expense_category(transaction.debit_category)
-            
-            # Get the cash flow activity type
-            activity_type = self.category_mapper.get_cashflow_category(transaction.debit_category)
-            
-            # Categorize the cash flow
-            if activity_type == 'Operating Activities':
-                operating_activities += cash_flow_amount
-                activity_details['Operating Activities'][category_name] = \
-                    activity_details['Operating Activities'].get(category_name, 0) + cash_flow_amount
-                    
-            elif activity_type == 'Investing Activities':
-                investing_activities += cash_flow_amount
-                activity_details['Investing Activities'][category_name] = \
-                    activity_details['Investing Activities'].get(category_name, 0) + cash_flow_amount
-                    
-            elif activity_type == 'Financing Activities':
-                financing_activities += cash_flow_amount
-                activity_details['Financing Activities'][category_name] = \
-                    activity_details['Financing Activities'].get(category_name, 0) + cash_flow_amount
+        table = transactions_to_table(transactions)
+        per_user, combined = sum_entity_line_items(table['user'], *self._line_items(table))
+        statements = {user: self._statement(entity_label.format(user), sections)
+                      for user, sections in per_user.items() if user != ''}
+        statements[combined_name] = self._statement(combined_name, combined)
+        return statements
+    
+    def _line_items(self, table: pd.DataFrame) -> Tuple[List[Any], np.ndarray, np.ndarray]:
+        """([activity, line], cash flow, mask) per transaction, as accepted by sum_line_items"""
+        
+        amount = table['amount'].to_numpy(dtype=float)
+        magnitude = np.abs(amount)
+        debit_codes, debits = encode(table['debit_category'])
+        
+        # Only trust the stored type (and cash flow flag) for prepaid assets from CSV
+        # processing; otherwise determine the type and assume cash is affected
+        prepaid = (table['transaction_type'] == 'prepaid_asset').to_numpy(dtype=bool)
+        affects_cash_flow = np.where(prepaid, table['affects_cash_flow'].to_numpy(dtype=bool), True)
+        revenue = ~prepaid & np.isin(debits, REVENUE_CATEGORIES)[debit_codes] & (amount > 0)
+        
+        # Revenue flows in; prepaid purchases and expenses flow out. Categories are mapped
+        # once per distinct value and carried as integer codes
+        debits_series = pd.Series(debits)
+        line = select_encoded(
+            [revenue, prepaid],
+            [(debit_codes, debits), (debit_codes, np.array([f"Prepaid: {name}" for name in debits], dtype=object))],
+            default=(debit_codes, self.category_mapper.map_expense_categories(debits_series).to_numpy(dtype=object)),
+        )
+        activities = self.category_mapper.map_cashflow_categories(debits_series).to_numpy(dtype=object)
+        return (
+            [(debit_codes, activities), line],
+            np.where(revenue, magnitude, -magnitude),
+            (amount != 0) & affects_cash_flow,
+        )
+    
+    @staticmethod
+    def _statement(entity_name: str, sections: Dict) -> Dict:
+        activity_details = {activity: sections.get((activity,), {}) for activity in
+                            ('Operating Activities', 'Investing Activities', 'Financing Activities')}
+        operating_activities = sum(activity_details['Operating Activities'].values())
+        investing_activities = sum(activity_details['Investing Activities'].values())
+        financing_activities = sum(activity_details['Financing Activities'].values())
         
         cash_flow_statement = {
             'Entity': entity_name,
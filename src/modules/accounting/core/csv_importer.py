@@ -0,0 +1,377 @@
+"""
+Streaming Import of Large Transaction CSV Exports
+
+Reads a transactions CSV (e.g. a multi-year bank or credit card export) in
+fixed-size chunks. Each chunk is cleaned and validated by DataCleaner,
+classified, and appended to per-month Parquet files, so memory is bounded by
+the chunk size rather than the file size. The ValidationReport is aggregated
+across chunks in the order DataCleaner produces for the whole file, and month
+files are only replaced once the whole import finished without errors.
+
+Amount types are inferred per chunk, as pandas does for the whole file. When
+only some chunks hold non-numeric amounts, whitespace around numbers in those
+chunks is counted as cleaned, which the whole-file count would not include.
+"""
+
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Callable, Dict, List, Optional, Union
+import logging
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .data_storage import MonthlyDataStorage
+from .data_storage_utils import clean_transactions_for_storage, get_monthly_data_path, validate_month_format
+from ..models.business.data_cleaner import (
+    CleaningAction, DataCleaner, ValidationError, ValidationReport, row_errors
+)
+from ..models.business.transaction_classifier import classify_transactions
+from ..models.domain.category import REVENUE_CATEGORIES
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Columns that assign rows to months, checked in order when no month is given
+MONTH_COLUMNS = ('year_month', 'month')
+DATE_COLUMNS = ('Date', 'date', '日期', 'Transaction Date')
+
+# Columns whose types are inferred; all others are read as text
+NUMERIC_COLUMNS = ('Amount',)
+
+# Month files are written under this name until the import is committed
+STAGING_FILE = "transactions.parquet.importing"
+
+
+@dataclass
+class ImportProgress:
+    """Progress of a running import, reported after every chunk"""
+    chunks: int
+    rows_read: int
+    rows_written: int
+    bytes_read: int
+    total_bytes: Optional[int] = None
+
+    @property
+    def fraction(self) -> Optional[float]:
+        """Share of the file read so far, if its size is known"""
+        if not self.total_bytes:
+            return None
+        return min(self.bytes_read / self.total_bytes, 1.0)
+
+
+@dataclass
+class ImportResult:
+    """Outcome of a streaming import"""
+    validation_report: ValidationReport = field(default_factory=ValidationReport)
+    rows_read: int = 0
+    rows_by_month: Dict[str, int] = field(default_factory=dict)
+    totals_by_month: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    saved_months: List[str] = field(default_factory=list)
+
+    @property
+    def succeeded(self) -> bool:
+        return not self.validation_report.has_errors()
+
+
+class StreamingTransactionImporter:
+    """
+    Chunked CSV import into MonthlyDataStorage.
+
+    Rows are assigned to months by the year_month argument, a year_month/month
+    column (YYYY-MM), or a date column, in that order of preference.
+
+    Example:
+        importer = StreamingTransactionImporter(chunk_size=50_000)
+        result = importer.import_csv("export_2019_2025.csv",
+                                     progress_callback=lambda p: print(p.fraction))
+    """
+
+    def __init__(
+        self,
+        data_storage: Optional[MonthlyDataStorage] = None,
+        chunk_size: int = 50_000,
+        revenue_categories: Optional[List[str]] = None
+    ):
+        """
+        Initialize the importer.
+
+        Args:
+            data_storage: Destination storage (default storage if None)
+            chunk_size: Number of CSV rows processed at a time
+            revenue_categories: Credit accounts classified as revenue
+        """
+        self.data_storage = data_storage or MonthlyDataStorage()
+        self.chunk_size = max(int(chunk_size), 1)
+        self.revenue_categories = revenue_categories if revenue_categories is not None else REVENUE_CATEGORIES
+
+    def import_csv(
+        self,
+        source: Union[str, Path, IO[bytes]],
+        year_month: Optional[str] = None,
+        overwrite: bool = True,
+        progress_callback: Optional[Callable[[ImportProgress], None]] = None
+    ) -> ImportResult:
+        """
+        Stream a transactions CSV into monthly Parquet files.
+
+        Args:
+            source: CSV file path or seekable binary file object (e.g. an upload)
+            year_month: Month of every row (YYYY-MM); derived per row if None
+            overwrite: Replace existing month files (skipped with a warning if False)
+            progress_callback: Called with an ImportProgress after every chunk
+
+        Returns:
+            ImportResult with the aggregated ValidationReport; nothing is
+            saved if the report has errors
+        """
+        if year_month is not None and not validate_month_format(year_month):
+            raise ValueError(f"Invalid month format: {year_month}. Use YYYY-MM")
+
+        handle = open(source, 'rb') if isinstance(source, (str, Path)) else source
+        try:
+            return self._import(handle, year_month, overwrite, progress_callback)
+        finally:
+            if handle is not source:
+                handle.close()
+
+    def _import(
+        self,
+        handle: IO[bytes],
+        year_month: Optional[str],
+        overwrite: bool,
+        progress_callback: Optional[Callable[[ImportProgress], None]]
+    ) -> ImportResult:
+        result = ImportResult()
+        start = handle.tell()
+        total_bytes = handle.seek(0, os.SEEK_END) - start
+        handle.seek(start)
+
+        try:
+            raw_columns = list(pd.read_csv(handle, encoding='utf-8-sig', nrows=0).columns)
+        except pd.errors.EmptyDataError:
+            raw_columns = []
+        handle.seek(start)
+        columns = [str(column).strip() for column in raw_columns]
+
+        missing = [column for column in DataCleaner.REQUIRED_COLUMNS if column not in columns]
+        month_column = self._month_column(columns, year_month)
+        if month_column is None and year_month is None:
+            result.validation_report.errors.append(ValidationError(
+                row_number=0,
+                column=', '.join(MONTH_COLUMNS + DATE_COLUMNS),
+                error_type='missing_column',
+                message="Missing month: pass year_month or include a month (YYYY-MM) or date column"
+            ))
+
+        reports: List[ValidationReport] = []
+        filled_columns = set()
+        writers: Dict[str, pq.ParquetWriter] = {}
+        schema = pa.schema([(column, pa.float64() if column in NUMERIC_COLUMNS else pa.string())
+                            for column in columns])
+        progress = ImportProgress(chunks=0, rows_read=0, rows_written=0, bytes_read=0, total_bytes=total_bytes)
+
+        try:
+            if raw_columns:
+                dtypes = {raw: str for raw, column in zip(raw_columns, columns) if column not in NUMERIC_COLUMNS}
+                reader = pd.read_csv(handle, encoding='utf-8-sig', dtype=dtypes, chunksize=self.chunk_size)
+                for chunk in reader:
+                    cleaner = DataCleaner(dataframe=chunk)
+                    cleaned = cleaner.clean_chunk(chunk, validate=not missing)
+                    filled_columns.update(cleaned.columns[cleaned.notna().any().to_numpy()])
+                    months = self._chunk_months(cleaned, month_column, year_month, cleaner.validation_report)
+                    reports.append(cleaner.validation_report)
+
+                    # Keep validating after the first error, but stop writing
+                    if not missing and not result.validation_report.has_errors() and \
+                            not any(report.has_errors() for report in reports):
+                        progress.rows_written += self._write_chunk(
+                            cleaned, months, columns, schema, writers, overwrite, result)
+
+                    progress.chunks += 1
+                    progress.rows_read += len(chunk)
+                    progress.bytes_read = handle.tell() - start
+                    if progress_callback is not None:
+                        progress_callback(progress)
+        except Exception:
+            self._discard(writers)
+            raise
+
+        result.rows_read = progress.rows_read
+        empty_columns = [column for column in columns if column not in filled_columns]
+        missing_or_empty = [column for column in DataCleaner.REQUIRED_COLUMNS
+                            if column in missing or column in empty_columns]
+        self._merge_reports(result.validation_report, reports, empty_columns, missing_or_empty)
+
+        if result.succeeded:
+            result.saved_months = self._commit(writers, [c for c in columns if c not in empty_columns])
+        else:
+            self._discard(writers)
+            result.rows_by_month, result.totals_by_month = {}, {}
+
+        logger.info(f"Imported {progress.rows_read} rows in {progress.chunks} chunks: "
+                    f"{result.validation_report.get_summary()}")
+        return result
+
+    @staticmethod
+    def _month_column(columns: List[str], year_month: Optional[str]) -> Optional[str]:
+        if year_month is not None:
+            return None
+        for column in MONTH_COLUMNS + DATE_COLUMNS:
+            if column in columns:
+                return column
+        return None
+
+    @staticmethod
+    def _chunk_months(
+        df: pd.DataFrame,
+        month_column: Optional[str],
+        year_month: Optional[str],
+        report: ValidationReport
+    ) -> np.ndarray:
+        """YYYY-MM of every row; invalid months are reported and left as None"""
+        if year_month is not None or month_column is None:
+            return np.full(len(df), year_month, dtype=object)
+
+        values = df[month_column]
+        if month_column in MONTH_COLUMNS:
+            text = values.astype('string').str.strip()
+            valid = text.str.fullmatch(r'\d{4}-(0[1-9]|1[0-2])').fillna(False).to_numpy(dtype=bool)
+            months = text.to_numpy(dtype=object)
+            expected = "YYYY-MM"
+        else:
+            dates = pd.to_datetime(values, errors='coerce', format='mixed')
+            valid = dates.notna().to_numpy()
+            months = dates.dt.strftime('%Y-%m').to_numpy(dtype=object)
+            expected = "a date"
+
+        report.errors.extend(row_errors(
+            df, [(month_column, ~valid)], 'invalid_month',
+            lambda row, column, value: f"Row {row}: {column} must be {expected} (got '{value}')"
+        ))
+        months[~valid] = None
+        return months
+
+    def _write_chunk(
+        self,
+        df: pd.DataFrame,
+        months: np.ndarray,
+        columns: List[str],
+        schema: pa.Schema,
+        writers: Dict[str, pq.ParquetWriter],
+        overwrite: bool,
+        result: ImportResult
+    ) -> int:
+        """Append a clean chunk to its months' staging files; returns rows written"""
+        if df.empty:
+            return 0
+
+        stored = clean_transactions_for_storage(df).reindex(columns=columns)
+        for column in columns:
+            if column not in NUMERIC_COLUMNS:
+                stored[column] = stored[column].astype('string')
+        codes, labels = pd.factorize(months)
+
+        written = 0
+        for code, month in enumerate(labels):
+            rows = codes == code
+            month_rows = stored[rows]
+            if month not in writers:
+                staging_path = self._month_path(month) / STAGING_FILE
+                if not overwrite and (staging_path.parent / "transactions.parquet").exists():
+                    logger.warning(f"Transactions file exists for {month}, skipping")
+                    writers[month] = None
+                else:
+                    staging_path.parent.mkdir(parents=True, exist_ok=True)
+                    writers[month] = pq.ParquetWriter(staging_path, schema)
+            if writers[month] is None:
+                continue
+
+            writers[month].write_table(pa.Table.from_pandas(month_rows, schema=schema, preserve_index=False))
+            totals = result.totals_by_month.setdefault(month, {})
+            table = classify_transactions(month_rows, self.revenue_categories)
+            for transaction_type, amount in table.groupby('transaction_type', sort=False)['amount'].sum().items():
+                totals[transaction_type] = totals.get(transaction_type, 0.0) + float(amount)
+            result.rows_by_month[month] = result.rows_by_month.get(month, 0) + len(month_rows)
+            written += len(month_rows)
+        return written
+
+    def _commit(self, writers: Dict[str, Optional[pq.ParquetWriter]], kept_columns: List[str]) -> List[str]:
+        """Replace month files with their staging files; returns the saved months"""
+        saved = []
+        for month, writer in writers.items():
+            if writer is None:
+                continue
+            writer.close()
+            staging_path = self._month_path(month) / STAGING_FILE
+            if len(kept_columns) < len(writer.schema.names):
+                # Columns empty in the whole file are dropped, as DataCleaner does
+                pq.write_table(pq.read_table(staging_path, columns=kept_columns), staging_path)
+            staging_path.replace(staging_path.parent / "transactions.parquet")
+            logger.info(f"Saved transactions data for {month}")
+            saved.append(month)
+        return sorted(saved)
+
+    def _discard(self, writers: Dict[str, Optional[pq.ParquetWriter]]) -> None:
+        for month, writer in writers.items():
+            if writer is None:
+                continue
+            writer.close()
+            staging_path = self._month_path(month) / STAGING_FILE
+            staging_path.unlink(missing_ok=True)
+            if not any(staging_path.parent.iterdir()):
+                staging_path.parent.rmdir()
+
+    def _month_path(self, month: str) -> Path:
+        return get_monthly_data_path(self.data_storage.base_path, month)
+
+    @staticmethod
+    def _merge_reports(
+        merged: ValidationReport,
+        reports: List[ValidationReport],
+        empty_columns: List[str],
+        missing_columns: List[str]
+    ) -> None:
+        """
+        Combine chunk reports into the report DataCleaner gives for the whole file:
+        action counts are summed, errors ordered by validation step, then row.
+        """
+        actions = {}
+        for report in reports:
+            for action in report.cleaning_actions:
+                if action.action_type not in actions:
+                    actions[action.action_type] = action
+                elif action.action_type != 'clean_column_names':
+                    actions[action.action_type].count += action.count
+            merged.warnings.extend(report.warnings)
+
+        if empty_columns:
+            logger.info(f"Removed {len(empty_columns)} completely empty columns")
+            actions['remove_empty_columns'] = CleaningAction(
+                action_type="remove_empty_columns",
+                description="Removed completely empty columns",
+                count=len(empty_columns),
+                details="Columns with all NaN/empty values"
+            )
+        order = DataCleaner.CLEANING_ACTION_TYPES
+        merged.cleaning_actions.extend(sorted(
+            actions.values(),
+            key=lambda a: order.index(a.action_type) if a.action_type in order else len(order)
+        ))
+
+        errors = [error for report in reports for error in report.errors]
+        if missing_columns:
+            # Row validation does not run when required columns are missing
+            errors = [error for error in errors if error.error_type == 'invalid_month']
+            merged.errors.append(ValidationError(
+                row_number=0,
+                column=', '.join(missing_columns),
+                error_type='missing_column',
+                message=f"Missing required columns: {', '.join(missing_columns)}"
+            ))
+        order = DataCleaner.ERROR_TYPES
+        merged.errors.extend(errors)
+        merged.errors.sort(key=lambda e: order.index(e.error_type) if e.error_type in order else len(order))
@@ -0,0 +1,231 @@
+"""
+Cross-Month Query Engine for Monthly Accounting Data
+
+Reads the MonthlyDataStorage tree (one transactions.parquet / assets.parquet
+per YYYY-MM directory) as a single partitioned Parquet dataset, with the
+directory name as the `month` partition key. Queries project only the
+requested columns, prune months from directory names without opening the
+files of unrelated months, and push user/category predicates down to the
+Parquet scan.
+"""
+
+import logging
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from .data_storage_utils import validate_month_format
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Partition key derived from the YYYY-MM directory name
+MONTH_FIELD = 'month'
+
+# Data file per kind of monthly data
+DATA_FILES = {
+    'transactions': 'transactions.parquet',
+    'assets': 'assets.parquet',
+}
+
+# Transaction columns matched by the user and category predicates
+USER_COLUMN = 'User'
+CATEGORY_COLUMNS = ('Debit', 'Credit')
+
+
+class MonthlyDataQuery:
+    """
+    Dataset-level reader over the monthly accounting Parquet store.
+
+    Example:
+        query = MonthlyDataQuery()
+        dining = query.transactions(start='2022-08', end='2025-07',
+                                    users=['XH'], categories=['餐饮'])
+    """
+
+    def __init__(self, base_path: str = "data/accounting/monthly_data"):
+        """
+        Initialize the query engine.
+
+        Args:
+            base_path: Base directory of the monthly data storage
+        """
+        self.base_path = Path(base_path)
+
+    def months(
+        self,
+        kind: str = 'transactions',
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        months: Optional[Iterable[str]] = None
+    ) -> List[str]:
+        """
+        List stored months, pruned by range from directory names alone.
+
+        Args:
+            kind: 'transactions' or 'assets'
+            start: First month (YYYY-MM, inclusive)
+            end: Last month (YYYY-MM, inclusive)
+            months: Explicit months to restrict to
+
+        Returns:
+            Sorted list of months that have a data file of this kind
+        """
+        file_name = self._file_name(kind)
+        for bound in (start, end):
+            if bound is not None and not validate_month_format(bound):
+                raise ValueError(f"Invalid month format: {bound}. Use YYYY-MM")
+
+        if not self.base_path.exists():
+            return []
+
+        wanted = set(months) if months is not None else None
+        selected = []
+        for month_dir in self.base_path.iterdir():
+            month = month_dir.name
+            if not (month_dir.is_dir() and validate_month_format(month)):
+                continue
+            if (start is not None and month < start) or (end is not None and month > end):
+                continue
+            if wanted is not None and month not in wanted:
+                continue
+            if (month_dir / file_name).exists():
+                selected.append(month)
+
+        return sorted(selected)
+
+    def dataset(
+        self,
+        kind: str = 'transactions',
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        months: Optional[Iterable[str]] = None
+    ) -> Optional[ds.Dataset]:
+        """
+        Partitioned dataset over the selected months.
+
+        Only the footers of the selected files are read, to unify their
+        schemas (e.g. a column that is all-null in some months).
+
+        Returns:
+            pyarrow Dataset with a `month` partition column, or None if no
+            month matches
+        """
+        selected = self.months(kind, start, end, months)
+        if not selected:
+            return None
+
+        files = [str(self.base_path / month / self._file_name(kind)) for month in selected]
+        try:
+            schema = pa.unify_schemas([pq.read_schema(path) for path in files], promote_options='permissive')
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            raise ValueError(f"Incompatible {kind} schemas across months {selected[0]}..{selected[-1]}: {e}")
+        partitioning = ds.DirectoryPartitioning(pa.schema([(MONTH_FIELD, pa.string())]))
+        return ds.dataset(
+            files,
+            schema=schema.append(pa.field(MONTH_FIELD, pa.string())),
+            format='parquet',
+            partitioning=partitioning,
+            partition_base_dir=str(self.base_path)
+        )
+
+    def query(
+        self,
+        kind: str = 'transactions',
+        columns: Optional[Sequence[str]] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        months: Optional[Iterable[str]] = None,
+        users: Optional[Iterable[str]] = None,
+        categories: Optional[Iterable[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Read rows across months with column projection and predicate pushdown.
+
+        Args:
+            kind: 'transactions' or 'assets'
+            columns: Columns to read (default: all); `month` is always included
+            start: First month (YYYY-MM, inclusive)
+            end: Last month (YYYY-MM, inclusive)
+            months: Explicit months to restrict to
+            users: Keep rows whose User is one of these
+            categories: Keep rows whose Debit or Credit account is one of these
+
+        Returns:
+            DataFrame ordered by month, rows within a month in file order;
+            empty if nothing matches
+        """
+        dataset = self.dataset(kind, start, end, months)
+        if dataset is None:
+            return pd.DataFrame(columns=list(columns or []) + [MONTH_FIELD])
+
+        if columns is not None:
+            columns = [column for column in columns if column != MONTH_FIELD] + [MONTH_FIELD]
+
+        table = dataset.to_table(columns=columns, filter=self._filter(dataset.schema, users, categories))
+        df = table.to_pandas()
+        logger.info(f"Queried {len(df)} {kind} rows from {len(dataset.files)} months")
+        return df.sort_values(MONTH_FIELD, kind='stable', ignore_index=True)
+
+    def transactions(self, **kwargs) -> pd.DataFrame:
+        """Query transactions across months (see query)"""
+        return self.query('transactions', **kwargs)
+
+    def assets(self, **kwargs) -> pd.DataFrame:
+        """Query assets across months (see query)"""
+        return self.query('assets', **kwargs)
+
+    def count(
+        self,
+        kind: str = 'transactions',
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        months: Optional[Iterable[str]] = None,
+        users: Optional[Iterable[str]] = None,
+        categories: Optional[Iterable[str]] = None
+    ) -> int:
+        """
+        Count matching rows without materializing them.
+
+        Without user/category predicates the count comes from Parquet metadata.
+        """
+        dataset = self.dataset(kind, start, end, months)
+        if dataset is None:
+            return 0
+        return dataset.count_rows(filter=self._filter(dataset.schema, users, categories))
+
+    @staticmethod
+    def _file_name(kind: str) -> str:
+        if kind not in DATA_FILES:
+            raise ValueError(f"Invalid data kind: {kind}. Use one of {list(DATA_FILES)}")
+        return DATA_FILES[kind]
+
+    @staticmethod
+    def _filter(
+        schema: pa.Schema,
+        users: Optional[Iterable[str]],
+        categories: Optional[Iterable[str]]
+    ) -> Optional[ds.Expression]:
+        """Predicate expression for the user and category filters"""
+        expression = None
+
+        if users is not None:
+            if USER_COLUMN not in schema.names:
+                raise ValueError(f"Cannot filter by user: no {USER_COLUMN} column")
+            expression = ds.field(USER_COLUMN).isin(list(users))
+
+        if categories is not None:
+            category_columns = [column for column in CATEGORY_COLUMNS if column in schema.names]
+            if not category_columns:
+                raise ValueError(f"Cannot filter by category: no {' or '.join(CATEGORY_COLUMNS)} column")
+            categories = list(categories)
+            matches = ds.field(category_columns[0]).isin(categories)
+            for column in category_columns[1:]:
+                matches = matches | ds.field(column).isin(categories)
+            expression = matches if expression is None else expression & matches
+
+        return expression
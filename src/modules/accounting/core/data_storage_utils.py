@@ -6,6 +6,7 @@ for the monthly data storage system.
 """
 
 import re
+import numpy as np
 import pandas as pd
 from pathlib import Path
 from typing import List, Dict, Any, Optional
@@ -519,122 +520,173 @@ def get_storage_statistics(base_path: Path) -> Dict[str, Any]:
 # Bulk Data Processing and Translation Utilities
 # =============================================================================
 
-def parse_user_expense_table(table_content: str) -> Dict[str, Any]:
+# Month abbreviations accepted in expense table headers (e.g. Jan-25)
+MONTH_ABBREVIATIONS = {
+    'Jan': '01', 'Feb': '02', 'Mar': '03', 'Apr': '04',
+    'May': '05', 'Jun': '06', 'Jul': '07', 'Aug': '08',
+    'Sep': '09', 'Oct': '10', 'Nov': '11', 'Dec': '12'
+}
+
+# Symbols stripped from expense table amounts
+EXPENSE_AMOUNT_SYMBOLS = ('¥', ',')
+
+
+def standardize_table_month(month: str) -> str:
     """
-    Parse user expense table format (User-Category-Month matrix).
+    Convert an expense table month header to YYYY-MM.
     
-    Example input format:
-    User        Jan-25    Feb-25    Mar-25
-    YY    房租    ¥11,512.80    ¥11,512.80    ¥11,512.80
-    XH    餐饮    ¥3,243.94    ¥2,240.63    ¥1,854.87
+    Accepts Jan-25, 01-25 and YYYY-MM.
+    
+    Raises:
+        ValueError: If the header is not a valid month
+    """
+    if validate_month_format(month):
+        return month
+    
+    try:
+        # Handle short month formats (Jan-25, 01-25)
+        if '-' in month and len(month.split('-')[1]) == 2:
+            # Format: Jan-25 or 01-25
+            month_part, year_part = month.split('-')
+            month_num = MONTH_ABBREVIATIONS.get(month_part, month_part.zfill(2))
+            standardized_month = f"20{year_part}-{month_num}"
+        else:
+            standardized_month = month
+            
+        # Validate format
+        if not validate_month_format(standardized_month):
+            raise ValueError(f"Invalid month format: {month}")
+        
+        return standardized_month
+        
+    except Exception as e:
+        raise ValueError(f"Error parsing month '{month}': {e}")
+
+
+def _strip_amount_symbols(text: str) -> str:
+    for symbol in EXPENSE_AMOUNT_SYMBOLS:
+        text = text.replace(symbol, '')
+    return text
+
+
+def parse_expense_matrix(table_content: str) -> Dict[str, Any]:
+    """
+    Parse a user expense table into a user/category x month amount matrix.
+    
+    Amounts of all rows and months are cleaned and converted in one pass,
+    and each distinct category is translated once. A repeated user/category
+    pair keeps the position of its first line and the amounts of its last.
     
     Args:
         table_content: Multi-line string with expense table
         
     Returns:
-        Dictionary with parsed data structure
+        Dictionary with "months" (YYYY-MM), "matrix" (DataFrame with user and
+        category columns followed by one float column per month, in user order)
+        and "total_records" (amount cells parsed)
     """
     from .category_translator import CategoryTranslator
     
-    translator = CategoryTranslator()
-    lines = [line.strip() for line in table_content.strip().split('\n') if line.strip()]
+    lines = [(number, line.strip()) for number, line in enumerate(table_content.strip().split('\n'), 1)]
+    lines = [(number, line) for number, line in lines if line]
     
     if not lines:
         raise ValueError("Empty table content")
     
     # Parse header row (months)
-    header = lines[0].split()
+    header = lines[0][1].split()
     if len(header) < 3:  # Minimum: User, Category, Month1
         raise ValueError("Invalid header format. Expected: User Category Month1 Month2 ...")
     
-    months = header[2:]  # Skip 'User' and first category column
+    months = [standardize_table_month(month) for month in header[2:]]  # Skip 'User' and first category column
     
-    # Validate month formats and standardize
-    standardized_months = []
-    for month in months:
-        try:
-            # Handle various month formats (Jan-25, 2025-01, etc.)
-            if '-' in month and len(month.split('-')[1]) == 2:
-                # Format: Jan-25 or 01-25
-                month_part, year_part = month.split('-')
-                
-                # Convert month names to numbers if needed
-                month_mapping = {
-                    'Jan': '01', 'Feb': '02', 'Mar': '03', 'Apr': '04',
-                    'May': '05', 'Jun': '06', 'Jul': '07', 'Aug': '08', 
-                    'Sep': '09', 'Oct': '10', 'Nov': '11', 'Dec': '12'
-                }
-                
-                if month_part in month_mapping:
-                    month_num = month_mapping[month_part]
-                else:
-                    month_num = month_part.zfill(2)
-                
-                standardized_month = f"20{year_part}-{month_num}"
-            else:
-                standardized_month = month
-                
-            # Validate format
-            if not validate_month_format(standardized_month):
-                raise ValueError(f"Invalid month format: {month}")
-                
-            standardized_months.append(standardized_month)
-            
-        except Exception as e:
-            raise ValueError(f"Error parsing month '{month}': {e}")
+    # Split data rows into user, category and amount cells
+    width = len(months)
+    line_numbers, users, categories, cells = [], [], [], []
+    for line_number, line in lines[1:]:
+        parts = line.split(None, 2)
+        amounts = parts[2].split()[:width] if len(parts) == 3 else []
+        if len(amounts) < width:
+            logger.warning(f"Line {line_number}: Insufficient data columns, skipping")
+            continue
+        line_numbers.append(line_number)
+        users.append(parts[0])
+        categories.append(parts[1])
+        cells.extend(amounts)
     
-    # Parse data rows
-    parsed_data = {
-        "months": standardized_months,
-        "users": {},
-        "categories": set(),
-        "total_records": 0
+    # Translate each distinct category once
+    translator = CategoryTranslator()
+    translation = {category: translator.translate_to_english(category) for category in dict.fromkeys(categories)}
+    
+    # Clean all amount cells at once (cells hold no whitespace, so joining keeps
+    # their boundaries unless a cell held only symbols); empty amounts are zero
+    cleaned = _strip_amount_symbols(' '.join(cells)).split()
+    if len(cleaned) != len(cells):
+        cleaned = [_strip_amount_symbols(cell) for cell in cells]
+    try:
+        values = np.array(cleaned, dtype=float)
+    except ValueError:
+        values = np.array(pd.to_numeric(pd.Series(cleaned, dtype=object), errors='coerce'), dtype=float)
+        values[np.array(cleaned, dtype=object) == ''] = 0.0
+    values = values.reshape(len(line_numbers), width)
+    
+    invalid = np.isnan(values)
+    for row, col in zip(*invalid.nonzero()):
+        logger.error(f"Error parsing amount '{cells[row * width + col]}' for "
+                     f"{users[row]}-{categories[row]}: could not convert to float")
+    values[invalid] = 0.0
+    
+    matrix = pd.concat([
+        pd.DataFrame({'user': users, 'category': [translation[c] for c in categories]},
+                     index=line_numbers, dtype=object),
+        pd.DataFrame(values, index=line_numbers, columns=months)
+    ], axis=1)
+    
+    # Later lines of a user/category overwrite earlier ones
+    matrix = matrix.groupby(['user', 'category'], sort=False).last().reset_index()
+    matrix = matrix.iloc[np.argsort(pd.factorize(matrix['user'])[0], kind='stable')].reset_index(drop=True)
+    
+    return {
+        "months": months,
+        "matrix": matrix,
+        "total_records": int(invalid.size - invalid.sum())
     }
+
+
+def parse_user_expense_table(table_content: str) -> Dict[str, Any]:
+    """
+    Parse user expense table format (User-Category-Month matrix).
     
-    current_user = None
-    for line_idx, line in enumerate(lines[1:], 2):
-        parts = line.split()
-        if len(parts) < len(standardized_months) + 2:
-            logger.warning(f"Line {line_idx}: Insufficient data columns, skipping")
-            continue
-        
-        user = parts[0]
-        category_chinese = parts[1]
-        amounts = parts[2:]
-        
-        # Update current user
-        if user != current_user:
-            current_user = user
-            if user not in parsed_data["users"]:
-                parsed_data["users"][user] = {}
-        
-        # Translate category to English
-        category_english = translator.translate_to_english(category_chinese)
-        parsed_data["categories"].add(category_english)
+    Example input format:
+    User        Jan-25    Feb-25    Mar-25
+    YY    房租    ¥11,512.80    ¥11,512.80    ¥11,512.80
+    XH    餐饮    ¥3,243.94    ¥2,240.63    ¥1,854.87
+    
+    Args:
+        table_content: Multi-line string with expense table
         
-        # Parse amounts for each month
-        month_amounts = {}
-        for month, amount_str in zip(standardized_months, amounts):
-            try:
-                # Clean amount string (remove ¥, commas, etc.)
-                cleaned_amount = amount_str.replace('¥', '').replace(',', '').strip()
-                amount = float(cleaned_amount) if cleaned_amount else 0.0
-                month_amounts[month] = amount
-                parsed_data["total_records"] += 1
-            except ValueError as e:
-                logger.error(f"Error parsing amount '{amount_str}' for {user}-{category_chinese}: {e}")
-                month_amounts[month] = 0.0
-        
-        # Store in parsed data structure
-        if category_english not in parsed_data["users"][user]:
-            parsed_data["users"][user]["categories"] = {}
-        
-        parsed_data["users"][user][category_english] = month_amounts
-    
-    parsed_data["categories"] = sorted(list(parsed_data["categories"]))
+    Returns:
+        Dictionary with parsed data structure; "matrix" holds the amounts
+        as parsed by parse_expense_matrix()
+    """
+    parsed = parse_expense_matrix(table_content)
+    months, matrix = parsed["months"], parsed["matrix"]
+    
+    users: Dict[str, Dict[str, Dict[str, float]]] = {}
+    amounts = matrix[months].to_numpy().tolist()
+    for user, category, month_amounts in zip(matrix['user'], matrix['category'], amounts):
+        users.setdefault(user, {})[category] = dict(zip(months, month_amounts))
+    
+    parsed_data = {
+        "months": months,
+        "users": users,
+        "categories": sorted(matrix['category'].unique().tolist()),
+        "total_records": parsed["total_records"],
+        "matrix": matrix
+    }
     logger.info(f"Parsed expense table: {len(parsed_data['users'])} users, "
                 f"{len(parsed_data['categories'])} categories, "
-                f"{len(standardized_months)} months")
+                f"{len(months)} months")
     
     return parsed_data
 
@@ -647,46 +699,48 @@ def convert_parsed_data_to_transactions(parsed_data: Dict[str, Any]) -> List[pd.
         parsed_data: Result from parse_user_expense_table()
         
     Returns:
-        List of DataFrames, one per month with transaction data
-    """
-    from datetime import datetime
-    from decimal import Decimal
-    
-    monthly_dataframes = []
+        List of (month, DataFrame) pairs with transaction data, for months
+        that have non-zero amounts
+    """
+    months = parsed_data["months"]
+    matrix = parsed_data.get("matrix")
+    if matrix is None:
+        # Parsed data built without parse_expense_matrix()
+        matrix = pd.DataFrame(
+            [{'user': user, 'category': category, **month_amounts}
+             for user, user_data in parsed_data["users"].items()
+             for category, month_amounts in user_data.items()
+             if category != "categories"],  # Skip metadata
+            columns=['user', 'category', *months]
+        ).fillna({month: 0.0 for month in months})
+    
+    # One row per (month, user, category), months in table order
+    long = matrix.melt(id_vars=['user', 'category'], value_vars=months,
+                       var_name='year_month', value_name='amount')
+    long = long[long['amount'] != 0.0]  # Skip zero amounts
+    
+    user = long['user'].astype(str)
+    category = long['category'].astype(str)
+    account = user + "_Account"
+    transactions = pd.DataFrame({
+        "date": long['year_month'] + "-01",  # Use first day of month
+        "Description": category + " - " + user,  # Capital D for schema compatibility
+        "Amount": -long['amount'].abs(),  # Expenses are negative
+        "Debit": category,  # Category goes in Debit column
+        "Credit": account,  # Account goes in Credit column
+        "User": user,
+        "category": category,  # Keep lowercase for internal use
+        "account_name": account,
+        "account_type": "Cash",
+        "notes": "Bulk upload - " + user + " " + category,
+        "year_month": long['year_month'],
+    })
+    
+    monthly_dataframes = [
+        (month, df.reset_index(drop=True))
+        for month, df in transactions.groupby('year_month', sort=False)
+    ]
     
-    for month in parsed_data["months"]:
-        transactions = []
-        
-        for user, user_data in parsed_data["users"].items():
-            for category, month_amounts in user_data.items():
-                if category == "categories":  # Skip metadata
-                    continue
-                    
-                amount = month_amounts.get(month, 0.0)
-                if amount == 0.0:  # Skip zero amounts
-                    continue
-                
-                # Create transaction record with proper schema
-                transaction = {
-                    "date": f"{month}-01",  # Use first day of month
-                    "Description": f"{category} - {user}",  # Capital D for schema compatibility
-                    "Amount": -abs(amount),  # Expenses are negative
-                    "Debit": category,  # Category goes in Debit column
-                    "Credit": f"{user}_Account",  # Account goes in Credit column  
-                    "User": user,  # User column
-                    "category": category,  # Keep lowercase for internal use
-                    "account_name": f"{user}_Account",
-                    "account_type": "Cash",
-                    "notes": f"Bulk upload - {user} {category}"
-                }
-                transactions.append(transaction)
-        
-        # Create DataFrame for this month
-        if transactions:
-            df = pd.DataFrame(transactions)
-            df["year_month"] = month
-            monthly_dataframes.append((month, df))
-            
     logger.info(f"Converted to {len(monthly_dataframes)} monthly transaction DataFrames")
     return monthly_dataframes
 
@@ -4,8 +4,15 @@ Simplified income statement generation
 Based on the example implementation with straightforward revenue/expense categorization.
 """
 
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
 from .models import Transaction, CategoryMapper, REVENUE_CATEGORIES
+from ..models.business.transaction_classifier import (
+    encode, select_encoded, sum_entity_line_items, sum_line_items, transactions_to_table
+)
 
 
 class IncomeStatementGenerator:
@@ -14,49 +21,56 @@ class IncomeStatementGenerator:
     def __init__(self, category_mapper: CategoryMapper):
         self.category_mapper = category_mapper
     
-    def generate_statement(self, transactions: List[Transaction], entity_name: str) -> Dict:
-        """Generate income statement for given transactions"""
+    def generate_statement(self, transactions: Union[pd.DataFrame, List[Transaction]], entity_name: str) -> Dict:
+        """Generate income statement for a transactions table or list, with one grouped sum"""
         
-        expense_summary = {}
-        revenue_summary = {}
-        total_expenses = 0
-        total_revenue = 0
+        sections = sum_line_items(*self._line_items(transactions_to_table(transactions)))
+        return self._statement(entity_name, sections)
+    
+    def generate_statements(self, transactions: Union[pd.DataFrame, List[Transaction]],
+                            combined_name: str = "Combined", entity_label: str = "{}") -> Dict[str, Dict]:
+        """
+        Generate income statements for every user plus the combined statement
+        from one grouped sum over (user, section, category)
         
-        for transaction in transactions:
-            # Skip transactions with zero amounts
-            if transaction.amount == 0:
-                continue
-            
-            # Determine transaction type - prioritize actual analysis over stored attributes
-            # since stored attributes may be defaults for old test data
-            if transaction.debit_category in REVENUE_CATEGORIES and transaction.amount > 0:
-                transaction_type = "revenue"
-            elif hasattr(transaction, 'transaction_type') and transaction.transaction_type == "prepaid_asset":
-                transaction_type = "prepaid_asset"  # Only trust this specific value
-            elif transaction.amount < 0:
-                transaction_type = "expense"
-            else:
-                transaction_type = "expense"
-            
-            # Skip prepaid asset transactions (they don't affect current period income)
-            if transaction_type == "prepaid_asset":
-                continue
-                
-            # Process revenue and expense transactions
-            if transaction_type == "revenue":
-                # Revenue transaction
-                category = transaction.debit_category
-                amount = abs(transaction.amount)  # Ensure positive for income statement
-                revenue_summary[category] = revenue_summary.get(category, 0) + amount
-                total_revenue += amount
-            elif transaction_type == "expense":
-                # Expense transaction (including expenses from prepaid and reimbursements)
-                category = self.category_mapper.get_expense_category(transaction.debit_category)
-                # Keep sign! Negative amounts = expense reductions (reimbursements)
-                # Positive amounts = regular expenses
-                amount = transaction.amount  # DO NOT use abs() - preserve sign!
-                expense_summary[category] = expense_summary.get(category, 0) + amount
-                total_expenses += amount
+        Returns {user: statement, ..., combined_name: statement}; entity_label
+        formats each user's entity name (e.g. "User: {}")
+        """
+        
+        table = transactions_to_table(transactions)
+        per_user, combined = sum_entity_line_items(table['user'], *self._line_items(table))
+        statements = {user: self._statement(entity_label.format(user), sections)
+                      for user, sections in per_user.items() if user != ''}
+        statements[combined_name] = self._statement(combined_name, combined)
+        return statements
+    
+    def _line_items(self, table: pd.DataFrame) -> Tuple[List[Any], np.ndarray, np.ndarray]:
+        """([section, line], signed amount, mask) per transaction, as accepted by sum_line_items"""
+        
+        amount = table['amount'].to_numpy(dtype=float)
+        debit_codes, debits = encode(table['debit_category'])
+        
+        # Revenue is determined from the category, not the stored type (which may be a default);
+        # prepaid assets don't affect current period income
+        revenue = np.isin(debits, REVENUE_CATEGORIES)[debit_codes] & (amount > 0)
+        prepaid = ~revenue & (table['transaction_type'] == 'prepaid_asset').to_numpy(dtype=bool)
+        
+        # Revenue lines keep their category and are positive; expense lines use the mapped
+        # expense category and keep their sign (negative = reimbursement)
+        expense_names = self.category_mapper.map_expense_categories(pd.Series(debits)).to_numpy(dtype=object)
+        return (
+            [(revenue.astype(np.int64), np.array(['Expenses', 'Revenue'], dtype=object)),
+             select_encoded([revenue], [(debit_codes, debits)], default=(debit_codes, expense_names))],
+            np.where(revenue, np.abs(amount), amount),
+            (amount != 0) & ~prepaid,
+        )
+    
+    @staticmethod
+    def _statement(entity_name: str, sections: Dict) -> Dict:
+        revenue_summary = sections.get(('Revenue',), {})
+        expense_summary = sections.get(('Expenses',), {})
+        total_revenue = sum(revenue_summary.values())
+        total_expenses = sum(expense_summary.values())
         
         # Create income statement structure
         income_statement = {
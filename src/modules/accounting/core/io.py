@@ -5,10 +5,11 @@ Based on pandas CSV processing similar to the example implementation.
 """
 
 import pandas as pd
-import re
-import os
-from typing import List
-from .models import Transaction
+from typing import List, Optional
+from .models import Transaction, REVENUE_CATEGORIES
+from ..models.business.transaction_classifier import (
+    classify_transaction, classify_transactions, clean_amounts, empty_transactions_table, transactions_from_table
+)
 
 
 class TransactionProcessor:
@@ -16,20 +17,21 @@ class TransactionProcessor:
     
     def __init__(self, csv_file_path: str):
         self.csv_file_path = csv_file_path
-        self.transactions: List[Transaction] = []
+        # Columnar transactions (see transaction_classifier.TRANSACTION_COLUMNS)
+        self.table: pd.DataFrame = empty_transactions_table()
+        self._transactions: Optional[List[Transaction]] = None
+    
+    @property
+    def transactions(self) -> List[Transaction]:
+        """Transaction objects, materialized from the table on first access"""
+        if self._transactions is None:
+            self._transactions = transactions_from_table(self.table, Transaction)
+        return self._transactions
     
     def _clean_amount(self, amount_str: str) -> float:
         """Clean and convert amount string to float"""
-        if pd.isna(amount_str) or amount_str == '':
-            return 0.0
-        
-        # Remove currency symbols and commas
-        cleaned = re.sub(r'[¥,￥$]', '', str(amount_str))
-        try:
-            return float(cleaned)
-        except ValueError:
-            return 0.0
-
+        return float(clean_amounts(pd.Series([amount_str], dtype=object)).iloc[0])
+    
     def _determine_transaction_type_and_sign(self, debit: str, credit: str, amount: float) -> tuple[str, str, bool, float]:
         """
         Determine transaction type and impacts based on Credit/Debit columns
@@ -42,36 +44,7 @@ class TransactionProcessor:
         3. Expense account debited → expense transaction
         4. Asset/liability conversions → may not affect current income/cash flow
         """
-        from .models import REVENUE_CATEGORIES
-        
-        debit = debit.strip()
-        credit = credit.strip()
-        cash_involved = credit.lower() in ["cash", "现金"] or debit.lower() in ["cash", "现金"]
-        
-        # Revenue transaction: Credit is a revenue account
-        if credit in REVENUE_CATEGORIES:
-            return "revenue", credit, cash_involved, abs(amount)
-
-        # Reimbursement: Debit = Cash, Credit = Expense category (cash inflow reduces expense)
-        # Example: 报销 ¥1,509.00 Cash 通勤 (got cash back for transportation)
-        elif debit.lower() in ["cash", "现金"] and credit not in REVENUE_CATEGORIES:
-            # This is cash received that reduces a previous expense
-            # Treat as negative expense (expense reduction)
-            return "expense", credit, cash_involved, -abs(amount)
-
-        # Prepaid expense being used (converted to expense): Debit = expense, Credit = prepaid
-        elif "prepaid" in credit.lower() or "pre-paid" in credit.lower():
-            # This converts prepaid asset to current expense - affects income statement only
-            return "expense", debit, False, abs(amount)
-
-        # Cash payment for future expense: Debit = prepaid, Credit = cash
-        elif "prepaid" in debit.lower() or "pre-paid" in debit.lower():
-            # This creates prepaid asset - affects cash flow only, not current income
-            return "prepaid_asset", debit, cash_involved, abs(amount)
-
-        # Regular expense: Debit = expense, Credit = cash (or other account)
-        else:
-            return "expense", debit, cash_involved, abs(amount)
+        return classify_transaction(debit, credit, amount, REVENUE_CATEGORIES)
     
     def load_transactions(self) -> None:
         """Load transactions from CSV file with proper Credit/Debit handling"""
@@ -81,44 +54,20 @@ class TransactionProcessor:
             # Clean column names (remove any extra spaces)
             df.columns = df.columns.str.strip()
             
-            for _, row in df.iterrows():
-                raw_amount = self._clean_amount(row.get('Amount', 0))
-                debit = str(row.get('Debit', '')).strip()
-                credit = str(row.get('Credit', '')).strip()
-                
-                # Skip transactions with zero amounts
-                if raw_amount == 0:
-                    continue
-                
-                # Determine transaction type, category, cash flow impact, and amount
-                transaction_type, category, affects_cash_flow, corrected_amount = self._determine_transaction_type_and_sign(
-                    debit, credit, raw_amount
-                )
-                
-                transaction = Transaction(
-                    description=str(row.get('Description', '')).strip(),
-                    amount=corrected_amount,
-                    debit_category=category,
-                    credit_account=credit,
-                    user=str(row.get('User', '')).strip()
-                )
-                
-                # Add metadata for transaction type and cash flow impact
-                transaction.transaction_type = transaction_type
-                transaction.affects_cash_flow = affects_cash_flow
-                
-                self.transactions.append(transaction)
+            self.table = classify_transactions(df, REVENUE_CATEGORIES, drop_blank=False)
+            self._transactions = None
                 
         except Exception as e:
             raise Exception(f"Error loading transactions: {e}")
     
     def get_transactions_by_user(self, user: str) -> List[Transaction]:
         """Get all transactions for a specific user"""
-        return [t for t in self.transactions if t.user == user]
+        return transactions_from_table(self.table, Transaction, (self.table['user'] == user).to_numpy())
     
     def get_all_users(self) -> List[str]:
         """Get list of all unique users"""
-        return list(set(t.user for t in self.transactions if t.user))
+        users = self.table['user']
+        return users[users != ''].unique().tolist()
 
 
 def save_statement_csv(statement_data: dict, filename: str) -> None:
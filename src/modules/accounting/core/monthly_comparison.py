@@ -5,18 +5,45 @@ Provides 12-month rolling comparison of stored financial statements
 with trend analysis, percentage changes, and data aggregation.
 """
 
+import numpy as np
 import pandas as pd
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 from decimal import Decimal
 import logging
 
-from .report_storage import MonthlyReportStorage
+from .report_storage import MonthlyReportStorage, statement_content
 from .data_storage_utils import get_recent_months, validate_month_format
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Separator between the keys of a metric path in labels
+METRIC_SEPARATOR = " > "
+
+
+def _numeric_leaves(data: Dict[str, Any], prefix: tuple = (), label: str = "", listed: bool = True):
+    """
+    Yield (path, label, value, listed) for every numeric leaf of a nested statement.
+    
+    Sections are only listed (extracted when no metrics are requested) if they
+    hold direct values; numeric strings are listed only if they are plain digits.
+    """
+    for key, value in data.items():
+        key_label = label + key if not prefix else label + METRIC_SEPARATOR + key
+        
+        if isinstance(value, (int, float, Decimal)):
+            yield prefix + (key,), key_label, float(value), listed
+        elif isinstance(value, dict):
+            has_values = any(isinstance(v, (int, float, Decimal, str)) for v in value.values())
+            yield from _numeric_leaves(value, prefix + (key,), key_label, listed and has_values)
+        elif isinstance(value, str):
+            try:
+                number = float(value)
+            except ValueError:
+                continue
+            yield prefix + (key,), key_label, number, listed and value.replace('.', '').replace('-', '').isdigit()
+
 
 class MonthlyComparisonEngine:
     """
@@ -78,13 +105,14 @@ class MonthlyComparisonEngine:
             }
         }
         
-        # Load data for each month and convert to standard format
+        # Load all months with one catalog lookup and convert to standard format
+        stored = self.report_storage.load_statements(statement_type, months)
         for month in months:
-            statement_data = self.report_storage.load_statement(month, statement_type)
+            statement_data = stored.get(month)
             
             if statement_data is not None:
                 # Extract the actual statement data (matches income statement format)
-                month_statement = statement_data.get("data", {})
+                month_statement = statement_content(statement_data)
                 
                 # Ensure standard income statement schema structure
                 standardized_data = self._standardize_to_income_statement_format(month_statement, month)
@@ -96,6 +124,35 @@ class MonthlyComparisonEngine:
         logger.info(f"Loaded {statement_type} data for {len(comparison_data['metadata']['available_months'])} months")
         return comparison_data
     
+    def metrics_frame(self, comparison_data: Dict[str, Any]) -> pd.DataFrame:
+        """
+        Flatten the available months' statements into one table.
+        
+        Args:
+            comparison_data: Data from get_comparison_data()
+            
+        Returns:
+            DataFrame with sorted months as rows and one float column per metric
+            path (labelled "Expenses > Rent"); NaN where a month lacks the metric
+        """
+        months = sorted([m for m in comparison_data["months"] if m in comparison_data["data"]])
+        frame, _ = self._flatten_statements([comparison_data["data"][m] for m in months], months)
+        return frame
+    
+    def month_over_month_changes(self, comparison_data: Dict[str, Any]) -> pd.DataFrame:
+        """
+        Percentage change of every metric from the previous available month.
+        
+        Args:
+            comparison_data: Data from get_comparison_data()
+            
+        Returns:
+            DataFrame shaped like metrics_frame(); NaN for the first month and
+            where either month lacks the metric
+        """
+        frame = self.metrics_frame(comparison_data)
+        return self._percentage_changes(frame.shift(), frame)
+    
     def calculate_monthly_trends(
         self, 
         comparison_data: Dict[str, Any],
@@ -136,41 +193,40 @@ class MonthlyComparisonEngine:
             logger.warning("Need at least 2 months of data for trend analysis")
             return trend_analysis
         
-        changes = []
+        if metric_path is None:
+            return trend_analysis
+        
+        frame, _ = self._flatten_statements([available_data[m] for m in sorted_months], sorted_months)
+        values = frame.reindex(columns=[METRIC_SEPARATOR.join(metric_path)]).iloc[:, 0]
+        previous = values.shift()
+        changes = self._percentage_changes(previous, values)
         
-        for i in range(1, len(sorted_months)):
-            prev_month = sorted_months[i-1]
-            curr_month = sorted_months[i]
-            
-            prev_value = self._extract_metric_value(available_data[prev_month], metric_path)
-            curr_value = self._extract_metric_value(available_data[curr_month], metric_path)
-            
-            if prev_value is not None and curr_value is not None:
-                if prev_value != 0:
-                    change_pct = ((curr_value - prev_value) / abs(prev_value)) * 100
-                else:
-                    change_pct = 100.0 if curr_value > 0 else -100.0 if curr_value < 0 else 0.0
-                
-                trend_analysis["trends"][curr_month] = {
-                    "previous_month": prev_month,
-                    "previous_value": float(prev_value),
-                    "current_value": float(curr_value),
-                    "absolute_change": float(curr_value - prev_value),
-                    "percentage_change": round(change_pct, 2),
-                    "trend_direction": "growth" if change_pct > 0 else "decline" if change_pct < 0 else "flat"
-                }
-                
-                changes.append(change_pct)
+        valid = changes.notna().to_numpy()
+        if not valid.any():
+            return trend_analysis
+        
+        previous_months = np.asarray(sorted_months[:-1], dtype=object)
+        for curr_month, prev_month, prev_value, curr_value, change_pct in zip(
+            values.index[valid], previous_months[valid[1:]], previous[valid], values[valid], changes[valid]
+        ):
+            trend_analysis["trends"][curr_month] = {
+                "previous_month": prev_month,
+                "previous_value": float(prev_value),
+                "current_value": float(curr_value),
+                "absolute_change": float(curr_value - prev_value),
+                "percentage_change": round(float(change_pct), 2),
+                "trend_direction": "growth" if change_pct > 0 else "decline" if change_pct < 0 else "flat"
+            }
         
         # Calculate summary statistics
-        if changes:
-            trend_analysis["summary"]["total_periods"] = len(changes)
-            trend_analysis["summary"]["growth_periods"] = len([c for c in changes if c > 0])
-            trend_analysis["summary"]["decline_periods"] = len([c for c in changes if c < 0])
-            trend_analysis["summary"]["flat_periods"] = len([c for c in changes if c == 0])
-            trend_analysis["summary"]["average_change_pct"] = round(sum(changes) / len(changes), 2)
-            trend_analysis["summary"]["max_growth_pct"] = round(max(changes) if changes else 0, 2)
-            trend_analysis["summary"]["max_decline_pct"] = round(min(changes) if changes else 0, 2)
+        changes = changes[valid]
+        trend_analysis["summary"]["total_periods"] = len(changes)
+        trend_analysis["summary"]["growth_periods"] = int((changes > 0).sum())
+        trend_analysis["summary"]["decline_periods"] = int((changes < 0).sum())
+        trend_analysis["summary"]["flat_periods"] = int((changes == 0).sum())
+        trend_analysis["summary"]["average_change_pct"] = round(float(changes.mean()), 2)
+        trend_analysis["summary"]["max_growth_pct"] = round(float(changes.max()), 2)
+        trend_analysis["summary"]["max_decline_pct"] = round(float(changes.min()), 2)
         
         return trend_analysis
     
@@ -194,26 +250,8 @@ class MonthlyComparisonEngine:
         if not months:
             return pd.DataFrame()
         
-        # Auto-extract metrics if not provided
-        if metrics is None:
-            metrics = self._extract_all_metrics(comparison_data["data"])
-        
-        # Create table data
-        table_data = {}
-        
-        for month in months:
-            month_data = comparison_data["data"][month]
-            month_values = {}
-            
-            for metric_path in metrics:
-                value = self._extract_metric_value(month_data, metric_path)
-                metric_label = " > ".join(metric_path) if isinstance(metric_path, list) else str(metric_path)
-                month_values[metric_label] = float(value) if value is not None else None
-            
-            table_data[month] = month_values
-        
-        # Create DataFrame
-        df = pd.DataFrame(table_data)
+        frame, listed = self._flatten_statements([comparison_data["data"][m] for m in months], months)
+        df = self._select_metrics(frame, listed, metrics).T
         df.index.name = "Metric"
         
         return df
@@ -243,8 +281,9 @@ class MonthlyComparisonEngine:
         prev_year_month = f"{int(year) - 1}-{month}"
         
         # Load data for both months
-        current_data = self.report_storage.load_statement(current_month, statement_type)
-        prev_year_data = self.report_storage.load_statement(prev_year_month, statement_type)
+        stored = self.report_storage.load_statements(statement_type, [current_month, prev_year_month])
+        current_data = stored.get(current_month)
+        prev_year_data = stored.get(prev_year_month)
         
         yoy_comparison = {
             "statement_type": statement_type,
@@ -259,35 +298,28 @@ class MonthlyComparisonEngine:
             logger.warning(f"Missing data for YoY comparison: current={current_data is not None}, prev_year={prev_year_data is not None}")
             return yoy_comparison
         
-        current_values = current_data.get("data", {})
-        prev_year_values = prev_year_data.get("data", {})
-        
-        # Auto-extract metrics if not provided
-        if metrics is None:
-            metrics = self._extract_all_metrics({"current": current_values, "prev": prev_year_values})
+        frame, listed = self._flatten_statements(
+            [statement_content(current_data), statement_content(prev_year_data)],
+            [current_month, prev_year_month]
+        )
+        values = self._select_metrics(frame, listed, metrics)
+        current_values, prev_year_values = values.iloc[0], values.iloc[1]
+        absolute_changes = current_values - prev_year_values
+        percentage_changes = self._percentage_changes(prev_year_values, current_values)
         
         # Calculate comparisons
-        for metric_path in metrics:
-            current_value = self._extract_metric_value(current_values, metric_path)
-            prev_year_value = self._extract_metric_value(prev_year_values, metric_path)
-            
-            metric_label = " > ".join(metric_path) if isinstance(metric_path, list) else str(metric_path)
-            
-            if current_value is not None and prev_year_value is not None:
-                absolute_change = current_value - prev_year_value
-                
-                if prev_year_value != 0:
-                    percentage_change = (absolute_change / abs(prev_year_value)) * 100
-                else:
-                    percentage_change = 100.0 if current_value > 0 else -100.0 if current_value < 0 else 0.0
-                
-                yoy_comparison["comparisons"][metric_label] = {
-                    "current_value": float(current_value),
-                    "previous_year_value": float(prev_year_value),
-                    "absolute_change": float(absolute_change),
-                    "percentage_change": round(percentage_change, 2),
-                    "trend": "growth" if percentage_change > 0 else "decline" if percentage_change < 0 else "flat"
-                }
+        for metric_label, current_value, prev_year_value, absolute_change, percentage_change in zip(
+            values.columns, current_values, prev_year_values, absolute_changes, percentage_changes
+        ):
+            if pd.isna(percentage_change):
+                continue
+            yoy_comparison["comparisons"][metric_label] = {
+                "current_value": float(current_value),
+                "previous_year_value": float(prev_year_value),
+                "absolute_change": float(absolute_change),
+                "percentage_change": round(float(percentage_change), 2),
+                "trend": "growth" if percentage_change > 0 else "decline" if percentage_change < 0 else "flat"
+            }
         
         return yoy_comparison
     
@@ -319,81 +351,90 @@ class MonthlyComparisonEngine:
             "metrics": {}
         }
         
-        # Extract all metrics and calculate statistics
-        all_metrics = self._extract_all_metrics(comparison_data["data"])
-        
-        for metric_path in all_metrics:
-            values = []
-            for month in available_months:
-                value = self._extract_metric_value(comparison_data["data"][month], metric_path)
-                if value is not None:
-                    values.append(float(value))
-            
-            if values:
-                metric_label = " > ".join(metric_path) if isinstance(metric_path, list) else str(metric_path)
-                summary["metrics"][metric_label] = {
-                    "count": len(values),
-                    "mean": round(sum(values) / len(values), 2),
-                    "min": round(min(values), 2),
-                    "max": round(max(values), 2),
-                    "std": round(pd.Series(values).std(), 2) if len(values) > 1 else 0,
-                    "total": round(sum(values), 2)
-                }
+        # Statistics of every metric as column aggregates
+        frame, listed = self._flatten_statements(
+            [comparison_data["data"][month] for month in available_months], available_months
+        )
+        statistics = frame[listed].agg(['count', 'mean', 'min', 'max', 'std', 'sum']).T
+        statistics = statistics[statistics['count'] > 0]
+        
+        for metric_label, stats in statistics.to_dict('index').items():
+            count = int(stats['count'])
+            summary["metrics"][metric_label] = {
+                "count": count,
+                "mean": round(stats['mean'], 2),
+                "min": round(stats['min'], 2),
+                "max": round(stats['max'], 2),
+                "std": round(stats['std'], 2) if count > 1 else 0,
+                "total": round(stats['sum'], 2)
+            }
         
         return summary
     
-    def _extract_metric_value(self, data: Dict[str, Any], metric_path: Optional[List[str]]) -> Optional[float]:
-        """Extract a specific metric value from nested data structure"""
-        if metric_path is None:
-            return None
-        
-        try:
-            current = data
-            for key in metric_path:
-                if isinstance(current, dict) and key in current:
-                    current = current[key]
-                else:
-                    return None
-            
-            # Convert to float if possible
-            if isinstance(current, (int, float, Decimal)):
-                return float(current)
-            elif isinstance(current, str):
-                try:
-                    return float(current)
-                except ValueError:
-                    return None
-            else:
-                return None
-                
-        except Exception:
-            return None
+    @staticmethod
+    def _flatten_statements(statements: List[Any], index: List[str]) -> Tuple[pd.DataFrame, List[str]]:
+        """
+        Flatten nested statements into one row each.
+        
+        Returns:
+            (frame, listed): frame has a float column per numeric leaf path,
+            sorted by path; listed holds the labels of the paths extracted when
+            no metrics are requested (leaves under sections with direct values)
+        """
+        # Scatter (row, column, value) triples into one matrix
+        positions: Dict[str, int] = {}
+        paths: List[tuple] = []
+        listed_labels = set()
+        rows, cols, values = [], [], []
+        for row, statement in enumerate(statements):
+            if not isinstance(statement, dict):
+                continue
+            for path, label, value, listed in _numeric_leaves(statement):
+                col = positions.get(label)
+                if col is None:
+                    col = positions[label] = len(paths)
+                    paths.append(path)
+                rows.append(row)
+                cols.append(col)
+                values.append(value)
+                if listed:
+                    listed_labels.add(label)
+        
+        matrix = np.full((len(statements), len(paths)), np.nan)
+        matrix[rows, cols] = values
+        order = sorted(range(len(paths)), key=paths.__getitem__)
+        columns = [METRIC_SEPARATOR.join(paths[i]) for i in order]
+        frame = pd.DataFrame(matrix[:, order], index=index, columns=columns)
+        return frame, [label for label in columns if label in listed_labels]
     
-    def _extract_all_metrics(self, data_dict: Dict[str, Any]) -> List[List[str]]:
-        """Extract all possible metric paths from data structure"""
-        metrics = set()
+    @staticmethod
+    def _select_metrics(
+        frame: pd.DataFrame,
+        listed: List[str],
+        metrics: Optional[List[List[str]]]
+    ) -> pd.DataFrame:
+        """Columns of the requested metric paths (all listed metrics if None), labelled as in the output"""
+        if metrics is None:
+            return frame[listed]
         
-        for month_data in data_dict.values():
-            if isinstance(month_data, dict):
-                metrics.update(self._get_nested_paths(month_data))
+        # Output label -> column, keeping the first of repeated metrics
+        labels = {}
+        for path in metrics:
+            label = METRIC_SEPARATOR.join(path) if isinstance(path, list) else str(path)
+            labels.setdefault(label, METRIC_SEPARATOR.join(path))
         
-        return [list(path) for path in sorted(metrics)]
+        selected = frame.reindex(columns=list(labels.values()))
+        selected.columns = list(labels)
+        return selected
     
-    def _get_nested_paths(self, data: Dict[str, Any], prefix: tuple = ()) -> set:
-        """Recursively get all paths in nested dictionary"""
-        paths = set()
-        
-        for key, value in data.items():
-            current_path = prefix + (key,)
-            
-            if isinstance(value, dict):
-                # Add intermediate path if it has numeric values
-                if any(isinstance(v, (int, float, Decimal, str)) for v in value.values()):
-                    paths.update(self._get_nested_paths(value, current_path))
-            elif isinstance(value, (int, float, Decimal)) or (isinstance(value, str) and value.replace('.', '').replace('-', '').isdigit()):
-                paths.add(current_path)
-        
-        return paths
+    @staticmethod
+    def _percentage_changes(previous, current):
+        """
+        Element-wise percentage change; ±100% from zero, NaN where either value is missing.
+        """
+        change = (current - previous) / previous.abs() * 100
+        from_zero = (np.sign(current) * 100.0).where(current != 0, 0.0)
+        return change.where(previous != 0, from_zero).where(previous.notna() & current.notna())
 
     
     def _standardize_to_income_statement_format(self, month_data: Dict[str, Any], month: str) -> Dict[str, Any]:
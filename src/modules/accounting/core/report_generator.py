@@ -33,32 +33,16 @@ class FinancialReportGenerator:
         # Load transactions
         self.processor.load_transactions()
         
-        # Get all users
-        users = self.processor.get_all_users()
-        
-        # Generate reports for each user and combined
-        user_income_data = {}
-        user_cashflow_data = {}
-        
-        # Individual user reports
-        for user in users:
-            user_transactions = self.processor.get_transactions_by_user(user)
-            
-            # Income statement
-            income_stmt = self.income_generator.generate_statement(user_transactions, f"User: {user}")
-            user_income_data[user] = self._flatten_income_statement(income_stmt)
-            
-            # Cash flow statement  
-            cashflow_stmt = self.cashflow_generator.generate_statement(user_transactions, f"User: {user}")
-            user_cashflow_data[user] = self._flatten_cashflow_statement(cashflow_stmt)
-        
-        # Combined report
-        all_transactions = self.processor.transactions
-        combined_income = self.income_generator.generate_statement(all_transactions, "Combined")
-        combined_cashflow = self.cashflow_generator.generate_statement(all_transactions, "Combined")
-        
-        user_income_data["Combined"] = self._flatten_income_statement(combined_income)
-        user_cashflow_data["Combined"] = self._flatten_cashflow_statement(combined_cashflow)
+        # Statements for each user and combined, from one pass over the transactions
+        income_statements = self.income_generator.generate_statements(self.processor.table,
+                                                                      entity_label="User: {}")
+        cashflow_statements = self.cashflow_generator.generate_statements(self.processor.table,
+                                                                          entity_label="User: {}")
+        
+        user_income_data = {user: self._flatten_income_statement(stmt)
+                            for user, stmt in income_statements.items()}
+        user_cashflow_data = {user: self._flatten_cashflow_statement(stmt)
+                              for user, stmt in cashflow_statements.items()}
         
         # Transpose the data (users as columns)
         transposed_income = self._transpose_user_data(user_income_data)
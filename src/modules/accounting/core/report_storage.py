@@ -3,12 +3,19 @@ Report Storage Manager for Monthly Accounting Statements
 
 Handles persistent storage of generated financial statements (income, cash flow, balance sheet)
 with singleton pattern per month and refresh capability.
+
+Statements are stored one JSON file per (month, statement type, entity). A
+SQLite catalog next to the month directories indexes every stored file and
+is updated on save and delete, so listing and multi-month loads are a single
+indexed query instead of directory walks.
 """
 
 import json
+import sqlite3
 import pandas as pd
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, Iterator, List, Optional, Any
 from datetime import datetime
 import logging
 from decimal import Decimal
@@ -19,6 +26,32 @@ from .data_storage_utils import validate_month_format, get_monthly_data_path
 logger = logging.getLogger(__name__)
 
 
+# Catalog database stored in the reports base directory
+CATALOG_FILE = "catalog.db"
+
+# Entity loaded when none is requested
+DEFAULT_ENTITY = "Combined"
+
+_CATALOG_SCHEMA = """
+CREATE TABLE IF NOT EXISTS statements (
+    year_month TEXT NOT NULL,
+    statement_type TEXT NOT NULL,
+    entity TEXT NOT NULL,
+    path TEXT NOT NULL,
+    generated_at TEXT,
+    PRIMARY KEY (statement_type, year_month, entity)
+);
+CREATE INDEX IF NOT EXISTS idx_statements_month ON statements(year_month);
+"""
+
+_CATALOG_COLUMNS = ("year_month", "statement_type", "entity", "path", "generated_at")
+
+
+def statement_content(stored: Dict[str, Any]) -> Dict[str, Any]:
+    """Statement body of a stored record (older files keep it under 'data')"""
+    return stored.get("statement", stored.get("data", {})) or {}
+
+
 class DecimalEncoder(json.JSONEncoder):
     """JSON encoder that handles Decimal objects"""
     def default(self, obj):
@@ -44,6 +77,13 @@ class MonthlyReportStorage:
         """
         self.base_path = Path(base_path)
         self.base_path.mkdir(parents=True, exist_ok=True)
+        self.catalog_path = self.base_path / CATALOG_FILE
+
+        new_catalog = not self.catalog_path.exists()
+        with self._catalog() as conn:
+            conn.executescript(_CATALOG_SCHEMA)
+        if new_catalog:
+            self.rebuild_catalog()
         
     def save_statement(
         self, 
@@ -90,6 +130,12 @@ class MonthlyReportStorage:
             statement_path = monthly_path / f"{statement_type}_{entity}.json"
             with open(statement_path, 'w', encoding='utf-8') as f:
                 json.dump(statement_with_meta, f, cls=DecimalEncoder, indent=2, ensure_ascii=False)
+
+            with self._catalog() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO statements VALUES (?, ?, ?, ?, ?)",
+                    (year_month, statement_type, entity, statement_path.name, statement_with_meta["generated_at"])
+                )
             
             logger.info(f"Saved {statement_type} for {year_month}")
             return True
@@ -101,7 +147,8 @@ class MonthlyReportStorage:
     def load_statement(
         self, 
         year_month: str, 
-        statement_type: str
+        statement_type: str,
+        entity: Optional[str] = None
     ) -> Optional[Dict[str, Any]]:
         """
         Load a financial statement for a specific month.
@@ -109,6 +156,7 @@ class MonthlyReportStorage:
         Args:
             year_month: Month in YYYY-MM format
             statement_type: Type of statement
+            entity: Entity to load (default: Combined, or the month's only entity)
             
         Returns:
             Statement data dictionary or None if not found
@@ -119,22 +167,53 @@ class MonthlyReportStorage:
         if statement_type not in self.STATEMENT_TYPES:
             raise ValueError(f"Invalid statement type: {statement_type}")
         
-        monthly_path = get_monthly_data_path(self.base_path, year_month)
-        statement_path = monthly_path / f"{statement_type}.json"
+        return self.load_statements(statement_type, [year_month], entity).get(year_month)
+    
+    def load_statements(
+        self,
+        statement_type: str,
+        months: Optional[Iterable[str]] = None,
+        entity: Optional[str] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Load one statement per month for many months at once.
         
-        if not statement_path.exists():
-            return None
+        The files to read are resolved with a single catalog query.
         
-        try:
-            with open(statement_path, 'r', encoding='utf-8') as f:
-                statement_data = json.load(f)
-            
-            logger.info(f"Loaded {statement_type} for {year_month}")
-            return statement_data
+        Args:
+            statement_type: Type of statement
+            months: Months to load (default: every cataloged month)
+            entity: Entity to load (default: Combined, or a month's only entity)
             
-        except Exception as e:
-            logger.error(f"Failed to load {statement_type} for {year_month}: {e}")
-            return None
+        Returns:
+            Dictionary mapping each month that has the statement to its stored data,
+            in month order
+        """
+        if statement_type not in self.STATEMENT_TYPES:
+            raise ValueError(f"Invalid statement type: {statement_type}")
+        
+        by_month: Dict[str, Dict[str, str]] = {}
+        for entry in self.catalog_entries(statement_type=statement_type, months=months, entity=entity):
+            by_month.setdefault(entry["year_month"], {})[entry["entity"]] = entry["path"]
+        
+        loaded = {}
+        for year_month, entity_paths in by_month.items():
+            if entity is not None or len(entity_paths) == 1:
+                path = next(iter(entity_paths.values()))
+            elif DEFAULT_ENTITY in entity_paths:
+                path = entity_paths[DEFAULT_ENTITY]
+            else:
+                logger.warning(f"Several {statement_type} entities for {year_month} and none is {DEFAULT_ENTITY}")
+                continue
+            statement_path = get_monthly_data_path(self.base_path, year_month) / path
+            try:
+                with open(statement_path, 'r', encoding='utf-8') as f:
+                    loaded[year_month] = json.load(f)
+            except Exception as e:
+                logger.error(f"Failed to load {statement_type} for {year_month}: {e}")
+        
+        logger.info(f"Loaded {statement_type} for {len(loaded)} months")
+        return loaded
     
     def list_available_statements(self, statement_type: Optional[str] = None) -> Dict[str, List[str]]:
         """
@@ -146,33 +225,113 @@ class MonthlyReportStorage:
         Returns:
             Dictionary mapping months to available statement types
         """
-        available = {}
+        available: Dict[str, List[str]] = {}
+        for entry in self.catalog_entries(statement_type=statement_type):
+            month_statements = available.setdefault(entry["year_month"], [])
+            if entry["statement_type"] not in month_statements:
+                month_statements.append(entry["statement_type"])
+        
+        for month_statements in available.values():
+            month_statements.sort(key=self.STATEMENT_TYPES.index)
+        return available
+    
+    def catalog_entries(
+        self,
+        statement_type: Optional[str] = None,
+        months: Optional[Iterable[str]] = None,
+        entity: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Query the statement catalog.
+        
+        Args:
+            statement_type: Filter by statement type (optional)
+            months: Filter by months (optional)
+            entity: Filter by entity (optional)
+            
+        Returns:
+            Catalog rows (year_month, statement_type, entity, path, generated_at)
+            ordered by month, statement type and entity
+        """
+        conditions, params = [], []
+        if statement_type is not None:
+            conditions.append("statement_type = ?")
+            params.append(statement_type)
+        if months is not None:
+            months = list(months)
+            conditions.append(f"year_month IN ({', '.join('?' * len(months))})")
+            params.extend(months)
+        if entity is not None:
+            conditions.append("entity = ?")
+            params.append(entity)
+        
+        query = f"SELECT {', '.join(_CATALOG_COLUMNS)} FROM statements"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY year_month, statement_type, entity"
+        
+        with self._catalog() as conn:
+            rows = conn.execute(query, params).fetchall()
+        return [dict(zip(_CATALOG_COLUMNS, row)) for row in rows]
+    
+    def rebuild_catalog(self) -> int:
+        """
+        Re-index every statement file under the base directory.
         
-        if not self.base_path.exists():
-            return available
+        Used when the catalog is first created over existing reports, or
+        after files were changed outside this class.
         
-        for month_dir in self.base_path.iterdir():
-            if month_dir.is_dir() and validate_month_format(month_dir.name):
-                month_statements = []
-                
-                for stmt_type in self.STATEMENT_TYPES:
-                    if statement_type is None or stmt_type == statement_type:
-                        statement_path = month_dir / f"{stmt_type}.json"
-                        if statement_path.exists():
-                            month_statements.append(stmt_type)
+        Returns:
+            Number of cataloged statements
+        """
+        entries = []
+        for month_dir in sorted(self.base_path.iterdir()):
+            if not (month_dir.is_dir() and validate_month_format(month_dir.name)):
+                continue
+            for statement_path in sorted(month_dir.glob("*.json")):
+                statement_type = next(
+                    (t for t in self.STATEMENT_TYPES
+                     if statement_path.stem == t or statement_path.stem.startswith(f"{t}_")),
+                    None
+                )
+                if statement_type is None:
+                    continue
+                try:
+                    with open(statement_path, 'r', encoding='utf-8') as f:
+                        stored = json.load(f)
+                except Exception as e:
+                    logger.warning(f"Skipping unreadable statement {statement_path}: {e}")
+                    continue
                 
-                if month_statements:
-                    available[month_dir.name] = month_statements
+                if statement_path.stem == statement_type:
+                    # Files saved before entities were part of the name
+                    content = statement_content(stored)
+                    entity = content.get('Entity') or stored.get("metadata", {}).get('entity', DEFAULT_ENTITY)
+                else:
+                    entity = statement_path.stem[len(statement_type) + 1:]
+                entries.append((month_dir.name, statement_type, entity, statement_path.name,
+                                stored.get("generated_at")))
         
-        return available
+        with self._catalog() as conn:
+            conn.execute("DELETE FROM statements")
+            conn.executemany("INSERT OR REPLACE INTO statements VALUES (?, ?, ?, ?, ?)", entries)
+        
+        logger.info(f"Cataloged {len(entries)} statements in {self.base_path}")
+        return len(entries)
     
-    def get_statement_info(self, year_month: str, statement_type: str) -> Dict[str, Any]:
+    def get_statement_info(
+        self,
+        year_month: str,
+        statement_type: str,
+        entity: str = DEFAULT_ENTITY
+    ) -> Dict[str, Any]:
         """
         Get information about a stored statement.
         
         Args:
             year_month: Month in YYYY-MM format
             statement_type: Type of statement
+            entity: Entity of the statement
             
         Returns:
             Dictionary with statement information
@@ -181,38 +340,32 @@ class MonthlyReportStorage:
             raise ValueError(f"Invalid month format: {year_month}")
             
         monthly_path = get_monthly_data_path(self.base_path, year_month)
-        statement_path = monthly_path / f"{statement_type}.json"
+        entries = self.catalog_entries(statement_type=statement_type, months=[year_month], entity=entity)
+        statement_path = monthly_path / (entries[0]["path"] if entries else f"{statement_type}_{entity}.json")
         
         info = {
             "year_month": year_month,
             "statement_type": statement_type,
+            "entity": entity,
             "exists": statement_path.exists(),
             "path": str(statement_path),
             "size_bytes": 0,
             "last_modified": None,
-            "generated_at": None
+            "generated_at": entries[0]["generated_at"] if entries else None
         }
         
         if statement_path.exists():
-            info["size_bytes"] = statement_path.stat().st_size
-            info["last_modified"] = datetime.fromtimestamp(
-                statement_path.stat().st_mtime
-            ).isoformat()
-            
-            # Try to get generation time from file content
-            try:
-                with open(statement_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    info["generated_at"] = data.get("generated_at")
-            except Exception as e:
-                logger.warning(f"Could not read generation time for {statement_path}: {e}")
+            stat = statement_path.stat()
+            info["size_bytes"] = stat.st_size
+            info["last_modified"] = datetime.fromtimestamp(stat.st_mtime).isoformat()
         
         return info
     
     def delete_statement(
         self, 
         year_month: str, 
-        statement_type: Optional[str] = None
+        statement_type: Optional[str] = None,
+        entity: Optional[str] = None
     ) -> bool:
         """
         Delete statements for a specific month.
@@ -220,6 +373,7 @@ class MonthlyReportStorage:
         Args:
             year_month: Month in YYYY-MM format
             statement_type: Type of statement, or None for all types
+            entity: Entity of the statement, or None for all entities
             
         Returns:
             True if deletion successful
@@ -227,6 +381,9 @@ class MonthlyReportStorage:
         if not validate_month_format(year_month):
             raise ValueError(f"Invalid month format: {year_month}")
             
+        if statement_type is not None and statement_type not in self.STATEMENT_TYPES:
+            raise ValueError(f"Invalid statement type: {statement_type}")
+            
         monthly_path = get_monthly_data_path(self.base_path, year_month)
         
         if not monthly_path.exists():
@@ -234,27 +391,23 @@ class MonthlyReportStorage:
             return True
         
         try:
-            if statement_type is None:
-                # Delete all statements for the month
-                for stmt_type in self.STATEMENT_TYPES:
-                    statement_path = monthly_path / f"{stmt_type}.json"
-                    if statement_path.exists():
-                        statement_path.unlink()
-                        logger.info(f"Deleted {stmt_type} for {year_month}")
-                
-                # Remove directory if empty
-                if not any(monthly_path.iterdir()):
-                    monthly_path.rmdir()
-                    logger.info(f"Removed empty directory for {year_month}")
-            else:
-                # Delete specific statement type
-                if statement_type not in self.STATEMENT_TYPES:
-                    raise ValueError(f"Invalid statement type: {statement_type}")
-                    
-                statement_path = monthly_path / f"{statement_type}.json"
+            entries = self.catalog_entries(statement_type=statement_type, months=[year_month], entity=entity)
+            for entry in entries:
+                statement_path = monthly_path / entry["path"]
                 if statement_path.exists():
                     statement_path.unlink()
-                    logger.info(f"Deleted {statement_type} for {year_month}")
+                    logger.info(f"Deleted {entry['statement_type']} for {entry['entity']} in {year_month}")
+            
+            with self._catalog() as conn:
+                conn.executemany(
+                    "DELETE FROM statements WHERE year_month = ? AND statement_type = ? AND entity = ?",
+                    [(year_month, entry["statement_type"], entry["entity"]) for entry in entries]
+                )
+            
+            # Remove directory if empty
+            if statement_type is None and entity is None and not any(monthly_path.iterdir()):
+                monthly_path.rmdir()
+                logger.info(f"Removed empty directory for {year_month}")
             
             return True
             
@@ -319,7 +472,7 @@ class MonthlyReportStorage:
                 
             try:
                 # Extract the main data from the statement
-                data = statement_data.get("data", {})
+                data = statement_content(statement_data)
                 
                 # Convert to DataFrame based on statement structure
                 if statement_type == "income_statement":
@@ -366,6 +519,16 @@ class MonthlyReportStorage:
 
         return results
     
+    @contextmanager
+    def _catalog(self) -> Iterator[sqlite3.Connection]:
+        """Catalog connection committed on success (one per call, so threads can share the storage)"""
+        conn = sqlite3.connect(str(self.catalog_path), timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+    
     def _income_statement_to_df(self, data: Dict[str, Any]) -> pd.DataFrame:
         """Convert income statement data to DataFrame"""
         rows = []
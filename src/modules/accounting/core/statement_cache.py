@@ -0,0 +1,330 @@
+"""
+Materialized Monthly Statements with Dependency Tracking
+
+Income and cash flow statements derived from a month's stored transactions
+are saved through MonthlyReportStorage together with a manifest recording
+the content hash of the source transactions.parquet and of the category
+configuration they were generated with. A month is regenerated only when
+either hash changed, so callers can ask for fresh statements without
+regenerating defensively.
+
+Statements saved from elsewhere (e.g. generated from a CSV uploaded in the
+UI) were not derived from the stored transactions. Their months are kept as
+saved: they are never stale, and only a forced refresh replaces them.
+"""
+
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+import logging
+
+import pandas as pd
+
+from .data_storage import MonthlyDataStorage
+from .data_storage_utils import validate_month_format, get_monthly_data_path
+from .report_storage import MonthlyReportStorage
+from ..models.business.transaction_processor import TransactionProcessor
+from ..models.business.income_statement_generator import IncomeStatementGenerator
+from ..models.business.cash_flow_generator import CashFlowStatementGenerator
+from ..models.domain.category import CategoryMapper
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Manifest stored next to a month's materialized statements
+MANIFEST_FILE = "materialized.json"
+
+# Source data file the statements are derived from
+SOURCE_FILE = "transactions.parquet"
+
+# Manifest source of statements generated by the cache itself
+MATERIALIZED_SOURCE = "materialized"
+
+
+def file_hash(path: Path, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of a file's content"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class MonthlyStatementCache:
+    """
+    Materializes monthly statements from stored transactions and tracks
+    which source and configuration versions they were derived from.
+    """
+
+    def __init__(
+        self,
+        data_storage: Optional[MonthlyDataStorage] = None,
+        report_storage: Optional[MonthlyReportStorage] = None,
+        category_mapper: Optional[CategoryMapper] = None
+    ):
+        """
+        Initialize the statement cache.
+
+        Args:
+            data_storage: Source of monthly transactions (default storage if None)
+            report_storage: Destination of generated statements (default storage if None)
+            category_mapper: Category configuration used to generate statements
+        """
+        self.data_storage = data_storage or MonthlyDataStorage()
+        self.report_storage = report_storage or MonthlyReportStorage()
+        self.category_mapper = category_mapper or CategoryMapper()
+        self.income_generator = IncomeStatementGenerator(self.category_mapper)
+        self.cashflow_generator = CashFlowStatementGenerator(self.category_mapper)
+        self._config_hash: Optional[str] = None
+
+    @property
+    def config_hash(self) -> str:
+        """Hash of the category configuration the statements depend on"""
+        if self._config_hash is None:
+            config_path = getattr(self.category_mapper.config_loader, 'config_file_path', None)
+            if config_path is not None and Path(config_path).exists():
+                self._config_hash = file_hash(Path(config_path))
+            else:
+                mappings = {
+                    'expense': self.category_mapper.expense_categories,
+                    'cashflow': self.category_mapper.cashflow_categories,
+                }
+                encoded = json.dumps(mappings, sort_keys=True, ensure_ascii=False).encode('utf-8')
+                self._config_hash = hashlib.sha256(encoded).hexdigest()
+        return self._config_hash
+
+    def source_hash(self, year_month: str) -> Optional[str]:
+        """Content hash of a month's transactions.parquet, None if there is none"""
+        source_path = get_monthly_data_path(self.data_storage.base_path, year_month) / SOURCE_FILE
+        if not source_path.exists():
+            return None
+        return file_hash(source_path)
+
+    def load_manifest(self, year_month: str) -> Optional[Dict[str, Any]]:
+        """Manifest of a month's materialized statements, None if never materialized"""
+        manifest_path = get_monthly_data_path(self.report_storage.base_path, year_month) / MANIFEST_FILE
+        if not manifest_path.exists():
+            return None
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"Could not read materialization manifest for {year_month}: {e}")
+            return None
+
+    def is_user_saved(self, year_month: str) -> bool:
+        """Check whether a month's statements were saved with save_statements rather than materialized"""
+        manifest = self.load_manifest(year_month)
+        return manifest is not None and manifest.get("source", MATERIALIZED_SOURCE) != MATERIALIZED_SOURCE
+
+    def is_stale(self, year_month: str) -> bool:
+        """
+        Check whether a month's statements must be regenerated.
+
+        Returns:
+            True if the month has transactions and its statements are missing
+            (including ones deleted since they were materialized) or were derived
+            from a different source file or category configuration; months with
+            user-saved statements are never stale
+        """
+        if not validate_month_format(year_month):
+            raise ValueError(f"Invalid month format: {year_month}. Use YYYY-MM")
+
+        current_source = self.source_hash(year_month)
+        if current_source is None:
+            return False
+
+        manifest = self.load_manifest(year_month)
+        if manifest is not None and manifest.get("source", MATERIALIZED_SOURCE) != MATERIALIZED_SOURCE:
+            return False
+        return (
+            manifest is None
+            or manifest.get("source_hash") != current_source
+            or manifest.get("config_hash") != self.config_hash
+            or self._has_missing_statements(year_month, manifest)
+        )
+
+    def stale_months(self, months: Optional[List[str]] = None) -> List[str]:
+        """
+        List months whose statements are out of date.
+
+        Args:
+            months: Months to check (default: every month with stored data)
+        """
+        if months is None:
+            months = self.data_storage.list_available_months()
+        return [month for month in months if self.is_stale(month)]
+
+    def refresh(self, year_month: str, force: bool = False) -> bool:
+        """
+        Regenerate a month's statements if its inputs changed.
+
+        Args:
+            year_month: Month in YYYY-MM format
+            force: Regenerate even if the statements are up to date or user-saved
+
+        Returns:
+            True if the statements were regenerated
+        """
+        if not force and not self.is_stale(year_month):
+            if self.is_user_saved(year_month):
+                logger.info(f"Kept user-saved statements for {year_month}; force a refresh to replace them")
+            return False
+
+        source_path = get_monthly_data_path(self.data_storage.base_path, year_month) / SOURCE_FILE
+        if not source_path.exists():
+            logger.warning(f"No transaction data found for {year_month}")
+            return False
+
+        # Hash the bytes that are read, so a concurrent upload shows up as stale next time
+        source_hash = file_hash(source_path)
+        processor = TransactionProcessor(dataframe=pd.read_parquet(source_path))
+        processor.load_transactions()
+
+        statements = {
+            "income_statement": self.income_generator.generate_statements(processor.table),
+            "cash_flow": self.cashflow_generator.generate_statements(processor.table),
+        }
+        metadata = {
+            "source": MATERIALIZED_SOURCE,
+            "source_hash": source_hash,
+            "config_hash": self.config_hash,
+        }
+        for statement_type, by_entity in statements.items():
+            for entity, statement in by_entity.items():
+                if not self.report_storage.save_statement(year_month, statement_type, statement,
+                                                          {**metadata, "entity": entity}):
+                    raise RuntimeError(f"Failed to save {statement_type} for {entity} in {year_month}")
+
+        self._remove_dropped_entities(year_month, statements)
+        self._write_manifest(year_month, {
+            "year_month": year_month,
+            "source_hash": source_hash,
+            "config_hash": self.config_hash,
+            "generated_at": datetime.now().isoformat(),
+            "source": MATERIALIZED_SOURCE,
+            "statements": {statement_type: list(by_entity) for statement_type, by_entity in statements.items()},
+        })
+        logger.info(f"Materialized statements for {year_month}")
+        return True
+
+    def save_statements(
+        self,
+        year_month: str,
+        statements: Dict[str, Dict[str, Any]],
+        source: str = "web_upload"
+    ) -> Dict[str, int]:
+        """
+        Save statements generated outside the cache and record them in the manifest.
+
+        The statements were not derived from the month's stored transactions, so
+        the manifest has no source hash and records ``source`` instead: the
+        month is no longer stale, and refresh keeps these statements unless
+        forced. Saving over materialized statements keeps the other entities
+        listed in the manifest.
+
+        Args:
+            year_month: Month in YYYY-MM format
+            statements: Statements by statement type and entity
+            source: Origin recorded in each statement's metadata
+
+        Returns:
+            Number of statements saved per statement type
+        """
+        if not validate_month_format(year_month):
+            raise ValueError(f"Invalid month format: {year_month}. Use YYYY-MM")
+
+        metadata = {
+            "source": source,
+            "generated_at": datetime.now().isoformat(),
+        }
+        tracked = (self.load_manifest(year_month) or {}).get("statements", {})
+        saved: Dict[str, int] = {}
+        for statement_type, by_entity in statements.items():
+            entities = tracked.setdefault(statement_type, [])
+            saved[statement_type] = 0
+            for entity, statement in by_entity.items():
+                if self.report_storage.save_statement(year_month, statement_type, statement,
+                                                      {**metadata, "entity": entity}):
+                    saved[statement_type] += 1
+                    if entity not in entities:
+                        entities.append(entity)
+
+        self._write_manifest(year_month, {
+            "year_month": year_month,
+            "source_hash": None,
+            "config_hash": self.config_hash,
+            "generated_at": metadata["generated_at"],
+            "source": source,
+            "statements": tracked,
+        })
+        return saved
+
+    def refresh_stale(
+        self,
+        months: Optional[List[str]] = None,
+        force: bool = False,
+        max_workers: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Regenerate every stale month in parallel.
+
+        Months are independent (separate source files and report directories),
+        so they are refreshed concurrently.
+
+        Args:
+            months: Months to consider (default: every month with stored data)
+            force: Regenerate all considered months, stale or not
+            max_workers: Thread pool size (default: one per month, up to 8)
+
+        Returns:
+            Dict mapping each considered month to True (regenerated),
+            False (up to date) or the error message if regeneration failed
+        """
+        if months is None:
+            months = self.data_storage.list_available_months()
+        if not months:
+            return {}
+
+        workers = max_workers or min(8, len(months))
+        results: Dict[str, Any] = {}
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {month: executor.submit(self.refresh, month, force) for month in months}
+            for month, future in futures.items():
+                try:
+                    results[month] = future.result()
+                except Exception as e:
+                    logger.error(f"Failed to materialize statements for {month}: {e}")
+                    results[month] = str(e)
+        return results
+
+    def _has_missing_statements(self, year_month: str, manifest: Dict[str, Any]) -> bool:
+        """Check whether a statement listed in the manifest is no longer in the catalog"""
+        catalogued = {
+            (entry["statement_type"], entry["entity"])
+            for entry in self.report_storage.catalog_entries(months=[year_month])
+        }
+        return any(
+            (statement_type, entity) not in catalogued
+            for statement_type, entities in manifest.get("statements", {}).items()
+            for entity in entities
+        )
+
+    def _remove_dropped_entities(self, year_month: str, statements: Dict[str, Dict[str, Any]]) -> None:
+        """Delete statements of entities that are no longer in the month's data"""
+        previous = (self.load_manifest(year_month) or {}).get("statements", {})
+        for statement_type, entities in previous.items():
+            for entity in set(entities) - set(statements.get(statement_type, {})):
+                self.report_storage.delete_statement(year_month, statement_type, entity)
+
+    def _write_manifest(self, year_month: str, manifest: Dict[str, Any]) -> None:
+        monthly_path = get_monthly_data_path(self.report_storage.base_path, year_month)
+        monthly_path.mkdir(parents=True, exist_ok=True)
+        # Write then rename, so readers never see a partial manifest
+        temp_path = monthly_path / f".{MANIFEST_FILE}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+        temp_path.replace(monthly_path / MANIFEST_FILE)
@@ -4,6 +4,7 @@ Business logic components for accounting module
 
 from .data_cleaner import DataCleaner, ValidationReport, ValidationError, CleaningAction
 from .transaction_processor import TransactionProcessor
+from .transaction_classifier import classify_transactions, clean_amounts
 from .income_statement_generator import IncomeStatementGenerator, format_currency, print_income_statement
 from .cash_flow_generator import CashFlowStatementGenerator, print_cash_flow_statement
 
@@ -13,6 +14,8 @@ __all__ = [
     'ValidationError',
     'CleaningAction',
     'TransactionProcessor',
+    'classify_transactions',
+    'clean_amounts',
     'IncomeStatementGenerator',
     'CashFlowStatementGenerator', 
     'format_currency',
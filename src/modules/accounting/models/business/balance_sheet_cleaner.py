@@ -12,10 +12,13 @@ Expected columns:
 from dataclasses import dataclass
 from typing import Tuple, List, Dict
 import logging
-import re
+import numpy as np
 import pandas as pd
 
-from .data_cleaner import ValidationReport, ValidationError, CleaningAction
+from .data_cleaner import (
+    ValidationReport, ValidationError, CleaningAction,
+    blank_mask, non_numeric_mask, normalize_currency, row_errors, strip_text_columns,
+)
 
 
 logger = logging.getLogger(__name__)
@@ -86,9 +89,8 @@ class BalanceSheetDataCleaner:
         original_rows = len(df)
         original_cols = len(df.columns)
 
-        df_before_empty_rows = df.copy()
         df = df.dropna(how='all')
-        empty_rows_removed = len(df_before_empty_rows) - len(df)
+        empty_rows_removed = original_rows - len(df)
         if empty_rows_removed > 0:
             self.validation_report.cleaning_actions.append(
                 CleaningAction(
@@ -99,9 +101,9 @@ class BalanceSheetDataCleaner:
                 )
             )
 
-        df_before_empty_cols = df.copy()
+        cols_before = len(df.columns)
         df = df.dropna(axis=1, how='all')
-        empty_cols_removed = len(df_before_empty_cols.columns) - len(df.columns)
+        empty_cols_removed = cols_before - len(df.columns)
         if empty_cols_removed > 0:
             self.validation_report.cleaning_actions.append(
                 CleaningAction(
@@ -152,15 +154,7 @@ class BalanceSheetDataCleaner:
 
     def _strip_whitespace(self, df: pd.DataFrame) -> pd.DataFrame:
         # String values only (columns already handled in _normalize_column_names)
-        whitespace_cleaned = 0
-        for col in df.columns:
-            if df[col].dtype == 'object':
-                before = df[col].copy()
-                df[col] = df[col].apply(lambda x: x.strip() if isinstance(x, str) else x)
-                whitespace_cleaned += sum(
-                    1 for a, b in zip(before, df[col])
-                    if isinstance(a, str) and isinstance(b, str) and a != b
-                )
+        whitespace_cleaned = strip_text_columns(df)
         if whitespace_cleaned > 0:
             self.validation_report.cleaning_actions.append(
                 CleaningAction(
@@ -174,24 +168,10 @@ class BalanceSheetDataCleaner:
 
     def _normalize_currency_columns(self, df: pd.DataFrame) -> pd.DataFrame:
         currency_cleaned_count = 0
-
-        def clean_amount(value):
-            nonlocal currency_cleaned_count
-            if pd.isna(value) or value == '':
-                return value
-            original = str(value)
-            cleaned = re.sub(r'[¥￥$,\s]', '', original)
-            if cleaned != original:
-                currency_cleaned_count += 1
-            try:
-                return float(cleaned)
-            except ValueError:
-                return value
-
-        if 'CNY' in df.columns:
-            df['CNY'] = df['CNY'].apply(clean_amount)
-        if 'USD' in df.columns:
-            df['USD'] = df['USD'].apply(clean_amount)
+        for col in ('CNY', 'USD'):
+            if col in df.columns:
+                df[col], cleaned = normalize_currency(df[col])
+                currency_cleaned_count += cleaned
 
         if currency_cleaned_count > 0:
             self.validation_report.cleaning_actions.append(
@@ -218,72 +198,41 @@ class BalanceSheetDataCleaner:
             )
 
     def _validate_required_fields(self, df: pd.DataFrame) -> None:
-        for idx, row in df.iterrows():
-            name = row.get('Account Name', '')
-            acc_type = row.get('Account Type', '')
-            if pd.isna(name) or str(name).strip() == '':
-                self.validation_report.errors.append(
-                    ValidationError(
-                        row_number=idx + 2,
-                        column='Account Name',
-                        error_type='missing_required_field',
-                        message=f"Row {idx + 2}: Missing Account Name",
-                    )
-                )
-            if pd.isna(acc_type) or str(acc_type).strip() == '':
-                self.validation_report.errors.append(
-                    ValidationError(
-                        row_number=idx + 2,
-                        column='Account Type',
-                        error_type='missing_required_field',
-                        message=f"Row {idx + 2}: Missing Account Type",
-                    )
-                )
+        checks = [(col, blank_mask(df[col]) if col in df.columns else np.ones(len(df), dtype=bool))
+                  for col in ('Account Name', 'Account Type')]
+        self.validation_report.errors.extend(row_errors(
+            df, checks, 'missing_required_field',
+            lambda row, col, _: f"Row {row}: Missing {col}",
+        ))
 
     def _validate_data_types(self, df: pd.DataFrame) -> None:
-        for idx, row in df.iterrows():
-            for col in ['CNY', 'USD']:
-                val = row.get(col)
-                if pd.isna(val) or val == '' or val == '-':
-                    continue
-                try:
-                    float(val)
-                except (ValueError, TypeError):
-                    self.validation_report.errors.append(
-                        ValidationError(
-                            row_number=idx + 2,
-                            column=col,
-                            error_type='invalid_data_type',
-                            message=f"Row {idx + 2}: {col} must be numeric (got '{val}')",
-                        )
-                    )
+        # Empty values and '-' placeholders are skipped
+        checks = [(col, non_numeric_mask(df[col], skip=('', '-'))) for col in ('CNY', 'USD') if col in df.columns]
+        self.validation_report.errors.extend(row_errors(
+            df, checks, 'invalid_data_type',
+            lambda row, col, val: f"Row {row}: {col} must be numeric (got '{val}')",
+        ))
 
     def _validate_business_rules(self, df: pd.DataFrame) -> None:
-        for idx, row in df.iterrows():
-            cny = row.get('CNY')
-            usd = row.get('USD')
-            if (pd.isna(cny) or cny in ['', '-'] or float(cny) == 0.0) and (
-                pd.isna(usd) or usd in ['', '-'] or float(usd) == 0.0
-            ):
-                self.validation_report.errors.append(
-                    ValidationError(
-                        row_number=idx + 2,
-                        column='CNY/USD',
-                        error_type='missing_required_field',
-                        message=f"Row {idx + 2}: At least one of CNY or USD must be provided",
-                    )
-                )
-
-            acc_type = str(row.get('Account Type', '')).strip()
-            if acc_type and acc_type not in ALLOWED_ACCOUNT_TYPES:
-                self.validation_report.warnings.append(
-                    ValidationError(
-                        row_number=idx + 2,
-                        column='Account Type',
-                        error_type='invalid_value',
-                        message=f"Row {idx + 2}: Account Type '{acc_type}' is not in allowed types",
-                    )
-                )
+        no_amount = np.ones(len(df), dtype=bool)
+        for col in ('CNY', 'USD'):
+            if col in df.columns:
+                values = df[col]
+                # Unparseable values count as provided; they are reported as invalid types
+                empty = values.isna() | values.isin(['', '-']) | (pd.to_numeric(values, errors='coerce') == 0.0)
+                no_amount = no_amount & empty.to_numpy(dtype=bool)
+        self.validation_report.errors.extend(row_errors(
+            df, [('CNY/USD', no_amount)], 'missing_required_field',
+            lambda row, col, _: f"Row {row}: At least one of CNY or USD must be provided",
+        ))
+
+        if 'Account Type' in df.columns:
+            acc_type = df['Account Type'].astype('string').str.strip().fillna('')
+            unknown = ((acc_type != '') & ~acc_type.isin(ALLOWED_ACCOUNT_TYPES)).to_numpy(dtype=bool)
+            self.validation_report.warnings.extend(row_errors(
+                df, [('Account Type', unknown)], 'invalid_value',
+                lambda row, col, val: f"Row {row}: Account Type '{str(val).strip()}' is not in allowed types",
+            ))
 
     def clean_and_validate(self) -> Tuple[pd.DataFrame, ValidationReport]:
         if self._raw_df is None:
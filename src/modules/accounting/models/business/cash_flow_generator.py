@@ -4,15 +4,23 @@ Cash flow statement generation business logic
 Handles the generation of cash flow statements from transaction data.
 """
 
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple, Union
+
+import numpy as np
+import pandas as pd
 
 from ..domain.transaction import Transaction
 from ..domain.category import CategoryMapper, REVENUE_CATEGORIES
+from .transaction_classifier import (
+    encode, select_encoded, sum_entity_line_items, sum_line_items, transactions_to_table
+)
 
 # Cash flow activity type constants
 OPERATING_ACTIVITIES = 'Operating Activities'
 INVESTING_ACTIVITIES = 'Investing Activities'
 FINANCING_ACTIVITIES = 'Financing Activities'
+ACTIVITIES = (OPERATING_ACTIVITIES, INVESTING_ACTIVITIES, FINANCING_ACTIVITIES)
+NON_OPERATING_ACTIVITIES = [INVESTING_ACTIVITIES, FINANCING_ACTIVITIES]
 
 # Transaction type constants
 TRANSACTION_TYPE_REVENUE = "revenue"
@@ -27,6 +35,8 @@ KEY_NET_FINANCING = 'Net Cash from Financing'
 KEY_NET_CHANGE = 'Net Change in Cash'
 KEY_ENTITY = 'Entity'
 
+COMBINED_ENTITY = 'Combined'
+
 
 class CashFlowStatementGenerator:
     """Generates cash flow statements from transaction data.
@@ -47,14 +57,17 @@ class CashFlowStatementGenerator:
         """
         self.category_mapper = category_mapper
 
-    def generate_statement(self, transactions: List[Transaction], entity_name: str) -> Dict[str, Any]:
+    def generate_statement(self, transactions: Union[pd.DataFrame, List[Transaction]],
+                           entity_name: str) -> Dict[str, Any]:
         """Generate cash flow statement for given transactions.
 
         Categorizes transactions into Operating, Investing, and Financing activities
-        and calculates net cash flows for each category.
+        and calculates net cash flows for each category, with one grouped sum over the
+        transactions table.
 
         Args:
-            transactions: List of Transaction objects to process.
+            transactions: Transactions table (see transaction_classifier) or list of
+                Transaction objects to process.
             entity_name: Name of the entity (user or "Combined").
 
         Returns:
@@ -70,109 +83,101 @@ class CashFlowStatementGenerator:
             Prepaid asset transactions that don't affect cash flow are also skipped.
         """
         
-        operating_activities = 0
-        investing_activities = 0
-        financing_activities = 0
-        
-        activity_details = {
-            OPERATING_ACTIVITIES: {},
-            INVESTING_ACTIVITIES: {},
-            FINANCING_ACTIVITIES: {}
-        }
-        
-        for transaction in transactions:
-            # Skip transactions with zero amounts
-            if transaction.amount == 0:
-                continue
-            
-            # Determine transaction type and cash flow impact - prioritize analysis over stored defaults
-            if (hasattr(transaction, 'affects_cash_flow') and
-                hasattr(transaction, 'transaction_type') and
-                transaction.transaction_type == TRANSACTION_TYPE_PREPAID_ASSET):
-                # Trust specific transaction types from CSV processing
-                transaction_type = transaction.transaction_type
-                affects_cash_flow = transaction.affects_cash_flow
-            else:
-                # Backward compatibility and analysis-based determination
-                affects_cash_flow = True  # Assume all transactions affect cash flow in old format
-                if transaction.debit_category in REVENUE_CATEGORIES and transaction.amount > 0:
-                    transaction_type = TRANSACTION_TYPE_REVENUE
-                elif transaction.amount < 0:
-                    transaction_type = TRANSACTION_TYPE_EXPENSE
-                else:
-                    transaction_type = TRANSACTION_TYPE_EXPENSE
-            
-            # Skip transactions that don't affect cash flow
-            if not affects_cash_flow:
-                continue
-            
-            # Get the cash flow activity type
-            # Check both debit and credit categories to properly classify investing/financing activities
-            debit_activity = self.category_mapper.get_cashflow_category(transaction.debit_category)
-            credit_activity = self.category_mapper.get_cashflow_category(transaction.credit_account)
-
-            # Determine activity type and cash flow direction
-            # Prioritize non-operating activities (investing and financing take precedence)
-            if debit_activity in [INVESTING_ACTIVITIES, FINANCING_ACTIVITIES]:
-                # Debit is investing/financing - this means cash went out for that activity
-                activity_type = debit_activity
-                category_name = transaction.debit_category
-                cash_flow_amount = -abs(transaction.amount)  # Outflow
-            elif credit_activity in [INVESTING_ACTIVITIES, FINANCING_ACTIVITIES]:
-                # Credit is investing/financing - this means cash came in from that activity
-                activity_type = credit_activity
-                category_name = transaction.credit_account
-                cash_flow_amount = abs(transaction.amount)  # Inflow
-            elif transaction_type == TRANSACTION_TYPE_REVENUE:
-                # Operating revenue: positive cash flow (cash coming in)
-                activity_type = debit_activity
-                cash_flow_amount = abs(transaction.amount)
-                category_name = transaction.debit_category
-            elif transaction_type == TRANSACTION_TYPE_PREPAID_ASSET:
-                # Prepaid asset purchase: negative cash flow (cash going out for future benefit)
-                activity_type = debit_activity
-                cash_flow_amount = -abs(transaction.amount)
-                category_name = f"Prepaid: {transaction.debit_category}"
-            else:
-                # Operating expense: negative cash flow (cash going out)
-                activity_type = debit_activity
-                cash_flow_amount = -abs(transaction.amount)
-                category_name = self.category_mapper.get_expense_category(transaction.debit_category)
-            
-            # Categorize the cash flow
-            if activity_type == OPERATING_ACTIVITIES:
-                operating_activities += cash_flow_amount
-                activity_details[OPERATING_ACTIVITIES][category_name] = \
-                    activity_details[OPERATING_ACTIVITIES].get(category_name, 0) + cash_flow_amount
-
-            elif activity_type == INVESTING_ACTIVITIES:
-                investing_activities += cash_flow_amount
-                activity_details[INVESTING_ACTIVITIES][category_name] = \
-                    activity_details[INVESTING_ACTIVITIES].get(category_name, 0) + cash_flow_amount
-
-            elif activity_type == FINANCING_ACTIVITIES:
-                financing_activities += cash_flow_amount
-                activity_details[FINANCING_ACTIVITIES][category_name] = \
-                    activity_details[FINANCING_ACTIVITIES].get(category_name, 0) + cash_flow_amount
-        
-        cash_flow_statement = {
-            KEY_ENTITY: entity_name,
-            OPERATING_ACTIVITIES: {
-                KEY_DETAILS: activity_details[OPERATING_ACTIVITIES],
-                KEY_NET_OPERATING: operating_activities
-            },
-            INVESTING_ACTIVITIES: {
-                KEY_DETAILS: activity_details[INVESTING_ACTIVITIES],
-                KEY_NET_INVESTING: investing_activities
-            },
-            FINANCING_ACTIVITIES: {
-                KEY_DETAILS: activity_details[FINANCING_ACTIVITIES],
-                KEY_NET_FINANCING: financing_activities
-            },
-            KEY_NET_CHANGE: operating_activities + investing_activities + financing_activities
-        }
-        
-        return cash_flow_statement
+        table = transactions_to_table(transactions)
+        sections = sum_line_items(*self._line_items(table))
+        return build_cash_flow_statement(entity_name, sections)
+
+    def generate_statements(self, transactions: Union[pd.DataFrame, List[Transaction]],
+                            combined_name: str = COMBINED_ENTITY,
+                            entity_label: str = "{}") -> Dict[str, Dict[str, Any]]:
+        """Generate cash flow statements for every user and for all users combined.
+
+        Rows are grouped by (user, activity, line) once and the combined
+        statement is folded from the same group totals.
+
+        Args:
+            transactions: Transactions table or list of Transaction objects.
+            combined_name: Key and entity name of the combined statement.
+            entity_label: Format for each user's entity name (e.g. "User: {}").
+
+        Returns:
+            {user: statement} for each non-blank user in order of appearance,
+            followed by {combined_name: statement}.
+        """
+        table = transactions_to_table(transactions)
+        per_user, combined = sum_entity_line_items(table['user'], *self._line_items(table))
+        statements = {user: build_cash_flow_statement(entity_label.format(user), sections)
+                      for user, sections in per_user.items() if user != ''}
+        statements[combined_name] = build_cash_flow_statement(combined_name, combined)
+        return statements
+
+    def _line_items(self, table: pd.DataFrame) -> Tuple[List[Tuple[np.ndarray, np.ndarray]], np.ndarray, np.ndarray]:
+        """Activity, line and cash flow per transaction, and the rows that count.
+
+        Categories are mapped once per distinct value and carried as integer codes.
+
+        Returns:
+            ([activity, line], cash flow, mask) as accepted by sum_line_items.
+        """
+        amount = table['amount'].to_numpy(dtype=float)
+        magnitude = np.abs(amount)
+        debit_codes, debits = encode(table['debit_category'])
+        credit_codes, credits = encode(table['credit_account'])
+
+        # Only trust the stored type (and cash flow flag) for prepaid assets from CSV
+        # processing; otherwise determine the type and assume cash is affected
+        prepaid = (table['transaction_type'] == TRANSACTION_TYPE_PREPAID_ASSET).to_numpy(dtype=bool)
+        affects_cash_flow = np.where(prepaid, table['affects_cash_flow'].to_numpy(dtype=bool), True)
+        revenue = ~prepaid & np.isin(debits, REVENUE_CATEGORIES)[debit_codes] & (amount > 0)
+
+        # Check both debit and credit categories to classify investing/financing activities
+        debit_activities = self.category_mapper.map_cashflow_categories(pd.Series(debits)).to_numpy(dtype=object)
+        credit_activities = self.category_mapper.map_cashflow_categories(pd.Series(credits)).to_numpy(dtype=object)
+        debit_non_operating = np.isin(debit_activities, NON_OPERATING_ACTIVITIES)[debit_codes]
+        credit_non_operating = np.isin(credit_activities, NON_OPERATING_ACTIVITIES)[credit_codes]
+
+        # Non-operating activities take precedence: a debited investing/financing account
+        # is an outflow, a credited one an inflow; then revenue, prepaid and expenses
+        conditions = [debit_non_operating, credit_non_operating, revenue, prepaid]
+        debit_activity = (debit_codes, debit_activities)
+        activity = select_encoded(conditions, [debit_activity, (credit_codes, credit_activities),
+                                               debit_activity, debit_activity], default=debit_activity)
+        debit_name = (debit_codes, debits)
+        line = select_encoded(conditions, [
+            debit_name,
+            (credit_codes, credits),
+            debit_name,
+            (debit_codes, np.array([f"Prepaid: {name}" for name in debits], dtype=object)),
+        ], default=(debit_codes, self.category_mapper.map_expense_categories(pd.Series(debits)).to_numpy(dtype=object)))
+        cash_flow = np.select(conditions, [-magnitude, magnitude, magnitude, -magnitude], default=-magnitude)
+        return [activity, line], cash_flow, (amount != 0) & affects_cash_flow
+
+
+def build_cash_flow_statement(entity_name: str, sections: Dict[Tuple, Dict[str, float]]) -> Dict[str, Any]:
+    """Cash flow statement dict from per-activity line totals (see sum_line_items)."""
+    activity_details = {activity: sections.get((activity,), {}) for activity in ACTIVITIES}
+    operating_activities = sum(activity_details[OPERATING_ACTIVITIES].values())
+    investing_activities = sum(activity_details[INVESTING_ACTIVITIES].values())
+    financing_activities = sum(activity_details[FINANCING_ACTIVITIES].values())
+
+    cash_flow_statement = {
+        KEY_ENTITY: entity_name,
+        OPERATING_ACTIVITIES: {
+            KEY_DETAILS: activity_details[OPERATING_ACTIVITIES],
+            KEY_NET_OPERATING: operating_activities
+        },
+        INVESTING_ACTIVITIES: {
+            KEY_DETAILS: activity_details[INVESTING_ACTIVITIES],
+            KEY_NET_INVESTING: investing_activities
+        },
+        FINANCING_ACTIVITIES: {
+            KEY_DETAILS: activity_details[FINANCING_ACTIVITIES],
+            KEY_NET_FINANCING: financing_activities
+        },
+        KEY_NET_CHANGE: operating_activities + investing_activities + financing_activities
+    }
+    
+    return cash_flow_statement
 
 
 def format_currency(amount: float) -> str:
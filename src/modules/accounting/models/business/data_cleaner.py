@@ -5,10 +5,10 @@ Handles automated data cleaning and validation BEFORE user preview.
 This ensures users see clean, validated data and only need to fix business logic issues.
 """
 
+import numpy as np
 import pandas as pd
-import re
 import logging
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, List, Sequence, Tuple
 from dataclasses import dataclass, field
 
 # Set up logger for DataCleaner
@@ -69,6 +69,112 @@ class ValidationReport:
         return " | ".join(summary) if summary else "ℹ️ No cleaning actions needed"
 
 
+# Currency symbols, thousands separators and whitespace stripped from amounts
+CURRENCY_PATTERN = r'[¥￥$,\s]'
+
+
+def strip_text_columns(df: pd.DataFrame) -> int:
+    """
+    Strip leading/trailing whitespace from every text value, in place.
+    
+    Non-string values in mixed columns are left untouched.
+    
+    Returns:
+        Number of values that changed
+    """
+    changed_count = 0
+    for col in df.columns:
+        values = df[col]
+        if not (values.dtype == object or isinstance(values.dtype, pd.StringDtype)):
+            continue
+        try:
+            stripped = values.str.strip()
+        except AttributeError:  # Object column without any strings
+            continue
+        # Stripping a string never yields NA, so NA marks non-strings
+        is_text = stripped.notna()
+        changed = is_text & (stripped != values)
+        count = int(changed.sum())
+        if count:
+            df[col] = stripped if values.dtype != object else stripped.where(is_text, values)
+            changed_count += count
+    return changed_count
+
+
+def normalize_currency(values: pd.Series) -> Tuple[pd.Series, int]:
+    """
+    Strip currency symbols, separators and whitespace and convert to float.
+    
+    Missing and empty values are kept as they are, and so are values that
+    still don't parse, so that validation can report them.
+    
+    Returns:
+        Tuple of (normalized values, number of values that had symbols removed)
+    """
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        return values.astype(float), 0
+    
+    blank = values.isna().to_numpy() | (values == '').fillna(False).to_numpy(dtype=bool)
+    text = values.astype('string')
+    cleaned = text.str.replace(CURRENCY_PATTERN, '', regex=True)
+    changed_count = int(((cleaned != text).fillna(False) & ~blank).sum())
+    
+    numbers = pd.to_numeric(cleaned, errors='coerce').astype(float)
+    parsed = (numbers.notna() & ~blank).to_numpy()
+    result = np.where(parsed, numbers.to_numpy(dtype=float), values.to_numpy(dtype=object))
+    # All floats (and missing values) -> float column, as with element-wise conversion
+    return pd.Series(result, index=values.index, dtype=object, name=values.name).infer_objects(), changed_count
+
+
+def blank_mask(values: pd.Series) -> np.ndarray:
+    """Values that are missing, empty or whitespace-only"""
+    return (values.astype('string').str.strip().fillna('') == '').to_numpy(dtype=bool)
+
+
+def non_numeric_mask(values: pd.Series, skip: Sequence = ('',)) -> np.ndarray:
+    """Present values (not missing and not in skip) that don't parse as numbers"""
+    if pd.api.types.is_numeric_dtype(values):
+        return np.zeros(len(values), dtype=bool)
+    present = values.notna() & ~values.isin(list(skip))
+    return (present & pd.to_numeric(values, errors='coerce').isna()).to_numpy(dtype=bool)
+
+
+def row_errors(df: pd.DataFrame, checks: Sequence[Tuple[str, np.ndarray]],
+               error_type: str, message: Callable[[int, str, object], str]) -> List[ValidationError]:
+    """
+    Build ValidationErrors only for the offending cells.
+    
+    Args:
+        df: Validated DataFrame (row numbers come from its index)
+        checks: (column, boolean mask of offending rows) pairs
+        error_type: ValidationError type
+        message: Builds the message from (row number, column, cell value)
+        
+    Returns:
+        Errors in row order, then in the order of checks within a row
+    """
+    if not checks or df.empty:
+        return []
+    rows, cols = np.nonzero(np.column_stack([mask for _, mask in checks]))
+    if not len(rows):
+        return []
+    
+    # +2 because: 0-indexed + header row
+    row_numbers = (df.index.to_numpy()[rows] + 2).tolist()
+    columns = [column for column, _ in checks]
+    cell_values = [df[column].to_numpy(dtype=object) if column in df.columns else np.full(len(df), None)
+                   for column in columns]
+    return [
+        ValidationError(
+            row_number=row_number,
+            column=columns[col],
+            error_type=error_type,
+            message=message(row_number, columns[col], cell_values[col][row])
+        )
+        for row_number, row, col in zip(row_numbers, rows.tolist(), cols.tolist())
+    ]
+
+
 class DataCleaner:
     """
     Automated data cleaning and validation for CSV transaction data.
@@ -79,6 +185,11 @@ class DataCleaner:
     
     REQUIRED_COLUMNS = ['Description', 'Amount', 'Debit', 'Credit', 'User']
     
+    # Report entries in the order the cleaning and validation steps run
+    CLEANING_ACTION_TYPES = ['remove_empty_rows', 'remove_no_amount_rows', 'remove_empty_columns',
+                             'clean_column_names', 'clean_whitespace', 'normalize_currency']
+    ERROR_TYPES = ['missing_column', 'missing_required_field', 'invalid_data_type']
+    
     def __init__(self, csv_file_path: str = None, dataframe: pd.DataFrame = None):
         """
         Initialize with either a CSV file path or a DataFrame.
@@ -111,10 +222,25 @@ class DataCleaner:
         original_rows = len(df)
         original_cols = len(df.columns)
         
+        df = self._remove_empty_rows(df)
+        df = self._remove_empty_columns(df)
+        
+        total_rows_removed = original_rows - len(df)
+        total_cols_removed = original_cols - len(df.columns)
+        
+        if total_rows_removed > 0 or total_cols_removed > 0:
+            logger.info(f"Data cleaning summary: {original_rows}→{len(df)} rows ({total_rows_removed} removed), "
+                       f"{original_cols}→{len(df.columns)} columns ({total_cols_removed} removed)")
+        
+        return df
+    
+    def _remove_empty_rows(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Remove completely empty rows and rows without amounts"""
+        original_rows = len(df)
+        
         # Remove rows where ALL values are NaN
-        df_before_empty_rows = df.copy()
         df = df.dropna(how='all')
-        empty_rows_removed = len(df_before_empty_rows) - len(df)
+        empty_rows_removed = original_rows - len(df)
         
         if empty_rows_removed > 0:
             logger.info(f"Removed {empty_rows_removed} completely empty rows")
@@ -129,7 +255,7 @@ class DataCleaner:
         
         # Remove rows with no amount (meaningless transactions)
         if 'Amount' in df.columns:
-            df_before_no_amount = df.copy()
+            rows_before = len(df)
             # Remove rows where Amount is NaN, empty string, or zero
             df = df[
                 df['Amount'].notna() & 
@@ -139,7 +265,7 @@ class DataCleaner:
                 (df['Amount'] != '0.0') &
                 (df['Amount'] != '0.00')
             ]
-            no_amount_removed = len(df_before_no_amount) - len(df)
+            no_amount_removed = rows_before - len(df)
             
             if no_amount_removed > 0:
                 logger.info(f"Removed {no_amount_removed} rows with no amount (meaningless transactions)")
@@ -152,10 +278,14 @@ class DataCleaner:
                     )
                 )
         
+        return df
+    
+    def _remove_empty_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Remove completely empty columns"""
         # Remove columns where ALL values are NaN
-        df_before_empty_cols = df.copy()
+        cols_before = len(df.columns)
         df = df.dropna(axis=1, how='all')
-        empty_cols_removed = len(df_before_empty_cols.columns) - len(df.columns)
+        empty_cols_removed = cols_before - len(df.columns)
         
         if empty_cols_removed > 0:
             logger.info(f"Removed {empty_cols_removed} completely empty columns")
@@ -168,13 +298,6 @@ class DataCleaner:
                 )
             )
         
-        total_rows_removed = original_rows - len(df)
-        total_cols_removed = original_cols - len(df.columns)
-        
-        if total_rows_removed > 0 or total_cols_removed > 0:
-            logger.info(f"Data cleaning summary: {original_rows}→{len(df)} rows ({total_rows_removed} removed), "
-                       f"{original_cols}→{len(df.columns)} columns ({total_cols_removed} removed)")
-        
         return df
     
     def _normalize_currency_values(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -190,28 +313,8 @@ class DataCleaner:
         if 'Amount' not in df.columns:
             return df
         
-        currency_cleaned_count = 0
-        
-        def clean_amount(value):
-            nonlocal currency_cleaned_count
-            if pd.isna(value) or value == '':
-                return value  # Keep NaN as-is for validation
-            
-            original_value = str(value)
-            # Convert to string and remove currency symbols and commas
-            cleaned = re.sub(r'[¥￥$,\s]', '', original_value)
-            
-            # Check if we actually cleaned something
-            if cleaned != original_value:
-                currency_cleaned_count += 1
-            
-            # Try to convert to float
-            try:
-                return float(cleaned)
-            except ValueError:
-                return value  # Keep original if can't convert (for validation error)
-        
-        df['Amount'] = df['Amount'].apply(clean_amount)
+        # Unparseable values are kept for validation errors
+        df['Amount'], currency_cleaned_count = normalize_currency(df['Amount'])
         
         if currency_cleaned_count > 0:
             logger.info(f"Normalized currency symbols in {currency_cleaned_count} amount values")
@@ -245,15 +348,7 @@ class DataCleaner:
             )
         
         # Strip whitespace from string columns
-        whitespace_cleaned_count = 0
-        for col in df.columns:
-            if df[col].dtype == 'object':  # String columns
-                original_values = df[col].copy()
-                df[col] = df[col].apply(lambda x: x.strip() if isinstance(x, str) else x)
-                # Count how many values were actually changed
-                changed_values = sum(1 for orig, new in zip(original_values, df[col]) 
-                                   if isinstance(orig, str) and isinstance(new, str) and orig != new)
-                whitespace_cleaned_count += changed_values
+        whitespace_cleaned_count = strip_text_columns(df)
         
         if whitespace_cleaned_count > 0:
             logger.info(f"Cleaned whitespace from {whitespace_cleaned_count} text values")
@@ -290,58 +385,29 @@ class DataCleaner:
         if 'Amount' not in df.columns:
             return
         
-        for idx, row in df.iterrows():
-            amount = row.get('Amount')
-            debit = row.get('Debit', '')
-            credit = row.get('Credit', '')
-            
-            # Skip completely empty rows
-            if pd.isna(amount) and pd.isna(debit) and pd.isna(credit):
-                continue
-            
-            # If amount exists, must have both debit and credit
-            if pd.notna(amount) and amount != '' and amount != 0:
-                if pd.isna(debit) or str(debit).strip() == '':
-                    error = ValidationError(
-                        row_number=idx + 2,  # +2 because: 0-indexed + header row
-                        column='Debit',
-                        error_type='missing_required_field',
-                        message=f"Row {idx + 2}: Missing Debit account (required when Amount is present)"
-                    )
-                    self.validation_report.errors.append(error)
-                
-                if pd.isna(credit) or str(credit).strip() == '':
-                    error = ValidationError(
-                        row_number=idx + 2,
-                        column='Credit',
-                        error_type='missing_required_field',
-                        message=f"Row {idx + 2}: Missing Credit account (required when Amount is present)"
-                    )
-                    self.validation_report.errors.append(error)
+        amount = df['Amount']
+        # If amount exists, must have both debit and credit
+        has_amount = (amount.notna() & (amount != '').fillna(True) & (amount != 0).fillna(True)).to_numpy(dtype=bool)
+        checks = []
+        for column in ('Debit', 'Credit'):
+            missing = blank_mask(df[column]) if column in df.columns else np.ones(len(df), dtype=bool)
+            checks.append((column, has_amount & missing))
+        
+        self.validation_report.errors.extend(row_errors(
+            df, checks, 'missing_required_field',
+            lambda row, column, _: f"Row {row}: Missing {column} account (required when Amount is present)"
+        ))
     
     def _validate_data_types(self, df: pd.DataFrame) -> None:
         """Validate that data types are correct"""
         if 'Amount' not in df.columns:
             return
         
-        for idx, row in df.iterrows():
-            amount = row.get('Amount')
-            
-            # Skip empty amounts
-            if pd.isna(amount) or amount == '':
-                continue
-            
-            # Check if amount is numeric
-            try:
-                float(amount)
-            except (ValueError, TypeError):
-                error = ValidationError(
-                    row_number=idx + 2,
-                    column='Amount',
-                    error_type='invalid_data_type',
-                    message=f"Row {idx + 2}: Amount must be a number (got '{amount}')"
-                )
-                self.validation_report.errors.append(error)
+        # Empty amounts are skipped
+        self.validation_report.errors.extend(row_errors(
+            df, [('Amount', non_numeric_mask(df['Amount']))], 'invalid_data_type',
+            lambda row, column, value: f"Row {row}: Amount must be a number (got '{value}')"
+        ))
     
     def _validate_business_rules(self, df: pd.DataFrame) -> None:
         """
@@ -388,6 +454,33 @@ class DataCleaner:
         
         return df, self.validation_report
     
+    def clean_chunk(self, df: pd.DataFrame, validate: bool = True) -> pd.DataFrame:
+        """
+        Clean and validate one chunk of a larger file.
+        
+        Runs the row-level steps of clean_and_validate. Columns are kept even
+        if they are empty within the chunk, and required columns are not
+        checked: both depend on the whole file, so the caller decides them
+        once. Cleaning actions and errors are added to validation_report.
+        
+        Args:
+            df: Chunk as read from the file (row numbers come from its index)
+            validate: Run row validation (skip when required columns are missing)
+            
+        Returns:
+            Cleaned chunk
+        """
+        df = self._remove_empty_rows(df)
+        df = self._strip_whitespace(df)
+        df = self._normalize_currency_values(df)
+        
+        if validate:
+            self._validate_required_fields(df)
+            self._validate_data_types(df)
+            self._validate_business_rules(df)
+        
+        return df
+    
     def get_cleaned_dataframe(self) -> pd.DataFrame:
         """Get the cleaned DataFrame (after running clean_and_validate)"""
         if self.cleaned_df is None:
@@ -4,10 +4,24 @@ Income statement generation business logic
 Handles the generation of income statements from transaction data.
 """
 
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple, Union
+
+import numpy as np
+import pandas as pd
 
 from ..domain.transaction import Transaction
 from ..domain.category import CategoryMapper, REVENUE_CATEGORIES
+from .transaction_classifier import (
+    encode, select_encoded, sum_entity_line_items, sum_line_items, transactions_to_table
+)
+
+NON_OPERATING_ACTIVITIES = ['Investing Activities', 'Financing Activities']
+
+# Statement sections
+REVENUE_SECTION = 'Revenue'
+EXPENSE_SECTION = 'Expenses'
+
+COMBINED_ENTITY = 'Combined'
 
 
 class IncomeStatementGenerator:
@@ -29,14 +43,17 @@ class IncomeStatementGenerator:
         """
         self.category_mapper = category_mapper
 
-    def generate_statement(self, transactions: List[Transaction], entity_name: str) -> Dict[str, Any]:
+    def generate_statement(self, transactions: Union[pd.DataFrame, List[Transaction]],
+                           entity_name: str) -> Dict[str, Any]:
         """Generate income statement for given transactions.
 
         Processes operating transactions and categorizes them into revenue and expenses.
         Excludes investing/financing activities and prepaid asset transactions.
+        All line items are computed in one grouped sum over the transactions table.
 
         Args:
-            transactions: List of Transaction objects to process.
+            transactions: Transactions table (see transaction_classifier) or list of
+                Transaction objects to process.
             entity_name: Name of the entity (user or "Combined").
 
         Returns:
@@ -54,58 +71,80 @@ class IncomeStatementGenerator:
             - Negative expense amounts represent reimbursements/reversals
         """
 
-        expense_summary = {}
-        revenue_summary = {}
-        total_expenses = 0
-        total_revenue = 0
-
-        for transaction in transactions:
-            # Skip transactions with zero amounts
-            if transaction.amount == 0:
-                continue
-
-            # Skip non-operating activities (investing and financing)
-            # Income statement should only include operating activities
-            # Check both debit and credit categories
-            debit_activity = self.category_mapper.get_cashflow_category(transaction.debit_category)
-            credit_activity = self.category_mapper.get_cashflow_category(transaction.credit_account)
-
-            if debit_activity in ['Investing Activities', 'Financing Activities']:
-                continue
-            if credit_activity in ['Investing Activities', 'Financing Activities']:
-                continue
-
-            # Determine transaction type - prioritize actual analysis over stored attributes
-            # since stored attributes may be defaults for old test data
-            if transaction.debit_category in REVENUE_CATEGORIES and transaction.amount > 0:
-                transaction_type = "revenue"
-            elif hasattr(transaction, 'transaction_type') and transaction.transaction_type == "prepaid_asset":
-                transaction_type = "prepaid_asset"  # Only trust this specific value
-            elif transaction.amount < 0:
-                transaction_type = "expense"
-            else:
-                transaction_type = "expense"
-
-            # Skip prepaid asset transactions (they don't affect current period income)
-            if transaction_type == "prepaid_asset":
-                continue
-
-            # Process revenue and expense transactions
-            if transaction_type == "revenue":
-                # Revenue transaction
-                category = transaction.debit_category
-                amount = abs(transaction.amount)  # Ensure positive for income statement
-                revenue_summary[category] = revenue_summary.get(category, 0) + amount
-                total_revenue += amount
-            elif transaction_type == "expense":
-                # Expense transaction (including expenses from prepaid and reimbursements)
-                category = self.category_mapper.get_expense_category(transaction.debit_category)
-                # Keep sign! Negative amounts = expense reductions (reimbursements)
-                # Positive amounts = regular expenses
-                amount = transaction.amount  # DO NOT use abs() - preserve sign!
-                expense_summary[category] = expense_summary.get(category, 0) + amount
-                total_expenses += amount
-        
+        table = transactions_to_table(transactions)
+        sections = sum_line_items(*self._line_items(table))
+        return self._statement(entity_name, sections.get((REVENUE_SECTION,), {}),
+                               sections.get((EXPENSE_SECTION,), {}))
+
+    def generate_statements(self, transactions: Union[pd.DataFrame, List[Transaction]],
+                            combined_name: str = COMBINED_ENTITY,
+                            entity_label: str = "{}") -> Dict[str, Dict[str, Any]]:
+        """Generate income statements for every user and for all users combined.
+
+        Rows are grouped by (user, section, category) once and the combined
+        statement is folded from the same group totals, so the cost does not
+        grow with the number of users.
+
+        Args:
+            transactions: Transactions table or list of Transaction objects.
+            combined_name: Key and entity name of the combined statement.
+            entity_label: Format for each user's entity name (e.g. "User: {}").
+
+        Returns:
+            {user: statement} for each non-blank user in order of appearance,
+            followed by {combined_name: statement}. Rows without a user only
+            count towards the combined statement.
+        """
+        table = transactions_to_table(transactions)
+        per_user, combined = sum_entity_line_items(table['user'], *self._line_items(table))
+        statements = {
+            user: self._statement(entity_label.format(user), sections.get((REVENUE_SECTION,), {}),
+                                  sections.get((EXPENSE_SECTION,), {}))
+            for user, sections in per_user.items() if user != ''
+        }
+        statements[combined_name] = self._statement(combined_name, combined.get((REVENUE_SECTION,), {}),
+                                                    combined.get((EXPENSE_SECTION,), {}))
+        return statements
+
+    def _line_items(self, table: pd.DataFrame) -> Tuple[List[Any], np.ndarray, np.ndarray]:
+        """Section, line and signed amount per transaction, and the rows that count.
+
+        Categories are mapped once per distinct value and carried as integer codes.
+
+        Returns:
+            ([section, line], amount, mask) as accepted by sum_line_items.
+        """
+        amount = table['amount'].to_numpy(dtype=float)
+        debit_codes, debits = encode(table['debit_category'])
+        credit_codes, credits = encode(table['credit_account'])
+
+        # Only operating activities: skip rows whose debit or credit side is investing/financing
+        non_operating = (
+            self.category_mapper.map_cashflow_categories(pd.Series(debits)).isin(NON_OPERATING_ACTIVITIES)
+            .to_numpy()[debit_codes] |
+            self.category_mapper.map_cashflow_categories(pd.Series(credits)).isin(NON_OPERATING_ACTIVITIES)
+            .to_numpy()[credit_codes]
+        )
+
+        # Revenue is determined from the category, not the stored type (which may be a default);
+        # prepaid assets don't affect current period income
+        revenue = np.isin(debits, REVENUE_CATEGORIES)[debit_codes] & (amount > 0)
+        prepaid = ~revenue & (table['transaction_type'] == 'prepaid_asset').to_numpy(dtype=bool)
+
+        section = (revenue.astype(np.int64), np.array([EXPENSE_SECTION, REVENUE_SECTION], dtype=object))
+        # Revenue lines keep their category; expense lines use the mapped expense category
+        line = select_encoded([revenue], [(debit_codes, debits)], default=(
+            debit_codes, self.category_mapper.map_expense_categories(pd.Series(debits)).to_numpy(dtype=object)))
+        # Revenue is positive; expenses keep their sign (negative = reimbursement)
+        signed = np.where(revenue, np.abs(amount), amount)
+        return [section, line], signed, (amount != 0) & ~non_operating & ~prepaid
+
+    @staticmethod
+    def _statement(entity_name: str, revenue_summary: Dict[str, float],
+                   expense_summary: Dict[str, float]) -> Dict[str, Any]:
+        total_revenue = sum(revenue_summary.values())
+        total_expenses = sum(expense_summary.values())
+
         # Create income statement structure
         income_statement = {
             'Entity': entity_name,
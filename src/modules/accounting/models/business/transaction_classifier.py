@@ -0,0 +1,296 @@
+"""
+Vectorized transaction classification
+
+Turns a raw Description/Amount/Debit/Credit/User table into a typed,
+columnar transactions table in whole-column operations: amounts are
+cleaned with one regex pass, and the transaction type, statement
+category, cash-flow impact and signed amount are chosen with np.select
+over boolean masks instead of per-row branching.
+
+Transaction objects are only built on demand (transactions_from_table),
+for consumers that still work with lists of transactions. Statement
+generators aggregate the table directly with sum_line_items, or with
+sum_entity_line_items for every user plus Combined at once.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Type
+
+import numpy as np
+import pandas as pd
+
+from ..domain.transaction import Transaction
+
+# Account names that denote cash
+CASH_ACCOUNTS = ('cash', '现金')
+
+# Prepaid-asset account markers (matched case-insensitively)
+PREPAID_PATTERN = r'prepaid|pre-paid'
+
+# Columns of the transactions table, in Transaction field order
+TRANSACTION_COLUMNS = ('description', 'amount', 'debit_category', 'credit_account', 'user',
+                       'transaction_type', 'affects_cash_flow')
+
+
+def clean_amounts(values: pd.Series) -> pd.Series:
+    """
+    Amount column to float: currency symbols and thousands separators are
+    stripped; blanks and unparseable values become 0.0
+    """
+    if pd.api.types.is_numeric_dtype(values):
+        return values.astype(float).fillna(0.0)
+    cleaned = values.astype('string').str.replace(r'[¥,￥$]', '', regex=True).str.strip()
+    return pd.to_numeric(cleaned, errors='coerce').astype(float).fillna(0.0)
+
+
+def _text(df: pd.DataFrame, column: str) -> pd.Series:
+    """Stripped text column with missing values as ''"""
+    if column not in df.columns:
+        return pd.Series('', index=df.index, dtype=object)
+    return df[column].astype('string').str.strip().fillna('').astype(object)
+
+
+def classify_transactions(df: pd.DataFrame,
+                          revenue_categories: Iterable[str],
+                          drop_blank: bool = True) -> pd.DataFrame:
+    """
+    Classify raw transaction rows
+
+    Rules, first match wins (cash is involved when either side is a cash account):
+
+    1. Credit is a revenue category -> revenue under the credit, positive amount
+    2. Debit is cash -> reimbursement: negative expense under the credit category
+    3. Credit is a prepaid account -> prepaid used up: expense under the debit,
+       no cash-flow impact
+    4. Debit is a prepaid account -> prepaid_asset under the debit
+    5. Otherwise -> expense under the debit
+
+    Args:
+        df: Raw rows with Description, Amount, Debit, Credit and User columns
+            (missing columns are treated as blank)
+        revenue_categories: Credit accounts that denote revenue
+        drop_blank: Drop rows with no description, debit or credit
+
+    Returns:
+        DataFrame with TRANSACTION_COLUMNS; zero-amount rows are dropped
+    """
+    if df.empty:
+        return empty_transactions_table()
+
+    description = _text(df, 'Description')
+    debit = _text(df, 'Debit')
+    credit = _text(df, 'Credit')
+    amount = clean_amounts(df['Amount']) if 'Amount' in df.columns else pd.Series(0.0, index=df.index)
+
+    keep = (amount != 0).to_numpy()
+    if drop_blank:
+        keep = keep & ((description != '') | (debit != '') | (credit != '')).to_numpy()
+
+    transaction_type, category, affects_cash_flow, signed = _classify(debit, credit, amount, revenue_categories)
+    table = pd.DataFrame({
+        'description': description.to_numpy(),
+        'amount': signed,
+        'debit_category': category,
+        'credit_account': credit.to_numpy(),
+        'user': _text(df, 'User').to_numpy(),
+        'transaction_type': transaction_type,
+        'affects_cash_flow': affects_cash_flow,
+    })
+    return table[keep].reset_index(drop=True)
+
+
+def classify_transaction(debit: str, credit: str, amount: float,
+                         revenue_categories: Iterable[str]) -> Tuple[str, str, bool, float]:
+    """
+    Classify a single Debit/Credit pair with the classify_transactions rules
+
+    Returns:
+        (transaction_type, category, affects_cash_flow, signed amount)
+    """
+    transaction_type, category, affects_cash_flow, signed = _classify(
+        pd.Series([debit.strip()], dtype=object), pd.Series([credit.strip()], dtype=object),
+        pd.Series([amount], dtype=float), revenue_categories
+    )
+    return str(transaction_type[0]), str(category[0]), bool(affects_cash_flow[0]), float(signed[0])
+
+
+def _classify(debit: pd.Series, credit: pd.Series, amount: pd.Series,
+              revenue_categories: Iterable[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Column-wise classification rules over stripped debit/credit text and raw amounts"""
+    debit_lower = debit.str.lower()
+    credit_lower = credit.str.lower()
+    debit_cash = debit_lower.isin(CASH_ACCOUNTS).to_numpy()
+    cash_involved = debit_cash | credit_lower.isin(CASH_ACCOUNTS).to_numpy()
+    revenue = credit.isin(list(revenue_categories)).to_numpy()
+    reimbursement = debit_cash & ~revenue
+    prepaid_used = credit_lower.str.contains(PREPAID_PATTERN, regex=True).to_numpy()
+    prepaid_paid = debit_lower.str.contains(PREPAID_PATTERN, regex=True).to_numpy()
+    conditions = [revenue, reimbursement, prepaid_used, prepaid_paid]
+
+    debit, credit = debit.to_numpy(dtype=object), credit.to_numpy(dtype=object)
+    magnitude = amount.abs().to_numpy(dtype=float)
+    return (
+        np.select(conditions, ['revenue', 'expense', 'expense', 'prepaid_asset'], default='expense'),
+        np.select(conditions, [credit, credit, debit, debit], default=debit),
+        np.select(conditions, [cash_involved, cash_involved, False, cash_involved],
+                  default=cash_involved).astype(bool),
+        np.where(reimbursement, -magnitude, magnitude),
+    )
+
+
+def empty_transactions_table() -> pd.DataFrame:
+    """Transactions table with no rows and the standard column dtypes"""
+    return pd.DataFrame({
+        'description': pd.Series(dtype=object),
+        'amount': pd.Series(dtype=float),
+        'debit_category': pd.Series(dtype=object),
+        'credit_account': pd.Series(dtype=object),
+        'user': pd.Series(dtype=object),
+        'transaction_type': pd.Series(dtype=object),
+        'affects_cash_flow': pd.Series(dtype=bool),
+    })
+
+
+def transactions_from_table(table: pd.DataFrame,
+                            transaction_cls: Type = Transaction,
+                            mask: Optional[np.ndarray] = None) -> List:
+    """Materialize Transaction objects for the (masked) rows of a transactions table"""
+    if mask is not None:
+        table = table[mask]
+    columns = [table[name].tolist() for name in TRANSACTION_COLUMNS]
+    return [transaction_cls(*values) for values in zip(*columns)]
+
+
+def transactions_to_table(transactions: Any) -> pd.DataFrame:
+    """
+    Transactions table for statement generation
+
+    Args:
+        transactions: A transactions table (returned as is) or an iterable of
+                      Transaction-like objects (core or domain model)
+    """
+    if isinstance(transactions, pd.DataFrame):
+        return transactions
+    transactions = list(transactions)
+    if not transactions:
+        return empty_transactions_table()
+    return pd.DataFrame({
+        'description': [getattr(t, 'description', '') for t in transactions],
+        'amount': np.fromiter((t.amount for t in transactions), dtype=float, count=len(transactions)),
+        'debit_category': [t.debit_category for t in transactions],
+        'credit_account': [getattr(t, 'credit_account', '') for t in transactions],
+        'user': [getattr(t, 'user', '') for t in transactions],
+        'transaction_type': [getattr(t, 'transaction_type', 'expense') for t in transactions],
+        'affects_cash_flow': np.fromiter((getattr(t, 'affects_cash_flow', True) for t in transactions),
+                                         dtype=bool, count=len(transactions)),
+    })
+
+
+def encode(values: Any) -> Tuple[np.ndarray, np.ndarray]:
+    """Column as (codes, labels): integer codes into the distinct labels, in order of appearance"""
+    codes, labels = pd.factorize(pd.Series(values, copy=False), use_na_sentinel=False)
+    return codes, np.asarray(labels, dtype=object)
+
+
+def select_encoded(conditions: Sequence[np.ndarray],
+                   choices: Sequence[Tuple[np.ndarray, Any]],
+                   default: Tuple[np.ndarray, Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    np.select over encoded columns: picks per row the label of the first
+    matching choice and returns the result encoded over the merged labels
+    """
+    parts = list(choices) + [default]
+    offsets = np.cumsum([0] + [len(labels) for _, labels in parts[:-1]])
+    codes = np.select(conditions, [part_codes + offset for (part_codes, _), offset in zip(choices, offsets)],
+                      default=default[0] + offsets[-1])
+    return _distinct(codes, np.concatenate([np.asarray(labels, dtype=object) for _, labels in parts]))
+
+
+def _distinct(codes: np.ndarray, labels: Any) -> Tuple[np.ndarray, np.ndarray]:
+    """Re-encode (codes, labels) so that equal labels share one code"""
+    remap, labels = encode(np.asarray(labels, dtype=object))
+    return remap[codes], labels
+
+
+def sum_line_items(keys: Sequence[Any], amounts: Any, mask: Any) -> Dict[Tuple, Dict[str, float]]:
+    """
+    Statement line totals from one grouped sum
+
+    Keys are combined into one integer group key and amounts summed with
+    bincount, so the cost is a few passes over integer arrays whatever the
+    number of sections and lines.
+
+    Args:
+        keys: Grouping columns, each a values array or (codes, labels) from
+              encode() (labels may repeat, e.g. mapped categories); all
+              but the last select the statement section
+              (e.g. [section, line] or [entity, section, line])
+        amounts: Signed amount per row
+        mask: Rows that contribute to the statement
+
+    Returns:
+        {section key tuple: {line: total}}, lines in order of first appearance
+    """
+    encoded = _encode_keys(keys)
+    mask = np.asarray(mask, dtype=bool)
+    if not mask.any():
+        return {}
+    return _sections(encoded, *_group_sums(encoded, [codes[mask] for codes, _ in encoded],
+                                           np.asarray(amounts, dtype=float)[mask]))
+
+
+def sum_entity_line_items(entities: Any, keys: Sequence[Any], amounts: Any,
+                          mask: Any) -> Tuple[Dict[Any, Dict[Tuple, Dict[str, float]]], Dict[Tuple, Dict[str, float]]]:
+    """
+    Per-entity and combined statement line totals from one grouped sum
+
+    Rows are grouped by (entity, *keys) once; the combined totals are folded
+    from those group totals, so every entity's statement and the combined
+    one cost a single pass over the transactions.
+
+    Args:
+        entities: Entity (e.g. user) per row
+        keys, amounts, mask: As for sum_line_items
+
+    Returns:
+        ({entity: {section: {line: total}}} for every entity in the column,
+        including those with no contributing rows, and the combined
+        {section: {line: total}}), all in order of first appearance
+    """
+    encoded = _encode_keys([entities] + list(keys))
+    mask = np.asarray(mask, dtype=bool)
+    per_entity: Dict[Any, Dict[Tuple, Dict[str, float]]] = {entity: {} for entity in encoded[0][1].tolist()}
+    if not mask.any():
+        return per_entity, {}
+
+    key_codes, totals = _group_sums(encoded, [codes[mask] for codes, _ in encoded],
+                                    np.asarray(amounts, dtype=float)[mask])
+    for (entity, *section), lines in _sections(encoded, key_codes, totals).items():
+        per_entity[entity][tuple(section)] = lines
+
+    # Groups are in order of first appearance, so folding them keeps that order
+    combined_codes, combined_totals = _group_sums(encoded[1:], key_codes[1:], totals)
+    return per_entity, _sections(encoded[1:], combined_codes, combined_totals)
+
+
+def _encode_keys(keys: Sequence[Any]) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """Grouping columns as (codes, distinct labels)"""
+    return [_distinct(*key) if isinstance(key, tuple) else encode(key) for key in keys]
+
+
+def _group_sums(encoded: Sequence[Tuple[np.ndarray, np.ndarray]], codes: Sequence[np.ndarray],
+                amounts: np.ndarray) -> Tuple[List[np.ndarray], np.ndarray]:
+    """Sum amounts per distinct combination of key codes, in order of first appearance"""
+    shape = [max(len(labels), 1) for _, labels in encoded]
+    groups, group_keys = pd.factorize(np.ravel_multi_index(list(codes), shape))
+    totals = np.bincount(groups, weights=amounts, minlength=len(group_keys))
+    return list(np.unravel_index(np.asarray(group_keys), shape)), totals
+
+
+def _sections(encoded: Sequence[Tuple[np.ndarray, np.ndarray]], key_codes: Sequence[np.ndarray],
+              totals: np.ndarray) -> Dict[Tuple, Dict[str, float]]:
+    """Decode group keys into {section key tuple: {line: total}}"""
+    key_labels = [labels[codes].tolist() for (_, labels), codes in zip(encoded, key_codes)]
+    sections: Dict[Tuple, Dict[str, float]] = {}
+    for *section, line, total in zip(*key_labels, totals.tolist()):
+        sections.setdefault(tuple(section), {})[line] = total
+    return sections
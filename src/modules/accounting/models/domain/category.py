@@ -6,6 +6,9 @@ Uses configuration files for maintainable category management.
 """
 
 from typing import Dict, List
+
+import pandas as pd
+
 from ...config import get_category_config
 
 
@@ -34,6 +37,14 @@ class CategoryMapper:
     
     def get_cashflow_category(self, category: str) -> str:
         return self.cashflow_categories.get(category, 'Operating Activities')
+    
+    def map_expense_categories(self, categories: pd.Series) -> pd.Series:
+        """Vectorized get_expense_category over a column of categories"""
+        return categories.map(self.expense_categories).fillna('Other Expenses').astype(object)
+    
+    def map_cashflow_categories(self, categories: pd.Series) -> pd.Series:
+        """Vectorized get_cashflow_category over a column of categories"""
+        return categories.map(self.cashflow_categories).fillna('Operating Activities').astype(object)
 
 
 def get_revenue_categories() -> List[str]:
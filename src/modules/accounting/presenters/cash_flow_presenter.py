@@ -54,20 +54,8 @@ class CashFlowPresenter:
         if not users:
             raise ValueError("No users found in transaction data")
 
-        # Generate statements for all users
-        cashflow_statements = {}
-
-        # Individual user statements
-        for user in users:
-            user_transactions = processor.get_transactions_by_user(user)
-            cashflow_stmt = self.cashflow_generator.generate_statement(user_transactions, user)
-            cashflow_statements[user] = cashflow_stmt
-
-        # Combined statement
-        combined_cashflow = self.cashflow_generator.generate_statement(
-            processor.transactions, "Combined"
-        )
-        cashflow_statements["Combined"] = combined_cashflow
+        # Statements for each user plus Combined, from one pass over the transactions
+        cashflow_statements = self.cashflow_generator.generate_statements(processor.table)
 
         return cashflow_statements, users
 
@@ -150,8 +138,8 @@ class CashFlowPresenter:
         processor.load_transactions()
         
         if entity_name == "Combined":
-            transactions = processor.transactions
+            transactions = processor.table
         else:
-            transactions = processor.get_transactions_by_user(entity_name)
+            transactions = processor.table[processor.table['user'] == entity_name]
         
         return self.cashflow_generator.generate_statement(transactions, entity_name)
\ No newline at end of file
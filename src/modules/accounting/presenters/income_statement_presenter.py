@@ -65,31 +65,9 @@ class IncomeStatementPresenter:
         if not users:
             raise ValueError("No users found in transaction data")
 
-        # Generate income statements for all users
-        income_statements = {}
-
-        # Individual user statements
-        for user in users:
-            user_transactions = processor.get_transactions_by_user(user)
-            income_stmt = self.income_generator.generate_statement(user_transactions, user)
-            income_statements[user] = income_stmt
-
-        # Combined statement
-        combined_income = self.income_generator.generate_statement(processor.transactions, "Combined")
-        income_statements["Combined"] = combined_income
-
-        # Generate cash flow statements from same transactions
-        cashflow_statements = {}
-
-        # Individual user cash flow statements
-        for user in users:
-            user_transactions = processor.get_transactions_by_user(user)
-            cashflow_stmt = self.cashflow_generator.generate_statement(user_transactions, user)
-            cashflow_statements[user] = cashflow_stmt
-
-        # Combined cash flow statement
-        combined_cashflow = self.cashflow_generator.generate_statement(processor.transactions, "Combined")
-        cashflow_statements["Combined"] = combined_cashflow
+        # Income and cash flow statements for each user plus Combined, one pass each
+        income_statements = self.income_generator.generate_statements(processor.table)
+        cashflow_statements = self.cashflow_generator.generate_statements(processor.table)
 
         return income_statements, cashflow_statements, users
     
@@ -143,8 +121,8 @@ class IncomeStatementPresenter:
         processor.load_transactions()
         
         if entity_name == "Combined":
-            transactions = processor.transactions
+            transactions = processor.table
         else:
-            transactions = processor.get_transactions_by_user(entity_name)
+            transactions = processor.table[processor.table['user'] == entity_name]
         
         return self.income_generator.generate_statement(transactions, entity_name)
\ No newline at end of file
@@ -42,26 +42,8 @@ class TransactionPresenter:
         if not users:
             raise ValueError("No users found in transaction data")
         
-        # Generate statements for all users
-        income_statements = {}
-        cashflow_statements = {}
-        
-        # Individual user statements
-        for user in users:
-            user_transactions = processor.get_transactions_by_user(user)
-            
-            # Generate income statement
-            income_stmt = self.income_generator.generate_statement(user_transactions, user)
-            income_statements[user] = income_stmt
-            
-            # Generate cash flow statement  
-            cashflow_stmt = self.cashflow_generator.generate_statement(user_transactions, user)
-            cashflow_statements[user] = cashflow_stmt
-        
-        # Combined statements
-        combined_income = self.income_generator.generate_statement(processor.transactions, "Combined")
-        combined_cashflow = self.cashflow_generator.generate_statement(processor.transactions, "Combined")
-        income_statements["Combined"] = combined_income
-        cashflow_statements["Combined"] = combined_cashflow
+        # Statements for each user plus Combined, from one pass over the transactions
+        income_statements = self.income_generator.generate_statements(processor.table)
+        cashflow_statements = self.cashflow_generator.generate_statements(processor.table)
         
         return income_statements, cashflow_statements, users
\ No newline at end of file
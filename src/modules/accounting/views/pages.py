@@ -135,35 +135,30 @@ def show_income_cashflow_tab():
                             help="Specify which month this income statement belongs to"
                         )
 
+                    from ...core.statement_cache import MonthlyStatementCache
+                    statement_cache = MonthlyStatementCache()
+                    try:
+                        if statement_cache.is_stale(year_month):
+                            st.info(f"ℹ️ The statements for {year_month} are out of date with its stored transactions. "
+                                    "Saving replaces them with these statements.")
+                        if statement_cache.source_hash(year_month) is not None:
+                            st.info(f"📌 {year_month} has stored transactions: refresh-monthly-statements keeps "
+                                    "the statements you save here unless run with --force.")
+                    except ValueError:
+                        pass  # Reported when saving
+
                     with col2:
                         st.write("")  # Spacing
                         st.write("")  # Spacing
                         if st.button("💾 Save Both Statements", type="primary", use_container_width=True):
                             try:
-                                from ...core.report_storage import MonthlyReportStorage
-                                storage = MonthlyReportStorage()
-
-                                # Save each user's income statement
-                                income_success = 0
-                                for entity, statement in income_statements.items():
-                                    metadata = {
-                                        "entity": entity,
-                                        "generated_at": datetime.now().isoformat(),
-                                        "source": "web_upload"
-                                    }
-                                    if storage.save_statement(year_month, "income_statement", statement, metadata):
-                                        income_success += 1
-
-                                # Save each user's cash flow statement
-                                cashflow_success = 0
-                                for entity, statement in cashflow_statements.items():
-                                    metadata = {
-                                        "entity": entity,
-                                        "generated_at": datetime.now().isoformat(),
-                                        "source": "web_upload"
-                                    }
-                                    if storage.save_statement(year_month, "cash_flow", statement, metadata):
-                                        cashflow_success += 1
+                                # Save each user's income and cash flow statements, recorded in the month's manifest
+                                saved = statement_cache.save_statements(year_month, {
+                                    "income_statement": income_statements,
+                                    "cash_flow": cashflow_statements,
+                                })
+                                income_success = saved["income_statement"]
+                                cashflow_success = saved["cash_flow"]
 
                                 if income_success > 0 and cashflow_success > 0:
                                     st.success(f"✅ Successfully saved {income_success} income statement(s) and {cashflow_success} cash flow statement(s) for {year_month}!")
@@ -13,6 +13,15 @@ import warnings
 from src.ui.app_logger import LOG
 from config.assets import PE_ASSETS, ASSETS, INDEX_ASSETS
 
+# Raw CSV column names (yfinance English, akshare Chinese) -> standard OHLCV names
+OHLCV_COLUMNS = {
+    'open': 'open', '开盘': 'open',
+    'high': 'high', '最高': 'high',
+    'low': 'low', '最低': 'low',
+    'close': 'close', '收盘': 'close',
+    'volume': 'volume', '成交量': 'volume',
+}
+
 class DataLoader:
     """Enhanced data loader with separation of raw and processed data"""
     
@@ -37,11 +46,12 @@ class DataLoader:
         if not close_cols:
             raise ValueError(f"Missing 'close' column for {asset_name}. Available columns: {list(df.columns)}")
         
-        # Standardize column names (handle various cases)
+        # Standardize OHLCV column names (handle various cases)
         column_mapping = {}
         for col in df.columns:
-            if col.lower() == 'close' or col == '收盘':
-                column_mapping[col] = 'close'
+            standard = OHLCV_COLUMNS.get(col.lower(), OHLCV_COLUMNS.get(col))
+            if standard and standard not in column_mapping.values() and standard not in df.columns:
+                column_mapping[col] = standard
         
         if column_mapping:
             df = df.rename(columns=column_mapping)
@@ -139,11 +149,21 @@ class DataLoader:
                     start_date_parsed = start_date_parsed.tz_localize(None)
                 df = df[df.index >= start_date_parsed]
             
-            # Create OHLV data for backtrader
-            df['open'] = df['close'].astype(float)
-            df['high'] = df['close'].astype(float) * 1.01
-            df['low'] = df['close'].astype(float) * 0.99
-            df['volume'] = 1000000
+            # Use real OHLCV columns when the raw file has them; otherwise fall back
+            # to the close, and leave volume unknown (NaN) so cost models do not
+            # mistake a placeholder for real liquidity
+            close = df['close'].astype(float)
+            for column in ('open', 'high', 'low'):
+                if column in df.columns:
+                    df[column] = pd.to_numeric(df[column], errors='coerce').fillna(close)
+                else:
+                    df[column] = close
+            df['high'] = df[['high', 'open', 'close']].max(axis=1)
+            df['low'] = df[['low', 'open', 'close']].min(axis=1)
+            if 'volume' in df.columns:
+                df['volume'] = pd.to_numeric(df['volume'], errors='coerce')
+            else:
+                df['volume'] = np.nan
             
             # Create custom PandasData feed
             class PandasData(bt.feeds.PandasData):
@@ -8,7 +8,7 @@ Separates business logic from UI concerns for better testability and reusability
 import os
 import pandas as pd
 from datetime import date
-from typing import Dict, Any, List, Tuple, Optional
+from typing import IO, Callable, Dict, Any, List, Tuple, Optional
 
 from src.modules.data_management.data_center.download import main as download_data_main, get_data_range_info
 from src.modules.data_management.data_center.data_processor import (
@@ -22,6 +22,7 @@ from src.modules.data_management.visualization.data_access import load_data_for_
 
 # Import accounting data management components
 from src.modules.accounting.core.data_storage import MonthlyDataStorage
+from src.modules.accounting.core.data_query import MonthlyDataQuery
 from src.modules.accounting.core.data_storage_utils import (
     get_current_year_month, 
     get_recent_months, 
@@ -29,6 +30,8 @@ from src.modules.accounting.core.data_storage_utils import (
     csv_to_dataframe
 )
 from src.modules.accounting.core.report_storage import MonthlyReportStorage
+from src.modules.accounting.core.statement_cache import MonthlyStatementCache
+from src.modules.accounting.core.csv_importer import ImportProgress, ImportResult, StreamingTransactionImporter
 
 
 class SystemDataPresenter:
@@ -36,7 +39,16 @@ class SystemDataPresenter:
     
     def __init__(self):
         self.data_storage = MonthlyDataStorage()
+        self.data_query = MonthlyDataQuery(self.data_storage.base_path)
         self.report_storage = MonthlyReportStorage()
+        self._statement_cache: Optional[MonthlyStatementCache] = None
+    
+    @property
+    def statement_cache(self) -> MonthlyStatementCache:
+        """Materialized monthly statements over this presenter's storages, created on first use"""
+        if self._statement_cache is None:
+            self._statement_cache = MonthlyStatementCache(self.data_storage, self.report_storage)
+        return self._statement_cache
     
     def get_available_data(self) -> pd.DataFrame:
         """Get information about available data files using singleton storage system."""
@@ -265,20 +277,16 @@ class SystemDataPresenter:
                 month_count = int(time_range.split()[1])
                 display_months = sorted(available_months, reverse=True)[:month_count]
             
-            # Load and combine data from all selected months
-            all_transactions = []
-            for month in display_months:
-                transactions_df, _ = self.data_storage.load_monthly_data(month)
-                if transactions_df is not None:
-                    all_transactions.append(transactions_df)
+            # Count transactions in the selected months from Parquet metadata
+            transactions_months = self.data_query.months(months=display_months)
             
-            if all_transactions:
-                combined = pd.concat(all_transactions, ignore_index=True)
+            if transactions_months:
+                transactions_count = self.data_query.count(months=transactions_months)
                 return {
                     'has_data': True,
                     'months': display_months,
-                    'transactions_count': len(combined),
-                    'message': f"Loaded {len(combined)} transactions from {len(display_months)} months"
+                    'transactions_count': transactions_count,
+                    'message': f"Loaded {transactions_count} transactions from {len(display_months)} months"
                 }
             else:
                 return {
@@ -298,22 +306,48 @@ class SystemDataPresenter:
             }
     
     def load_combined_transactions(self, months: List[str]) -> pd.DataFrame:
-        """Load and combine transactions from multiple months."""
-        all_transactions = []
+        """Load and combine transactions from multiple months in one dataset read."""
+        try:
+            combined = self.data_query.transactions(months=months)
+        except ValueError as e:
+            LOG.error(f"Error loading transactions for {months}: {e}")
+            return pd.DataFrame()
         
-        for month in months:
-            transactions_df, _ = self.data_storage.load_monthly_data(month)
-            if transactions_df is not None:
-                transactions_df['month'] = month  # Add month column for tracking
-                all_transactions.append(transactions_df)
+        if combined.empty:
+            return pd.DataFrame()
         
-        if all_transactions:
-            combined = pd.concat(all_transactions, ignore_index=True)
-            # Sort by month (newest first) - transactions don't have date column
-            combined = combined.sort_values('month', ascending=False)
-            return combined
+        # Sort by month (newest first) - transactions don't have date column
+        return combined.sort_values('month', ascending=False, kind='stable')
+    
+    def import_transactions_csv(self,
+                                source: IO[bytes],
+                                year_month: Optional[str] = None,
+                                overwrite: bool = True,
+                                progress_callback: Optional[Callable[[ImportProgress], None]] = None,
+                                chunk_size: int = 50_000) -> ImportResult:
+        """Stream an uploaded transactions CSV into monthly storage, chunk by chunk"""
+        importer = StreamingTransactionImporter(data_storage=self.data_storage, chunk_size=chunk_size)
+        result = importer.import_csv(source, year_month=year_month, overwrite=overwrite,
+                                     progress_callback=progress_callback)
+        if result.succeeded:
+            LOG.info(f"Imported {result.rows_read} uploaded transactions into {len(result.saved_months)} months")
+        else:
+            LOG.warning(f"Transaction upload rejected: {result.validation_report.get_summary()}")
+        return result
+    
+    def refresh_stale_statements(self, months: List[str]) -> Dict[str, Any]:
+        """
+        Regenerate the statements of months whose stored transactions changed.
         
-        return pd.DataFrame()
+        Returns:
+            Refresh result per stale month (see MonthlyStatementCache.refresh_stale);
+            months with user-saved statements are never stale and are left alone
+        """
+        stale = self.statement_cache.stale_months(months)
+        if not stale:
+            return {}
+        LOG.info(f"Regenerating statements for {len(stale)} months with changed transactions")
+        return self.statement_cache.refresh_stale(stale)
     
     def get_visualization_data(self) -> Dict[str, pd.DataFrame]:
         """Get data for visualization."""
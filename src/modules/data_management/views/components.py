@@ -300,6 +300,11 @@ def show_accounting_data_tab():
         except Exception as e:
             st.error(f"❌ Error processing upload: {e}")
     
+    # 📥 Streaming CSV Import
+    st.markdown("---")
+    st.markdown("### 📥 Import Transactions CSV")
+    _show_csv_import(presenter)
+    
     # 📊 Unified Data Table
     st.markdown("---")
     st.markdown("### 📊 All Transactions Data")
@@ -327,7 +332,7 @@ def show_accounting_data_tab():
         
         with batch_col4:
             if st.button("💾 Save All Changes", type="primary"):
-                _save_all_changes(edited_data, presenter.data_storage, upload_info)
+                _save_all_changes(edited_data, presenter, upload_info)
                 st.success("✅ All changes saved successfully!")
                 st.rerun()
     
@@ -346,6 +351,71 @@ def show_accounting_data_tab():
                 st.metric("Categories", upload_info["total_categories"])
 
 
+def _show_csv_import(presenter: SystemDataPresenter):
+    """Chunked import of a (possibly multi-year) transactions CSV export."""
+    uploaded_file = st.file_uploader(
+        "Transactions CSV export",
+        type=['csv'],
+        key="transactions_csv_import",
+        help="Large exports are read, cleaned and saved in chunks. Rows need a month (YYYY-MM) or date column, "
+             "or enter the month below."
+    )
+    col1, col2 = st.columns(2)
+    with col1:
+        month = st.text_input("Month (YYYY-MM, optional)", key="transactions_csv_import_month").strip()
+    with col2:
+        overwrite = st.checkbox("Overwrite existing months", value=True, key="transactions_csv_import_overwrite")
+    
+    if uploaded_file is None or not st.button("📥 Import CSV", type="primary"):
+        return
+    
+    progress_bar = st.progress(0.0, text="Importing...")
+    
+    def show_progress(progress):
+        fraction = progress.fraction
+        progress_bar.progress(fraction or 0.0, text=f"{progress.rows_read:,} rows read, "
+                                                    f"{progress.rows_written:,} rows written")
+    
+    try:
+        # The upload is streamed from its file object; no temporary copy or full DataFrame
+        result = presenter.import_transactions_csv(uploaded_file, year_month=month or None,
+                                                   overwrite=overwrite, progress_callback=show_progress)
+    except Exception as e:
+        st.error(f"❌ Error importing CSV: {e}")
+        return
+    
+    report = result.validation_report
+    st.write(report.get_cleaning_summary())
+    if not result.succeeded:
+        st.error(f"❌ {report.get_summary()} - nothing was saved")
+        with st.expander("🔍 View Validation Errors", expanded=True):
+            for error in report.errors[:100]:
+                st.write(f"• {error.message}")
+            if len(report.errors) > 100:
+                st.write(f"... and {len(report.errors) - 100} more")
+        return
+    
+    progress_bar.progress(1.0, text="Import complete")
+    st.success(f"✅ Imported {result.rows_read:,} rows into {len(result.saved_months)} months: "
+               f"{', '.join(result.saved_months)}")
+    _refresh_statements(presenter, result.saved_months)
+
+
+def _refresh_statements(presenter: SystemDataPresenter, months: List[str]):
+    """Regenerate the monthly statements made stale by newly saved transactions."""
+    results = presenter.refresh_stale_statements(months)
+    regenerated = sorted(month for month, result in results.items() if result is True)
+    failed = {month: result for month, result in results.items() if isinstance(result, str)}
+    if regenerated:
+        st.info(f"🔄 Regenerated statements for {', '.join(regenerated)}")
+    for month, error in sorted(failed.items()):
+        st.warning(f"⚠️ Could not regenerate statements for {month}: {error}")
+    kept = sorted(month for month in months if presenter.statement_cache.is_user_saved(month))
+    if kept:
+        st.info(f"📌 Kept statements saved from an upload for {', '.join(kept)}; "
+                f"run refresh-monthly-statements --force to regenerate them from the transactions")
+
+
 def _merge_transactions_data(existing_df: pd.DataFrame, upload_df: pd.DataFrame, overwrite: bool) -> pd.DataFrame:
     """Merge uploaded transactions with existing data."""
     if existing_df.empty:
@@ -495,7 +565,7 @@ def _show_delete_selected_dialog(data: pd.DataFrame):
         st.info("Delete functionality will be implemented with row selection")
 
 
-def _save_all_changes(data: pd.DataFrame, data_storage, upload_info: dict):
+def _save_all_changes(data: pd.DataFrame, presenter: SystemDataPresenter, upload_info: dict):
     """Save all changes to storage."""
     try:
         # Group by month and save
@@ -512,7 +582,7 @@ def _save_all_changes(data: pd.DataFrame, data_storage, upload_info: dict):
             # Remove internal columns before saving
             clean_data = month_data.drop(columns=['_data_source'], errors='ignore')
             
-            result = data_storage.save_monthly_data(
+            result = presenter.data_storage.save_monthly_data(
                 month,
                 transactions_df=clean_data,
                 overwrite=True
@@ -523,6 +593,7 @@ def _save_all_changes(data: pd.DataFrame, data_storage, upload_info: dict):
         
         if saved_months:
             st.success(f"✅ Saved data for {len(saved_months)} months: {', '.join(sorted(saved_months))}")
+            _refresh_statements(presenter, saved_months)
         
     except Exception as e:
         st.error(f"❌ Error saving data: {e}")
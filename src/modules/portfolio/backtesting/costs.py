@@ -0,0 +1,54 @@
+"""
+Backtrader Cost Model Adapter
+Plugs a trading.costs TransactionCostModel into the backtrader broker.
+
+Backtrader only supports fixed-percentage slippage, so the model's price
+impact is charged through the commission scheme instead: each fill pays
+commission plus ``|size| * price * impact``, which has the same effect on
+cash and portfolio value. One commission info is registered per data feed
+so size-dependent models see that feed's current bar volume.
+"""
+
+from typing import Any, Dict
+
+import backtrader as bt
+import numpy as np
+
+from src.modules.portfolio.trading.costs import TransactionCostModel
+from src.ui.app_logger import LOG
+
+
+class CostModelCommissionInfo(bt.CommInfoBase):
+    """Stock-like commission scheme that charges a TransactionCostModel's costs"""
+
+    params = (
+        ('stocklike', True),
+        ('commtype', bt.CommInfoBase.COMM_PERC),
+        ('percabs', True),
+        ('cost_model', None),
+        ('data', None),
+    )
+
+    def _getcommission(self, size, price, pseudoexec):
+        volume = np.nan
+        if self.p.data is not None and len(self.p.data):
+            volume = float(self.p.data.volume[0])
+        costs = self.p.cost_model.estimate(price, abs(size), np.sign(size) or 1.0, volume=volume)
+        return float(costs.commission + costs.slippage_cost)
+
+
+def apply_cost_model(broker: bt.BrokerBase,
+                     cost_model: TransactionCostModel,
+                     feeds: Dict[str, Any]) -> None:
+    """
+    Register ``cost_model`` on the broker for every data feed
+
+    Args:
+        broker: Cerebro broker
+        cost_model: Transaction cost model to charge on fills
+        feeds: Data feeds keyed by the name they were added to cerebro with
+    """
+    broker.set_slippage_perc(perc=0.0)
+    for name, feed in feeds.items():
+        broker.addcommissioninfo(CostModelCommissionInfo(cost_model=cost_model, data=feed), name=name)
+    LOG.info(f"Applied {type(cost_model).__name__} to {len(feeds)} data feeds")
@@ -18,6 +18,8 @@ from config.assets import ASSETS
 from config.system import INITIAL_CAPITAL, COMMISSION
 from src.modules.data_management.data_center.data_loader import DataLoader
 from src.modules.portfolio.strategies.metadata import StrategyMetadata
+from src.modules.portfolio.trading.costs import TransactionCostModel
+from .costs import apply_cost_model
 
 class EnhancedBacktestEngine:
     """
@@ -29,12 +31,15 @@ class EnhancedBacktestEngine:
                  commission: float = COMMISSION,
                  execution_lag: int = 1,  # Days of execution lag (T+1)
                  slippage: float = 0.001,  # 0.1% slippage per trade
-                 data_root: str = "data"):
+                 data_root: str = "data",
+                 cost_model: Optional[TransactionCostModel] = None):
         
         self.initial_capital = initial_capital
         self.commission = commission
         self.execution_lag = execution_lag
         self.slippage = slippage
+        # When set, replaces the flat commission/slippage with the model's per-fill costs
+        self.cost_model = cost_model
         
         # Initialize data loader
         self.data_loader = DataLoader(data_root)
@@ -122,6 +127,7 @@ class EnhancedBacktestEngine:
             
             # Load and add data feeds
             data_feeds_added = 0
+            feeds = {}
             market_data_summary = {}
             asset_returns_data = {}  # For attribution analysis
             
@@ -130,6 +136,7 @@ class EnhancedBacktestEngine:
                     data_feed = self.data_loader.load_data_feed(asset_name, asset_name, start_date)
                     if data_feed is not None:
                         cerebro.adddata(data_feed, name=asset_name)
+                        feeds[asset_name] = data_feed
                         data_feeds_added += 1
                         
                         # Track data summary
@@ -156,6 +163,9 @@ class EnhancedBacktestEngine:
             
             LOG.info(f"Loaded {data_feeds_added} data feeds for backtesting")
             
+            if self.cost_model is not None:
+                apply_cost_model(cerebro.broker, self.cost_model, feeds)
+            
             # Add strategy with parameters
             cerebro.addstrategy(strategy_class, **strategy_kwargs)
             
@@ -393,7 +403,9 @@ class EnhancedBacktestEngine:
             
             with open(rebalance_file, 'w', newline='') as f:
                 if results['rebalancing_log']:
-                    writer = csv.DictWriter(f, fieldnames=results['rebalancing_log'][0].keys())
+                    # Union of keys in first-seen order; entries may carry optional fields
+                    fieldnames = list(dict.fromkeys(key for entry in results['rebalancing_log'] for key in entry))
+                    writer = csv.DictWriter(f, fieldnames=fieldnames)
                     writer.writeheader()
                     writer.writerows(results['rebalancing_log'])
         
@@ -11,8 +11,9 @@ from pathlib import Path
 from src.modules.portfolio.performance.analytics import PerformanceAnalyzer
 from config import INITIAL_CAPITAL, COMMISSION, ASSETS
 from src.modules.data_management.data_center.data_loader import load_market_data, load_data_feed
+from src.modules.portfolio.backtesting.costs import apply_cost_model
 
-def run_backtest(strategy_class, strategy_name, start_date=None, end_date=None, initial_capital=None, commission=None, enable_attribution=False, **kwargs):
+def run_backtest(strategy_class, strategy_name, start_date=None, end_date=None, initial_capital=None, commission=None, enable_attribution=False, cost_model=None, **kwargs):
     """
     Run a backtest for a given strategy.
     
@@ -24,6 +25,7 @@ def run_backtest(strategy_class, strategy_name, start_date=None, end_date=None,
         initial_capital: Override initial capital (optional)
         commission: Override commission rate (optional)
         enable_attribution: Enable performance attribution analysis
+        cost_model: TransactionCostModel charged on every fill instead of the flat commission (optional)
         **kwargs: Additional parameters for the strategy
     
     Returns:
@@ -87,6 +89,9 @@ def run_backtest(strategy_class, strategy_name, start_date=None, end_date=None,
             LOG.error("No valid data feeds found for backtesting")
             return None
         
+        if cost_model is not None:
+            apply_cost_model(cerebro.broker, cost_model, {data._name: data for data in cerebro.datas})
+        
         # Add strategy with parameters
         cerebro.addstrategy(strategy_class, **kwargs)
         
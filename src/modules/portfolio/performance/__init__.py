@@ -6,5 +6,7 @@ Main focus for GUI/dashboard development.
 """
 
 from .analytics import PerformanceAnalyzer
+from .charts import PerformanceCharts
+from .streaming import StreamingMetrics
 
-__all__ = ['PerformanceAnalyzer']
\ No newline at end of file
+__all__ = ['PerformanceAnalyzer', 'PerformanceCharts', 'StreamingMetrics']
\ No newline at end of file
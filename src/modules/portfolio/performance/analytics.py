@@ -5,15 +5,14 @@ Professional performance evaluation with comprehensive metrics and attribution a
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any, Union
 from datetime import datetime, timedelta
 import warnings
 warnings.filterwarnings('ignore')
 
 from src.ui.app_logger import LOG
+from .charts import PerformanceCharts
 
 class PerformanceAnalyzer:
     """
@@ -138,6 +137,119 @@ class PerformanceAnalyzer:
         LOG.info(f"Strategy comparison saved to {comparison_file}")
         return comparison_df
     
+    def calculate_batch_metrics(self,
+                                returns: Union[pd.DataFrame, Dict[str, pd.Series]]) -> pd.DataFrame:
+        """
+        Calculate comprehensive metrics for many strategies in one vectorized pass
+        
+        Args:
+            returns: Dates x strategies returns matrix, or a dict of return series
+                     which is outer-joined onto a shared calendar. Missing values
+                     are skipped per column, matching _calculate_comprehensive_metrics.
+            
+        Returns:
+            DataFrame indexed by strategy with one column per metric. Strategies
+            with insufficient data have NaN metrics and an 'error' message.
+        """
+        if isinstance(returns, dict):
+            returns = pd.DataFrame(returns)
+        if returns.empty:
+            return pd.DataFrame()
+        
+        values = returns.to_numpy(dtype=float, copy=True)
+        values[np.isinf(values)] = 0.0
+        valid = ~np.isnan(values)
+        periods = valid.sum(axis=0)
+        
+        with warnings.catch_warnings(), np.errstate(divide='ignore', invalid='ignore'):
+            # Empty and all-missing columns are flagged below, not warned about here
+            warnings.simplefilter('ignore', RuntimeWarning)
+            
+            # Basic metrics
+            mean = np.nanmean(values, axis=0)
+            std = np.nanstd(values, axis=0, ddof=1)
+            growth = np.prod(np.where(valid, 1 + values, 1.0), axis=0)
+            total_return = growth - 1
+            annual_return = growth ** (252 / periods) - 1
+            volatility = std * np.sqrt(252)
+            
+            # Risk-adjusted metrics
+            sharpe_ratio = np.where(volatility > 0, annual_return / volatility, 0.0)
+            
+            # Drawdown analysis (missing periods carry the previous value forward)
+            cumulative = np.cumprod(np.where(valid, 1 + values, 1.0), axis=0)
+            running_max = np.maximum.accumulate(cumulative, axis=0)
+            drawdown = (cumulative - running_max) / running_max
+            max_drawdown = np.nanmin(np.where(valid, drawdown, np.nan), axis=0)
+            max_dd_duration = _batch_max_drawdown_duration(drawdown, valid)
+            
+            # Calmar ratio
+            calmar_ratio = np.where(max_drawdown != 0, annual_return / np.abs(max_drawdown), 0.0)
+            
+            # Sortino ratio (downside deviation)
+            downside = np.where(values < 0, values, np.nan)
+            downside_std = np.nanstd(downside, axis=0, ddof=1) * np.sqrt(252)
+            sortino_ratio = np.where(downside_std > 0, annual_return / downside_std, 0.0)
+            
+            # Value at Risk (VaR)
+            sorted_values = np.sort(values, axis=0)
+            var_95 = _sorted_column_quantile(sorted_values, periods, 0.05)
+            var_99 = _sorted_column_quantile(sorted_values, periods, 0.01)
+            
+            # Tail ratio
+            upside_count = (values > 0).sum(axis=0)
+            sorted_upside = np.sort(np.where(values > 0, values, np.nan), axis=0)
+            upside_95 = _sorted_column_quantile(sorted_upside, upside_count, 0.95)
+            tail_ratio = np.where(upside_count > 0, upside_95 / np.abs(var_95), 0.0)
+            
+            # Higher moments (bias-corrected, as pandas skew/kurt)
+            deviations = np.where(valid, values - mean, 0.0)
+            squared = deviations * deviations
+            m2 = squared.sum(axis=0) / periods
+            m3 = (squared * deviations).sum(axis=0) / periods
+            m4 = (squared * squared).sum(axis=0) / periods
+            n = periods.astype(float)
+            skewness = np.where(n >= 3, np.sqrt(n * (n - 1)) / (n - 2) * m3 / m2 ** 1.5, np.nan)
+            kurtosis = np.where(
+                n >= 4,
+                (n - 1) / ((n - 2) * (n - 3)) * ((n + 1) * m4 / m2 ** 2 - 3 * (n - 1)),
+                np.nan
+            )
+            
+            best = np.nanmax(np.where(valid, values, -np.inf), axis=0)
+            worst = np.nanmin(np.where(valid, values, np.inf), axis=0)
+        
+        metrics_df = pd.DataFrame({
+            'total_return': total_return,
+            'annual_return': annual_return,
+            'volatility': volatility,
+            'sharpe_ratio': sharpe_ratio,
+            'sortino_ratio': sortino_ratio,
+            'calmar_ratio': calmar_ratio,
+            'max_drawdown': max_drawdown,
+            'max_drawdown_duration': max_dd_duration,
+            'var_95': var_95,
+            'var_99': var_99,
+            'tail_ratio': tail_ratio,
+            'skewness': skewness,
+            'kurtosis': kurtosis,
+            'best_month': best,
+            'worst_month': worst,
+            'positive_months': (values > 0).sum(axis=0),
+            'negative_months': (values < 0).sum(axis=0),
+            'total_periods': periods
+        }, index=returns.columns)
+        
+        # Same guard as the single-series path
+        invalid = (periods == 0) | ~(std > 0)
+        metrics_df.loc[invalid, metrics_df.columns] = np.nan
+        metrics_df['error'] = pd.Series(
+            np.where(invalid, 'Insufficient or invalid data', None), index=metrics_df.index, dtype=object
+        )
+        
+        LOG.info(f"Calculated batch metrics for {values.shape[1]} strategies over {values.shape[0]} periods")
+        return metrics_df
+    
     def _calculate_comprehensive_metrics(self, 
                                        returns: pd.Series, 
                                        name: str) -> Dict[str, float]:
@@ -178,20 +290,7 @@ class PerformanceAnalyzer:
         var_99 = clean_returns.quantile(0.01)
         
         # Maximum drawdown duration
-        drawdown_periods = []
-        in_drawdown = False
-        drawdown_start = None
-        
-        for i, dd in enumerate(drawdown):
-            if dd < 0 and not in_drawdown:
-                in_drawdown = True
-                drawdown_start = i
-            elif dd == 0 and in_drawdown:
-                in_drawdown = False
-                if drawdown_start is not None:
-                    drawdown_periods.append(i - drawdown_start)
-        
-        max_dd_duration = max(drawdown_periods) if drawdown_periods else 0
+        max_dd_duration = _max_drawdown_duration(drawdown.to_numpy())
         
         # Tail ratio
         upside_returns = clean_returns[clean_returns > 0]
@@ -234,17 +333,20 @@ class PerformanceAnalyzer:
         """
         rolling_metrics = {}
         
+        # Shared across windows: log returns turn compounding into a running sum
+        log_returns = np.log1p(returns)
+        cumulative = (1 + returns).cumprod()
+        
         for window in windows:
             if len(returns) < window:
                 continue
                 
             # Rolling returns and volatility
-            rolling_return = returns.rolling(window=window).apply(lambda x: (1 + x).prod() - 1)
+            rolling_return = _rolling_compound_return(log_returns, window)
             rolling_vol = returns.rolling(window=window).std() * np.sqrt(252)
             rolling_sharpe = (rolling_return * 252 / window) / rolling_vol
             
             # Rolling drawdown
-            cumulative = (1 + returns).cumprod()
             rolling_max = cumulative.rolling(window=window).max()
             rolling_dd = (cumulative - rolling_max) / rolling_max
             
@@ -328,7 +430,10 @@ class PerformanceAnalyzer:
         
         Args:
             strategy_results: Strategy backtest results
-            save_charts: Whether to save performance charts
+            save_charts: Whether to make performance charts available. Charts
+                         are rendered lazily, on first access to
+                         ``report['charts'][name]``, so matplotlib is only
+                         imported when a chart is actually needed.
             
         Returns:
             Comprehensive performance report
@@ -350,12 +455,11 @@ class PerformanceAnalyzer:
         # Rolling analysis
         rolling_metrics = self.rolling_performance_analysis(returns)
         
-        # Generate charts if requested
+        # Charts render on first access
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         charts_info = {}
         if save_charts:
-            charts_info = self._generate_performance_charts(
-                portfolio_df, strategy_name, metrics
-            )
+            charts_info = PerformanceCharts(portfolio_df, strategy_name, self.results_dir, timestamp)
         
         # Compile report
         report = {
@@ -369,8 +473,7 @@ class PerformanceAnalyzer:
             'recommendations': self._generate_recommendations(metrics)
         }
         
-        # Save report
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # Save report (every available chart is listed; only rendered ones have a path yet)
         strategy_safe = strategy_name.replace('/', '_').replace(' ', '_')
         report_file = self.results_dir / f"{strategy_safe}_performance_report_{timestamp}.json"
         
@@ -384,72 +487,6 @@ class PerformanceAnalyzer:
         LOG.info(f"Performance report saved to {report_file}")
         return report
     
-    def _generate_performance_charts(self, 
-                                   portfolio_df: pd.DataFrame, 
-                                   strategy_name: str,
-                                   metrics: Dict[str, float]) -> Dict[str, str]:
-        """Generate performance visualization charts"""
-        charts = {}
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        strategy_safe = strategy_name.replace('/', '_').replace(' ', '_')
-        
-        # Set style
-        plt.style.use('seaborn-v0_8')
-        
-        # 1. Portfolio Value Evolution
-        fig, ax = plt.subplots(figsize=(12, 6))
-        portfolio_df.plot(x='date', y='value', ax=ax, title=f'{strategy_name} - Portfolio Value Evolution')
-        ax.set_ylabel('Portfolio Value ($)')
-        ax.grid(True)
-        
-        chart_file = self.results_dir / f"{strategy_safe}_portfolio_evolution_{timestamp}.png"
-        plt.savefig(chart_file, dpi=300, bbox_inches='tight')
-        charts['portfolio_evolution'] = str(chart_file)
-        plt.close()
-        
-        # 2. Returns Distribution
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
-        
-        returns = portfolio_df['returns'].dropna()
-        
-        # Histogram
-        returns.hist(bins=50, ax=ax1, alpha=0.7)
-        ax1.axvline(returns.mean(), color='red', linestyle='--', label=f'Mean: {returns.mean():.3f}')
-        ax1.set_title(f'{strategy_name} - Returns Distribution')
-        ax1.set_xlabel('Daily Returns')
-        ax1.set_ylabel('Frequency')
-        ax1.legend()
-        
-        # Cumulative returns
-        cumulative_returns = (1 + returns).cumprod()
-        cumulative_returns.plot(ax=ax2, title=f'{strategy_name} - Cumulative Returns')
-        ax2.set_ylabel('Cumulative Return')
-        ax2.grid(True)
-        
-        chart_file = self.results_dir / f"{strategy_safe}_returns_analysis_{timestamp}.png"
-        plt.savefig(chart_file, dpi=300, bbox_inches='tight')
-        charts['returns_analysis'] = str(chart_file)
-        plt.close()
-        
-        # 3. Drawdown Chart
-        fig, ax = plt.subplots(figsize=(12, 6))
-        
-        cumulative = (1 + returns).cumprod()
-        running_max = cumulative.expanding().max()
-        drawdown = (cumulative - running_max) / running_max
-        
-        drawdown.plot(ax=ax, title=f'{strategy_name} - Drawdown Analysis', color='red')
-        ax.fill_between(drawdown.index, drawdown, 0, alpha=0.3, color='red')
-        ax.set_ylabel('Drawdown')
-        ax.grid(True)
-        
-        chart_file = self.results_dir / f"{strategy_safe}_drawdown_{timestamp}.png"
-        plt.savefig(chart_file, dpi=300, bbox_inches='tight')
-        charts['drawdown'] = str(chart_file)
-        plt.close()
-        
-        return charts
-    
     def _analyze_rebalancing(self, rebalancing_log: List[Dict]) -> Dict[str, Any]:
         """Analyze rebalancing patterns"""
         if not rebalancing_log:
@@ -494,7 +531,9 @@ class PerformanceAnalyzer:
     
     def _serialize_for_json(self, obj: Any) -> Any:
         """Convert objects to JSON-serializable format"""
-        if isinstance(obj, pd.DataFrame):
+        if isinstance(obj, PerformanceCharts):
+            return obj.inventory
+        elif isinstance(obj, pd.DataFrame):
             # Convert DataFrame to dict and handle Timestamp columns
             df_dict = obj.to_dict()
             return self._serialize_for_json(df_dict)
@@ -509,12 +548,103 @@ class PerformanceAnalyzer:
         elif isinstance(obj, datetime):
             return obj.isoformat()
         elif isinstance(obj, dict):
-            return {key: self._serialize_for_json(value) for key, value in obj.items()}
+            return {
+                key.isoformat() if isinstance(key, (pd.Timestamp, datetime)) else key: self._serialize_for_json(value)
+                for key, value in obj.items()
+            }
         elif isinstance(obj, list):
             return [self._serialize_for_json(item) for item in obj]
         else:
             return obj
 
+
+def _max_drawdown_duration(drawdown: np.ndarray) -> int:
+    """
+    Longest completed drawdown, in periods, via run-length encoding.
+    
+    A drawdown run starts when the series drops below its peak and is only
+    counted once it recovers (drawdown back to 0); a drawdown still open at
+    the end of the series is not counted.
+    """
+    if drawdown.size == 0:
+        return 0
+    
+    underwater = np.concatenate(([0], (drawdown < 0).astype(np.int8), [0]))
+    edges = np.diff(underwater)
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    
+    # Keep only runs that recovered before the end of the series
+    recovered = ends < drawdown.size
+    if not recovered.any():
+        return 0
+    return int((ends[recovered] - starts[recovered]).max())
+
+
+def _batch_max_drawdown_duration(drawdown: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """
+    Column-wise ``_max_drawdown_duration`` for a dates x strategies matrix.
+    
+    Durations are measured in valid (non-missing) periods of each column;
+    missing periods keep the underwater state of the previous valid period.
+    """
+    n_rows, n_cols = drawdown.shape
+    result = np.zeros(n_cols, dtype=int)
+    if n_rows == 0:
+        return result
+    
+    # Position of each row within its column's compacted (valid-only) series
+    position = np.cumsum(valid, axis=0) - 1
+    
+    underwater = pd.DataFrame(np.where(valid, drawdown < 0, np.nan)).ffill().fillna(0).to_numpy(dtype=np.int8)
+    padded = np.vstack([np.zeros((1, n_cols), np.int8), underwater, np.zeros((1, n_cols), np.int8)])
+    edges = np.diff(padded, axis=0).T
+    
+    # Runs pair up in order within each column: one start and one end each
+    start_cols, start_rows = np.nonzero(edges == 1)
+    _, end_rows = np.nonzero(edges == -1)
+    
+    recovered = end_rows < n_rows
+    if recovered.any():
+        cols = start_cols[recovered]
+        durations = position[end_rows[recovered], cols] - position[start_rows[recovered], cols]
+        np.maximum.at(result, cols, durations)
+    return result
+
+
+def _sorted_column_quantile(sorted_values: np.ndarray, counts: np.ndarray, q: float) -> np.ndarray:
+    """
+    Linear-interpolated quantile per column of an ascending-sorted matrix.
+    
+    NaNs sort to the bottom of each column, so only the first ``counts[j]``
+    rows of column j are used; matches ``Series.quantile`` on the non-missing
+    values and avoids the per-column Python path of ``np.nanquantile``.
+    """
+    result = np.full(sorted_values.shape[1], np.nan)
+    has_data = counts > 0
+    if not has_data.any():
+        return result
+    
+    position = q * (counts[has_data] - 1)
+    lower = np.floor(position).astype(int)
+    upper = np.ceil(position).astype(int)
+    columns = np.flatnonzero(has_data)
+    low_values = sorted_values[lower, columns]
+    high_values = sorted_values[upper, columns]
+    result[has_data] = low_values + (high_values - low_values) * (position - lower)
+    return result
+
+
+def _rolling_compound_return(log_returns: pd.Series, window: int) -> pd.Series:
+    """
+    Rolling compounded return over ``window`` periods in O(n).
+    
+    Compounding ``prod(1 + r) - 1`` equals ``expm1(sum(log1p(r)))``, so the
+    window product becomes a running sum of log returns instead of a Python
+    callback per window.
+    """
+    return np.expm1(log_returns.rolling(window=window).sum())
+
 def log_rebalance_details(strategy_name: str, rebalance_data: list) -> None:
     """Lightweight helper to persist rebalancing details (moved from src/analytics.py)."""
     if not rebalance_data:
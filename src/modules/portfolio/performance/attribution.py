@@ -21,6 +21,7 @@ from dataclasses import dataclass
 
 from src.ui.app_logger import LOG
 from config.assets import ASSETS
+from .attribution_store import AttributionStore
 
 warnings.filterwarnings('ignore', category=RuntimeWarning)
 
@@ -56,6 +57,7 @@ class PerformanceAttributor:
         """
         self.results_dir = Path(results_dir)
         self.results_dir.mkdir(parents=True, exist_ok=True)
+        self.store = AttributionStore(str(self.results_dir / "store"))
         LOG.info(f"Standalone performance attribution system initialized, results dir: {self.results_dir}")
     
     def load_strategy_data(self, strategy_name: str, start_date: str, end_date: str) -> Dict[str, pd.DataFrame]:
@@ -239,10 +241,14 @@ class PerformanceAttributor:
                                     asset_returns: Optional[pd.DataFrame] = None,
                                     weights_data: Optional[pd.DataFrame] = None,
                                     include_weekly: bool = True,
-                                    include_monthly: bool = True) -> Dict[str, Any]:
+                                    include_monthly: bool = True,
+                                    store_results: bool = False) -> Dict[str, Any]:
         """
         Compatibility method: if dataframes are provided, run attribution directly;
         otherwise, fall back to loading recent period via run_attribution_analysis.
+        
+        With ``store_results`` the results are also appended to the strategy's
+        Parquet dataset (replacing stored rows in the analyzed date range).
         """
         try:
             if all(x is not None for x in [portfolio_data, asset_returns, weights_data]):
@@ -261,6 +267,8 @@ class PerformanceAttributor:
                     'report_date': datetime.now().isoformat(),
                     'daily_analysis': self.decompose_returns(daily_attributions)
                 }
+                weekly: List[AttributionResult] = []
+                monthly: List[AttributionResult] = []
                 if include_weekly:
                     weekly = self.calculate_periodic_attribution(daily_attributions, 'weekly')
                     if weekly:
@@ -269,6 +277,13 @@ class PerformanceAttributor:
                     monthly = self.calculate_periodic_attribution(daily_attributions, 'monthly')
                     if monthly:
                         report['monthly_analysis'] = self.decompose_returns(monthly)
+                if store_results:
+                    # Persist columnar results so they can be exported/viewed without a rerun
+                    report['stored_files'] = self.store_attribution_data(strategy_name, {
+                        'daily': daily_attributions,
+                        'weekly': weekly,
+                        'monthly': monthly
+                    })
                 return report
             # No dataframes provided: require external dates via run_attribution_analysis
             return {'error': 'Insufficient inputs: provide portfolio_data, asset_returns, and weights_data or use run_attribution_analysis with dates'}
@@ -732,7 +747,8 @@ class PerformanceAttributor:
                             strategy_name: str, 
                             attribution_data: Dict[str, List[AttributionResult]]) -> Dict[str, str]:
         """
-        Save attribution analysis data to CSV and Excel files
+        Save attribution analysis data to CSV and Excel files, and to the
+        strategy's Parquet attribution dataset
         
         Args:
             strategy_name: Name of the strategy
@@ -741,77 +757,208 @@ class PerformanceAttributor:
         Returns:
             Dictionary with saved file paths
         """
-        saved_files = {}
-        strategy_safe = strategy_name.replace('/', '_').replace(' ', '_').lower()
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
         try:
-            for period, results in attribution_data.items():
-                if not results:
-                    continue
-                
-                # Convert to DataFrame
-                rows = []
-                for attr in results:
-                    row = {
-                        'Date': attr.date.strftime('%Y-%m-%d'),
-                        'Total_Return': attr.total_return,
-                        'Weight_Change_Impact': attr.weight_change_impact
-                    }
-                    
-                    # Add asset contributions
-                    for asset, contrib in attr.asset_contributions.items():
-                        row[f'Asset_Contrib_{asset}'] = contrib
-                    
-                    # Add rebalancing impacts
-                    for asset, impact in attr.rebalancing_impact.items():
-                        row[f'Rebal_Impact_{asset}'] = impact
-                    
-                    rows.append(row)
-                
-                if rows:
-                    df = pd.DataFrame(rows)
-                    
-                    # Save CSV
-                    csv_file = self.results_dir / f"{strategy_safe}_{period}_attribution_{timestamp}.csv"
-                    df.to_csv(csv_file, index=False)
-                    saved_files[f'{period}_csv'] = str(csv_file)
-            
-            # Create comprehensive Excel file with all periods
-            if any(attribution_data.values()):
-                excel_file = self.results_dir / f"{strategy_safe}_attribution_analysis_{timestamp}.xlsx"
-                
-                with pd.ExcelWriter(excel_file, engine='openpyxl') as writer:
-                    for period, results in attribution_data.items():
-                        if not results:
-                            continue
-                        
-                        # Convert to DataFrame for Excel
-                        rows = []
-                        for attr in results:
-                            row = {
-                                'Date': attr.date.strftime('%Y-%m-%d'),
-                                'Total_Return': attr.total_return,
-                                'Weight_Change_Impact': attr.weight_change_impact
-                            }
-                            
-                            for asset, contrib in attr.asset_contributions.items():
-                                row[f'Asset_Contrib_{asset}'] = contrib
-                            
-                            for asset, impact in attr.rebalancing_impact.items():
-                                row[f'Rebal_Impact_{asset}'] = impact
-                            
-                            rows.append(row)
-                        
-                        if rows:
-                            df = pd.DataFrame(rows)
-                            df.to_excel(writer, sheet_name=period.title(), index=False)
-                
-                saved_files['excel_comprehensive'] = str(excel_file)
+            frames = {
+                period: attribution_results_to_frame(results)
+                for period, results in attribution_data.items() if results
+            }
+            saved_files = self._write_attribution_files(strategy_name, frames, self.results_dir)
+            saved_files.update(self._store_frames(strategy_name, frames))
             
             LOG.info(f"Attribution data saved for {strategy_name}: {list(saved_files.keys())}")
             return saved_files
             
         except Exception as e:
             LOG.error(f"Error saving attribution data for {strategy_name}: {e}")
-            return {'error': f'Failed to save attribution data: {str(e)}'}
\ No newline at end of file
+            return {'error': f'Failed to save attribution data: {str(e)}'}
+    
+    def store_attribution_data(self,
+                               strategy_name: str,
+                               attribution_data: Dict[str, List[AttributionResult]],
+                               mode: str = 'append') -> Dict[str, str]:
+        """
+        Persist attribution results to the strategy's Parquet dataset only
+        
+        Args:
+            strategy_name: Name of the strategy
+            attribution_data: Dictionary with different period attribution data
+            mode: 'append' to extend stored results, 'overwrite' to replace them
+            
+        Returns:
+            Dictionary with written part file paths
+        """
+        try:
+            frames = {
+                period: attribution_results_to_frame(results)
+                for period, results in attribution_data.items() if results
+            }
+            return self._store_frames(strategy_name, frames, mode=mode)
+        except Exception as e:
+            LOG.error(f"Error storing attribution data for {strategy_name}: {e}")
+            return {'error': f'Failed to store attribution data: {str(e)}'}
+    
+    def load_attribution_data(self,
+                              strategy_name: str,
+                              start_date: Optional[str] = None,
+                              end_date: Optional[str] = None) -> Dict[str, List[AttributionResult]]:
+        """
+        Load stored attribution results for a strategy, by period
+        
+        Returns:
+            Dictionary of period name to attribution results (empty if none stored)
+        """
+        attribution_data = {}
+        for period in self.store.list_periods(strategy_name):
+            frame = self.store.read(strategy_name, period, start_date=start_date, end_date=end_date)
+            if not frame.empty:
+                attribution_data[period] = attribution_frame_to_results(frame, period)
+        return attribution_data
+    
+    def load_attribution_report(self,
+                                strategy_name: str,
+                                start_date: Optional[str] = None,
+                                end_date: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Rebuild an attribution report from stored results without rerunning the backtest
+        
+        Returns:
+            Report with the same structure as run_attribution_analysis, or an error
+        """
+        attribution_data = self.load_attribution_data(strategy_name, start_date, end_date)
+        if not attribution_data:
+            return {'error': f'No stored attribution results for {strategy_name}'}
+        
+        all_dates = [attr.date for results in attribution_data.values() for attr in results]
+        report: Dict[str, Any] = {
+            'strategy_name': strategy_name,
+            'analysis_period': {
+                'start_date': start_date or str(min(all_dates).date()),
+                'end_date': end_date or str(max(all_dates).date())
+            },
+            'report_date': datetime.now().isoformat(),
+            'source': 'stored'
+        }
+        for period, results in attribution_data.items():
+            report[f'{period}_analysis'] = self.decompose_returns(results)
+        return report
+    
+    def export_attribution_data(self,
+                                strategy_name: str,
+                                output_dir: Optional[str] = None,
+                                periods: Optional[List[str]] = None) -> Dict[str, str]:
+        """
+        Export stored attribution results to CSV and Excel files
+        
+        Args:
+            strategy_name: Name of the strategy
+            output_dir: Target directory (defaults to the results directory)
+            periods: Periods to export (defaults to all stored periods)
+            
+        Returns:
+            Dictionary with exported file paths (empty if nothing is stored)
+        """
+        target_dir = Path(output_dir) if output_dir else self.results_dir
+        target_dir.mkdir(parents=True, exist_ok=True)
+        
+        frames = {}
+        for period in periods or self.store.list_periods(strategy_name):
+            frame = self.store.read(strategy_name, period)
+            if not frame.empty:
+                frames[period] = frame
+        
+        return self._write_attribution_files(strategy_name, frames, target_dir)
+    
+    def _store_frames(self, 
+                      strategy_name: str, 
+                      frames: Dict[str, pd.DataFrame],
+                      mode: str = 'append') -> Dict[str, str]:
+        """Write per-period frames to the Parquet dataset"""
+        stored = {}
+        for period, frame in frames.items():
+            part_file = self.store.write(strategy_name, period, frame, mode=mode)
+            if part_file is not None:
+                stored[f'{period}_parquet'] = str(part_file)
+        return stored
+    
+    def _write_attribution_files(self,
+                                 strategy_name: str,
+                                 frames: Dict[str, pd.DataFrame],
+                                 output_dir: Path) -> Dict[str, str]:
+        """Write per-period CSVs and one Excel workbook with a sheet per period"""
+        saved_files = {}
+        if not frames:
+            return saved_files
+        
+        strategy_safe = AttributionStore.strategy_key(strategy_name)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        
+        export_frames = {}
+        for period, frame in frames.items():
+            df = frame.copy()
+            df['Date'] = pd.to_datetime(df['Date']).dt.strftime('%Y-%m-%d')
+            export_frames[period] = df
+            
+            csv_file = output_dir / f"{strategy_safe}_{period}_attribution_{timestamp}.csv"
+            df.to_csv(csv_file, index=False)
+            saved_files[f'{period}_csv'] = str(csv_file)
+        
+        excel_file = output_dir / f"{strategy_safe}_attribution_analysis_{timestamp}.xlsx"
+        with pd.ExcelWriter(excel_file, engine='openpyxl') as writer:
+            for period, df in export_frames.items():
+                df.to_excel(writer, sheet_name=period.title(), index=False)
+        saved_files['excel_comprehensive'] = str(excel_file)
+        
+        return saved_files
+
+
+def attribution_results_to_frame(attribution_results: List[AttributionResult]) -> pd.DataFrame:
+    """
+    Build the columnar attribution table (one row per period) in a single pass.
+    
+    Columns: Date, Total_Return, Weight_Change_Impact, Asset_Contrib_<asset>...,
+    Rebal_Impact_<asset>...
+    """
+    if not attribution_results:
+        return pd.DataFrame()
+    
+    frame = pd.DataFrame({
+        'Date': pd.to_datetime([attr.date for attr in attribution_results]),
+        'Total_Return': [attr.total_return for attr in attribution_results],
+        'Weight_Change_Impact': [attr.weight_change_impact for attr in attribution_results],
+    })
+    contributions = pd.DataFrame.from_records(
+        [attr.asset_contributions for attr in attribution_results]
+    ).add_prefix('Asset_Contrib_')
+    rebalancing = pd.DataFrame.from_records(
+        [attr.rebalancing_impact for attr in attribution_results]
+    ).add_prefix('Rebal_Impact_')
+    return pd.concat([frame, contributions, rebalancing], axis=1)
+
+
+def attribution_frame_to_results(frame: pd.DataFrame, period: str) -> List[AttributionResult]:
+    """Materialize AttributionResult objects from a stored attribution table"""
+    contrib_columns = [col for col in frame.columns if col.startswith('Asset_Contrib_')]
+    rebal_columns = [col for col in frame.columns if col.startswith('Rebal_Impact_')]
+    contrib_assets = [col[len('Asset_Contrib_'):] for col in contrib_columns]
+    rebal_assets = [col[len('Rebal_Impact_'):] for col in rebal_columns]
+    
+    contrib_values = frame[contrib_columns].to_numpy(dtype=float)
+    rebal_values = frame[rebal_columns].to_numpy(dtype=float)
+    
+    results = []
+    for i, (date, total_return, weight_impact) in enumerate(
+        zip(pd.to_datetime(frame['Date']), frame['Total_Return'], frame['Weight_Change_Impact'])
+    ):
+        results.append(AttributionResult(
+            date=date,
+            total_return=float(total_return),
+            asset_contributions={
+                asset: value for asset, value in zip(contrib_assets, contrib_values[i]) if not np.isnan(value)
+            },
+            weight_change_impact=float(weight_impact),
+            rebalancing_impact={
+                asset: value for asset, value in zip(rebal_assets, rebal_values[i]) if not np.isnan(value)
+            },
+            attribution_period=period
+        ))
+    return results
@@ -0,0 +1,162 @@
+"""
+Attribution Result Store
+
+Persists attribution results as one Parquet dataset per strategy, partitioned
+by attribution period (hive-style ``period=<name>`` directories), so results
+can be exported or displayed later without rerunning the backtest.
+
+Layout::
+
+    analytics/attribution/store/
+    └── <kind>/<strategy_safe>/
+        ├── period=daily/part-<timestamp>.parquet
+        ├── period=weekly/part-<timestamp>.parquet
+        └── period=monthly/part-<timestamp>.parquet
+
+``kind`` is ``asset`` for PerformanceAttributor results and ``sector`` for
+SectorAttributor (Brinson) results. Every partition file holds a ``Date``
+column; extending a backtest appends a new part file and supersedes stored
+rows from the first new date onward, so partially complete weekly/monthly
+periods are replaced rather than duplicated.
+"""
+
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+import pandas as pd
+
+from src.ui.app_logger import LOG
+
+DATE_COLUMN = 'Date'
+PERIOD_COLUMN = 'Period'
+
+
+class AttributionStore:
+    """Columnar, appendable storage for attribution results."""
+
+    def __init__(self, base_dir: str = "analytics/attribution/store"):
+        self.base_dir = Path(base_dir)
+
+    @staticmethod
+    def strategy_key(strategy_name: str) -> str:
+        """Filesystem-safe strategy key, matching the attribution CSV naming"""
+        return strategy_name.replace('/', '_').replace(' ', '_').lower()
+
+    def dataset_path(self, strategy_name: str, kind: str = 'asset') -> Path:
+        return self.base_dir / kind / self.strategy_key(strategy_name)
+
+    def partition_path(self, strategy_name: str, period: str, kind: str = 'asset') -> Path:
+        return self.dataset_path(strategy_name, kind) / f"period={period}"
+
+    def list_periods(self, strategy_name: str, kind: str = 'asset') -> List[str]:
+        """Periods that have stored results for the strategy"""
+        dataset = self.dataset_path(strategy_name, kind)
+        if not dataset.exists():
+            return []
+        return sorted(
+            part.name.split('=', 1)[1] for part in dataset.glob('period=*')
+            if part.is_dir() and any(part.glob('*.parquet'))
+        )
+
+    def has_results(self, strategy_name: str, kind: str = 'asset') -> bool:
+        return bool(self.list_periods(strategy_name, kind))
+
+    def write(self,
+              strategy_name: str,
+              period: str,
+              frame: pd.DataFrame,
+              kind: str = 'asset',
+              mode: str = 'append') -> Optional[Path]:
+        """
+        Write one period's results for a strategy.
+
+        Args:
+            strategy_name: Name of the strategy
+            period: Attribution period ('daily', 'weekly', 'monthly')
+            frame: Columnar results with a ``Date`` column
+            kind: 'asset' or 'sector'
+            mode: 'append' replaces stored rows dated within the new frame's
+                  [first, last] date range and keeps the rest;
+                  'overwrite' replaces the whole partition
+
+        Returns:
+            Path of the part file written, or None if there was nothing to write
+        """
+        if frame is None or frame.empty:
+            return None
+        if mode not in ('append', 'overwrite'):
+            raise ValueError(f"Unsupported write mode: {mode}")
+
+        frame = frame.copy()
+        frame[DATE_COLUMN] = pd.to_datetime(frame[DATE_COLUMN]).dt.normalize()
+        partition = self.partition_path(strategy_name, period, kind)
+        partition.mkdir(parents=True, exist_ok=True)
+
+        if mode == 'overwrite':
+            for part_file in partition.glob('*.parquet'):
+                part_file.unlink()
+        else:
+            self._drop_range(partition, frame[DATE_COLUMN].min(), frame[DATE_COLUMN].max())
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        part_file = partition / f"part-{timestamp}.parquet"
+        frame.to_parquet(part_file, index=False)
+        LOG.info(f"Stored {len(frame)} {period} {kind} attribution rows for {strategy_name} in {part_file}")
+        return part_file
+
+    def read(self,
+             strategy_name: str,
+             period: Optional[str] = None,
+             kind: str = 'asset',
+             start_date: Optional[str] = None,
+             end_date: Optional[str] = None,
+             columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Read stored results for a strategy.
+
+        Args:
+            strategy_name: Name of the strategy
+            period: Single period to read; all periods if None (adds a ``Period`` column)
+            kind: 'asset' or 'sector'
+            start_date: Optional inclusive lower bound on ``Date``
+            end_date: Optional inclusive upper bound on ``Date``
+            columns: Optional column projection (``Date`` is always included)
+
+        Returns:
+            DataFrame sorted by date; empty if nothing is stored
+        """
+        periods = [period] if period else self.list_periods(strategy_name, kind)
+        if columns is not None and DATE_COLUMN not in columns:
+            columns = [DATE_COLUMN] + list(columns)
+
+        frames = []
+        for name in periods:
+            for part_file in sorted(self.partition_path(strategy_name, name, kind).glob('*.parquet')):
+                part = pd.read_parquet(part_file, columns=columns)
+                if period is None:
+                    part[PERIOD_COLUMN] = name
+                frames.append(part)
+
+        if not frames:
+            return pd.DataFrame()
+
+        result = pd.concat(frames, ignore_index=True)
+        if start_date is not None:
+            result = result[result[DATE_COLUMN] >= pd.to_datetime(start_date)]
+        if end_date is not None:
+            result = result[result[DATE_COLUMN] <= pd.to_datetime(end_date)]
+        return result.sort_values(DATE_COLUMN, kind='stable').reset_index(drop=True)
+
+    def _drop_range(self, partition: Path, first_date: pd.Timestamp, last_date: pd.Timestamp) -> None:
+        """Drop stored rows dated within [first_date, last_date]"""
+        for part_file in partition.glob('*.parquet'):
+            dates = pd.read_parquet(part_file, columns=[DATE_COLUMN])[DATE_COLUMN]
+            if dates.empty or dates.max() < first_date or dates.min() > last_date:
+                continue
+            if dates.min() >= first_date and dates.max() <= last_date:
+                part_file.unlink()
+                continue
+            stored = pd.read_parquet(part_file)
+            outside = (stored[DATE_COLUMN] < first_date) | (stored[DATE_COLUMN] > last_date)
+            stored[outside].to_parquet(part_file, index=False)
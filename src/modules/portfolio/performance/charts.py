@@ -0,0 +1,124 @@
+"""
+Lazy Performance Charts
+Chart files for performance reports, rendered on first access so that
+metrics-only report generation never imports or runs matplotlib.
+"""
+
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+import pandas as pd
+
+
+def _pyplot():
+    """Import pyplot on demand and apply the report chart style."""
+    import matplotlib.pyplot as plt
+    plt.style.use('seaborn-v0_8')
+    return plt
+
+
+class PerformanceCharts(Mapping):
+    """
+    Mapping of chart name to PNG path, where each chart is rendered the first
+    time its path is requested and cached afterwards.
+    """
+    
+    _RENDERERS = {
+        'portfolio_evolution': '_render_portfolio_evolution',
+        'returns_analysis': '_render_returns_analysis',
+        'drawdown': '_render_drawdown',
+    }
+    
+    def __init__(self, 
+                 portfolio_df: pd.DataFrame, 
+                 strategy_name: str,
+                 results_dir: Path,
+                 timestamp: str):
+        self.portfolio_df = portfolio_df
+        self.strategy_name = strategy_name
+        self.results_dir = Path(results_dir)
+        self.timestamp = timestamp
+        self._strategy_safe = strategy_name.replace('/', '_').replace(' ', '_')
+        self._paths: Dict[str, str] = {}
+    
+    def __getitem__(self, name: str) -> str:
+        if name not in self._paths:
+            if name not in self._RENDERERS:
+                raise KeyError(name)
+            self._paths[name] = getattr(self, self._RENDERERS[name])()
+        return self._paths[name]
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._RENDERERS)
+    
+    def __len__(self) -> int:
+        return len(self._RENDERERS)
+    
+    def __repr__(self) -> str:
+        return f"PerformanceCharts({self.strategy_name!r}, rendered={sorted(self._paths)})"
+    
+    @property
+    def rendered(self) -> Dict[str, str]:
+        """Charts rendered so far, without triggering any rendering"""
+        return dict(self._paths)
+    
+    @property
+    def inventory(self) -> Dict[str, Optional[str]]:
+        """Every available chart, with its path if rendered so far and None otherwise"""
+        return {name: self._paths.get(name) for name in self._RENDERERS}
+    
+    def _save(self, plt, chart_name: str) -> str:
+        chart_file = self.results_dir / f"{self._strategy_safe}_{chart_name}_{self.timestamp}.png"
+        plt.savefig(chart_file, dpi=300, bbox_inches='tight')
+        plt.close()
+        return str(chart_file)
+    
+    def _drawdown(self, returns: pd.Series) -> pd.Series:
+        cumulative = (1 + returns).cumprod()
+        running_max = cumulative.expanding().max()
+        return (cumulative - running_max) / running_max
+    
+    def _render_portfolio_evolution(self) -> str:
+        plt = _pyplot()
+        fig, ax = plt.subplots(figsize=(12, 6))
+        self.portfolio_df.plot(x='date', y='value', ax=ax, 
+                               title=f'{self.strategy_name} - Portfolio Value Evolution')
+        ax.set_ylabel('Portfolio Value ($)')
+        ax.grid(True)
+        return self._save(plt, 'portfolio_evolution')
+    
+    def _render_returns_analysis(self) -> str:
+        plt = _pyplot()
+        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
+        
+        returns = self.portfolio_df['returns'].dropna()
+        
+        # Histogram
+        returns.hist(bins=50, ax=ax1, alpha=0.7)
+        ax1.axvline(returns.mean(), color='red', linestyle='--', label=f'Mean: {returns.mean():.3f}')
+        ax1.set_title(f'{self.strategy_name} - Returns Distribution')
+        ax1.set_xlabel('Daily Returns')
+        ax1.set_ylabel('Frequency')
+        ax1.legend()
+        
+        # Cumulative returns
+        cumulative_returns = (1 + returns).cumprod()
+        cumulative_returns.plot(ax=ax2, title=f'{self.strategy_name} - Cumulative Returns')
+        ax2.set_ylabel('Cumulative Return')
+        ax2.grid(True)
+        
+        return self._save(plt, 'returns_analysis')
+    
+    def _render_drawdown(self) -> str:
+        plt = _pyplot()
+        fig, ax = plt.subplots(figsize=(12, 6))
+        
+        drawdown = self._drawdown(self.portfolio_df['returns'].dropna())
+        
+        drawdown.plot(ax=ax, title=f'{self.strategy_name} - Drawdown Analysis', color='red')
+        ax.fill_between(drawdown.index, drawdown, 0, alpha=0.3, color='red')
+        ax.set_ylabel('Drawdown')
+        ax.grid(True)
+        
+        return self._save(plt, 'drawdown')
@@ -18,6 +18,8 @@ from config.sectors import (
     get_asset_sector, calculate_sector_weights, get_sector_color, get_all_sectors
 )
 
+from .attribution_store import AttributionStore
+
 LOG = logging.getLogger(__name__)
 
 @dataclass
@@ -57,6 +59,7 @@ class SectorAttributor:
         """
         self.results_dir = Path(results_dir)
         self.results_dir.mkdir(parents=True, exist_ok=True)
+        self.store = AttributionStore(str(self.results_dir / "store"))
         LOG.info(f"Sector attribution analyzer initialized, results dir: {self.results_dir}")
     
     def load_portfolio_data(self, strategy_name: str, start_date: str, end_date: str) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
@@ -470,48 +473,52 @@ class SectorAttributor:
             'attribution_data': df.to_dict('records')
         }
     
+    @staticmethod
+    def store_name(strategy_name: str, benchmark: Optional[str] = None) -> str:
+        """Name of the stored sector dataset for a strategy and benchmark"""
+        if not benchmark:
+            return strategy_name
+        return f"{strategy_name}__{benchmark}"
+    
     def save_attribution_results(self, 
                                strategy_name: str,
                                attribution_results: List[SectorAttributionResult],
-                               summary: Dict[str, Any]) -> Dict[str, str]:
+                               summary: Dict[str, Any],
+                               period: str = 'daily',
+                               benchmark: Optional[str] = None) -> Dict[str, str]:
         """
-        Save attribution results to files.
+        Save attribution results to files and to the strategy's Parquet dataset.
         
         Args:
             strategy_name: Name of the strategy
             attribution_results: List of attribution results
             summary: Attribution summary
+            period: Attribution period of the results ('daily', 'weekly', 'monthly')
+            benchmark: Benchmark the results were computed against; results for
+                different benchmarks are stored separately
             
         Returns:
             Dictionary with saved file paths
         """
-        strategy_safe = strategy_name.replace('/', '_').replace(' ', '_').lower()
+        strategy_safe = AttributionStore.strategy_key(strategy_name)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
         saved_files = {}
         
         try:
-            # Save detailed results to CSV
+            # Save detailed results to CSV and the columnar store
             if attribution_results:
-                df_data = []
-                for result in attribution_results:
-                    df_data.append({
-                        'Date': result.date.strftime('%Y-%m-%d'),
-                        'Sector': result.sector,
-                        'Portfolio_Weight': result.portfolio_weight,
-                        'Benchmark_Weight': result.benchmark_weight,
-                        'Portfolio_Return': result.portfolio_return,
-                        'Benchmark_Return': result.benchmark_return,
-                        'Allocation_Effect': result.allocation_effect,
-                        'Selection_Effect': result.selection_effect,
-                        'Interaction_Effect': result.interaction_effect,
-                        'Total_Effect': result.total_effect
-                    })
+                df = sector_results_to_frame(attribution_results)
                 
-                df = pd.DataFrame(df_data)
+                csv_df = df.copy()
+                csv_df['Date'] = csv_df['Date'].dt.strftime('%Y-%m-%d')
                 csv_file = self.results_dir / f"{strategy_safe}_sector_attribution_{timestamp}.csv"
-                df.to_csv(csv_file, index=False)
+                csv_df.to_csv(csv_file, index=False)
                 saved_files['detailed_csv'] = str(csv_file)
+                
+                part_file = self.store.write(self.store_name(strategy_name, benchmark), period, df, kind='sector')
+                if part_file is not None:
+                    saved_files[f'{period}_parquet'] = str(part_file)
             
             # Save summary to JSON
             import json
@@ -525,4 +532,53 @@ class SectorAttributor:
             
         except Exception as e:
             LOG.error(f"Error saving attribution results: {e}")
-            return {'error': str(e)}
\ No newline at end of file
+            return {'error': str(e)}
+    
+    def load_attribution_results(self,
+                                 strategy_name: str,
+                                 period: str = 'daily',
+                                 start_date: Optional[str] = None,
+                                 end_date: Optional[str] = None,
+                                 benchmark: Optional[str] = None) -> List[SectorAttributionResult]:
+        """
+        Load stored sector attribution results without rerunning the analysis.
+        
+        Returns:
+            List of attribution results (empty if none are stored for the period
+            and benchmark)
+        """
+        frame = self.store.read(self.store_name(strategy_name, benchmark), period, kind='sector',
+                                start_date=start_date, end_date=end_date)
+        if frame.empty:
+            return []
+        return [
+            SectorAttributionResult(
+                date=row.Date,
+                sector=row.Sector,
+                portfolio_weight=row.Portfolio_Weight,
+                benchmark_weight=row.Benchmark_Weight,
+                portfolio_return=row.Portfolio_Return,
+                benchmark_return=row.Benchmark_Return,
+                allocation_effect=row.Allocation_Effect,
+                selection_effect=row.Selection_Effect,
+                interaction_effect=row.Interaction_Effect,
+                total_effect=row.Total_Effect
+            )
+            for row in frame.itertuples(index=False)
+        ]
+
+
+def sector_results_to_frame(attribution_results: List[SectorAttributionResult]) -> pd.DataFrame:
+    """Build the columnar sector attribution table in a single pass."""
+    return pd.DataFrame({
+        'Date': pd.to_datetime([result.date for result in attribution_results]),
+        'Sector': [result.sector for result in attribution_results],
+        'Portfolio_Weight': [result.portfolio_weight for result in attribution_results],
+        'Benchmark_Weight': [result.benchmark_weight for result in attribution_results],
+        'Portfolio_Return': [result.portfolio_return for result in attribution_results],
+        'Benchmark_Return': [result.benchmark_return for result in attribution_results],
+        'Allocation_Effect': [result.allocation_effect for result in attribution_results],
+        'Selection_Effect': [result.selection_effect for result in attribution_results],
+        'Interaction_Effect': [result.interaction_effect for result in attribution_results],
+        'Total_Effect': [result.total_effect for result in attribution_results],
+    })
\ No newline at end of file
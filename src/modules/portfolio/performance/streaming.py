@@ -0,0 +1,195 @@
+"""
+Streaming Performance Metrics
+Online accumulator that is fed one portfolio value (or return) at a time and
+can be queried at any point for the fields of
+PerformanceAnalyzer._calculate_comprehensive_metrics.
+"""
+
+import math
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+
+class StreamingMetrics:
+    """
+    Incremental performance metrics for paper trading and in-backtest monitoring.
+    
+    Moments use Welford/Pébay updates, drawdown tracks the running peak and the
+    current underwater run, and downside deviation keeps its own Welford state,
+    so each update is O(1). VaR and tail ratio need the return distribution;
+    they are exact quantiles over a bounded window of the most recent
+    ``quantile_window`` returns, kept in a fixed-size ring buffer, so memory
+    and query cost do not grow with the length of the run. Until the window
+    fills they match the full-history calculation exactly.
+    """
+    
+    # Five years of daily returns
+    DEFAULT_QUANTILE_WINDOW = 1260
+    
+    def __init__(self,
+                 name: str = "Portfolio",
+                 periods_per_year: int = 252,
+                 quantile_window: int = DEFAULT_QUANTILE_WINDOW):
+        self.name = name
+        self.periods_per_year = periods_per_year
+        self.quantile_window = max(int(quantile_window), 1)
+        self.reset()
+    
+    def reset(self) -> None:
+        """Clear all accumulated state"""
+        self.last_value: Optional[float] = None
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self._m3 = 0.0
+        self._m4 = 0.0
+        self.growth = 1.0
+        
+        # Downside deviation (Welford over negative returns only)
+        self.downside_count = 0
+        self._downside_mean = 0.0
+        self._downside_m2 = 0.0
+        
+        # Drawdown state on the cumulative growth curve
+        self.peak = None
+        self.max_drawdown = 0.0
+        self.current_drawdown = 0.0
+        self._underwater_periods = 0
+        self.max_drawdown_duration = 0
+        
+        self.positive_periods = 0
+        self.negative_periods = 0
+        self.best = -math.inf
+        self.worst = math.inf
+        # Ring buffer of the latest quantile_window returns for VaR and tail ratio
+        self._window = np.empty(self.quantile_window, dtype=float)
+    
+    def add_value(self, value: float) -> Optional[float]:
+        """
+        Feed the latest portfolio value.
+        
+        Returns:
+            The period return derived from the previous value, or None for the
+            first value and for invalid (NaN or non-positive) values, which are
+            skipped as the backtest runner does.
+        """
+        if value is None or not math.isfinite(value) or value <= 0:
+            return None
+        
+        previous = self.last_value
+        self.last_value = float(value)
+        if previous is None:
+            return None
+        
+        period_return = self.last_value / previous - 1
+        self.add_return(period_return)
+        return period_return
+    
+    def add_return(self, period_return: float) -> None:
+        """Feed one period return"""
+        if period_return is None or math.isnan(period_return):
+            return
+        if math.isinf(period_return):
+            period_return = 0.0
+        
+        # Mean and central moments
+        n1 = self.count
+        self.count += 1
+        n = self.count
+        delta = period_return - self.mean
+        delta_n = delta / n
+        delta_n2 = delta_n * delta_n
+        term1 = delta * delta_n * n1
+        self.mean += delta_n
+        self._m4 += term1 * delta_n2 * (n * n - 3 * n + 3) + 6 * delta_n2 * self._m2 - 4 * delta_n * self._m3
+        self._m3 += term1 * delta_n * (n - 2) - 3 * delta_n * self._m2
+        self._m2 += term1
+        
+        # Downside deviation
+        if period_return < 0:
+            self.negative_periods += 1
+            self.downside_count += 1
+            downside_delta = period_return - self._downside_mean
+            self._downside_mean += downside_delta / self.downside_count
+            self._downside_m2 += downside_delta * (period_return - self._downside_mean)
+        elif period_return > 0:
+            self.positive_periods += 1
+        
+        self.best = max(self.best, period_return)
+        self.worst = min(self.worst, period_return)
+        self._window[(self.count - 1) % self.quantile_window] = period_return
+        
+        # Running peak and drawdown; only recovered drawdowns count toward duration
+        self.growth *= 1 + period_return
+        if self.peak is None or self.growth >= self.peak:
+            self.peak = self.growth
+            if self._underwater_periods:
+                self.max_drawdown_duration = max(self.max_drawdown_duration, self._underwater_periods)
+                self._underwater_periods = 0
+            self.current_drawdown = 0.0
+        else:
+            self.current_drawdown = (self.growth - self.peak) / self.peak
+            self.max_drawdown = min(self.max_drawdown, self.current_drawdown)
+            self._underwater_periods += 1
+    
+    @property
+    def std(self) -> float:
+        """Sample standard deviation of period returns"""
+        return math.sqrt(self._m2 / (self.count - 1)) if self.count > 1 else math.nan
+    
+    def metrics(self) -> Dict[str, Any]:
+        """Current metrics, with the same fields as the batch calculation"""
+        if self.count == 0:
+            return {}
+        
+        std = self.std
+        if not std > 0:
+            return {'name': self.name, 'error': 'Insufficient or invalid data'}
+        
+        n = self.count
+        total_return = self.growth - 1
+        annual_return = self.growth ** (self.periods_per_year / n) - 1
+        volatility = std * math.sqrt(self.periods_per_year)
+        sharpe_ratio = annual_return / volatility if volatility > 0 else 0
+        calmar_ratio = annual_return / abs(self.max_drawdown) if self.max_drawdown != 0 else 0
+        
+        downside_std = 0
+        if self.downside_count > 1:
+            downside_std = math.sqrt(self._downside_m2 / (self.downside_count - 1)) * math.sqrt(self.periods_per_year)
+        sortino_ratio = annual_return / downside_std if downside_std > 0 else 0
+        
+        returns = self._window[:min(n, self.quantile_window)]
+        var_99, var_95 = np.quantile(returns, [0.01, 0.05])
+        upside = returns[returns > 0]
+        tail_ratio = np.quantile(upside, 0.95) / abs(var_95) if upside.size else 0
+        
+        m2 = self._m2 / n
+        skewness = math.nan
+        kurtosis = math.nan
+        if n >= 3:
+            skewness = math.sqrt(n * (n - 1)) / (n - 2) * (self._m3 / n) / m2 ** 1.5
+        if n >= 4:
+            kurtosis = (n - 1) / ((n - 2) * (n - 3)) * ((n + 1) * (self._m4 / n) / m2 ** 2 - 3 * (n - 1))
+        
+        return {
+            'name': self.name,
+            'total_return': total_return,
+            'annual_return': annual_return,
+            'volatility': volatility,
+            'sharpe_ratio': sharpe_ratio,
+            'sortino_ratio': sortino_ratio,
+            'calmar_ratio': calmar_ratio,
+            'max_drawdown': self.max_drawdown,
+            'max_drawdown_duration': self.max_drawdown_duration,
+            'var_95': float(var_95),
+            'var_99': float(var_99),
+            'tail_ratio': float(tail_ratio),
+            'skewness': skewness,
+            'kurtosis': kurtosis,
+            'best_month': self.best,
+            'worst_month': self.worst,
+            'positive_months': self.positive_periods,
+            'negative_months': self.negative_periods,
+            'total_periods': n
+        }
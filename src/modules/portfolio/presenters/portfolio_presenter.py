@@ -5,8 +5,7 @@ Orchestrates portfolio management, backtesting, and attribution analysis busines
 Separates business logic from UI concerns for better testability and reusability.
 """
 
-import json
-import os
+import weakref
 from datetime import date, timedelta
 from typing import Dict, Optional, Any, List, Tuple
 
@@ -15,14 +14,45 @@ from config.system import INITIAL_CAPITAL, COMMISSION
 from src.modules.portfolio.backtesting.runner import run_backtest
 from src.modules.portfolio.strategies.registry import strategy_registry
 from src.modules.portfolio.strategies.base import FixedWeightStrategy
+from src.modules.portfolio.trading.holdings import DEFAULT_ACCOUNT, HoldingsStore, load_latest_prices
+from src.modules.portfolio.trading.rebalance import RebalancePlanner
 from src.ui.app_logger import LOG
 
 
 class PortfolioPresenter:
     """Presenter for portfolio management operations."""
     
-    def __init__(self, holdings_file: str = "data/holdings.json"):
+    def __init__(self,
+                 holdings_file: str = "data/accounts/holdings.json",
+                 holdings_db: str = "data/accounts/holdings.db"):
+        # Legacy weight file, imported into the holdings database on first use
         self.holdings_file = holdings_file
+        self.holdings_db = holdings_db
+        self._holdings_store: Optional[HoldingsStore] = None
+        self._latest_prices: Optional[Dict[str, float]] = None
+    
+    @property
+    def holdings_store(self) -> HoldingsStore:
+        """Holdings database, opened (and seeded from the legacy JSON file) on first access."""
+        if self._holdings_store is None:
+            self._holdings_store = HoldingsStore(self.holdings_db)
+            # Close the connection with the presenter, e.g. when a UI session ends
+            self._finalizer = weakref.finalize(self, self._holdings_store.close)
+            if not self._holdings_store.has_lots():
+                self._holdings_store.import_weights_json(self.holdings_file)
+        return self._holdings_store
+    
+    def close(self) -> None:
+        """Close the holdings database (reopened on next access)."""
+        if self._holdings_store is not None:
+            self._finalizer()
+            self._holdings_store = None
+    
+    def get_latest_prices(self) -> Dict[str, float]:
+        """Latest close per asset from the market data files (loaded once per presenter)."""
+        if self._latest_prices is None:
+            self._latest_prices = load_latest_prices()
+        return self._latest_prices
     
     def get_available_strategies(self) -> Dict[str, Any]:
         """Get list of available strategies."""
@@ -62,21 +92,41 @@ class PortfolioPresenter:
             return {}
     
     def load_holdings(self) -> Dict[str, float]:
-        """Load current holdings from JSON file."""
-        if os.path.exists(self.holdings_file):
-            try:
-                with open(self.holdings_file, 'r') as f:
-                    return json.load(f)
-            except Exception as e:
-                LOG.error(f"Error loading holdings: {e}")
+        """
+        Load current holdings as weights.
+        
+        With lots recorded, weights are the market values of all accounts at the
+        latest prices; otherwise the saved weight allocation is returned.
+        """
+        try:
+            store = self.holdings_store
+            if store.has_lots():
+                return store.current_weights(self.get_latest_prices())
+            return store.weights(DEFAULT_ACCOUNT)
+        except Exception as e:
+            LOG.error(f"Error loading holdings: {e}")
         return {}
     
+    def holdings_from_lots(self) -> bool:
+        """Whether holdings are derived from recorded lots (weights can't be edited directly)."""
+        try:
+            return self.holdings_store.has_lots()
+        except Exception as e:
+            LOG.error(f"Error reading holdings: {e}")
+            return False
+    
     def save_holdings(self, holdings_dict: Dict[str, float]) -> str:
-        """Save holdings to JSON file."""
+        """
+        Save the holdings weight allocation, updating only the changed assets.
+        
+        Refused once lots are recorded, since load_holdings() then derives the
+        weights from the lots and a saved allocation would never be read.
+        """
         try:
-            os.makedirs(os.path.dirname(self.holdings_file), exist_ok=True)
-            with open(self.holdings_file, 'w') as f:
-                json.dump(holdings_dict, f, indent=4)
+            if self.holdings_store.has_lots():
+                LOG.warning("Holdings weights not saved: holdings are tracked as lots")
+                return "Error saving holdings: holdings are tracked as lots, update the lots instead"
+            self.holdings_store.set_weights(holdings_dict, DEFAULT_ACCOUNT)
             return "Holdings saved successfully!"
         except Exception as e:
             LOG.error(f"Error saving holdings: {e}")
@@ -130,19 +180,17 @@ class PortfolioPresenter:
         if not strategy_weights:
             return []
         
-        comparison_data = []
-        all_assets = sorted(list(set(strategy_weights.keys()) | set(holdings.keys())))
+        # Gaps within 1% count as balanced
+        gaps = RebalancePlanner.unconstrained(no_trade_band=0.01).weight_gaps(holdings, strategy_weights)
         
-        for asset in all_assets:
-            target = strategy_weights.get(asset, 0)
-            current = holdings.get(asset, 0)
-            diff = target - current
-            
+        comparison_data = []
+        for asset, target, current, diff, balanced in zip(gaps.index, gaps['target'], gaps['current'],
+                                                          gaps['gap'], gaps['within_band']):
             display_info = ASSET_DISPLAY_INFO.get(asset, {})
             asset_name = display_info.get('name', asset)
             
             # Color coding for differences
-            if abs(diff) < 0.01:  # Within 1%
+            if balanced:
                 status = "✅ Balanced"
             elif diff > 0:
                 status = f"⬆️ Under-weighted ({diff:.1%})"
@@ -254,7 +302,9 @@ class PortfolioPresenter:
             saved_files = sector_attributor.save_attribution_results(
                 strategy_name=strategy_choice,
                 attribution_results=aggregated_results,
-                summary=summary
+                summary=summary,
+                period=frequency,
+                benchmark=benchmark
             )
             
             return {
@@ -268,3 +318,56 @@ class PortfolioPresenter:
         except Exception as e:
             LOG.error(f"Sector attribution analysis failed: {e}")
             return {"error": str(e)}
+    
+    def has_stored_attribution(self, strategy_choice: str, attribution_kind: str = 'asset', benchmark: Optional[str] = None) -> bool:
+        """Check whether attribution results are stored for a strategy (and benchmark, for sector results)."""
+        from src.modules.portfolio.performance.attribution_store import AttributionStore
+        if attribution_kind == 'sector':
+            from src.modules.portfolio.performance.sector_attribution import SectorAttributor
+            strategy_choice = SectorAttributor.store_name(strategy_choice, benchmark)
+        return AttributionStore().has_results(strategy_choice, kind=attribution_kind)
+    
+    def load_stored_asset_attribution(self, strategy_choice: str, start_date: str, end_date: str) -> Dict[str, Any]:
+        """Load asset-level attribution from stored results instead of rerunning it."""
+        try:
+            from src.modules.portfolio.performance.attribution import PerformanceAttributor
+            
+            attributor = PerformanceAttributor()
+            return attributor.load_attribution_report(
+                strategy_name=strategy_choice,
+                start_date=start_date,
+                end_date=end_date
+            )
+            
+        except Exception as e:
+            LOG.error(f"Loading stored asset attribution failed: {e}")
+            return {"error": str(e)}
+    
+    def load_stored_sector_attribution(self, strategy_choice: str, start_date: str, end_date: str, frequency: str, benchmark: str) -> Dict[str, Any]:
+        """Load sector attribution from stored results instead of rerunning it."""
+        try:
+            from src.modules.portfolio.performance.sector_attribution import SectorAttributor
+            
+            sector_attributor = SectorAttributor()
+            results = sector_attributor.load_attribution_results(
+                strategy_name=strategy_choice,
+                period=frequency,
+                start_date=start_date,
+                end_date=end_date,
+                benchmark=benchmark
+            )
+            
+            if not results:
+                return {"error": f"No stored {frequency} sector attribution results for {strategy_choice} against {benchmark}"}
+            
+            return {
+                'attribution_results': results,
+                'summary': sector_attributor.create_attribution_summary(results),
+                'saved_files': {},
+                'frequency': frequency,
+                'benchmark': benchmark
+            }
+            
+        except Exception as e:
+            LOG.error(f"Loading stored sector attribution failed: {e}")
+            return {"error": str(e)}
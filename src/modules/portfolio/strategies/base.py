@@ -3,9 +3,14 @@ Base strategy classes for Personal Finance Agent.
 Provides foundation for all strategy implementations.
 """
 import backtrader as bt
+import numpy as np
 from abc import abstractmethod
 from typing import Dict, Any, Optional
 
+from src.modules.portfolio.performance.streaming import StreamingMetrics
+from src.modules.portfolio.trading.rebalance import RebalancePlanner
+from src.modules.portfolio.trading.risk import PreTradeRiskEngine
+
 class BaseStrategy(bt.Strategy):
     """
     Abstract base class for all investment strategies.
@@ -25,6 +30,13 @@ class BaseStrategy(bt.Strategy):
         # Track last rebalance positions for richer logging
         self.last_rebalance_bar_index: int = 0
         self.last_rebalance_calendar_date = None
+        # Online performance metrics, queryable at any bar via get_live_metrics()
+        self.live_metrics = StreamingMetrics(self.strategy_name)
+        # Turns target weights into share trades; strategy weights are followed as given
+        self.rebalance_planner = RebalancePlanner.unconstrained()
+        # Pre-trade position/sector limit checks; reports violations in the rebalance log
+        # without rejecting (set enforce=True to drop violating buys)
+        self.risk_engine = PreTradeRiskEngine(enforce=False)
     
         
     def next(self):
@@ -33,6 +45,7 @@ class BaseStrategy(bt.Strategy):
         portfolio_value = self.broker.getvalue()
         self.portfolio_values.append(portfolio_value)
         self.portfolio_dates.append(current_date)
+        self.live_metrics.add_value(portfolio_value)
         
         # Capture weights evolution for attribution analysis
         current_weights = self.get_current_weights()
@@ -40,6 +53,10 @@ class BaseStrategy(bt.Strategy):
         weights_entry.update(current_weights)
         self.weights_evolution.append(weights_entry)
         
+    def get_live_metrics(self) -> Dict[str, Any]:
+        """Performance metrics accumulated up to the current bar"""
+        return self.live_metrics.metrics()
+    
     def get_current_weights(self) -> Dict[str, float]:
         """Get current portfolio weights"""
         total_value = self.broker.getvalue()
@@ -57,37 +74,42 @@ class BaseStrategy(bt.Strategy):
     def rebalance_portfolio(self, target_weights: Dict[str, float], rebalance_context: Optional[Dict[str, Any]] = None):
         """Rebalance portfolio to target weights"""
         total_value = self.broker.getvalue()
-        transactions = []
         # Capture current weights and current prices for transparency
         current_weights_snapshot = self.get_current_weights()
-        current_prices_snapshot = {}
         
-        for data in self.datas:
-            asset_name = data._name
-            target_weight = target_weights.get(asset_name, 0.0)
-            target_value = total_value * target_weight
-            
-            current_position = self.getposition(data)
-            current_price = data.close[0]
-            current_prices_snapshot[asset_name] = float(current_price)
-            current_value = current_position.size * current_price
-            
-            if target_value == 0 and current_position.size > 0:
-                order = self.close(data)
-                transactions.append(f"Close {asset_name}")
-            elif target_value > 0:
-                target_shares = int(target_value / data.close[0])
-                shares_to_trade = target_shares - current_position.size
-                
-                if abs(shares_to_trade) > 0:
-                    if shares_to_trade > 0:
-                        self.buy(data=data, size=shares_to_trade)
-                        transactions.append(f"Buy {shares_to_trade} of {asset_name}")
-                    else:
-                        self.sell(data=data, size=abs(shares_to_trade))
-                        transactions.append(f"Sell {abs(shares_to_trade)} of {asset_name}")
+        assets = [data._name for data in self.datas]
+        prices = np.fromiter((data.close[0] for data in self.datas), dtype=float, count=len(self.datas))
+        shares = np.fromiter((self.getposition(data).size for data in self.datas), dtype=float, count=len(self.datas))
+        current_prices_snapshot = dict(zip(assets, prices.tolist()))
+        
+        # Sells are submitted before buys so their proceeds fund the buys
+        plan = self.rebalance_planner.plan(assets, shares, prices, target_weights,
+                                           cash=self.broker.getcash(), portfolio_value=total_value)
+        trades = plan.trades()
+        self.risk_engine.update_portfolio(dict(zip(assets, shares.tolist())), current_prices_snapshot,
+                                          self.broker.getcash())
+        risk = self.risk_engine.check_orders([t[0] for t in trades], [t[1] for t in trades],
+                                             [t[2] for t in trades])
+        
+        closes = set(plan.assets[plan.closes()].tolist())
+        transactions = []
+        for (asset_name, side, quantity), description, approved in zip(trades, plan.descriptions(),
+                                                                        risk.approved.tolist()):
+            if not approved:
+                continue
+            data = self.getdatabyname(asset_name)
+            if asset_name in closes:
+                self.close(data)
+            elif side == "buy":
+                self.buy(data=data, size=quantity)
+            else:
+                self.sell(data=data, size=quantity)
+            transactions.append(description)
+        
+        risk_findings = risk.rejections([t[0] for t in trades]) if self.risk_engine.enforce else \
+            [{'order': t[0], 'reason': r} for t, r in zip(trades, risk.reasons) if r is not None]
         
-        if transactions:
+        if transactions or risk_findings:
             rebalance_details = {
                 'date': self.datas[0].datetime.date(0),
                 'total_portfolio_value': total_value,
@@ -97,6 +119,8 @@ class BaseStrategy(bt.Strategy):
                 'rebalance_days': getattr(self.params, 'rebalance_days', None),
                 'threshold': getattr(self.params, 'threshold', None),
             }
+            # Always present, so every log entry has the same columns
+            rebalance_details['risk_rejections' if self.risk_engine.enforce else 'risk_violations'] = risk_findings
             # Attach context about time vs trading-day gaps and trigger reasons
             if rebalance_context:
                 rebalance_details.update(rebalance_context)
@@ -4,6 +4,16 @@ Executes trades as instructed by management or strategy modules.
 Interfaces with external trading APIs and handles order execution.
 """
 
-from .executor import TradeExecutor
+from .executor import TradeExecutor, SimulationExecutor, PaperTradingExecutor
+from .order_book import OrderBook
+from .journal import OrderJournal
+from .rebalance import RebalancePlanner, RebalancePlan
+from .risk import PreTradeRiskEngine, RiskCheckResult
+from .holdings import HoldingsStore
+from .costs import (
+    TransactionCostModel, FixedCostModel, SpreadCostModel, SquareRootImpactCostModel
+)
 
-__all__ = ['TradeExecutor']
\ No newline at end of file
+__all__ = ['TradeExecutor', 'SimulationExecutor', 'PaperTradingExecutor', 'OrderBook', 'OrderJournal',
+           'RebalancePlanner', 'RebalancePlan', 'PreTradeRiskEngine', 'RiskCheckResult', 'HoldingsStore',
+           'TransactionCostModel', 'FixedCostModel', 'SpreadCostModel', 'SquareRootImpactCostModel']
\ No newline at end of file
@@ -0,0 +1,211 @@
+"""
+Transaction Cost Models
+Vectorized commission and slippage estimates shared by the simulation
+executor, the backtrader broker (see backtesting.costs) and weight-based
+vectorized backtests.
+
+Every model works on numpy arrays of fills, so pricing one order or a
+million simulated fills is the same call. Models:
+
+- FixedCostModel: constant commission and slippage rates
+- SpreadCostModel: pays half the bid-ask spread on every fill
+- SquareRootImpactCostModel: half spread plus square-root market impact,
+  ``impact_coefficient * volatility * sqrt(quantity / volume)``, using bar
+  volume when the price data has it
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class TransactionCosts(NamedTuple):
+    """Per-fill cost arrays"""
+    execution_price: np.ndarray
+    commission: np.ndarray
+    slippage_cost: np.ndarray
+
+
+def side_sign(side: Any) -> np.ndarray:
+    """+1 for buys and -1 for sells; accepts 'buy'/'sell' labels or signed numbers"""
+    side = np.asarray(side)
+    if side.dtype.kind in 'OUS':
+        return np.where(np.char.lower(side.astype(str)) == 'buy', 1.0, -1.0)
+    return np.where(side >= 0, 1.0, -1.0)
+
+
+def _known(values: Optional[Any], shape) -> Optional[np.ndarray]:
+    """Broadcast optional market inputs, or None when not supplied"""
+    if values is None:
+        return None
+    return np.broadcast_to(np.asarray(values, dtype=float), shape)
+
+
+class TransactionCostModel(ABC):
+    """
+    Base class for transaction cost models
+
+    Subclasses define price_impact(); commission, execution prices and
+    turnover cost drag are derived from it here.
+    """
+
+    def __init__(self, commission_rate: float = 0.001, min_commission: float = 0.0):
+        self.commission_rate = commission_rate
+        self.min_commission = min_commission
+
+    @abstractmethod
+    def price_impact(self,
+                     price: np.ndarray,
+                     quantity: np.ndarray,
+                     volume: Optional[np.ndarray] = None,
+                     spread: Optional[np.ndarray] = None,
+                     volatility: Optional[np.ndarray] = None) -> np.ndarray:
+        """Adverse price move per fill, as a non-negative fraction of price"""
+
+    def commission(self, notional: Any) -> np.ndarray:
+        """Commission per fill for the given traded notional"""
+        notional = np.abs(np.asarray(notional, dtype=float))
+        commission = notional * self.commission_rate
+        if self.min_commission > 0:
+            commission = np.where(notional > 0, np.maximum(commission, self.min_commission), 0.0)
+        return commission
+
+    def estimate(self,
+                 price: Any,
+                 quantity: Any,
+                 side: Any,
+                 volume: Optional[Any] = None,
+                 spread: Optional[Any] = None,
+                 volatility: Optional[Any] = None) -> TransactionCosts:
+        """
+        Price a batch of fills
+
+        Args:
+            price: Reference (pre-cost) price per fill
+            quantity: Fill quantity (sign ignored)
+            side: 'buy'/'sell' labels or signed numbers per fill
+            volume: Bar volume per fill (NaN/zero when unknown)
+            spread: Relative bid-ask spread per fill (NaN when unknown)
+            volatility: Daily return volatility per fill (NaN when unknown)
+
+        Returns:
+            TransactionCosts with execution price, commission and slippage cost arrays
+        """
+        price = np.asarray(price, dtype=float)
+        quantity = np.abs(np.asarray(quantity, dtype=float))
+        shape = np.broadcast_shapes(price.shape, quantity.shape)
+        price = np.broadcast_to(price, shape)
+        quantity = np.broadcast_to(quantity, shape)
+
+        impact = self.price_impact(price, quantity, _known(volume, shape),
+                                   _known(spread, shape), _known(volatility, shape))
+        execution_price = price * (1 + side_sign(side) * impact)
+        return TransactionCosts(
+            execution_price=execution_price,
+            commission=self.commission(quantity * execution_price),
+            slippage_cost=quantity * price * impact,
+        )
+
+    def cost_drag(self,
+                  weights: pd.DataFrame,
+                  prices: pd.DataFrame,
+                  portfolio_value: pd.Series,
+                  volume: Optional[pd.DataFrame] = None) -> pd.Series:
+        """
+        Trading cost of a weight path as a fraction of portfolio value per date
+
+        For vectorized backtests: subtract the result from the gross portfolio
+        return series. The first row is treated as the initial purchase.
+
+        Args:
+            weights: Target weights per date (rows) and asset (columns)
+            prices: Prices aligned with ``weights``
+            portfolio_value: Portfolio value per date
+            volume: Optional bar volume aligned with ``weights``
+        """
+        weights = weights.fillna(0.0)
+        prices = prices.reindex(index=weights.index, columns=weights.columns)
+        value = portfolio_value.reindex(weights.index).to_numpy(dtype=float)[:, None]
+
+        turnover = weights.diff().abs()
+        turnover.iloc[0] = weights.iloc[0].abs()
+        notional = turnover.to_numpy(dtype=float) * value
+        price = prices.to_numpy(dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            quantity = np.where(price > 0, notional / price, 0.0)
+        bar_volume = None
+        if volume is not None:
+            bar_volume = volume.reindex(index=weights.index, columns=weights.columns).to_numpy(dtype=float)
+
+        impact = self.price_impact(price, quantity, bar_volume)
+        cost = np.nan_to_num(notional * impact) + self.commission(notional)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            drag = cost.sum(axis=1) / value[:, 0]
+        return pd.Series(np.nan_to_num(drag), index=weights.index, name='cost_drag')
+
+
+class FixedCostModel(TransactionCostModel):
+    """Constant commission and slippage rates (the executor's default)"""
+
+    def __init__(self, commission_rate: float = 0.001, slippage_rate: float = 0.001,
+                 min_commission: float = 0.0):
+        super().__init__(commission_rate, min_commission)
+        self.slippage_rate = slippage_rate
+
+    def price_impact(self, price, quantity, volume=None, spread=None, volatility=None) -> np.ndarray:
+        return np.full(np.shape(price), self.slippage_rate, dtype=float)
+
+
+class SpreadCostModel(TransactionCostModel):
+    """Crosses half the bid-ask spread; ``spread`` is the default relative spread"""
+
+    def __init__(self, commission_rate: float = 0.001, spread: float = 0.001,
+                 min_commission: float = 0.0):
+        super().__init__(commission_rate, min_commission)
+        self.spread = spread
+
+    def _half_spread(self, shape, spread: Optional[np.ndarray]) -> np.ndarray:
+        if spread is None:
+            return np.full(shape, self.spread / 2)
+        return np.where(np.isfinite(spread) & (spread >= 0), spread, self.spread) / 2
+
+    def price_impact(self, price, quantity, volume=None, spread=None, volatility=None) -> np.ndarray:
+        return self._half_spread(np.shape(price), spread)
+
+
+class SquareRootImpactCostModel(SpreadCostModel):
+    """
+    Half spread plus square-root market impact
+
+    impact = spread / 2 + impact_coefficient * volatility * sqrt(quantity / volume)
+
+    Fills without a usable bar volume pay ``fallback_impact`` on top of the half spread.
+    """
+
+    def __init__(self,
+                 commission_rate: float = 0.001,
+                 spread: float = 0.001,
+                 impact_coefficient: float = 1.0,
+                 volatility: float = 0.02,
+                 fallback_impact: float = 0.001,
+                 min_commission: float = 0.0):
+        super().__init__(commission_rate, spread, min_commission)
+        self.impact_coefficient = impact_coefficient
+        self.volatility = volatility
+        self.fallback_impact = fallback_impact
+
+    def price_impact(self, price, quantity, volume=None, spread=None, volatility=None) -> np.ndarray:
+        shape = np.shape(price)
+        half_spread = self._half_spread(shape, spread)
+        sigma = np.full(shape, self.volatility) if volatility is None else \
+            np.where(np.isfinite(volatility) & (volatility > 0), volatility, self.volatility)
+        if volume is None:
+            return half_spread + self.fallback_impact
+
+        known = np.isfinite(volume) & (volume > 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            participation = np.where(known, quantity / np.where(known, volume, 1.0), 0.0)
+        impact = self.impact_coefficient * sigma * np.sqrt(participation)
+        return half_spread + np.where(known, impact, self.fallback_impact)
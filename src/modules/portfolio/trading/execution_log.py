@@ -0,0 +1,187 @@
+"""
+Execution History
+Columnar buffer for executor fills.
+
+Fills are stored column by column in preallocated numpy arrays instead of a
+list of per-fill dicts, so a batch of fills is appended with a handful of
+array copies and the whole history converts to a DataFrame without
+re-materialising every record. Iterating or indexing still yields the
+familiar execution record dicts.
+
+With ``max_records`` set the buffer becomes a ring: the oldest records are
+evicted in chunks once it is full, and written to Parquet part files under
+``spill_dir`` when one is configured (otherwise they are dropped).
+"""
+
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.ui.app_logger import LOG
+
+# Column name -> numpy dtype
+EXECUTION_COLUMNS = {
+    'timestamp': object,
+    'order_id': object,
+    'symbol': object,
+    'side': object,
+    'quantity': float,
+    'price': float,
+    'commission': float,
+    'slippage_cost': float,
+}
+
+
+class ExecutionHistory:
+    """Columnar log of execution records, optionally bounded"""
+
+    def __init__(self,
+                 max_records: Optional[int] = None,
+                 spill_dir: Optional[str] = None,
+                 initial_capacity: int = 1024):
+        if max_records is not None and max_records < 1:
+            raise ValueError("max_records must be positive")
+        self.max_records = max_records
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        # Records evicted from memory (spilled to disk or dropped)
+        self.evicted_records = 0
+        self._capacity = max_records if max_records else max(int(initial_capacity), 1)
+        self._start = 0
+        self._size = 0
+        self._columns: Dict[str, np.ndarray] = {
+            name: np.empty(self._capacity, dtype=dtype) for name, dtype in EXECUTION_COLUMNS.items()
+        }
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(self._size):
+            yield self._record(i)
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("execution history index out of range")
+        return self._record(index)
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """Append a single execution record"""
+        self._make_room(1)
+        position = (self._start + self._size) % self._capacity
+        for name, column in self._columns.items():
+            column[position] = record[name]
+        self._size += 1
+
+    def extend(self, columns: Dict[str, Any]) -> None:
+        """
+        Append a batch of executions given column-wise
+
+        Args:
+            columns: Mapping of every execution column to a sequence as long as
+                     ``order_id``; scalar values are broadcast (e.g. one batch timestamp)
+        """
+        count = len(columns['order_id'])
+        if count == 0:
+            return
+        batch = {}
+        for name, dtype in EXECUTION_COLUMNS.items():
+            values = columns[name]
+            if np.ndim(values) == 0:
+                array = np.empty(count, dtype=dtype)
+                array[:] = values
+            else:
+                array = np.asarray(values, dtype=dtype)
+            batch[name] = array
+
+        chunk = self._capacity if self.max_records else count
+        for offset in range(0, count, chunk):
+            size = min(chunk, count - offset)
+            self._make_room(size)
+            positions = self._positions(self._size, size)
+            for name, column in self._columns.items():
+                column[positions] = batch[name][offset:offset + size]
+            self._size += size
+
+    def column(self, name: str) -> np.ndarray:
+        """Stored values of one column, oldest first"""
+        column = self._columns[name]
+        if self._start + self._size <= self._capacity:
+            return column[self._start:self._start + self._size]
+        return column[self._positions(0, self._size)]
+
+    def to_frame(self, include_spilled: bool = False) -> pd.DataFrame:
+        """
+        Execution history as a DataFrame
+
+        Args:
+            include_spilled: Prepend records previously spilled to ``spill_dir``
+        """
+        frame = pd.DataFrame({name: self.column(name) for name in self._columns})
+        for name, dtype in EXECUTION_COLUMNS.items():
+            if dtype is float:
+                frame[name] = frame[name].astype(float)
+        if include_spilled and self.spill_dir is not None:
+            parts = [pd.read_parquet(path) for path in sorted(self.spill_dir.glob('executions-*.parquet'))]
+            if parts:
+                frame = pd.concat(parts + [frame], ignore_index=True)
+        return frame
+
+    def clear(self) -> None:
+        self._start = 0
+        self._size = 0
+
+    def _positions(self, first: int, count: int) -> np.ndarray:
+        return (self._start + first + np.arange(count)) % self._capacity
+
+    def _record(self, index: int) -> Dict[str, Any]:
+        position = (self._start + index) % self._capacity
+        record = {}
+        for name, column in self._columns.items():
+            value = column[position]
+            record[name] = float(value) if EXECUTION_COLUMNS[name] is float else value
+        return record
+
+    def _make_room(self, count: int) -> None:
+        required = self._size + count
+        if required <= self._capacity:
+            return
+        if self.max_records is None:
+            self._grow(required)
+            return
+        # Evict in chunks so spilling does not write one file per record
+        overflow = required - self._capacity
+        self._evict(min(self._size, max(overflow, self._capacity // 4)))
+
+    def _grow(self, required: int) -> None:
+        capacity = self._capacity
+        while capacity < required:
+            capacity *= 2
+        for name, column in self._columns.items():
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            self._columns[name] = grown
+        self._capacity = capacity
+
+    def _evict(self, count: int) -> None:
+        """Remove the oldest ``count`` records, spilling them to disk if configured"""
+        if count <= 0:
+            return
+        if self.spill_dir is not None:
+            positions = self._positions(0, count)
+            evicted = pd.DataFrame({name: column[positions] for name, column in self._columns.items()})
+            for name, dtype in EXECUTION_COLUMNS.items():
+                if dtype is float:
+                    evicted[name] = evicted[name].astype(float)
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+            path = self.spill_dir / f"executions-{timestamp}.parquet"
+            evicted.to_parquet(path, index=False)
+            LOG.debug(f"Spilled {count} execution records to {path}")
+        self._start = (self._start + count) % self._capacity
+        self._size -= count
+        self.evicted_records += count
@@ -8,10 +8,18 @@ from abc import ABC, abstractmethod
 from enum import Enum
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
+import itertools
+import time
+import numpy as np
 import pandas as pd
-from dataclasses import dataclass
 
 from src.ui.app_logger import LOG
+from .costs import FixedCostModel, TransactionCostModel
+from .execution_log import ExecutionHistory
+from .journal import OrderJournal
+from .order_book import Bar, Fill, OrderBook
+from .order_index import OrderIndex, datetime_to_ns
+from .risk import PreTradeRiskEngine
 
 class OrderType(Enum):
     """Order types"""
@@ -36,32 +44,118 @@ class ExecutionMode(Enum):
     PAPER = "paper"
     LIVE = "live"
 
-@dataclass
+# Process-wide order sequence; monotonic, so generated order ids never collide
+_order_sequence = itertools.count(1)
+
+def advance_order_sequence(value: int) -> None:
+    """Ensure later sequence numbers are greater than ``value`` (e.g. after journal replay)"""
+    global _order_sequence
+    _order_sequence = itertools.count(max(value + 1, next(_order_sequence)))
+
 class Order:
-    """Order representation"""
-    order_id: str
-    symbol: str
-    quantity: float
-    order_type: OrderType
-    side: str  # "buy" or "sell"
-    price: Optional[float] = None
-    stop_price: Optional[float] = None
-    time_in_force: str = "GTC"  # Good Till Cancelled
-    created_time: datetime = None
-    updated_time: datetime = None
-    status: OrderStatus = OrderStatus.PENDING
-    filled_quantity: float = 0.0
-    average_fill_price: float = 0.0
-    commission: float = 0.0
-    metadata: Dict[str, Any] = None
-    
-    def __post_init__(self):
-        if self.created_time is None:
-            self.created_time = datetime.now()
-        if self.updated_time is None:
-            self.updated_time = self.created_time
-        if self.metadata is None:
-            self.metadata = {}
+    """
+    Order representation
+    
+    A slotted record, compact enough to keep millions of simulated orders in
+    memory. Every order takes a monotonic ``seq`` number, used for generated
+    ids. The creation time is captured as an integer nanosecond timestamp and
+    only converted to a datetime when first read, ``updated_time`` defaults
+    to the creation time, and the metadata dict is allocated on first access.
+    """
+    
+    __slots__ = ('order_id', 'symbol', 'quantity', 'order_type', 'side', 'price', 'stop_price',
+                 'time_in_force', 'status', 'filled_quantity', 'average_fill_price', 'commission',
+                 'seq', '_created', '_updated', '_metadata')
+    
+    def __init__(self,
+                 order_id: Optional[str],
+                 symbol: str,
+                 quantity: float,
+                 order_type: OrderType,
+                 side: str,  # "buy" or "sell"
+                 price: Optional[float] = None,
+                 stop_price: Optional[float] = None,
+                 time_in_force: str = "GTC",  # Good Till Cancelled
+                 created_time: Optional[datetime] = None,
+                 updated_time: Optional[datetime] = None,
+                 status: OrderStatus = OrderStatus.PENDING,
+                 filled_quantity: float = 0.0,
+                 average_fill_price: float = 0.0,
+                 commission: float = 0.0,
+                 metadata: Optional[Dict[str, Any]] = None):
+        self.seq = next(_order_sequence)
+        self.order_id = order_id if order_id is not None else f"ORD_{self.seq}"
+        self.symbol = symbol
+        self.quantity = quantity
+        self.order_type = order_type
+        self.side = side
+        self.price = price
+        self.stop_price = stop_price
+        self.time_in_force = time_in_force
+        self.status = status
+        self.filled_quantity = filled_quantity
+        self.average_fill_price = average_fill_price
+        self.commission = commission
+        self._created = time.time_ns() if created_time is None else created_time
+        self._updated = updated_time
+        self._metadata = metadata or None
+    
+    @property
+    def created_time(self) -> datetime:
+        created = self._created
+        if type(created) is int:
+            created = self._created = datetime.fromtimestamp(created / 1e9)
+        return created
+    
+    @created_time.setter
+    def created_time(self, value: datetime) -> None:
+        self._created = value
+    
+    @property
+    def created_ns(self) -> int:
+        """Creation time as integer nanoseconds (no datetime conversion for new orders)"""
+        created = self._created
+        return created if type(created) is int else datetime_to_ns(created)
+    
+    @property
+    def updated_time(self) -> datetime:
+        return self.created_time if self._updated is None else self._updated
+    
+    @updated_time.setter
+    def updated_time(self, value: datetime) -> None:
+        self._updated = value
+    
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        if self._metadata is None:
+            self._metadata = {}
+        return self._metadata
+    
+    @metadata.setter
+    def metadata(self, value: Optional[Dict[str, Any]]) -> None:
+        self._metadata = value or None
+    
+    @property
+    def has_metadata(self) -> bool:
+        return bool(self._metadata)
+    
+    def _fields(self) -> tuple:
+        return (self.order_id, self.symbol, self.quantity, self.order_type, self.side, self.price,
+                self.stop_price, self.time_in_force, self.created_time, self.updated_time, self.status,
+                self.filled_quantity, self.average_fill_price, self.commission, self._metadata or {})
+    
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._fields() == other._fields()
+    
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        return (f"Order(order_id={self.order_id!r}, symbol={self.symbol!r}, quantity={self.quantity!r}, "
+                f"order_type={self.order_type}, side={self.side!r}, price={self.price!r}, "
+                f"stop_price={self.stop_price!r}, status={self.status}, "
+                f"filled_quantity={self.filled_quantity!r})")
 
 class TradeExecutor(ABC):
     """
@@ -72,20 +166,42 @@ class TradeExecutor(ABC):
     def __init__(self, 
                  execution_mode: ExecutionMode = ExecutionMode.SIMULATION,
                  commission_rate: float = 0.001,
-                 slippage_rate: float = 0.001):
+                 slippage_rate: float = 0.001,
+                 history_limit: Optional[int] = None,
+                 history_spill_dir: Optional[str] = None,
+                 cost_model: Optional[TransactionCostModel] = None,
+                 journal_path: Optional[str] = None,
+                 risk_engine: Optional[PreTradeRiskEngine] = None,
+                 enforce_risk_limits: bool = True,
+                 initial_cash: Optional[float] = None):
         self.execution_mode = execution_mode
         self.commission_rate = commission_rate
         self.slippage_rate = slippage_rate
+        # Prices commission and slippage for every fill; defaults to the fixed rates above
+        self.cost_model = cost_model or FixedCostModel(commission_rate, slippage_rate)
         
-        # Order tracking
+        # Order tracking; status changes go through _set_status() to keep the index current
         self.orders: Dict[str, Order] = {}
-        self.execution_history: List[Dict] = []
+        self.order_index = OrderIndex()
+        # Keeps the latest history_limit fills in memory, older ones spill to disk (or are dropped)
+        self.execution_history = ExecutionHistory(max_records=history_limit, spill_dir=history_spill_dir)
         
         # Performance tracking
         self.total_commission_paid = 0.0
         self.total_slippage_cost = 0.0
         self.execution_count = 0
         
+        # Pre-trade position/sector limit checks, kept in sync with fills. The default
+        # engine enforces the config/system.py limits; enforce_risk_limits=False only
+        # reports violations. Weights need a cash snapshot: pass initial_cash or call
+        # risk_engine.update_portfolio()
+        self.risk_engine = risk_engine if risk_engine is not None else PreTradeRiskEngine(enforce=enforce_risk_limits)
+        if initial_cash is not None:
+            self.risk_engine.update_portfolio(cash=initial_cash)
+        
+        # Durable order/fill journal; concrete executors replay it at the end of __init__
+        self.journal = OrderJournal(journal_path) if journal_path else None
+        
         LOG.info(f"Trade executor initialized in {execution_mode.value} mode")
     
     @abstractmethod
@@ -93,6 +209,18 @@ class TradeExecutor(ABC):
         """Submit order for execution"""
         pass
     
+    def submit_orders(self, orders: List[Order]) -> List[bool]:
+        """
+        Submit a batch of orders (e.g. one rebalance)
+        
+        Executors that can price a batch at once override this; the default
+        submits orders one at a time.
+        
+        Returns:
+            Submission result per order, in input order
+        """
+        return [self.submit_order(order) for order in orders]
+    
     @abstractmethod
     def cancel_order(self, order_id: str) -> bool:
         """Cancel pending order"""
@@ -109,10 +237,7 @@ class TradeExecutor(ABC):
                            side: str,
                            order_id: Optional[str] = None) -> Order:
         """Create market order"""
-        if order_id is None:
-            order_id = f"MKT_{symbol}_{int(datetime.now().timestamp())}"
-        
-        return Order(
+        order = Order(
             order_id=order_id,
             symbol=symbol,
             quantity=abs(quantity),
@@ -120,6 +245,9 @@ class TradeExecutor(ABC):
             side=side,
             metadata={'strategy': 'system_rebalance'}
         )
+        if order_id is None:
+            order.order_id = f"MKT_{symbol}_{order.seq}"
+        return order
     
     def create_limit_order(self, 
                           symbol: str, 
@@ -128,10 +256,7 @@ class TradeExecutor(ABC):
                           limit_price: float,
                           order_id: Optional[str] = None) -> Order:
         """Create limit order"""
-        if order_id is None:
-            order_id = f"LMT_{symbol}_{int(datetime.now().timestamp())}"
-        
-        return Order(
+        order = Order(
             order_id=order_id,
             symbol=symbol,
             quantity=abs(quantity),
@@ -140,35 +265,264 @@ class TradeExecutor(ABC):
             price=limit_price,
             metadata={'strategy': 'system_rebalance'}
         )
+        if order_id is None:
+            order.order_id = f"LMT_{symbol}_{order.seq}"
+        return order
+    
+    def create_stop_order(self,
+                          symbol: str,
+                          quantity: float,
+                          side: str,
+                          stop_price: float,
+                          limit_price: Optional[float] = None,
+                          time_in_force: str = "GTC",
+                          order_id: Optional[str] = None) -> Order:
+        """Create stop order (stop-limit when limit_price is given)"""
+        order_type = OrderType.STOP if limit_price is None else OrderType.STOP_LIMIT
+        order = Order(
+            order_id=order_id,
+            symbol=symbol,
+            quantity=abs(quantity),
+            order_type=order_type,
+            side=side,
+            price=limit_price,
+            stop_price=stop_price,
+            time_in_force=time_in_force,
+            metadata={'strategy': 'system_rebalance'}
+        )
+        if order_id is None:
+            prefix = "STP" if limit_price is None else "STL"
+            order.order_id = f"{prefix}_{symbol}_{order.seq}"
+        return order
     
     def get_execution_summary(self) -> Dict[str, Any]:
         """Get execution performance summary"""
+        filled_orders = self.order_index.count(OrderStatus.FILLED)
         return {
             'execution_mode': self.execution_mode.value,
             'total_orders': len(self.orders),
-            'filled_orders': len([o for o in self.orders.values() if o.status == OrderStatus.FILLED]),
+            'filled_orders': filled_orders,
+            'orders_by_status': {
+                status.value: count for status, count in self.order_index.status_counts.items() if count
+            },
             'total_commission': self.total_commission_paid,
             'total_slippage': self.total_slippage_cost,
             'execution_count': self.execution_count,
-            'success_rate': (
-                len([o for o in self.orders.values() if o.status == OrderStatus.FILLED]) /
-                max(len(self.orders), 1)
-            )
+            'success_rate': filled_orders / max(len(self.orders), 1)
         }
+    
+    def get_orders(self,
+                   symbol: Optional[str] = None,
+                   status: Optional[OrderStatus] = None,
+                   start_time: Optional[datetime] = None,
+                   end_time: Optional[datetime] = None) -> List[Order]:
+        """
+        Query orders by symbol, status and creation-time range via the order index
+        
+        Args:
+            symbol: Only orders for this symbol
+            status: Only orders currently in this status
+            start_time: Inclusive lower bound on created_time
+            end_time: Inclusive upper bound on created_time
+            
+        Returns:
+            Matching orders in creation-time order
+        """
+        return self.order_index.query(symbol, status, start_time, end_time)
+    
+    def get_executions(self,
+                       symbol: Optional[str] = None,
+                       start_time: Optional[datetime] = None,
+                       end_time: Optional[datetime] = None,
+                       include_spilled: bool = False) -> pd.DataFrame:
+        """
+        Execution history as a DataFrame, optionally filtered by symbol and time range
+        
+        Args:
+            symbol: Only executions for this symbol
+            start_time: Inclusive lower bound on execution timestamp
+            end_time: Inclusive upper bound on execution timestamp
+            include_spilled: Include records spilled to disk by a bounded history
+        """
+        executions = self.execution_history.to_frame(include_spilled=include_spilled)
+        if executions.empty:
+            return executions
+        mask = np.ones(len(executions), dtype=bool)
+        if symbol is not None:
+            mask &= (executions['symbol'] == symbol).to_numpy()
+        if start_time is not None or end_time is not None:
+            timestamps = pd.to_datetime(executions['timestamp'])
+            if start_time is not None:
+                mask &= (timestamps >= pd.Timestamp(start_time)).to_numpy()
+            if end_time is not None:
+                mask &= (timestamps <= pd.Timestamp(end_time)).to_numpy()
+        return executions[mask].reset_index(drop=True)
+    
+    def restore_from_journal(self) -> int:
+        """
+        Rebuild orders, cost counters and execution history from the journal
+        
+        Open orders are handed to _restore_open_order() so executors can put
+        them back on their books. Bounded histories only reload their most
+        recent ``history_limit`` fills; counters always cover every fill.
+        
+        Returns:
+            Number of orders restored
+        """
+        if self.journal is None or self.journal.is_empty:
+            return 0
+        
+        open_statuses = (OrderStatus.PENDING, OrderStatus.SUBMITTED, OrderStatus.PARTIAL_FILLED)
+        records = self.journal.load_orders()
+        for record in records:
+            order = Order(
+                order_id=record['order_id'],
+                symbol=record['symbol'],
+                quantity=record['quantity'],
+                order_type=OrderType(record['order_type']),
+                side=record['side'],
+                price=record['price'],
+                stop_price=record['stop_price'],
+                time_in_force=record['time_in_force'],
+                created_time=record['created_time'],
+                updated_time=record['updated_time'],
+                status=OrderStatus(record['status'] or OrderStatus.PENDING.value),
+                filled_quantity=record['filled_quantity'],
+                average_fill_price=record['average_fill_price'],
+                commission=record['commission'],
+                metadata=record['metadata'],
+            )
+            self.orders[order.order_id] = order
+            self.order_index.add(order)
+            suffix = order.order_id.rsplit('_', 1)[-1]
+            if suffix.isdigit():
+                advance_order_sequence(int(suffix))
+            if order.status in open_statuses:
+                self._restore_open_order(order)
+        
+        totals = self.journal.fill_totals()
+        self.total_commission_paid = totals['commission']
+        self.total_slippage_cost = totals['slippage_cost']
+        self.execution_count = totals['count']
+        
+        fills = self.journal.fills_frame(limit=self.execution_history.max_records)
+        self.execution_history.clear()
+        self.execution_history.extend({
+            name: (fills[name].dt.to_pydatetime().to_numpy() if name == 'timestamp' else fills[name].to_numpy())
+            for name in fills.columns
+        })
+        self.execution_history.evicted_records = totals['count'] - len(fills)
+        
+        LOG.info(f"Restored {len(records)} orders and {totals['count']} fills from journal {self.journal.path}")
+        return len(records)
+    
+    def close(self) -> None:
+        """Flush and close the journal"""
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+    
+    def _restore_open_order(self, order: Order) -> None:
+        """Re-queue an open order recovered from the journal (no-op by default)"""
+        pass
+    
+    def _track_order(self, order: Order) -> None:
+        """Store an order and register it in the order index"""
+        self.orders[order.order_id] = order
+        self.order_index.add(order)
+        if self.journal is not None:
+            self.journal.record_order(order)
+    
+    def _set_status(self, order: Order, status: OrderStatus) -> None:
+        """
+        Change order status, keeping status counters, indexes and the journal current
+        
+        The journal event is stamped with ``order.updated_time`` (market time for
+        bar-driven fills), so callers set it before changing the status.
+        """
+        self.order_index.set_status(order, status)
+        if self.journal is not None and order.order_id in self.orders:
+            self.journal.record_status(order, timestamp=order.updated_time)
+    
+    def _log_execution(self, record: Dict[str, Any]) -> None:
+        """Append one execution record to the history, journal and risk snapshot"""
+        self.execution_history.append(record)
+        if self.journal is not None:
+            self.journal.record_fills({name: [value] for name, value in record.items()})
+        self.risk_engine.record_fills([record['symbol']], [record['side']], [record['quantity']],
+                                      [record['price']], record['commission'])
+    
+    def _log_executions(self, batch: Dict[str, Any]) -> None:
+        """Append a column-wise batch of executions to the history, journal and risk snapshot"""
+        self.execution_history.extend(batch)
+        if self.journal is not None:
+            self.journal.record_fills(batch)
+        self.risk_engine.record_fills(batch['symbol'], batch['side'], batch['quantity'],
+                                      batch['price'], batch['commission'])
+    
+    def _risk_check(self, orders: List[Order]) -> List[bool]:
+        """
+        Run the pre-trade risk engine on a batch of orders
+        
+        Rejected orders are stored with status REJECTED; the engine's reason is
+        kept in ``order.metadata['risk_check']`` for rejected and flagged orders.
+        
+        Returns:
+            Approval per order
+        """
+        if not orders:
+            return [True] * len(orders)
+        result = self.risk_engine.check_orders(
+            [order.symbol for order in orders],
+            [order.side for order in orders],
+            [order.quantity for order in orders],
+            [self._reference_price(order) for order in orders],
+        )
+        approvals = result.approved.tolist()
+        for order, approved, reason in zip(orders, approvals, result.reasons):
+            if reason is None:
+                continue
+            order.metadata['risk_check'] = reason
+            if not approved:
+                self._track_order(order)
+                self._set_status(order, OrderStatus.REJECTED)
+                LOG.warning(f"Order {order.order_id} rejected by pre-trade risk check: {reason}")
+        return approvals
+    
+    def _reference_price(self, order: Order) -> float:
+        """Price used to value an order in pre-trade checks (NaN when unknown)"""
+        if order.price is not None:
+            return order.price
+        if order.stop_price is not None:
+            return order.stop_price
+        return np.nan
 
 class SimulationExecutor(TradeExecutor):
     """
     Simulation executor for backtesting
-    Simulates order execution with configurable latency and slippage
+    Simulates order execution with configurable latency and slippage.
+    
+    Market orders fill immediately at the latest close. Limit, stop and
+    stop-limit orders rest in an OrderBook and are matched as new bars
+    arrive through process_bar() / process_market_data().
     """
     
+    EXECUTION_MODE = ExecutionMode.SIMULATION
+    
     def __init__(self, 
                  market_data: Dict[str, pd.DataFrame],
                  execution_delay_ms: int = 100,
+                 max_participation: Optional[float] = None,
                  **kwargs):
-        super().__init__(ExecutionMode.SIMULATION, **kwargs)
+        super().__init__(self.EXECUTION_MODE, **kwargs)
         self.market_data = market_data
         self.execution_delay_ms = execution_delay_ms
+        # Resting orders; max_participation caps fills at a fraction of bar volume
+        self.order_book = OrderBook(max_participation=max_participation)
+        # Latest close and volume seen per symbol via process_bar()
+        self.last_prices: Dict[str, float] = {}
+        self.last_volumes: Dict[str, Optional[float]] = {}
+        self.restore_from_journal()
         
     def submit_order(self, order: Order) -> bool:
         """Submit order for simulation execution"""
@@ -179,33 +533,138 @@ class SimulationExecutor(TradeExecutor):
                 order.status = OrderStatus.REJECTED
                 return False
             
+            if not self._risk_check([order])[0]:
+                return False
+            
             # Store order
-            self.orders[order.order_id] = order
-            order.status = OrderStatus.SUBMITTED
+            self._track_order(order)
+            self._set_status(order, OrderStatus.SUBMITTED)
             
             # Simulate execution for market orders
             if order.order_type == OrderType.MARKET:
-                success = self._simulate_market_execution(order)
-                if success:
-                    self.execution_count += 1
-                return success
+                return self._simulate_market_execution(order)
             
-            # For limit orders, would need more sophisticated simulation
-            LOG.warning(f"Limit order simulation not fully implemented: {order.order_id}")
+            # Limit/stop orders rest until a bar reaches their price
+            self.order_book.add(order)
+            LOG.info(f"Order resting in book: {order.order_id} {order.order_type.value} "
+                     f"{order.side} {order.quantity} {order.symbol}")
             return True
             
         except Exception as e:
             LOG.error(f"Order submission failed: {e}")
-            order.status = OrderStatus.REJECTED
+            self._set_status(order, OrderStatus.REJECTED)
             return False
     
+    def submit_orders(self, orders: List[Order]) -> List[bool]:
+        """
+        Submit a batch of orders, pricing all market orders in one vectorized pass
+        
+        Market orders share one reference-price lookup per symbol, one batch
+        timestamp and one summary log line; their fills are appended to the
+        execution history column-wise. Other order types rest in the order book.
+        
+        Returns:
+            Submission result per order, in input order
+        """
+        results = [False] * len(orders)
+        market_idx = []
+        reference = []
+        volumes = []
+        latest: Dict[str, Optional[float]] = {}
+        approvals = iter(self._risk_check([order for order in orders if order.symbol in self.market_data]))
+        
+        for i, order in enumerate(orders):
+            if order.symbol not in self.market_data:
+                LOG.error(f"No market data available for {order.symbol}")
+                order.status = OrderStatus.REJECTED
+                continue
+            if not next(approvals):
+                continue
+            
+            self._track_order(order)
+            self._set_status(order, OrderStatus.SUBMITTED)
+            if order.order_type != OrderType.MARKET:
+                try:
+                    self.order_book.add(order)
+                    results[i] = True
+                except ValueError as e:
+                    LOG.error(f"Order submission failed: {e}")
+                    self._set_status(order, OrderStatus.REJECTED)
+                continue
+            
+            if order.symbol not in latest:
+                latest[order.symbol] = self._latest_price(order.symbol)
+            price = latest[order.symbol]
+            if price is None:
+                self._set_status(order, OrderStatus.REJECTED)
+                continue
+            market_idx.append(i)
+            reference.append(price)
+            volumes.append(self._latest_volume(order.symbol))
+        
+        if not market_idx:
+            return results
+        
+        for i in market_idx:
+            results[i] = True
+        self._fill_market_orders([orders[i] for i in market_idx], reference, volumes, datetime.now())
+        return results
+    
+    def _fill_market_orders(self,
+                            filled: List[Order],
+                            reference: List[float],
+                            volumes: List[Optional[float]],
+                            timestamp: datetime) -> Dict[str, Any]:
+        """
+        Fill market orders in one vectorized pass at their reference prices
+        
+        Returns:
+            The execution batch, column-wise, as appended to the execution history
+        """
+        reference_price = np.asarray(reference, dtype=float)
+        quantity = np.fromiter((order.quantity for order in filled), dtype=float, count=len(filled))
+        sign = np.fromiter((1.0 if order.side == "buy" else -1.0 for order in filled), dtype=float, count=len(filled))
+        volume = np.array([np.nan if v is None else v for v in volumes], dtype=float)
+        
+        execution_price, commission, slippage_cost = self.cost_model.estimate(
+            reference_price, quantity, sign, volume=volume
+        )
+        
+        for order, price, fee in zip(filled, execution_price.tolist(), commission.tolist()):
+            order.filled_quantity = order.quantity
+            order.average_fill_price = price
+            order.commission = fee
+            order.updated_time = timestamp
+            self._set_status(order, OrderStatus.FILLED)
+        
+        self.total_commission_paid += float(commission.sum())
+        self.total_slippage_cost += float(slippage_cost.sum())
+        self.execution_count += len(filled)
+        batch = {
+            'timestamp': timestamp,
+            'order_id': [order.order_id for order in filled],
+            'symbol': [order.symbol for order in filled],
+            'side': [order.side for order in filled],
+            'quantity': quantity,
+            'price': execution_price,
+            'commission': commission,
+            'slippage_cost': slippage_cost,
+        }
+        self._log_executions(batch)
+        
+        LOG.info(f"Simulated batch execution: {len(filled)} market orders across {len(set(o.symbol for o in filled))} symbols, "
+                 f"notional {float(np.sum(quantity * execution_price)):,.2f}, "
+                 f"commission {float(commission.sum()):.2f}, slippage {float(slippage_cost.sum()):.2f}")
+        return batch
+    
     def cancel_order(self, order_id: str) -> bool:
         """Cancel order"""
         if order_id in self.orders:
             order = self.orders[order_id]
-            if order.status in [OrderStatus.PENDING, OrderStatus.SUBMITTED]:
-                order.status = OrderStatus.CANCELLED
+            if order.status in [OrderStatus.PENDING, OrderStatus.SUBMITTED, OrderStatus.PARTIAL_FILLED]:
+                self.order_book.cancel(order_id)
                 order.updated_time = datetime.now()
+                self._set_status(order, OrderStatus.CANCELLED)
                 return True
         return False
     
@@ -213,90 +672,274 @@ class SimulationExecutor(TradeExecutor):
         """Get order status"""
         return self.orders.get(order_id)
     
+    def _reference_price(self, order: Order) -> float:
+        """Market orders are valued at the latest price"""
+        if order.order_type == OrderType.MARKET:
+            price = self._latest_price(order.symbol)
+            return np.nan if price is None else price
+        return super()._reference_price(order)
+    
+    def _restore_open_order(self, order: Order) -> None:
+        """Put a recovered limit/stop order back in the order book"""
+        if order.order_type != OrderType.MARKET:
+            self.order_book.add(order)
+    
+    def process_bar(self,
+                    symbol: str,
+                    timestamp: datetime,
+                    open_price: float,
+                    high: float,
+                    low: float,
+                    close: float,
+                    volume: Optional[float] = None) -> List[Dict]:
+        """
+        Advance the simulation by one bar for a symbol
+        
+        Args:
+            symbol: Symbol the bar belongs to
+            timestamp: Bar timestamp
+            open_price, high, low, close: Bar prices
+            volume: Bar volume (enables partial fills when max_participation is set)
+            
+        Returns:
+            Execution records produced by this bar
+        """
+        self.last_prices[symbol] = close
+        self.last_volumes[symbol] = volume
+        if not len(self.order_book):
+            return []
+        
+        bar = Bar(timestamp, open_price, high, low, close, volume)
+        fills, expired = self.order_book.process_bar(symbol, bar)
+        
+        records = [self._apply_fill(fill, volume) for fill in fills]
+        for order in expired:
+            order.updated_time = timestamp
+            self._set_status(order, OrderStatus.EXPIRED)
+            LOG.info(f"Order expired ({order.time_in_force}): {order.order_id}")
+        return records
+    
+    def process_market_data(self, bars: Dict[str, pd.DataFrame]) -> List[Dict]:
+        """
+        Replay OHLCV bars (columns open/high/low/close[/volume], indexed by date)
+        through the order book, one symbol at a time in chronological order
+        
+        Returns:
+            All execution records produced by the replay
+        """
+        records = []
+        for symbol, frame in bars.items():
+            if frame.empty:
+                continue
+            frame = frame.sort_index()
+            close = frame['close'].to_numpy(dtype=float)
+            open_ = frame['open'].to_numpy(dtype=float) if 'open' in frame else close
+            high = frame['high'].to_numpy(dtype=float) if 'high' in frame else close
+            low = frame['low'].to_numpy(dtype=float) if 'low' in frame else close
+            volume = frame['volume'].to_numpy(dtype=float) if 'volume' in frame else None
+            timestamps = frame.index.to_pydatetime()
+            
+            for i in range(len(frame)):
+                records.extend(self.process_bar(
+                    symbol, timestamps[i], open_[i], high[i], low[i], close[i],
+                    None if volume is None else volume[i]
+                ))
+        return records
+    
+    def _apply_fill(self, fill: Fill, volume: Optional[float] = None) -> Dict:
+        """Apply an order book fill to its order and record costs"""
+        order = fill.order
+        # Limit fills are price-protected; triggered stops trade at market and pay slippage
+        if fill.liquidity == "stop":
+            costs = self.cost_model.estimate(fill.price, fill.quantity, order.side,
+                                             volume=np.nan if volume is None else volume)
+            execution_price = float(costs.execution_price)
+            commission = float(costs.commission)
+            slippage_cost = float(costs.slippage_cost)
+        else:
+            execution_price = fill.price
+            commission = float(self.cost_model.commission(fill.quantity * fill.price))
+            slippage_cost = 0.0
+        return self._record_fill(order, fill.quantity, execution_price, commission, slippage_cost, fill.timestamp)
+    
+    def _record_fill(self,
+                     order: Order,
+                     quantity: float,
+                     execution_price: float,
+                     commission: float,
+                     slippage_cost: float,
+                     timestamp: datetime) -> Dict:
+        """Update order fill state, cost counters and execution history"""
+        filled = order.filled_quantity + quantity
+        order.average_fill_price = (
+            order.average_fill_price * order.filled_quantity + execution_price * quantity
+        ) / filled
+        order.filled_quantity = filled
+        order.commission += commission
+        order.updated_time = timestamp
+        self._set_status(order, OrderStatus.FILLED if filled >= order.quantity else OrderStatus.PARTIAL_FILLED)
+        
+        self.total_commission_paid += commission
+        self.total_slippage_cost += slippage_cost
+        self.execution_count += 1
+        
+        execution_record = {
+            'timestamp': timestamp,
+            'order_id': order.order_id,
+            'symbol': order.symbol,
+            'side': order.side,
+            'quantity': quantity,
+            'price': execution_price,
+            'commission': commission,
+            'slippage_cost': slippage_cost
+        }
+        self._log_execution(execution_record)
+        
+        LOG.info(f"Simulated execution: {order.symbol} {order.side} {quantity} @ {execution_price:.4f}")
+        return execution_record
+    
+    def _latest_price(self, symbol: str) -> Optional[float]:
+        """Current market price: latest processed bar, else latest available close"""
+        if symbol in self.last_prices:
+            return self.last_prices[symbol]
+        market_df = self.market_data.get(symbol)
+        if market_df is None or market_df.empty:
+            return None
+        return float(market_df['close'].iloc[-1])
+    
+    def _latest_volume(self, symbol: str) -> Optional[float]:
+        """Volume of the latest bar, if the market data has one"""
+        if symbol in self.last_prices:
+            return self.last_volumes.get(symbol)
+        market_df = self.market_data.get(symbol)
+        if market_df is None or market_df.empty or 'volume' not in market_df:
+            return None
+        return float(market_df['volume'].iloc[-1])
+    
     def _simulate_market_execution(self, order: Order) -> bool:
         """Simulate market order execution"""
         try:
-            # Get current market price (use latest available)
-            market_df = self.market_data[order.symbol]
-            if market_df.empty:
-                order.status = OrderStatus.REJECTED
+            market_price = self._latest_price(order.symbol)
+            if market_price is None:
+                self._set_status(order, OrderStatus.REJECTED)
                 return False
             
-            # Use latest close price as execution price
-            execution_price = market_df['close'].iloc[-1]
-            
-            # Apply slippage
-            if order.side == "buy":
-                execution_price *= (1 + self.slippage_rate)
-            else:
-                execution_price *= (1 - self.slippage_rate)
-            
-            # Calculate commission
-            commission = abs(order.quantity * execution_price * self.commission_rate)
-            
-            # Fill order
-            order.status = OrderStatus.FILLED
-            order.filled_quantity = order.quantity
-            order.average_fill_price = execution_price
-            order.commission = commission
-            order.updated_time = datetime.now()
-            
-            # Track costs
-            self.total_commission_paid += commission
-            slippage_cost = abs(order.quantity * market_df['close'].iloc[-1] * self.slippage_rate)
-            self.total_slippage_cost += slippage_cost
-            
-            # Log execution
-            execution_record = {
-                'timestamp': order.updated_time,
-                'order_id': order.order_id,
-                'symbol': order.symbol,
-                'side': order.side,
-                'quantity': order.quantity,
-                'price': execution_price,
-                'commission': commission,
-                'slippage_cost': slippage_cost
-            }
-            self.execution_history.append(execution_record)
-            
-            LOG.info(f"Simulated execution: {order.symbol} {order.side} {order.quantity} @ {execution_price:.4f}")
+            volume = self._latest_volume(order.symbol)
+            costs = self.cost_model.estimate(market_price, order.quantity, order.side,
+                                             volume=np.nan if volume is None else volume)
+            self._record_fill(order, order.quantity, float(costs.execution_price),
+                              float(costs.commission), float(costs.slippage_cost), datetime.now())
             return True
             
         except Exception as e:
             LOG.error(f"Execution simulation failed for {order.order_id}: {e}")
-            order.status = OrderStatus.REJECTED
+            self._set_status(order, OrderStatus.REJECTED)
             return False
 
-class PaperTradingExecutor(TradeExecutor):
+class PaperTradingExecutor(SimulationExecutor):
     """
     Paper trading executor
-    Connects to real market data but executes trades in simulation
+    Executes trades in simulation against a streamed market feed.
+    
+    Orders are filled asynchronously: market orders wait for the next tick
+    of their symbol and fill at its open, limit/stop orders rest in the order
+    book and are matched on every tick. Feed ticks through on_tick(), e.g.
+    from a PaperTradingSession.
     """
     
-    def __init__(self, **kwargs):
-        super().__init__(ExecutionMode.PAPER, **kwargs)
-        # Would integrate with real-time data feeds
+    EXECUTION_MODE = ExecutionMode.PAPER
+    
+    def __init__(self, market_data: Optional[Dict[str, pd.DataFrame]] = None, **kwargs):
+        # Market orders waiting for the next tick of their symbol; set before the
+        # base initializer so orders replayed from the journal can be re-queued
+        self.pending_market_orders: Dict[str, List[Order]] = {}
+        super().__init__(market_data or {}, **kwargs)
         LOG.info("Paper trading executor initialized")
     
     def submit_order(self, order: Order) -> bool:
         """Submit paper trade order"""
-        # Implementation would connect to real-time market data
-        # For now, placeholder
-        LOG.info(f"Paper trade submitted: {order.order_id}")
-        self.orders[order.order_id] = order
-        order.status = OrderStatus.SUBMITTED
+        return self.submit_orders([order])[0]
+    
+    def submit_orders(self, orders: List[Order]) -> List[bool]:
+        """Queue orders for the next ticks; nothing fills until on_tick()"""
+        results = []
+        for order, approved in zip(orders, self._risk_check(orders)):
+            if not approved:
+                results.append(False)
+                continue
+            self._track_order(order)
+            self._set_status(order, OrderStatus.SUBMITTED)
+            if order.order_type == OrderType.MARKET:
+                self.pending_market_orders.setdefault(order.symbol, []).append(order)
+                results.append(True)
+                continue
+            try:
+                self.order_book.add(order)
+                results.append(True)
+            except ValueError as e:
+                LOG.error(f"Paper order rejected: {e}")
+                self._set_status(order, OrderStatus.REJECTED)
+                results.append(False)
+        LOG.info(f"Paper orders submitted: {sum(results)} of {len(orders)}")
+        return results
+    
+    def on_tick(self,
+                symbol: str,
+                timestamp: datetime,
+                open_price: float,
+                high: float,
+                low: float,
+                close: float,
+                volume: Optional[float] = None) -> List[Dict]:
+        """
+        Process one market data tick (bar) for a symbol
+        
+        Returns:
+            Execution records produced by this tick
+        """
+        records = []
+        pending = [order for order in self.pending_market_orders.pop(symbol, [])
+                   if order.status == OrderStatus.SUBMITTED]
+        if pending:
+            batch = self._fill_market_orders(pending, [open_price] * len(pending),
+                                             [volume] * len(pending), timestamp)
+            records.extend(self._batch_records(batch))
+        records.extend(self.process_bar(symbol, timestamp, open_price, high, low, close, volume))
+        return records
+    
+    def resize_order(self, order_id: str, quantity: float) -> bool:
+        """
+        Reduce a queued market order before it fills; a zero quantity cancels it
+        
+        Returns:
+            True if the order was resized or cancelled
+        """
+        order = self.orders.get(order_id)
+        if order is None or order.order_type != OrderType.MARKET or order.status != OrderStatus.SUBMITTED:
+            return False
+        if quantity <= 0:
+            return self.cancel_order(order_id)
+        order.quantity = float(min(quantity, order.quantity))
+        if self.journal is not None:
+            self.journal.record_order(order)
         return True
     
-    def cancel_order(self, order_id: str) -> bool:
-        """Cancel paper trade order"""
-        if order_id in self.orders:
-            self.orders[order_id].status = OrderStatus.CANCELLED
-            return True
-        return False
+    def _restore_open_order(self, order: Order) -> None:
+        """Re-queue a recovered market order for the next tick; others go back in the book"""
+        if order.order_type == OrderType.MARKET:
+            self.pending_market_orders.setdefault(order.symbol, []).append(order)
+        else:
+            self.order_book.add(order)
     
-    def get_order_status(self, order_id: str) -> Optional[Order]:
-        """Get paper trade order status"""
-        return self.orders.get(order_id)
+    @staticmethod
+    def _batch_records(batch: Dict[str, Any]) -> List[Dict]:
+        count = len(batch['order_id'])
+        return [
+            {name: (values if name == 'timestamp' else
+                    values[i].item() if isinstance(values, np.ndarray) else values[i])
+             for name, values in batch.items()}
+            for i in range(count)
+        ]
 
 class LiveTradingExecutor(TradeExecutor):
     """
@@ -346,7 +989,7 @@ def create_executor(execution_mode: ExecutionMode,
             raise ValueError("Market data required for simulation mode")
         return SimulationExecutor(market_data, **kwargs)
     elif execution_mode == ExecutionMode.PAPER:
-        return PaperTradingExecutor(**kwargs)
+        return PaperTradingExecutor(market_data, **kwargs)
     elif execution_mode == ExecutionMode.LIVE:
         return LiveTradingExecutor(**kwargs)
     else:
@@ -0,0 +1,412 @@
+"""
+Holdings Store
+Multi-account holdings kept as lots in an indexed SQLite database.
+
+Each account holds lots (symbol, quantity, total cost basis, currency,
+acquisition date). Lots are added, updated and removed one row at a time,
+so editing a position never rewrites the rest of the holdings. Accounts
+that are only tracked as a weight allocation (the legacy
+``data/accounts/holdings.json`` format) keep their weights in a separate
+table, updated incrementally as well.
+
+Valuation is columnar: positions are aggregated per symbol in SQL, then
+priced, converted to the base currency and normalized to weights with
+vectorized pandas operations against the latest closes from the market
+data files. Gap analysis against strategy targets goes through
+RebalancePlanner.weight_gaps.
+"""
+
+import json
+import sqlite3
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.ui.app_logger import LOG
+from .rebalance import RebalancePlanner
+
+DEFAULT_ACCOUNT = 'default'
+BASE_CURRENCY = 'USD'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS accounts (
+    account_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    currency TEXT NOT NULL,
+    created_time TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS lots (
+    lot_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    account_id TEXT NOT NULL REFERENCES accounts(account_id),
+    symbol TEXT NOT NULL,
+    quantity REAL NOT NULL,
+    cost_basis REAL NOT NULL,
+    currency TEXT NOT NULL,
+    acquired TEXT,
+    updated_time TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS weights (
+    account_id TEXT NOT NULL REFERENCES accounts(account_id),
+    symbol TEXT NOT NULL,
+    weight REAL NOT NULL,
+    updated_time TEXT NOT NULL,
+    PRIMARY KEY (account_id, symbol)
+);
+CREATE INDEX IF NOT EXISTS idx_lots_account ON lots(account_id, symbol);
+CREATE INDEX IF NOT EXISTS idx_lots_symbol ON lots(symbol);
+"""
+
+LOT_COLUMNS = ('account_id', 'symbol', 'quantity', 'cost_basis', 'currency', 'acquired')
+_UPDATABLE = frozenset(LOT_COLUMNS)
+
+
+def _now() -> str:
+    return datetime.now().isoformat()
+
+
+def _iso_date(value: Any) -> Optional[str]:
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    if isinstance(value, (date, datetime, pd.Timestamp)):
+        return value.isoformat()
+    return str(value)
+
+
+def latest_prices(market_data: Dict[str, pd.DataFrame], column: str = 'close') -> Dict[str, float]:
+    """Last valid ``column`` value per asset from DataLoader.load_market_data() frames"""
+    prices = {}
+    for asset, frame in market_data.items():
+        if frame is None or frame.empty or column not in frame.columns:
+            continue
+        values = frame[column].dropna()
+        if not values.empty:
+            prices[asset] = float(values.iloc[-1])
+    return prices
+
+
+def load_latest_prices(data_root: str = "data") -> Dict[str, float]:
+    """Latest close per configured asset from the price files under ``<data_root>/raw/price``"""
+    from src.modules.data_management.data_center.data_loader import DataLoader
+
+    return latest_prices(DataLoader(data_root).load_market_data())
+
+
+class HoldingsStore:
+    """SQLite store of accounts, lots and weight allocations"""
+
+    def __init__(self, path: str = "data/accounts/holdings.db", base_currency: str = BASE_CURRENCY):
+        """
+        Args:
+            path: Database file (created if missing)
+            base_currency: Currency weights and market values are reported in
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.base_currency = base_currency
+
+        # A UI session may reuse the store from different worker threads (one at a time)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def __enter__(self) -> "HoldingsStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    # ---------------------------------------------------------------- accounts
+
+    def add_account(self, account_id: str, name: Optional[str] = None, currency: Optional[str] = None) -> None:
+        """Register an account (no-op if it already exists)"""
+        with self._conn:
+            self._ensure_account(account_id, name, currency)
+
+    def remove_account(self, account_id: str) -> None:
+        """Delete an account with its lots and weights"""
+        with self._conn:
+            self._conn.execute("DELETE FROM lots WHERE account_id = ?", (account_id,))
+            self._conn.execute("DELETE FROM weights WHERE account_id = ?", (account_id,))
+            self._conn.execute("DELETE FROM accounts WHERE account_id = ?", (account_id,))
+
+    def accounts(self) -> pd.DataFrame:
+        return pd.read_sql_query("SELECT * FROM accounts ORDER BY account_id", self._conn)
+
+    def _ensure_account(self, account_id: str, name: Optional[str] = None, currency: Optional[str] = None) -> None:
+        self._conn.execute(
+            "INSERT OR IGNORE INTO accounts VALUES (?, ?, ?, ?)",
+            (account_id, name or account_id, currency or self.base_currency, _now())
+        )
+
+    # -------------------------------------------------------------------- lots
+
+    def add_lot(self,
+                account_id: str,
+                symbol: str,
+                quantity: float,
+                cost_basis: float = 0.0,
+                currency: Optional[str] = None,
+                acquired: Any = None) -> int:
+        """
+        Add one lot, creating the account if needed
+
+        Args:
+            account_id: Owning account
+            symbol: Asset symbol (config/assets.py key)
+            quantity: Units held
+            cost_basis: Total cost of the lot, in the lot currency
+            currency: Lot currency (defaults to the base currency)
+            acquired: Acquisition date
+
+        Returns:
+            The new lot id
+        """
+        with self._conn:
+            self._ensure_account(account_id)
+            cursor = self._conn.execute(
+                f"INSERT INTO lots ({', '.join(LOT_COLUMNS)}, updated_time) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (account_id, symbol, float(quantity), float(cost_basis), currency or self.base_currency,
+                 _iso_date(acquired), _now())
+            )
+        return int(cursor.lastrowid)
+
+    def add_lots(self, lots: pd.DataFrame) -> int:
+        """
+        Bulk-insert lots from a frame with LOT_COLUMNS (cost_basis, currency and
+        acquired are optional) in one transaction
+
+        Returns:
+            Number of lots inserted
+        """
+        if lots.empty:
+            return 0
+        frame = pd.DataFrame({
+            'account_id': lots['account_id'].astype(str),
+            'symbol': lots['symbol'].astype(str),
+            'quantity': lots['quantity'].astype(float),
+            'cost_basis': lots['cost_basis'].astype(float) if 'cost_basis' in lots else 0.0,
+            'currency': lots['currency'] if 'currency' in lots else self.base_currency,
+            'acquired': lots['acquired'].map(_iso_date) if 'acquired' in lots else None,
+        })
+        stamp = _now()
+        with self._conn:
+            for account_id in frame['account_id'].unique().tolist():
+                self._ensure_account(account_id)
+            self._conn.executemany(
+                f"INSERT INTO lots ({', '.join(LOT_COLUMNS)}, updated_time) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                ((*row, stamp) for row in frame.itertuples(index=False, name=None))
+            )
+        return len(frame)
+
+    def update_lot(self, lot_id: int, **fields: Any) -> bool:
+        """
+        Update fields of one lot in place
+
+        Args:
+            lot_id: Lot to update
+            **fields: Any of LOT_COLUMNS
+
+        Returns:
+            True if the lot exists
+        """
+        unknown = set(fields) - _UPDATABLE
+        if unknown:
+            raise ValueError(f"Unknown lot fields: {sorted(unknown)}")
+        if not fields:
+            return self._conn.execute("SELECT 1 FROM lots WHERE lot_id = ?", (lot_id,)).fetchone() is not None
+        if 'acquired' in fields:
+            fields['acquired'] = _iso_date(fields['acquired'])
+        assignments = ', '.join(f"{name} = ?" for name in fields)
+        with self._conn:
+            if 'account_id' in fields:
+                self._ensure_account(fields['account_id'])
+            cursor = self._conn.execute(
+                f"UPDATE lots SET {assignments}, updated_time = ? WHERE lot_id = ?",
+                (*fields.values(), _now(), lot_id)
+            )
+        return cursor.rowcount > 0
+
+    def remove_lot(self, lot_id: int) -> bool:
+        """Delete one lot; returns True if it existed"""
+        with self._conn:
+            cursor = self._conn.execute("DELETE FROM lots WHERE lot_id = ?", (lot_id,))
+        return cursor.rowcount > 0
+
+    def has_lots(self, account_id: Optional[str] = None) -> bool:
+        query, params = self._filtered("SELECT 1 FROM lots", account_id)
+        return self._conn.execute(query + " LIMIT 1", params).fetchone() is not None
+
+    def lots_frame(self, account_id: Optional[str] = None, symbol: Optional[str] = None) -> pd.DataFrame:
+        """Lots, optionally for one account and/or symbol, in insertion order"""
+        query, params = self._filtered("SELECT * FROM lots", account_id, symbol)
+        return pd.read_sql_query(query + " ORDER BY lot_id", self._conn, params=params)
+
+    def positions(self, account_id: Optional[str] = None, by_account: bool = False) -> pd.DataFrame:
+        """
+        Lots aggregated in SQL to one row per symbol and currency
+
+        Args:
+            account_id: Only this account (default: all accounts)
+            by_account: Keep one row per account as well
+
+        Returns:
+            DataFrame with [account_id,] symbol, currency, quantity, cost_basis and lots columns
+        """
+        keys = "account_id, symbol, currency" if by_account else "symbol, currency"
+        query, params = self._filtered(
+            f"SELECT {keys}, SUM(quantity) AS quantity, SUM(cost_basis) AS cost_basis, COUNT(*) AS lots "
+            f"FROM lots", account_id
+        )
+        return pd.read_sql_query(f"{query} GROUP BY {keys} ORDER BY {keys}", self._conn, params=params)
+
+    @staticmethod
+    def _filtered(query: str, account_id: Optional[str] = None, symbol: Optional[str] = None):
+        clauses, params = [], []
+        if account_id is not None:
+            clauses.append("account_id = ?")
+            params.append(account_id)
+        if symbol is not None:
+            clauses.append("symbol = ?")
+            params.append(symbol)
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        return query, params
+
+    # ----------------------------------------------------------------- weights
+
+    def weights(self, account_id: str = DEFAULT_ACCOUNT) -> Dict[str, float]:
+        """Stored weight allocation of an account"""
+        rows = self._conn.execute(
+            "SELECT symbol, weight FROM weights WHERE account_id = ? ORDER BY rowid", (account_id,)
+        ).fetchall()
+        return {symbol: float(weight) for symbol, weight in rows}
+
+    def set_weights(self, weights: Dict[str, float], account_id: str = DEFAULT_ACCOUNT) -> int:
+        """
+        Replace an account's weight allocation, writing only the rows that changed
+
+        Returns:
+            Number of rows inserted, updated or deleted
+        """
+        current = self.weights(account_id)
+        changed = [(account_id, symbol, float(weight), _now()) for symbol, weight in weights.items()
+                   if current.get(symbol) != float(weight)]
+        removed = [(account_id, symbol) for symbol in current if symbol not in weights]
+        if not changed and not removed:
+            return 0
+        with self._conn:
+            self._ensure_account(account_id)
+            self._conn.executemany(
+                "INSERT INTO weights VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(account_id, symbol) DO UPDATE SET weight = excluded.weight, "
+                "updated_time = excluded.updated_time", changed
+            )
+            self._conn.executemany("DELETE FROM weights WHERE account_id = ? AND symbol = ?", removed)
+        return len(changed) + len(removed)
+
+    def import_weights_json(self, path: str, account_id: str = DEFAULT_ACCOUNT) -> bool:
+        """
+        Import a legacy ``{asset: weight}`` JSON file into an account that has
+        no weights yet
+
+        Returns:
+            True if weights were imported
+        """
+        path = Path(path)
+        if not path.exists() or self.weights(account_id):
+            return False
+        try:
+            with open(path, 'r') as f:
+                weights = json.load(f)
+        except Exception as e:
+            LOG.error(f"Error reading legacy holdings file {path}: {e}")
+            return False
+        self.set_weights({asset: float(weight) for asset, weight in weights.items()}, account_id)
+        LOG.info(f"Imported {len(weights)} holdings weights from {path} into account '{account_id}'")
+        return True
+
+    # --------------------------------------------------------------- valuation
+
+    def valuation(self,
+                  prices: Dict[str, float],
+                  account_id: Optional[str] = None,
+                  fx_rates: Optional[Dict[str, float]] = None) -> pd.DataFrame:
+        """
+        Value positions at the given prices
+
+        Args:
+            prices: Latest price per symbol, in the lot currency
+            account_id: Only this account (default: all accounts combined)
+            fx_rates: Base-currency value of one unit of each currency; lots in a
+                      currency without a rate are not valued (None takes every
+                      currency at par)
+
+        Returns:
+            DataFrame indexed by symbol with quantity, price, market_value and
+            cost_basis (both in the base currency), unrealized_pnl and weight
+        """
+        positions = self.positions(account_id)
+        if positions.empty:
+            return pd.DataFrame(columns=['quantity', 'price', 'market_value', 'cost_basis',
+                                         'unrealized_pnl', 'weight'],
+                                index=pd.Index([], name='symbol'), dtype=float)
+
+        rates = pd.Series({self.base_currency: 1.0, **(fx_rates or {})}, dtype=float)
+        fx = positions['currency'].map(rates).to_numpy(dtype=float)
+        if fx_rates is None:
+            fx = np.where(np.isnan(fx), 1.0, fx)
+        price = positions['symbol'].map(pd.Series(prices, dtype=float)).to_numpy(dtype=float)
+
+        unvalued = ~np.isfinite(price * fx)
+        if unvalued.any():
+            LOG.warning(f"No price or FX rate for holdings: {sorted(set(positions['symbol'][unvalued]))}")
+
+        frame = pd.DataFrame({
+            'symbol': positions['symbol'],
+            'quantity': positions['quantity'],
+            'market_value': positions['quantity'].to_numpy() * price * fx,
+            'cost_basis': positions['cost_basis'].to_numpy() * fx,
+        }).groupby('symbol', sort=True).sum(min_count=1)
+        frame.insert(1, 'price', frame.index.map(pd.Series(prices, dtype=float)).to_numpy(dtype=float))
+        frame['unrealized_pnl'] = frame['market_value'] - frame['cost_basis']
+        total = frame['market_value'].sum()
+        frame['weight'] = frame['market_value'] / total if total > 0 else 0.0
+        return frame
+
+    def current_weights(self,
+                        prices: Dict[str, float],
+                        account_id: Optional[str] = None,
+                        fx_rates: Optional[Dict[str, float]] = None) -> Dict[str, float]:
+        """Market-value weights of the valued positions"""
+        weights = self.valuation(prices, account_id, fx_rates)['weight'].dropna()
+        return {symbol: float(weight) for symbol, weight in weights.items()}
+
+    def gap_analysis(self,
+                     target_weights: Dict[str, float],
+                     prices: Dict[str, float],
+                     account_id: Optional[str] = None,
+                     fx_rates: Optional[Dict[str, float]] = None,
+                     planner: Optional[RebalancePlanner] = None) -> pd.DataFrame:
+        """
+        Gaps between current market-value weights and target weights
+
+        Returns:
+            RebalancePlanner.weight_gaps() frame plus market_value and
+            target_value (gap translated to base-currency value) columns
+        """
+        planner = planner or RebalancePlanner.unconstrained()
+        valued = self.valuation(prices, account_id, fx_rates)
+        current = valued['weight'].dropna().to_dict()
+        gaps = planner.weight_gaps(current, target_weights)
+        total = float(valued['market_value'].sum())
+        gaps['market_value'] = valued['market_value'].reindex(gaps.index).fillna(0.0)
+        gaps['target_value'] = gaps['target'] * total
+        return gaps
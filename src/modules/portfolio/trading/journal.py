@@ -0,0 +1,301 @@
+"""
+Order Journal
+Append-only SQLite journal of orders, order state changes and fills.
+
+Executors write every accepted order, every status change and every fill
+to the journal so their state survives restarts: replay rebuilds the
+orders, cost counters and the tail of the execution history. Sessions also
+checkpoint the last market bar they fully processed, so a restarted replay
+can skip bars that were already traded. The database
+runs in WAL mode and commits are batched (every ``sync_every`` records or
+``sync_interval`` seconds, and on flush/close), so each commit is one WAL
+fsync rather than one per record. Records written since the last commit
+are lost on a crash.
+
+Tables are indexed by symbol and time, so the journal can be analyzed in
+bulk with SQL or loaded into DataFrames (orders_frame, fills_frame)
+without building per-record Python objects.
+"""
+
+import json
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.ui.app_logger import LOG
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS orders (
+    order_id TEXT PRIMARY KEY,
+    symbol TEXT NOT NULL,
+    side TEXT NOT NULL,
+    order_type TEXT NOT NULL,
+    quantity REAL NOT NULL,
+    price REAL,
+    stop_price REAL,
+    time_in_force TEXT NOT NULL,
+    created_time TEXT NOT NULL,
+    metadata TEXT
+);
+CREATE TABLE IF NOT EXISTS order_events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    order_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    filled_quantity REAL NOT NULL,
+    average_fill_price REAL NOT NULL,
+    commission REAL NOT NULL,
+    timestamp TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS fills (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    order_id TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    side TEXT NOT NULL,
+    quantity REAL NOT NULL,
+    price REAL NOT NULL,
+    commission REAL NOT NULL,
+    slippage_cost REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS checkpoints (
+    name TEXT PRIMARY KEY,
+    bar_time TEXT NOT NULL,
+    trading_days INTEGER NOT NULL,
+    closed INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_orders_symbol ON orders(symbol, created_time);
+CREATE INDEX IF NOT EXISTS idx_events_order ON order_events(order_id, seq);
+CREATE INDEX IF NOT EXISTS idx_fills_symbol ON fills(symbol, timestamp);
+CREATE INDEX IF NOT EXISTS idx_fills_timestamp ON fills(timestamp);
+"""
+
+FILL_COLUMNS = ('timestamp', 'order_id', 'symbol', 'side', 'quantity', 'price', 'commission', 'slippage_cost')
+
+
+def _iso(value: Any) -> Optional[str]:
+    return None if value is None else value.isoformat()
+
+
+class OrderJournal:
+    """SQLite write-ahead journal for executor orders and fills"""
+
+    def __init__(self, path: str, sync_every: int = 500, sync_interval: float = 1.0):
+        """
+        Args:
+            path: Journal database file (created if missing)
+            sync_every: Commit after this many unsynced records
+            sync_interval: Commit when the oldest unsynced record is this many seconds old
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.sync_every = max(int(sync_every), 1)
+        self.sync_interval = sync_interval
+        self._unsynced = 0
+        self._first_unsynced_at = 0.0
+
+        self._conn = sqlite3.connect(str(self.path))
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def __enter__(self) -> "OrderJournal":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @property
+    def is_empty(self) -> bool:
+        return self._conn.execute("SELECT 1 FROM orders LIMIT 1").fetchone() is None
+
+    # ------------------------------------------------------------------ writes
+
+    def record_order(self, order) -> None:
+        """Journal a newly accepted order and its initial state"""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO orders VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (order.order_id, order.symbol, order.side, order.order_type.value, float(order.quantity),
+             order.price, order.stop_price, order.time_in_force, _iso(order.created_time),
+             json.dumps(order.metadata, default=str) if order.has_metadata else None)
+        )
+        self._written(1)
+
+    def record_status(self, order, status: Any = None, timestamp: Optional[datetime] = None) -> None:
+        """Journal an order state change (status and fill state)"""
+        self.record_statuses([order], status, timestamp)
+
+    def record_statuses(self, orders: Iterable, status: Any = None, timestamp: Optional[datetime] = None) -> None:
+        """Journal state changes for a batch of orders in one statement"""
+        stamp = _iso(timestamp or datetime.now())
+        rows = [
+            (order.order_id, (status or order.status).value, float(order.filled_quantity),
+             float(order.average_fill_price), float(order.commission), stamp)
+            for order in orders
+        ]
+        self._conn.executemany(
+            "INSERT INTO order_events (order_id, status, filled_quantity, average_fill_price, commission, timestamp) "
+            "VALUES (?, ?, ?, ?, ?, ?)", rows
+        )
+        self._written(len(rows))
+
+    def record_fills(self, columns: Dict[str, Any]) -> None:
+        """
+        Journal a batch of fills given column-wise, as passed to ExecutionHistory.extend()
+
+        Scalar columns (e.g. one batch timestamp) are broadcast.
+        """
+        count = len(columns['order_id'])
+        if count == 0:
+            return
+        values = []
+        for name in FILL_COLUMNS:
+            column = columns[name]
+            if np.ndim(column) == 0:
+                column = [column] * count
+            if name == 'timestamp':
+                column = [_iso(value) for value in column]
+            elif isinstance(column, np.ndarray):
+                column = column.tolist()
+            values.append(column)
+        self._conn.executemany(
+            f"INSERT INTO fills ({', '.join(FILL_COLUMNS)}) VALUES ({', '.join('?' * len(FILL_COLUMNS))})",
+            zip(*values)
+        )
+        self._written(count)
+
+    def record_checkpoint(self, name: str, bar_time: datetime, trading_days: int, closed: bool = True) -> None:
+        """
+        Record the last bar a session fully processed
+
+        Args:
+            name: Session name
+            bar_time: Timestamp of the bar
+            trading_days: Trading days closed so far
+            closed: Whether the bar's end-of-day close and rebalance are done too
+        """
+        self._conn.execute(
+            "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?)",
+            (name, _iso(bar_time), int(trading_days), int(bool(closed)))
+        )
+        self._written(1)
+
+    def flush(self) -> None:
+        """Commit (and fsync) every record written so far"""
+        if self._unsynced:
+            self._conn.commit()
+            self._unsynced = 0
+
+    def close(self) -> None:
+        self.flush()
+        self._conn.close()
+
+    def _written(self, count: int) -> None:
+        if not self._unsynced:
+            self._first_unsynced_at = time.monotonic()
+        self._unsynced += count
+        if self._unsynced >= self.sync_every or \
+                time.monotonic() - self._first_unsynced_at >= self.sync_interval:
+            self.flush()
+
+    # ------------------------------------------------------------------- reads
+
+    def orders_frame(self, symbol: Optional[str] = None) -> pd.DataFrame:
+        """Orders with their latest journaled state"""
+        query = """
+            SELECT o.*, e.status, e.filled_quantity, e.average_fill_price, e.commission,
+                   e.timestamp AS updated_time
+            FROM orders o
+            LEFT JOIN order_events e ON e.seq = (
+                SELECT MAX(seq) FROM order_events WHERE order_id = o.order_id
+            )
+        """
+        params: Tuple = ()
+        if symbol is not None:
+            query += " WHERE o.symbol = ?"
+            params = (symbol,)
+        query += " ORDER BY o.created_time, o.rowid"
+        frame = pd.read_sql_query(query, self._conn, params=params)
+        for column in ('created_time', 'updated_time'):
+            frame[column] = pd.to_datetime(frame[column], format='ISO8601')
+        return frame
+
+    def fills_frame(self,
+                    symbol: Optional[str] = None,
+                    start_time: Optional[datetime] = None,
+                    end_time: Optional[datetime] = None,
+                    limit: Optional[int] = None) -> pd.DataFrame:
+        """
+        Journaled fills in execution order, filtered in SQL
+
+        Args:
+            symbol: Only fills for this symbol
+            start_time: Inclusive lower bound on fill timestamp
+            end_time: Inclusive upper bound on fill timestamp
+            limit: Only the most recent ``limit`` matching fills
+        """
+        clauses, params = [], []
+        if symbol is not None:
+            clauses.append("symbol = ?")
+            params.append(symbol)
+        if start_time is not None:
+            clauses.append("timestamp >= ?")
+            params.append(_iso(start_time))
+        if end_time is not None:
+            clauses.append("timestamp <= ?")
+            params.append(_iso(end_time))
+        query = f"SELECT seq, {', '.join(FILL_COLUMNS)} FROM fills"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        if limit is not None:
+            query = f"SELECT * FROM ({query} ORDER BY seq DESC LIMIT {int(limit)})"
+        query += " ORDER BY seq"
+        frame = pd.read_sql_query(query, self._conn, params=params)
+        frame['timestamp'] = pd.to_datetime(frame['timestamp'], format='ISO8601')
+        return frame.drop(columns='seq')
+
+    def fill_totals(self) -> Dict[str, float]:
+        """Fill count and total commission and slippage, aggregated in SQL"""
+        count, commission, slippage = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(commission), 0), COALESCE(SUM(slippage_cost), 0) FROM fills"
+        ).fetchone()
+        return {'count': int(count), 'commission': float(commission), 'slippage_cost': float(slippage)}
+
+    def load_checkpoint(self, name: str) -> Optional[Dict[str, Any]]:
+        """Last checkpoint recorded under ``name``, None if there is none"""
+        row = self._conn.execute(
+            "SELECT bar_time, trading_days, closed FROM checkpoints WHERE name = ?", (name,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {'bar_time': datetime.fromisoformat(row[0]), 'trading_days': int(row[1]), 'closed': bool(row[2])}
+
+    def load_orders(self) -> List[Dict[str, Any]]:
+        """Orders and their latest state as plain dicts, in creation order, for replay"""
+        frame = self.orders_frame()
+        records = []
+        for row in frame.itertuples(index=False):
+            records.append({
+                'order_id': row.order_id,
+                'symbol': row.symbol,
+                'side': row.side,
+                'order_type': row.order_type,
+                'quantity': float(row.quantity),
+                'price': None if pd.isna(row.price) else float(row.price),
+                'stop_price': None if pd.isna(row.stop_price) else float(row.stop_price),
+                'time_in_force': row.time_in_force,
+                'created_time': row.created_time.to_pydatetime(),
+                'updated_time': None if pd.isna(row.updated_time) else row.updated_time.to_pydatetime(),
+                'status': row.status,
+                'filled_quantity': 0.0 if pd.isna(row.filled_quantity) else float(row.filled_quantity),
+                'average_fill_price': 0.0 if pd.isna(row.average_fill_price) else float(row.average_fill_price),
+                'commission': 0.0 if pd.isna(row.commission) else float(row.commission),
+                'metadata': json.loads(row.metadata) if row.metadata else {},
+            })
+        LOG.debug(f"Loaded {len(records)} orders from journal {self.path}")
+        return records
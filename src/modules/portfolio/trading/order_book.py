@@ -0,0 +1,301 @@
+"""
+Order Book Simulator
+Bar-driven matching engine for resting limit, stop and stop-limit orders.
+
+Resting orders are kept in price-indexed heaps per symbol and side, so each
+new bar only inspects the orders whose trigger or limit price the bar
+actually reached, instead of scanning every open order. Cancelled and
+expired orders are removed lazily when they surface at the top of a heap.
+"""
+
+import heapq
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .executor import Order
+
+# Order type values (see executor.OrderType); compared by value to avoid a circular import
+_MARKET = "market"
+_LIMIT = "limit"
+_STOP_LIMIT = "stop_limit"
+
+# Time-in-force values understood by the book
+TIF_GTC = "GTC"  # Good Till Cancelled
+TIF_DAY = "DAY"  # Expires at the end of its first trading day
+TIF_IOC = "IOC"  # Immediate Or Cancel: first bar only, remainder cancelled
+TIF_FOK = "FOK"  # Fill Or Kill: whole quantity on the first bar or cancelled
+
+SINGLE_BAR_TIFS = (TIF_IOC, TIF_FOK)
+
+
+@dataclass
+class Bar:
+    """OHLCV bar for one symbol"""
+    timestamp: datetime
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: Optional[float] = None
+
+
+@dataclass
+class Fill:
+    """Single (possibly partial) execution produced by the book"""
+    order: "Order"
+    quantity: float
+    price: float
+    timestamp: datetime
+    liquidity: str  # "limit" or "stop"
+
+
+class _SymbolBook:
+    """Resting orders for one symbol"""
+
+    def __init__(self):
+        # Limit heaps: best price first (highest bid, lowest offer)
+        self.buy_limits: List[Tuple[float, int, str]] = []
+        self.sell_limits: List[Tuple[float, int, str]] = []
+        # Stop heaps: nearest trigger first
+        self.buy_stops: List[Tuple[float, int, str]] = []
+        self.sell_stops: List[Tuple[float, int, str]] = []
+        # DAY orders keyed by their session date
+        self.day_expiry: List[Tuple[date, int, str]] = []
+        # Orders awaiting their first bar (session assignment / IOC / FOK)
+        self.awaiting_first_bar: List[str] = []
+
+
+class OrderBook:
+    """
+    Event-driven matching engine for SimulationExecutor.
+
+    Orders rest until a bar reaches their price:
+    - Buy limit fills when the bar trades at or below the limit (at the open if it gaps through)
+    - Sell limit fills when the bar trades at or above the limit
+    - Stops trigger when the bar trades through the stop price; stop orders then fill
+      as market orders, stop-limit orders become resting limit orders
+
+    Bar volume, when available, caps fills at ``max_participation`` of the bar,
+    producing partial fills that keep resting for later bars.
+    """
+
+    def __init__(self, max_participation: Optional[float] = None):
+        self.max_participation = max_participation
+        self.active: Dict[str, "Order"] = {}
+        self._books: Dict[str, _SymbolBook] = {}
+        self._seq = 0
+
+    def __len__(self) -> int:
+        return len(self.active)
+
+    def add(self, order: "Order") -> None:
+        """Add a resting LIMIT, STOP or STOP_LIMIT order"""
+        order_type = order.order_type.value
+        if order_type == _MARKET:
+            raise ValueError("Market orders are executed directly and never rest in the book")
+        if order_type != "stop" and order.price is None:
+            raise ValueError(f"{order_type} order {order.order_id} requires a limit price")
+        if order_type != _LIMIT and order.stop_price is None:
+            raise ValueError(f"{order_type} order {order.order_id} requires a stop price")
+
+        book = self._books.setdefault(order.symbol, _SymbolBook())
+        self.active[order.order_id] = order
+
+        if order_type == _LIMIT:
+            self._push_limit(book, order)
+        else:
+            self._push_stop(book, order)
+
+        if order.time_in_force.upper() in (TIF_DAY,) + SINGLE_BAR_TIFS:
+            book.awaiting_first_bar.append(order.order_id)
+
+    def cancel(self, order_id: str) -> bool:
+        """Remove an order from the book; heap entries are discarded lazily"""
+        return self.active.pop(order_id, None) is not None
+
+    def resting_orders(self, symbol: Optional[str] = None) -> List["Order"]:
+        """Orders currently resting in the book"""
+        if symbol is None:
+            return list(self.active.values())
+        return [order for order in self.active.values() if order.symbol == symbol]
+
+    def process_bar(self, symbol: str, bar: Bar) -> Tuple[List[Fill], List["Order"]]:
+        """
+        Match resting orders for ``symbol`` against a new bar.
+
+        Returns:
+            (fills, expired_orders). Order fill state is not modified here; the
+            executor applies fills so that costs and history are recorded in one place.
+        """
+        book = self._books.get(symbol)
+        if book is None:
+            return [], []
+
+        expired = self._expire_day_orders(book, bar)
+        first_bar_orders = self._start_sessions(book, bar)
+
+        remaining = {}
+        available = None
+        # Unknown (None/NaN) or zero volume leaves fills uncapped
+        if self.max_participation is not None and bar.volume is not None and bar.volume > 0:
+            available = bar.volume * self.max_participation
+
+        fills: List[Fill] = []
+        available = self._trigger_stops(book, bar, fills, remaining, available, first_bar_orders)
+        available = self._match_limits(book, bar, fills, remaining, available, first_bar_orders)
+
+        # IOC/FOK remainders do not survive their first bar
+        for order_id in first_bar_orders:
+            order = self.active.get(order_id)
+            if order is not None and order.time_in_force.upper() in SINGLE_BAR_TIFS:
+                self.cancel(order_id)
+                expired.append(order)
+
+        return fills, expired
+
+    def _remaining(self, order: "Order", pending: Dict[str, float]) -> float:
+        return pending.get(order.order_id, order.quantity - order.filled_quantity)
+
+    def _next_seq(self) -> int:
+        self._seq += 1
+        return self._seq
+
+    def _push_limit(self, book: _SymbolBook, order: "Order") -> None:
+        if order.side == "buy":
+            heapq.heappush(book.buy_limits, (-order.price, self._next_seq(), order.order_id))
+        else:
+            heapq.heappush(book.sell_limits, (order.price, self._next_seq(), order.order_id))
+
+    def _push_stop(self, book: _SymbolBook, order: "Order") -> None:
+        if order.side == "buy":
+            heapq.heappush(book.buy_stops, (order.stop_price, self._next_seq(), order.order_id))
+        else:
+            heapq.heappush(book.sell_stops, (-order.stop_price, self._next_seq(), order.order_id))
+
+    def _live(self, order_id: str) -> Optional["Order"]:
+        return self.active.get(order_id)
+
+    def _start_sessions(self, book: _SymbolBook, bar: Bar) -> List[str]:
+        """Assign DAY sessions and collect orders seeing their first bar"""
+        first_bar_orders = [oid for oid in book.awaiting_first_bar if oid in self.active]
+        book.awaiting_first_bar = []
+        session = bar.timestamp.date() if isinstance(bar.timestamp, datetime) else bar.timestamp
+        for order_id in first_bar_orders:
+            if self.active[order_id].time_in_force.upper() == TIF_DAY:
+                heapq.heappush(book.day_expiry, (session, self._next_seq(), order_id))
+        return first_bar_orders
+
+    def _expire_day_orders(self, book: _SymbolBook, bar: Bar) -> List["Order"]:
+        expired = []
+        session = bar.timestamp.date() if isinstance(bar.timestamp, datetime) else bar.timestamp
+        while book.day_expiry and book.day_expiry[0][0] < session:
+            _, _, order_id = heapq.heappop(book.day_expiry)
+            order = self.active.get(order_id)
+            if order is not None:
+                self.cancel(order_id)
+                expired.append(order)
+        return expired
+
+    def _take(self, order: "Order", pending: Dict[str, float], available: Optional[float]) -> Tuple[float, Optional[float]]:
+        """Quantity fillable now for ``order`` given remaining bar liquidity"""
+        wanted = self._remaining(order, pending)
+        quantity = wanted if available is None else min(wanted, available)
+        if available is not None:
+            available -= quantity
+        pending[order.order_id] = wanted - quantity
+        return quantity, available
+
+    def _record(self, fills: List[Fill], order: "Order", quantity: float, price: float,
+                bar: Bar, liquidity: str, pending: Dict[str, float]) -> None:
+        if quantity > 0:
+            fills.append(Fill(order, quantity, price, bar.timestamp, liquidity))
+        if pending[order.order_id] <= 0:
+            self.cancel(order.order_id)
+
+    def _trigger_stops(self, book: _SymbolBook, bar: Bar, fills: List[Fill],
+                       pending: Dict[str, float], available: Optional[float],
+                       first_bar_orders: List[str]) -> Optional[float]:
+        """Trigger stops reached by the bar; stop orders fill, stop-limits start resting"""
+        triggered: List["Order"] = []
+        first_bar = set(first_bar_orders)
+
+        while book.buy_stops and book.buy_stops[0][0] <= bar.high:
+            order = self._live(heapq.heappop(book.buy_stops)[2])
+            if order is not None:
+                triggered.append(order)
+        while book.sell_stops and -book.sell_stops[0][0] >= bar.low:
+            order = self._live(heapq.heappop(book.sell_stops)[2])
+            if order is not None:
+                triggered.append(order)
+
+        for order in triggered:
+            if order.order_type.value == _STOP_LIMIT:
+                self._push_limit(book, order)
+                continue
+
+            single_bar = order.order_id in first_bar and order.time_in_force.upper() in SINGLE_BAR_TIFS
+            if single_bar and order.time_in_force.upper() == TIF_FOK and available is not None and \
+                    self._remaining(order, pending) > available:
+                # Fill-or-kill cannot be satisfied by this bar's liquidity; expired by process_bar
+                continue
+
+            # Stop becomes a market order: fill at the stop, or the open if the bar gapped through it,
+            # within the range the bar actually traded
+            if order.side == "buy":
+                price = max(order.stop_price, bar.open)
+            else:
+                price = min(order.stop_price, bar.open)
+            price = min(max(price, bar.low), bar.high)
+            quantity, available = self._take(order, pending, available)
+            self._record(fills, order, quantity, price, bar, "stop", pending)
+            if order.order_id in self.active and not single_bar:
+                # Unfilled remainder of a triggered stop keeps trying at market on later bars
+                self._push_limit_market(book, order)
+        return available
+
+    def _push_limit_market(self, book: _SymbolBook, order: "Order") -> None:
+        """Re-queue a triggered stop remainder so it is marketable on every later bar"""
+        if order.side == "buy":
+            heapq.heappush(book.buy_stops, (float('-inf'), self._next_seq(), order.order_id))
+        else:
+            heapq.heappush(book.sell_stops, (float('-inf'), self._next_seq(), order.order_id))
+
+    def _match_limits(self, book: _SymbolBook, bar: Bar, fills: List[Fill],
+                      pending: Dict[str, float], available: Optional[float],
+                      first_bar_orders: List[str]) -> Optional[float]:
+        """Fill limit orders whose price the bar reached, best price first"""
+        fok = {oid for oid in first_bar_orders
+               if oid in self.active and self.active[oid].time_in_force.upper() == TIF_FOK}
+
+        for heap, side in ((book.buy_limits, "buy"), (book.sell_limits, "sell")):
+            deferred = []
+            while heap and (available is None or available > 0):
+                key = heap[0][0]
+                limit_price = -key if side == "buy" else key
+                reached = bar.low <= limit_price if side == "buy" else bar.high >= limit_price
+                if not reached:
+                    break
+                entry = heapq.heappop(heap)
+                order = self._live(entry[2])
+                if order is None:
+                    continue
+
+                if order.order_id in fok and available is not None and \
+                        self._remaining(order, pending) > available:
+                    # Fill-or-kill cannot be satisfied by this bar's liquidity
+                    deferred.append(entry)
+                    continue
+
+                if side == "buy":
+                    price = min(limit_price, bar.open) if bar.open <= limit_price else limit_price
+                else:
+                    price = max(limit_price, bar.open) if bar.open >= limit_price else limit_price
+                quantity, available = self._take(order, pending, available)
+                self._record(fills, order, quantity, price, bar, "limit", pending)
+                if order.order_id in self.active:
+                    deferred.append(entry)
+            for entry in deferred:
+                heapq.heappush(heap, entry)
+        return available
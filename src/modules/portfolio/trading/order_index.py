@@ -0,0 +1,136 @@
+"""
+Order Index
+Incrementally maintained lookups over an executor's orders.
+
+The executor registers every stored order and routes status changes through
+the index, which keeps per-status counts, per-status and per-symbol order
+sets and a creation-time ordering. Summaries and order queries then touch
+only the matching orders instead of scanning every order ever submitted.
+"""
+
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from .executor import Order, OrderStatus
+
+
+def datetime_to_ns(value: datetime) -> int:
+    """Naive local datetime (or pandas Timestamp) as integer epoch nanoseconds, microsecond precision"""
+    # datetime.timestamp() directly: Timestamp.timestamp() reads naive values as UTC
+    return round(datetime.timestamp(value) * 1e6) * 1000
+
+
+class OrderIndex:
+    """Status counters plus symbol, status and creation-time indexes"""
+
+    def __init__(self):
+        self.status_counts: Counter = Counter()
+        # Insertion-ordered dicts used as ordered sets of order ids
+        self._by_status: Dict["OrderStatus", Dict[str, None]] = {}
+        self._by_symbol: Dict[str, Dict[str, None]] = {}
+        # Parallel sorted lists of (created_ns, sequence) keys and order ids
+        self._time_keys: List[tuple] = []
+        self._time_ids: List[str] = []
+        self._orders: Dict[str, "Order"] = {}
+        self._seq = 0
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    def add(self, order: "Order") -> None:
+        """Register an order under its current status"""
+        if order.order_id in self._orders:
+            self.remove(order.order_id)
+        self._orders[order.order_id] = order
+        self.status_counts[order.status] += 1
+        self._by_status.setdefault(order.status, {})[order.order_id] = None
+        self._by_symbol.setdefault(order.symbol, {})[order.order_id] = None
+
+        self._seq += 1
+        key = (order.created_ns, self._seq)
+        if not self._time_keys or key >= self._time_keys[-1]:
+            self._time_keys.append(key)
+            self._time_ids.append(order.order_id)
+        else:
+            position = bisect_right(self._time_keys, key)
+            self._time_keys.insert(position, key)
+            self._time_ids.insert(position, order.order_id)
+
+    def remove(self, order_id: str) -> None:
+        """Drop an order from every index"""
+        order = self._orders.pop(order_id, None)
+        if order is None:
+            return
+        self._discard(order.status, order_id)
+        symbol_ids = self._by_symbol.get(order.symbol, {})
+        symbol_ids.pop(order_id, None)
+        position = self._time_ids.index(order_id)
+        del self._time_keys[position]
+        del self._time_ids[position]
+
+    def set_status(self, order: "Order", status: "OrderStatus") -> None:
+        """Change an order's status and move it between status indexes"""
+        previous = order.status
+        order.status = status
+        if order.order_id not in self._orders or previous == status:
+            return
+        self._discard(previous, order.order_id)
+        self.status_counts[status] += 1
+        self._by_status.setdefault(status, {})[order.order_id] = None
+
+    def count(self, status: "OrderStatus") -> int:
+        return self.status_counts[status]
+
+    def query(self,
+              symbol: Optional[str] = None,
+              status: Optional["OrderStatus"] = None,
+              start_time: Optional[datetime] = None,
+              end_time: Optional[datetime] = None) -> List["Order"]:
+        """
+        Orders matching every given criterion, in creation-time order
+
+        Args:
+            symbol: Only orders for this symbol
+            status: Only orders currently in this status
+            start_time: Inclusive lower bound on created_time
+            end_time: Inclusive upper bound on created_time
+        """
+        candidates = []
+        if symbol is not None:
+            candidates.append(self._by_symbol.get(symbol, {}))
+        if status is not None:
+            candidates.append(self._by_status.get(status, {}))
+
+        time_bounded = start_time is not None or end_time is not None
+        if time_bounded:
+            start_ns = None if start_time is None else datetime_to_ns(start_time)
+            end_ns = None if end_time is None else datetime_to_ns(end_time)
+            low = 0 if start_ns is None else bisect_left(self._time_keys, (start_ns,))
+            high = len(self._time_keys) if end_ns is None else \
+                bisect_right(self._time_keys, (end_ns, float('inf')))
+            # Walk the time range when it is narrower than every other candidate set
+            if not candidates or high - low <= min(len(c) for c in candidates):
+                return [self._orders[oid] for oid in self._time_ids[low:high]
+                        if all(oid in c for c in candidates)]
+
+        if not candidates:
+            return [self._orders[oid] for oid in self._time_ids]
+
+        smallest = min(candidates, key=len)
+        others = [c for c in candidates if c is not smallest]
+        orders = [self._orders[oid] for oid in smallest if all(oid in c for c in others)]
+        if time_bounded:
+            orders = [order for order in orders
+                      if (start_ns is None or order.created_ns >= start_ns)
+                      and (end_ns is None or order.created_ns <= end_ns)]
+        orders.sort(key=lambda order: order.created_ns)
+        return orders
+
+    def _discard(self, status: "OrderStatus", order_id: str) -> None:
+        ids = self._by_status.get(status)
+        if ids is not None and order_id in ids:
+            del ids[order_id]
+            self.status_counts[status] -= 1
@@ -0,0 +1,463 @@
+"""
+Paper Trading Runtime
+Runs a strategy against a streamed market feed with a PaperTradingExecutor.
+
+A ReplayMarketDataServer stands in for a live feed: it replays the local
+``data/raw/price`` files tick by tick (one tick per symbol per bar, in time
+order) onto an asyncio queue. A PaperTradingSession consumes the queue,
+fills orders asynchronously on the following ticks, recalculates target
+weights on a schedule and rebalances, and records latency for every
+tick-to-order and tick-to-fill path.
+"""
+
+import asyncio
+import math
+import time
+from array import array
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from config.system import INITIAL_CAPITAL, REBALANCE_THRESHOLD
+from src.modules.portfolio.performance.streaming import StreamingMetrics
+from src.ui.app_logger import LOG
+from .executor import Order, OrderStatus, OrderType, PaperTradingExecutor
+from .rebalance import RebalancePlanner
+
+
+@dataclass
+class MarketTick:
+    """One bar for one symbol, stamped when it was published to the feed"""
+    symbol: str
+    timestamp: datetime
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: Optional[float]
+    published_ns: int = 0
+
+
+class ReplayMarketDataServer:
+    """Replays OHLCV frames as a time-ordered tick stream on an asyncio queue"""
+
+    def __init__(self, market_data: Dict[str, pd.DataFrame], interval: float = 0.0):
+        """
+        Args:
+            market_data: OHLCV frames per symbol, indexed by date (``close`` required)
+            interval: Seconds to wait between ticks (0 replays as fast as possible)
+        """
+        self.interval = interval
+        self._ticks = self._flatten(market_data)
+
+    @classmethod
+    def from_price_files(cls, data_root: str = "data", interval: float = 0.0) -> "ReplayMarketDataServer":
+        """Replay the raw price CSVs under ``<data_root>/raw/price``"""
+        from src.modules.data_management.data_center.data_loader import DataLoader
+
+        market_data = DataLoader(data_root).load_market_data()
+        market_data = {name: df for name, df in market_data.items()
+                       if not df.empty and 'close' in df.columns}
+        return cls(market_data, interval)
+
+    def __len__(self) -> int:
+        return len(self._ticks['symbol'])
+
+    @staticmethod
+    def _flatten(market_data: Dict[str, pd.DataFrame]) -> Dict[str, np.ndarray]:
+        """Stack every symbol's bars into columns sorted by (timestamp, symbol)"""
+        frames = []
+        for symbol, frame in market_data.items():
+            if frame is None or frame.empty:
+                continue
+            close = frame['close'].astype(float)
+            frames.append(pd.DataFrame({
+                'timestamp': frame.index,
+                'symbol': symbol,
+                'open': frame['open'].astype(float) if 'open' in frame else close,
+                'high': frame['high'].astype(float) if 'high' in frame else close,
+                'low': frame['low'].astype(float) if 'low' in frame else close,
+                'close': close,
+                'volume': frame['volume'].astype(float) if 'volume' in frame else np.nan,
+            }))
+        if not frames:
+            return {'symbol': np.array([], dtype=object)}
+        ticks = pd.concat(frames, ignore_index=True).sort_values(['timestamp', 'symbol'], kind='stable')
+        columns = {name: ticks[name].to_numpy() for name in ticks.columns}
+        columns['timestamp'] = ticks['timestamp'].dt.to_pydatetime()
+        return columns
+
+    async def publish(self, queue: asyncio.Queue) -> int:
+        """Publish every tick, then a None end-of-stream marker; returns the tick count"""
+        ticks = self._ticks
+        count = len(self)
+        volume = ticks.get('volume')
+        for i in range(count):
+            tick_volume = None if volume is None or np.isnan(volume[i]) else float(volume[i])
+            tick = MarketTick(ticks['symbol'][i], ticks['timestamp'][i], float(ticks['open'][i]),
+                              float(ticks['high'][i]), float(ticks['low'][i]), float(ticks['close'][i]),
+                              tick_volume)
+            tick.published_ns = time.perf_counter_ns()
+            await queue.put(tick)
+            if self.interval > 0:
+                await asyncio.sleep(self.interval)
+        await queue.put(None)
+        return count
+
+
+class LatencyTracker:
+    """Nanosecond latency samples per named path, summarized in microseconds"""
+
+    def __init__(self):
+        self._samples: Dict[str, array] = {}
+
+    def record(self, path: str, start_ns: int, end_ns: Optional[int] = None) -> None:
+        end_ns = time.perf_counter_ns() if end_ns is None else end_ns
+        self._samples.setdefault(path, array('q')).append(end_ns - start_ns)
+
+    def count(self, path: str) -> int:
+        return len(self._samples.get(path, ()))
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        result = {}
+        for path, samples in self._samples.items():
+            if not samples:
+                continue
+            values = np.frombuffer(samples, dtype=np.int64) / 1_000.0
+            p50, p95, p99 = np.percentile(values, [50, 95, 99])
+            result[path] = {
+                'count': len(values),
+                'mean_us': float(values.mean()),
+                'p50_us': float(p50),
+                'p95_us': float(p95),
+                'p99_us': float(p99),
+                'max_us': float(values.max()),
+            }
+        return result
+
+
+class PaperTradingSession:
+    """
+    Strategy loop for paper trading
+
+    At the close of every ``rebalance_days``-th trading day the session asks
+    ``target_weights_fn(current_date)`` for target weights, which can be a
+    strategy's ``calculate_target_weights`` or a standalone function such as
+    ``calculate_target_weights_standalone`` bound to its processed data.
+    Orders are submitted when the next day's first tick arrives and fill on
+    each symbol's next tick. Sells go first: buys are held back until the
+    rebalance's sells have filled, and each buy is cut down to the cash
+    available at its fill price, so a gap-up open cannot overdraw the account.
+    A rebalance waits for buys placed during the previous day; orders older
+    than that are cancelled and re-planned.
+
+    Before submitting, the session loads its book into the executor's
+    pre-trade risk engine, so orders breaching the position/sector limits
+    are rejected unless the executor was built with enforce_risk_limits=False.
+
+    With a journaled executor, the session checkpoints the last bar it fully
+    processed; after a restart it restores cash and positions from the
+    journaled fills and skips feed ticks at or before that bar.
+    """
+
+    def __init__(self,
+                 executor: PaperTradingExecutor,
+                 target_weights_fn: Callable[[Any], Dict[str, float]],
+                 strategy_name: str = "PaperTrading",
+                 initial_cash: float = INITIAL_CAPITAL,
+                 rebalance_days: int = 1,
+                 threshold: float = REBALANCE_THRESHOLD,
+                 queue_size: int = 10_000,
+                 planner: Optional[RebalancePlanner] = None):
+        self.executor = executor
+        self.target_weights_fn = target_weights_fn
+        self.strategy_name = strategy_name
+        self.cash = float(initial_cash)
+        self.rebalance_days = max(int(rebalance_days), 1)
+        self.threshold = threshold
+        self.queue_size = queue_size
+        self.planner = planner or RebalancePlanner.unconstrained()
+
+        self.positions: Dict[str, float] = {}
+        self.last_prices: Dict[str, float] = {}
+        self.portfolio_values: List[float] = []
+        self.portfolio_dates: List[Any] = []
+        self.rebalance_log: List[Dict[str, Any]] = []
+        self.metrics = StreamingMetrics(strategy_name)
+        self.latency = LatencyTracker()
+
+        self._current_timestamp = None
+        self._trading_days = 0
+        self._order_seq = 0
+        self._rebalanced_once = False
+        # Buys waiting for the current rebalance's sells to fill
+        self._deferred_buys: List[Order] = []
+        self._open_sells: set = set()
+        # Last bar processed before a restart; ticks up to it are skipped
+        self._resume_after: Optional[datetime] = None
+        # Tick publish time per order id, for tick-to-fill latency
+        self._order_origin_ns: Dict[str, int] = {}
+        self._restore_from_journal()
+
+    @property
+    def portfolio_value(self) -> float:
+        return self.cash + sum(qty * self.last_prices.get(symbol, 0.0) for symbol, qty in self.positions.items())
+
+    def current_weights(self) -> Dict[str, float]:
+        value = self.portfolio_value
+        if value <= 0:
+            return {}
+        return {symbol: qty * self.last_prices.get(symbol, 0.0) / value
+                for symbol, qty in self.positions.items() if qty}
+
+    async def run(self, server: ReplayMarketDataServer) -> Dict[str, Any]:
+        """Replay the server's feed through the session and return a summary"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        producer = asyncio.create_task(server.publish(queue))
+        try:
+            while True:
+                tick = await queue.get()
+                if tick is None:
+                    break
+                self.on_tick(tick)
+            await producer
+        finally:
+            if not producer.done():
+                producer.cancel()
+        if self._current_timestamp is not None:
+            # The last bar's rebalance needs the next bar, which a restarted session provides
+            self._checkpoint(self._current_timestamp, closed=False)
+            self._close_day(self._current_timestamp)
+        return self.summary()
+
+    def on_tick(self, tick: MarketTick) -> None:
+        """Handle one tick: close out the previous day if needed, then fill and mark prices"""
+        received_ns = time.perf_counter_ns()
+        self.latency.record('feed_to_consumer', tick.published_ns, received_ns)
+
+        if self._resume_after is not None and tick.timestamp <= self._resume_after:
+            # Already traded before the restart: only mark the price
+            self.last_prices[tick.symbol] = tick.close
+            return
+
+        if self._current_timestamp is not None and tick.timestamp != self._current_timestamp:
+            self._close_day(self._current_timestamp)
+            if self._rebalance_due():
+                self._rebalance(self._current_timestamp, tick)
+            self._checkpoint(self._current_timestamp, closed=True)
+        self._current_timestamp = tick.timestamp
+
+        self._fit_buys_to_cash(tick)
+        records = self.executor.on_tick(tick.symbol, tick.timestamp, tick.open, tick.high,
+                                        tick.low, tick.close, tick.volume)
+        for record in records:
+            self._apply_fill(record)
+            origin = self._order_origin_ns.pop(record['order_id'], None)
+            if origin is not None:
+                self.latency.record('order_to_fill', origin)
+            self.latency.record('tick_to_fill', tick.published_ns)
+        self.last_prices[tick.symbol] = tick.close
+
+        if self._deferred_buys:
+            self._open_sells = {order_id for order_id in self._open_sells
+                                if self.executor.orders[order_id].status == OrderStatus.SUBMITTED}
+            if not self._open_sells:
+                self._submit(self._deferred_buys, tick)
+                self._deferred_buys = []
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'strategy_name': self.strategy_name,
+            'final_value': self.portfolio_value,
+            'cash': self.cash,
+            'positions': {symbol: qty for symbol, qty in self.positions.items() if qty},
+            'trading_days': self._trading_days,
+            'rebalances': len(self.rebalance_log),
+            'metrics': self.metrics.metrics(),
+            'execution': self.executor.get_execution_summary(),
+            'latency': self.latency.summary(),
+        }
+
+    def _restore_from_journal(self) -> None:
+        """Rebuild cash, positions and the replay position from a journaled executor after a restart"""
+        journal = self.executor.journal
+        if journal is None:
+            return
+        checkpoint = journal.load_checkpoint(self.strategy_name)
+        if checkpoint is not None:
+            self._resume_after = checkpoint['bar_time']
+            self._trading_days = checkpoint['trading_days']
+            self._rebalanced_once = True
+            if not checkpoint['closed']:
+                # The next bar closes the checkpointed day and runs its rebalance
+                self._current_timestamp = self._resume_after
+            LOG.info(f"Paper session {self.strategy_name} resumes after {self._resume_after}")
+        if not self.executor.execution_count:
+            return
+        fills = journal.fills_frame()
+        signed = np.where(fills['side'] == "buy", 1.0, -1.0) * fills['quantity'].to_numpy()
+        positions = pd.Series(signed).groupby(fills['symbol'].to_numpy()).sum()
+        self.positions = {symbol: float(qty) for symbol, qty in positions.items() if qty}
+        self.last_prices.update(fills.groupby('symbol')['price'].last().to_dict())
+        self.cash -= float((signed * fills['price'].to_numpy()).sum() + fills['commission'].sum())
+        self._order_seq = max((int(order_id.rsplit('_', 1)[-1]) for order_id in self.executor.orders
+                               if order_id.startswith("PAPER_")), default=0)
+        self._rebalanced_once = True
+        LOG.info(f"Paper session restored {len(self.positions)} positions from {len(fills)} journaled fills")
+    
+    def _checkpoint(self, timestamp, closed: bool) -> None:
+        """Journal the last fully processed bar, and whether its close and rebalance are done"""
+        if self.executor.journal is not None:
+            self.executor.journal.record_checkpoint(self.strategy_name, timestamp, self._trading_days, closed)
+
+    def _close_day(self, timestamp) -> None:
+        value = self.portfolio_value
+        self._trading_days += 1
+        self.portfolio_dates.append(timestamp)
+        self.portfolio_values.append(value)
+        self.metrics.add_value(value)
+
+    def _rebalance_due(self) -> bool:
+        return not self._rebalanced_once or (self._trading_days - 1) % self.rebalance_days == 0
+
+    def _rebalance(self, as_of, tick: MarketTick) -> None:
+        """Compute target weights as of the closed day and submit the resulting orders"""
+        as_of_date = as_of.date() if hasattr(as_of, 'date') else as_of
+        try:
+            target_weights = self.target_weights_fn(as_of_date)
+        except Exception as e:
+            LOG.error(f"Paper trading weight calculation failed on {as_of_date}: {e}")
+            return
+
+        current = self.current_weights()
+        drift = max((abs(current.get(s, 0.0) - w) for s, w in target_weights.items()), default=0.0)
+        if self._rebalanced_once and drift <= self.threshold:
+            return
+
+        # Orders placed during the closed day (deferred buys) fill on this bar; plan after they settle.
+        # Anything older is stale: cancel it and plan from the current book.
+        outstanding = [order for orders in self.executor.pending_market_orders.values() for order in orders
+                       if order.status == OrderStatus.SUBMITTED]
+        if any(order.created_time >= as_of for order in outstanding):
+            LOG.info(f"Paper rebalance for {as_of_date} skipped: {len(outstanding)} orders have not filled yet")
+            return
+        for order in outstanding:
+            self.executor.cancel_order(order.order_id)
+        self._deferred_buys = []
+
+        value = self.portfolio_value
+        # Assets without a price yet (e.g. CASH) are not traded; sells come first
+        plan = self.planner.plan_from_holdings(self.positions, self.last_prices, target_weights,
+                                               cash=self.cash, portfolio_value=value)
+        orders = []
+        for symbol, side, quantity in plan.trades():
+            self._order_seq += 1
+            orders.append(Order(
+                order_id=f"PAPER_{self._order_seq}",
+                symbol=symbol,
+                quantity=quantity,
+                order_type=OrderType.MARKET,
+                side=side,
+                created_time=tick.timestamp,
+                metadata={'strategy': self.strategy_name},
+            ))
+        sells = [order for order in orders if order.side == "sell"]
+        buys = [order for order in orders if order.side == "buy"]
+        if sells:
+            accepted = self._submit(sells, tick)
+            self._open_sells = {order.order_id for order in accepted}
+            if self._open_sells:
+                self._deferred_buys = buys
+                buys = []
+        if buys:
+            self._submit(buys, tick)
+
+        self._rebalanced_once = True
+        self.rebalance_log.append({
+            'date': as_of_date,
+            'total_portfolio_value': value,
+            'orders': len(orders),
+            'current_weights': current,
+            'target_weights': dict(target_weights),
+        })
+
+    def _submit(self, orders: List[Order], tick: MarketTick) -> List[Order]:
+        """Submit orders to the executor; returns the accepted ones"""
+        # Pre-trade risk checks weigh the orders against the session's book
+        self.executor.risk_engine.update_portfolio(self.positions, self.last_prices, self.cash)
+        results = self.executor.submit_orders(orders)
+        submitted_ns = time.perf_counter_ns()
+        self.latency.record('tick_to_order', tick.published_ns, submitted_ns)
+        accepted = [order for order, ok in zip(orders, results) if ok]
+        for order in accepted:
+            self._order_origin_ns[order.order_id] = submitted_ns
+        return accepted
+
+    def _fit_buys_to_cash(self, tick: MarketTick) -> None:
+        """Cut buys filling on this tick down to the cash available at its open"""
+        pending = [order for order in self.executor.pending_market_orders.get(tick.symbol, [])
+                   if order.side == "buy" and order.status == OrderStatus.SUBMITTED]
+        available = self.cash
+        for order in pending:
+            costs = self.executor.cost_model.estimate(tick.open, order.quantity, "buy",
+                                                      volume=np.nan if tick.volume is None else tick.volume)
+            cost = float(costs.execution_price) * order.quantity + float(costs.commission)
+            if cost > available:
+                # Costs per share do not grow for smaller orders, so this never overshoots
+                quantity = math.floor(max(available, 0.0) * order.quantity / cost)
+                LOG.warning(f"Paper buy {order.order_id} cut from {order.quantity:g} to {quantity} {order.symbol}: "
+                            f"{cost:,.2f} needed at the open, {available:,.2f} cash available")
+                cost = cost * quantity / order.quantity
+                self.executor.resize_order(order.order_id, quantity)
+            available -= cost
+
+    def _apply_fill(self, record: Dict[str, Any]) -> None:
+        quantity = record['quantity']
+        notional = quantity * record['price']
+        if record['side'] == "buy":
+            self.positions[record['symbol']] = self.positions.get(record['symbol'], 0.0) + quantity
+            self.cash -= notional + record['commission']
+        else:
+            self.positions[record['symbol']] = self.positions.get(record['symbol'], 0.0) - quantity
+            self.cash += notional - record['commission']
+
+
+def run_paper_trading(target_weights_fn: Callable[[Any], Dict[str, float]],
+                      strategy_name: str = "PaperTrading",
+                      data_root: str = "data",
+                      interval: float = 0.0,
+                      journal_path: Optional[str] = None,
+                      enforce_risk_limits: bool = True,
+                      **session_kwargs) -> Dict[str, Any]:
+    """
+    Convenience entry point: replay local price files through a paper session
+
+    Args:
+        target_weights_fn: Callable returning target weights for a date
+        strategy_name: Name used for logging and metrics
+        data_root: Data directory containing raw/price
+        interval: Seconds between replayed ticks
+        journal_path: Order journal to resume from and write to
+        enforce_risk_limits: Reject orders breaching the position/sector limits;
+                             False only reports them
+        **session_kwargs: Passed to PaperTradingSession
+
+    Returns:
+        Session summary, or {'error': ...} if no price data is available
+    """
+    server = ReplayMarketDataServer.from_price_files(data_root, interval)
+    if len(server) == 0:
+        LOG.error(f"No price data found under {data_root}/raw/price for paper trading")
+        return {'error': 'No price data available'}
+    executor = PaperTradingExecutor(journal_path=journal_path, enforce_risk_limits=enforce_risk_limits)
+    session = PaperTradingSession(executor, target_weights_fn, strategy_name, **session_kwargs)
+    LOG.info(f"Starting paper trading for {strategy_name}: {len(server)} ticks")
+    try:
+        summary = asyncio.run(session.run(server))
+    finally:
+        executor.close()
+    LOG.info(f"Paper trading finished for {strategy_name}: final value {summary['final_value']:,.2f}")
+    return summary
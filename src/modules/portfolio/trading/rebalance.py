@@ -0,0 +1,267 @@
+"""
+Rebalance Planner
+Turns target weights into the minimal list of share trades.
+
+Current holdings, prices and target weights are handled as aligned numpy
+arrays, so planning a rebalance is a handful of vectorized operations
+whatever the number of assets. The planner:
+
+- caps target weights at ``max_position_size`` per asset and scales each
+  sector down to ``max_sector_allocation`` (config/system.py limits, sector
+  membership from config/sectors.py); capped weight stays uninvested.
+  Assets without a sector mapping are subject to the position limit only
+  (see sector_limited, shared with the pre-trade risk checks)
+- rounds target positions down to whole lots
+- skips assets whose weight is within ``no_trade_band`` of the target
+- sequences sells before buys and scales buys down to the cash available
+  once the sells have settled
+
+The resulting RebalancePlan is used by backtest strategies, executors (via
+to_orders) and the holdings page gap analysis.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config.sectors import ASSET_SECTOR_MAPPING
+from config.system import MAX_POSITION_SIZE, MAX_SECTOR_ALLOCATION
+
+# Cash equivalents, exempt from position and sector limits
+CASH_ASSETS = ('CASH',)
+
+
+def sector_limited(assets: Sequence[str], sector_mapping: Dict[str, str],
+                   cash_assets: Iterable[str] = CASH_ASSETS) -> np.ndarray:
+    """
+    Mask of the assets the sector limit applies to
+
+    Cash equivalents and assets missing from ``sector_mapping`` are excluded:
+    an unmapped asset has no known sector to measure, so lumping unrelated
+    assets into one catch-all sector would cap them arbitrarily.
+    """
+    cash_assets = frozenset(cash_assets)
+    return np.fromiter((asset in sector_mapping and asset not in cash_assets for asset in assets),
+                       dtype=bool, count=len(assets))
+
+
+def _format_quantity(quantity: float) -> str:
+    """Share count without scientific notation: whole shares, or 4 decimals for fractional lots"""
+    if float(quantity).is_integer():
+        return f"{quantity:,.0f}"
+    return f"{quantity:,.4f}"
+
+
+@dataclass
+class RebalancePlan:
+    """Per-asset rebalance arrays; trades() lists the resulting orders in execution order"""
+    assets: np.ndarray
+    prices: np.ndarray
+    current_shares: np.ndarray
+    target_shares: np.ndarray
+    trade_shares: np.ndarray
+    current_weights: np.ndarray
+    target_weights: np.ndarray
+    portfolio_value: float
+    # Cash left after every planned trade settles (before costs)
+    ending_cash: float
+
+    def trades(self) -> List[Tuple[str, str, float]]:
+        """(asset, side, quantity) per trade, sells first, then buys, each in asset order"""
+        sells = np.flatnonzero(self.trade_shares < 0)
+        buys = np.flatnonzero(self.trade_shares > 0)
+        return ([(self.assets[i], "sell", float(-self.trade_shares[i])) for i in sells] +
+                [(self.assets[i], "buy", float(self.trade_shares[i])) for i in buys])
+
+    def closes(self) -> np.ndarray:
+        """Mask of assets whose whole position is sold"""
+        return (self.trade_shares < 0) & (self.target_shares == 0)
+
+    def descriptions(self) -> List[str]:
+        """Human-readable transactions, e.g. for rebalance logs"""
+        closes = set(self.assets[self.closes()].tolist())
+        return [f"Close {asset}" if asset in closes else
+                f"{side.capitalize()} {_format_quantity(quantity)} of {asset}"
+                for asset, side, quantity in self.trades()]
+
+    def to_orders(self, executor, **kwargs) -> List[Any]:
+        """Market orders for the plan, created through ``executor.create_market_order``"""
+        return [executor.create_market_order(asset, quantity, side, **kwargs)
+                for asset, side, quantity in self.trades()]
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({
+            'price': self.prices,
+            'current_shares': self.current_shares,
+            'target_shares': self.target_shares,
+            'trade_shares': self.trade_shares,
+            'current_weight': self.current_weights,
+            'target_weight': self.target_weights,
+        }, index=pd.Index(self.assets, name='asset'))
+
+
+class RebalancePlanner:
+    """Vectorized target-weight to trade-list planner"""
+
+    def __init__(self,
+                 max_position_size: Optional[float] = MAX_POSITION_SIZE,
+                 max_sector_allocation: Optional[float] = MAX_SECTOR_ALLOCATION,
+                 no_trade_band: float = 0.0,
+                 lot_sizes: Optional[Dict[str, float]] = None,
+                 default_lot_size: float = 1.0,
+                 sector_mapping: Optional[Dict[str, str]] = None,
+                 cash_assets: Sequence[str] = CASH_ASSETS):
+        """
+        Args:
+            max_position_size: Maximum weight per asset (None disables the limit)
+            max_sector_allocation: Maximum weight per sector (None disables the limit)
+            no_trade_band: Leave assets alone whose weight is within this distance of target
+            lot_sizes: Tradable lot size per asset
+            default_lot_size: Lot size for assets not in ``lot_sizes``
+            sector_mapping: Asset to sector mapping (defaults to config/sectors.py)
+            cash_assets: Cash-equivalent assets, exempt from position and sector limits
+        """
+        self.max_position_size = max_position_size
+        self.max_sector_allocation = max_sector_allocation
+        self.no_trade_band = no_trade_band
+        self.lot_sizes = lot_sizes or {}
+        self.default_lot_size = default_lot_size
+        self.sector_mapping = ASSET_SECTOR_MAPPING if sector_mapping is None else sector_mapping
+        self.cash_assets = frozenset(cash_assets)
+
+    @classmethod
+    def unconstrained(cls, **kwargs) -> "RebalancePlanner":
+        """Planner that follows target weights as given, without position or sector limits"""
+        return cls(max_position_size=None, max_sector_allocation=None, **kwargs)
+
+    def apply_limits(self, assets: Sequence[str], weights: Any) -> np.ndarray:
+        """Target weights capped per asset and scaled down per sector; cash assets are untouched"""
+        assets = np.asarray(assets, dtype=object)
+        weights = np.clip(np.asarray(weights, dtype=float), 0.0, None)
+        limited = ~np.isin(assets, list(self.cash_assets))
+        if self.max_position_size is not None:
+            weights = np.where(limited, np.minimum(weights, self.max_position_size), weights)
+        in_sector = sector_limited(assets, self.sector_mapping, self.cash_assets)
+        if self.max_sector_allocation is not None and in_sector.any():
+            sectors = np.array([self.sector_mapping.get(asset, '') for asset in assets], dtype=object)
+            codes = np.unique(sectors, return_inverse=True)[1]
+            totals = np.bincount(codes, weights=np.where(in_sector, weights, 0.0))
+            with np.errstate(divide='ignore', invalid='ignore'):
+                scale = np.where(totals > self.max_sector_allocation,
+                                 self.max_sector_allocation / totals, 1.0)
+            weights = np.where(in_sector, weights * scale[codes], weights)
+        return weights
+
+    def plan(self,
+             assets: Sequence[str],
+             current_shares: Any,
+             prices: Any,
+             target_weights: Any,
+             cash: float = 0.0,
+             portfolio_value: Optional[float] = None) -> RebalancePlan:
+        """
+        Plan the trades that move current holdings to target weights
+
+        Args:
+            assets: Asset names
+            current_shares: Shares held per asset
+            prices: Current price per asset (NaN or non-positive prices are never traded)
+            target_weights: Target weight per asset, or a {asset: weight} mapping
+                            (assets missing from the mapping target 0)
+            cash: Uninvested cash
+            portfolio_value: Total portfolio value (defaults to cash + holdings value)
+
+        Returns:
+            RebalancePlan with per-asset arrays
+        """
+        assets = np.asarray(list(assets), dtype=object)
+        shares = np.asarray(current_shares, dtype=float)
+        prices = np.asarray(prices, dtype=float)
+        if isinstance(target_weights, dict):
+            target_weights = [target_weights.get(asset, 0.0) for asset in assets]
+        targets = self.apply_limits(assets, target_weights)
+
+        tradable = np.isfinite(prices) & (prices > 0)
+        values = np.where(tradable, shares * np.where(tradable, prices, 0.0), 0.0)
+        if portfolio_value is None:
+            portfolio_value = float(cash + values.sum())
+        with np.errstate(divide='ignore', invalid='ignore'):
+            current = values / portfolio_value if portfolio_value > 0 else np.zeros_like(values)
+
+        lots = np.array([self.lot_sizes.get(asset, self.default_lot_size) for asset in assets], dtype=float)
+        safe_price = np.where(tradable, prices, 1.0)
+        target_shares = np.floor(targets * portfolio_value / (safe_price * lots)) * lots
+        target_shares = np.where(tradable, target_shares, shares)
+
+        trade = target_shares - shares
+        if self.no_trade_band > 0:
+            hold = np.abs(targets - current) <= self.no_trade_band
+            trade = np.where(hold, 0.0, trade)
+
+        # Sells settle first; buys may only spend what is then available
+        proceeds = float(-(np.minimum(trade, 0.0) * safe_price).sum())
+        buys = np.maximum(trade, 0.0)
+        spend = float((buys * safe_price).sum())
+        available = cash + proceeds
+        if spend > available > 0 and spend > 0:
+            scaled = np.floor(buys * (available / spend) / lots) * lots
+            trade = np.where(trade > 0, scaled, trade)
+            spend = float((np.maximum(trade, 0.0) * safe_price).sum())
+        elif spend > 0 and available <= 0:
+            trade = np.minimum(trade, 0.0)
+            spend = 0.0
+
+        return RebalancePlan(
+            assets=assets,
+            prices=prices,
+            current_shares=shares,
+            target_shares=shares + trade,
+            trade_shares=trade,
+            current_weights=current,
+            target_weights=targets,
+            portfolio_value=portfolio_value,
+            ending_cash=cash + proceeds - spend,
+        )
+
+    def plan_from_holdings(self,
+                           holdings: Dict[str, float],
+                           prices: Dict[str, float],
+                           target_weights: Dict[str, float],
+                           cash: float = 0.0,
+                           portfolio_value: Optional[float] = None) -> RebalancePlan:
+        """plan() for {asset: shares} and {asset: price} mappings over the union of assets"""
+        assets = sorted(set(holdings) | set(target_weights) | set(prices))
+        return self.plan(
+            assets,
+            [holdings.get(asset, 0.0) for asset in assets],
+            [prices.get(asset, np.nan) for asset in assets],
+            target_weights,
+            cash=cash,
+            portfolio_value=portfolio_value,
+        )
+
+    def weight_gaps(self,
+                    current_weights: Dict[str, float],
+                    target_weights: Dict[str, float],
+                    assets: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """
+        Weight-level gap analysis (no prices needed)
+
+        Returns:
+            DataFrame indexed by asset with current, target (after limits), gap
+            and within_band columns
+        """
+        if assets is None:
+            assets = sorted(set(current_weights) | set(target_weights))
+        assets = list(assets)
+        current = np.array([current_weights.get(asset, 0.0) for asset in assets], dtype=float)
+        target = self.apply_limits(assets, [target_weights.get(asset, 0.0) for asset in assets])
+        gap = target - current
+        return pd.DataFrame({
+            'current': current,
+            'target': target,
+            'gap': gap,
+            'within_band': np.abs(gap) <= self.no_trade_band,
+        }, index=pd.Index(assets, name='asset'))
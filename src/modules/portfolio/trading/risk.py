@@ -0,0 +1,206 @@
+"""
+Pre-Trade Risk Checks
+Enforces the config/system.py risk limits on order batches before submission.
+
+PreTradeRiskEngine keeps a portfolio snapshot (positions, last prices and
+cash), updated by its owner through update_portfolio() and by executors
+as orders fill. check_orders() evaluates a whole batch at once: exposure
+changes are aggregated per asset and per sector with bincount over the
+precomputed sector membership, so a check costs O(orders + assets) and
+is cheap enough to run on every bar of a backtest.
+
+An order is rejected when it adds exposure to an asset whose post-trade
+weight exceeds MAX_POSITION_SIZE, or to a sector whose post-trade weight
+exceeds MAX_SECTOR_ALLOCATION. Orders that reduce exposure always pass.
+Cash equivalents are exempt, and assets without a sector mapping are
+subject to the position limit only (the same policy as RebalancePlanner,
+via rebalance.sector_limited). With ``enforce=False`` the engine only
+reports violations, for monitoring strategies whose allocation policy
+intentionally exceeds the limits.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from config.sectors import ASSET_SECTOR_MAPPING
+from config.system import MAX_POSITION_SIZE, MAX_SECTOR_ALLOCATION
+from src.ui.app_logger import LOG
+from .costs import side_sign
+from .rebalance import CASH_ASSETS, sector_limited
+
+# Tolerance for floating-point weight comparisons
+_EPSILON = 1e-9
+
+
+@dataclass
+class RiskCheckResult:
+    """Outcome of a pre-trade check, aligned with the checked orders"""
+    approved: np.ndarray
+    reasons: List[Optional[str]]
+    # Post-trade weights of the assets and sectors touched by the batch
+    asset_weights: Dict[str, float] = field(default_factory=dict)
+    sector_weights: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def all_approved(self) -> bool:
+        return bool(self.approved.all())
+
+    def rejections(self, labels: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        """Rejected orders with their reasons; ``labels`` names them (defaults to position)"""
+        return [{'order': labels[i] if labels is not None else i, 'reason': self.reasons[i]}
+                for i in np.flatnonzero(~self.approved)]
+
+
+class PreTradeRiskEngine:
+    """Position and sector limit checks over order batches"""
+
+    def __init__(self,
+                 max_position_size: Optional[float] = MAX_POSITION_SIZE,
+                 max_sector_allocation: Optional[float] = MAX_SECTOR_ALLOCATION,
+                 sector_mapping: Optional[Dict[str, str]] = None,
+                 cash_assets: Sequence[str] = CASH_ASSETS,
+                 enforce: bool = True):
+        """
+        Args:
+            max_position_size: Maximum post-trade weight per asset (None disables)
+            max_sector_allocation: Maximum post-trade weight per sector (None disables)
+            sector_mapping: Asset to sector mapping (defaults to config/sectors.py)
+            cash_assets: Assets exempt from both limits
+            enforce: Reject violating orders; False only reports them
+        """
+        self.max_position_size = max_position_size
+        self.max_sector_allocation = max_sector_allocation
+        self.enforce = enforce
+        self.cash_assets = frozenset(cash_assets)
+
+        # Precomputed sector membership: asset -> sector code
+        mapping = ASSET_SECTOR_MAPPING if sector_mapping is None else sector_mapping
+        self.sector_mapping = mapping
+        self.sectors: List[str] = sorted(set(mapping.values()))
+        self._sector_codes: Dict[str, int] = {sector: i for i, sector in enumerate(self.sectors)}
+        self._asset_sector: Dict[str, int] = {asset: self._sector_codes[sector] for asset, sector in mapping.items()}
+
+        self.positions: Dict[str, float] = {}
+        self.prices: Dict[str, float] = {}
+        self.cash = 0.0
+        self.rejected_count = 0
+
+    def update_portfolio(self,
+                         positions: Optional[Dict[str, float]] = None,
+                         prices: Optional[Dict[str, float]] = None,
+                         cash: Optional[float] = None) -> None:
+        """Replace the positions (shares) and cash snapshot and refresh prices"""
+        if positions is not None:
+            self.positions = {asset: float(qty) for asset, qty in positions.items() if qty}
+        if prices is not None:
+            self.prices.update(prices)
+        if cash is not None:
+            self.cash = float(cash)
+
+    def record_fills(self, symbols: Sequence[str], sides: Any, quantities: Any, prices: Any,
+                     commissions: Any = 0.0) -> None:
+        """Apply executed fills to the snapshot"""
+        signed = side_sign(sides) * np.abs(np.asarray(quantities, dtype=float))
+        prices = np.broadcast_to(np.asarray(prices, dtype=float), signed.shape)
+        self.cash -= float((signed * prices).sum() + np.sum(commissions))
+        for symbol, qty, price in zip(symbols, signed.tolist(), prices.tolist()):
+            self.positions[symbol] = self.positions.get(symbol, 0.0) + qty
+            self.prices[symbol] = price
+
+    @property
+    def portfolio_value(self) -> float:
+        return self.cash + sum(qty * self.prices.get(asset, 0.0) for asset, qty in self.positions.items())
+
+    def check_orders(self,
+                     symbols: Sequence[str],
+                     sides: Any,
+                     quantities: Any,
+                     prices: Optional[Any] = None) -> RiskCheckResult:
+        """
+        Check a batch of orders against position and sector limits
+
+        Args:
+            symbols: Symbol per order
+            sides: 'buy'/'sell' labels or signed numbers per order
+            quantities: Order quantities (sign ignored)
+            prices: Reference price per order (NaN or None uses the snapshot price)
+
+        Returns:
+            RiskCheckResult; in report-only mode every order is approved and
+            reasons still describe the violations
+        """
+        count = len(symbols)
+        reasons: List[Optional[str]] = [None] * count
+        value = self.portfolio_value
+        if count == 0 or (self.max_position_size is None and self.max_sector_allocation is None):
+            return RiskCheckResult(np.ones(count, dtype=bool), reasons)
+        if value <= 0:
+            # Weights are undefined without a portfolio snapshot (see update_portfolio)
+            LOG.warning(f"Pre-trade risk check skipped for {count} orders: portfolio value is {value:.2f}; "
+                        f"call update_portfolio() with positions, prices and cash")
+            return RiskCheckResult(np.ones(count, dtype=bool), reasons)
+
+        symbols = np.asarray(symbols, dtype=object)
+        assets, inverse = np.unique(symbols, return_inverse=True)
+        snapshot = np.array([self.prices.get(asset, np.nan) for asset in assets], dtype=float)
+        price = snapshot[inverse] if prices is None else np.asarray(prices, dtype=float)
+        price = np.where(np.isfinite(price), price, snapshot[inverse])
+        signed = side_sign(sides) * np.abs(np.asarray(quantities, dtype=float))
+        delta = np.nan_to_num(signed * price)
+
+        # Post-trade exposure per asset touched by the batch
+        asset_price = np.where(np.isfinite(snapshot), snapshot, 0.0)
+        current = np.array([self.positions.get(asset, 0.0) for asset in assets], dtype=float) * asset_price
+        asset_weight = (current + np.bincount(inverse, weights=delta, minlength=len(assets))) / value
+        limited = ~np.isin(assets, list(self.cash_assets))
+        breach = np.zeros(len(assets), dtype=bool)
+        if self.max_position_size is not None:
+            breach |= limited & (asset_weight > self.max_position_size + _EPSILON)
+
+        # Post-trade exposure per sector, from the whole portfolio plus the batch
+        sector_weight = np.zeros(len(self.sectors) + 1)
+        asset_sector = np.array([self._sector_of(asset) for asset in assets], dtype=np.int64)
+        if self.max_sector_allocation is not None:
+            held = [asset for asset in self.positions if asset not in self.cash_assets]
+            if held:
+                codes = np.fromiter((self._sector_of(asset) for asset in held), dtype=np.int64, count=len(held))
+                values = np.fromiter((self.positions[a] * self.prices.get(a, 0.0) for a in held),
+                                     dtype=float, count=len(held))
+                sector_weight += np.bincount(codes, weights=values, minlength=len(sector_weight))
+            batch_delta = np.where(limited[inverse], delta, 0.0)
+            sector_weight += np.bincount(asset_sector[inverse], weights=batch_delta, minlength=len(sector_weight))
+            sector_weight /= value
+            sector_breach = sector_weight > self.max_sector_allocation + _EPSILON
+            breach |= sector_limited(assets, self.sector_mapping, self.cash_assets) & sector_breach[asset_sector]
+
+        adds_exposure = signed > 0
+        rejected = adds_exposure & breach[inverse]
+        for i in np.flatnonzero(rejected):
+            a = inverse[i]
+            reasons[i] = self._reason(assets[a], asset_weight[a], sector_weight[asset_sector[a]], asset_sector[a])
+
+        if rejected.any():
+            self.rejected_count += int(rejected.sum())
+            LOG.warning(f"Pre-trade risk check {'rejected' if self.enforce else 'flagged'} "
+                        f"{int(rejected.sum())} of {count} orders")
+        return RiskCheckResult(
+            approved=~rejected if self.enforce else np.ones(count, dtype=bool),
+            reasons=reasons,
+            asset_weights=dict(zip(assets.tolist(), asset_weight.tolist())),
+            sector_weights={self._sector_name(code): float(sector_weight[code]) for code in set(asset_sector.tolist())},
+        )
+
+    def _sector_of(self, asset: str) -> int:
+        # Unmapped assets share the trailing 'Other' slot, reported but never limited
+        return self._asset_sector.get(asset, len(self.sectors))
+
+    def _sector_name(self, code: int) -> str:
+        return self.sectors[code] if code < len(self.sectors) else 'Other'
+
+    def _reason(self, asset: str, asset_weight: float, sector_weight: float, sector_code: int) -> str:
+        if self.max_position_size is not None and asset_weight > self.max_position_size + _EPSILON:
+            return f"{asset} position {asset_weight:.1%} exceeds max {self.max_position_size:.1%}"
+        return (f"{self._sector_name(sector_code)} sector {sector_weight:.1%} exceeds max "
+                f"{self.max_sector_allocation:.1%} ({asset})")
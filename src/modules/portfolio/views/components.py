@@ -23,12 +23,19 @@ from src.modules.data_management.visualization.charts import (
 )
 
 
+def get_portfolio_presenter() -> PortfolioPresenter:
+    """Presenter shared by the session, so the holdings database and price files are opened once."""
+    if 'portfolio_presenter' not in st.session_state:
+        st.session_state.portfolio_presenter = PortfolioPresenter()
+    return st.session_state.portfolio_presenter
+
+
 def show_portfolio_tab():
     """Display portfolio management interface."""
     st.subheader("💼 Portfolio Management")
     st.markdown("Manage your portfolio holdings and compare with strategy targets")
     
-    presenter = PortfolioPresenter()
+    presenter = get_portfolio_presenter()
     
     col1, col2 = st.columns(2)
     
@@ -37,6 +44,7 @@ def show_portfolio_tab():
         
         # Load current holdings
         holdings = presenter.load_holdings()
+        from_lots = presenter.holdings_from_lots()
         
         # Calculate total weight for validation
         total_weight = sum(holdings.values()) if holdings else 0
@@ -53,6 +61,9 @@ def show_portfolio_tab():
         
         # Inline editable holdings table
         st.subheader("Edit Holdings")
+        if from_lots:
+            st.info("Holdings are tracked as lots; weights are the lots' market values at the latest prices "
+                    "and can't be edited here.")
         asset_options = list(ASSET_DISPLAY_INFO.keys())
 
         # Prepare editable DataFrame
@@ -91,12 +102,13 @@ def show_portfolio_tab():
                     format="%.2f"
                 )
             },
+            disabled=from_lots,
             key="holdings_editor"
         )
 
         save_col1, save_col2 = st.columns([1, 3])
         with save_col1:
-            if st.button("💾 Save Holdings", type="primary", use_container_width=True):
+            if st.button("💾 Save Holdings", type="primary", use_container_width=True, disabled=from_lots):
                 # Build holdings dict from edited rows
                 updated = {}
                 for _, row in edited_df.iterrows():
@@ -115,8 +127,11 @@ def show_portfolio_tab():
                         # Normalize to 100%
                         normalized = {k: (v / total) for k, v in updated.items()}
                         message = presenter.save_holdings({k: round(v, 6) for k, v in normalized.items()})
-                        st.success(message)
-                        st.rerun()
+                        if message.startswith("Error"):
+                            st.error(message)
+                        else:
+                            st.success(message)
+                            st.rerun()
 
         # Show allocation chart below editor using current holdings
         if holdings:
@@ -166,7 +181,7 @@ def show_backtest_tab():
     st.subheader("🎯 Strategy Backtesting")
     st.markdown("Test investment strategies on historical data with realistic execution costs")
     
-    presenter = PortfolioPresenter()
+    presenter = get_portfolio_presenter()
     
     # Configuration section: Three columns for better layout
     config_col1, config_col2, config_col3 = st.columns([1, 1, 1.2])
@@ -386,7 +401,7 @@ def show_attribution_tab():
     st.subheader("📊 Performance Attribution Analysis")
     st.markdown("Analyze how portfolio returns are attributed to individual assets and sectors")
     
-    presenter = PortfolioPresenter()
+    presenter = get_portfolio_presenter()
     
     # Configuration section
     config_col1, config_col2, config_col3 = st.columns([1, 1, 1])
@@ -483,6 +498,17 @@ def show_attribution_tab():
             help="Choose format for exporting attribution results"
         )
         
+        # Reuse stored results instead of rerunning the analysis
+        attribution_kind = 'asset' if attribution_type == "Asset-Level Attribution" else 'sector'
+        use_stored = False
+        stored_benchmark = benchmark_choice if attribution_kind == 'sector' else None
+        if strategy_choice and presenter.has_stored_attribution(strategy_choice, attribution_kind, stored_benchmark):
+            use_stored = st.checkbox(
+                "Use saved results",
+                value=False,
+                help="Load previously stored attribution results instead of rerunning the analysis"
+            )
+        
         # Analysis button
         run_attribution = st.button("🔍 Run Attribution Analysis", type="primary", use_container_width=True)
     
@@ -494,7 +520,21 @@ def show_attribution_tab():
         # Show loading spinner
         with st.spinner("Running attribution analysis..."):
             try:
-                if attribution_type == "Asset-Level Attribution":
+                if use_stored and attribution_type == "Asset-Level Attribution":
+                    results = presenter.load_stored_asset_attribution(
+                        strategy_choice=strategy_choice,
+                        start_date=start_date.strftime("%Y-%m-%d"),
+                        end_date=end_date.strftime("%Y-%m-%d")
+                    )
+                elif use_stored:
+                    results = presenter.load_stored_sector_attribution(
+                        strategy_choice=strategy_choice,
+                        start_date=start_date.strftime("%Y-%m-%d"),
+                        end_date=end_date.strftime("%Y-%m-%d"),
+                        frequency=attribution_frequency.lower(),
+                        benchmark=benchmark_choice
+                    )
+                elif attribution_type == "Asset-Level Attribution":
                     results = presenter.run_asset_attribution_analysis(
                         strategy_choice=strategy_choice,
                         start_date=start_date.strftime("%Y-%m-%d"),
@@ -5,7 +5,7 @@ Allows running strategies and backtests without GUI.
 """
 import argparse
 import sys
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 from src.ui.app_logger import LOG
 from src.modules.portfolio.strategies.registry import strategy_registry
@@ -160,10 +160,9 @@ def run_attribution_analysis(strategy_name: str,
                 from src.modules.portfolio.performance.attribution import PerformanceAttributor
                 attributor = PerformanceAttributor()
                 
-                # Save attribution data
-                daily_attributions = []  # Would need to reconstruct from data
-                saved_files = attributor.save_attribution_data(
-                    strategy_name, {period: daily_attributions}
+                # Export the results stored by the backtest's attribution run
+                saved_files = attributor.export_attribution_data(
+                    strategy_name, output_dir=export_path, periods=[period.lower()]
                 )
                 
                 if saved_files:
@@ -486,6 +485,19 @@ def process_monthly_accounting(month: str, year: str) -> bool:
         balance_sheet = bs_generator.generate_balance_sheet(assets, owner_equity, date(int(year), int(month), 1))
         print("   ✅ Balance sheet generated")
         
+        # Income and cash flow come from the month's stored transactions when there are any;
+        # their materialized statements are regenerated only if stale
+        from src.modules.accounting.core.report_storage import statement_content
+        from src.modules.accounting.core.statement_cache import MonthlyStatementCache
+        year_month = f"{year}-{month:0>2}"
+        cache = MonthlyStatementCache()
+        if cache.is_stale(year_month):
+            print("   Stored transactions or category config changed - regenerating statements...")
+            cache.refresh(year_month)
+        elif cache.is_user_saved(year_month):
+            print("   📌 Using statements saved from an upload (refresh-monthly-statements --force replaces them)")
+        stored = cache.report_storage.load_monthly_statements(year_month)
+        
         # Generate income statement (placeholder until transactions available)
         print("   Generating income statement...")
         income_statement = {
@@ -498,7 +510,11 @@ def process_monthly_accounting(month: str, year: str) -> bool:
             "net_operating_income": "¥0.00",
             "note": "Placeholder - awaiting transaction data format"
         }
-        print("   ⏳ Income statement placeholder generated (awaiting transaction format)")
+        if 'income_statement' in stored:
+            income_statement = statement_content(stored['income_statement'])
+            print("   ✅ Income statement loaded from monthly statements")
+        else:
+            print("   ⏳ Income statement placeholder generated (awaiting transaction format)")
         
         # Generate cash flow statement (placeholder until transactions available)
         print("   Generating cash flow statement...")
@@ -513,7 +529,11 @@ def process_monthly_accounting(month: str, year: str) -> bool:
             "net_change_in_cash": "¥0.00",
             "note": "Placeholder - awaiting transaction data format"
         }
-        print("   ⏳ Cash flow statement placeholder generated (awaiting transaction format)")
+        if 'cash_flow_statement' in stored:
+            cash_flow = statement_content(stored['cash_flow_statement'])
+            print("   ✅ Cash flow statement loaded from monthly statements")
+        else:
+            print("   ⏳ Cash flow statement placeholder generated (awaiting transaction format)")
         
         # Step 3: Save outputs
         print("\n💾 SAVING OUTPUTS...")
@@ -559,12 +579,101 @@ def process_monthly_accounting(month: str, year: str) -> bool:
         return False
 
 
+def refresh_monthly_statements(months: Optional[List[str]] = None, force: bool = False,
+                               workers: Optional[int] = None) -> bool:
+    """Regenerate materialized monthly statements whose source data or category config changed"""
+    try:
+        from src.modules.accounting.core.statement_cache import MonthlyStatementCache
+
+        cache = MonthlyStatementCache()
+        print("\n🔄 Refreshing Monthly Statements")
+        print("=" * 40)
+
+        results = cache.refresh_stale(months=months, force=force, max_workers=workers)
+        if not results:
+            print("ℹ️  No monthly data found")
+            return True
+
+        failed = 0
+        for month, result in results.items():
+            if result is True:
+                print(f"   ✅ {month}: regenerated")
+            elif result is False and cache.is_user_saved(month):
+                print(f"   📌 {month}: kept statements saved from an upload (use --force to regenerate)")
+            elif result is False:
+                print(f"   ⏭️  {month}: up to date")
+            else:
+                failed += 1
+                print(f"   ❌ {month}: {result}")
+
+        print()
+        return failed == 0
+
+    except Exception as e:
+        print(f"❌ Error refreshing monthly statements: {e}")
+        LOG.error(f"Monthly statement refresh failed: {e}")
+        return False
+
+
+def import_transactions_csv(csv_path: str, month: Optional[str] = None, chunk_size: int = 50_000,
+                            overwrite: bool = True) -> bool:
+    """Stream a large transactions CSV export into the monthly data store"""
+    try:
+        from src.modules.accounting.core.csv_importer import StreamingTransactionImporter
+
+        print(f"\n📥 Importing Transactions: {csv_path}")
+        print("=" * 40)
+
+        def show_progress(progress):
+            fraction = progress.fraction
+            done = f"{fraction:.0%}" if fraction is not None else f"{progress.rows_read:,} rows"
+            print(f"\r   {done} read, {progress.rows_written:,} rows written", end="", flush=True)
+
+        importer = StreamingTransactionImporter(chunk_size=chunk_size)
+        result = importer.import_csv(csv_path, year_month=month, overwrite=overwrite,
+                                     progress_callback=show_progress)
+        print()
+
+        report = result.validation_report
+        print(f"   {report.get_cleaning_summary()}")
+        if not result.succeeded:
+            print(f"   {report.get_summary()} - nothing was saved")
+            for error in report.errors[:20]:
+                print(f"   ❌ {error.message}")
+            if len(report.errors) > 20:
+                print(f"   ... and {len(report.errors) - 20} more")
+            return False
+
+        for month_key in result.saved_months:
+            totals = ", ".join(f"{kind} {amount:,.2f}" for kind, amount in result.totals_by_month[month_key].items())
+            print(f"   ✅ {month_key}: {result.rows_by_month[month_key]:,} rows ({totals})")
+        print()
+        return True
+
+    except Exception as e:
+        print(f"❌ Error importing transactions: {e}")
+        LOG.error(f"Transaction import failed: {e}")
+        return False
+
 def export_attribution_data(strategy_name: str, output_dir: str = "analytics/attribution"):
     """Export attribution data for a strategy to CSV/Excel files"""
     print(f"\n📤 Exporting attribution data for {strategy_name}")
     
     try:
         from pathlib import Path
+        from src.modules.portfolio.performance.attribution import PerformanceAttributor
+        
+        # Export from the stored Parquet dataset when available
+        attributor = PerformanceAttributor()
+        stored_periods = attributor.store.list_periods(strategy_name)
+        if stored_periods:
+            print(f"📦 Stored attribution periods: {', '.join(stored_periods)}")
+            saved_files = attributor.export_attribution_data(strategy_name, output_dir=output_dir)
+            print(f"💾 Attribution data exported:")
+            for file_type, file_path in saved_files.items():
+                print(f"   {file_type}: {file_path}")
+            print(f"\n✅ Attribution data exported to: {output_dir}")
+            return True
         
         # Check if attribution data exists
         attribution_dir = Path(output_dir)
@@ -652,6 +761,24 @@ def main():
     process_monthly_parser.add_argument('year', help='Year (e.g., 2025)')
     process_monthly_parser.add_argument('month', help='Month (e.g., 07)')
     
+    refresh_statements_parser = subparsers.add_parser('refresh-monthly-statements',
+                                                      help='Regenerate stale monthly statements')
+    refresh_statements_parser.add_argument('months', nargs='*', help='Months in YYYY-MM format (default: all)')
+    refresh_statements_parser.add_argument('--force', action='store_true',
+                                           help='Regenerate even if statements are up to date')
+    refresh_statements_parser.add_argument('--workers', type=int, default=None,
+                                           help='Number of months to process in parallel')
+    
+    import_transactions_parser = subparsers.add_parser('import-transactions',
+                                                       help='Import a large transactions CSV export by month')
+    import_transactions_parser.add_argument('csv_path', help='Path to the transactions CSV')
+    import_transactions_parser.add_argument('--month', default=None,
+                                            help='Month (YYYY-MM) of all rows (default: from a date or month column)')
+    import_transactions_parser.add_argument('--chunk-size', type=int, default=50_000,
+                                            help='Rows processed at a time')
+    import_transactions_parser.add_argument('--no-overwrite', action='store_true',
+                                            help='Skip months that already have transactions')
+    
     # Parse arguments
     args = parser.parse_args()
     
@@ -711,6 +838,13 @@ def main():
         
         elif args.command == 'process-monthly-accounting':
             process_monthly_accounting(args.month, args.year)
+        
+        elif args.command == 'refresh-monthly-statements':
+            refresh_monthly_statements(args.months or None, force=args.force, workers=args.workers)
+        
+        elif args.command == 'import-transactions':
+            import_transactions_csv(args.csv_path, month=args.month, chunk_size=args.chunk_size,
+                                    overwrite=not args.no_overwrite)
     
     except KeyboardInterrupt:
         print("\nOperation cancelled by user")
@@ -14,7 +14,6 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 import streamlit as st
-import json
 from src.ui.app_logger import LOG
 
 # Configure Streamlit page
@@ -27,6 +26,7 @@ st.set_page_config(
 
 # Import page functions
 from src.modules.portfolio.investment_management import show_investment_page
+from src.modules.portfolio.views.components import get_portfolio_presenter
 from src.modules.data_management.system_data_management import show_system_data_page
 from src.modules.accounting.views.pages import accounting_management_page
 
@@ -34,31 +34,15 @@ from src.modules.accounting.views.pages import accounting_management_page
 if 'target_weights_cache' not in st.session_state:
     st.session_state.target_weights_cache = {}
 
-# Holdings file path
-HOLDINGS_FILE = "data/holdings.json"
-
-
+# Holdings are kept in the portfolio holdings database (see PortfolioPresenter)
 def load_holdings() -> dict:
-    """Load current holdings from JSON file."""
-    if os.path.exists(HOLDINGS_FILE):
-        try:
-            with open(HOLDINGS_FILE, 'r') as f:
-                return json.load(f)
-        except Exception as e:
-            LOG.error(f"Error loading holdings: {e}")
-    return {}
+    """Load current holdings weights."""
+    return get_portfolio_presenter().load_holdings()
 
 
 def save_holdings(holdings_dict: dict) -> str:
-    """Save holdings to JSON file."""
-    try:
-        os.makedirs(os.path.dirname(HOLDINGS_FILE), exist_ok=True)
-        with open(HOLDINGS_FILE, 'w') as f:
-            json.dump(holdings_dict, f, indent=4)
-        return "Holdings saved successfully!"
-    except Exception as e:
-        LOG.error(f"Error saving holdings: {e}")
-        return f"Error saving holdings: {e}"
+    """Save the holdings weight allocation."""
+    return get_portfolio_presenter().save_holdings(holdings_dict)
 
 
 def main():
@@ -0,0 +1,91 @@
+"""
+Benchmark for the compact Order representation.
+
+Creates one million orders with the slotted Order and with the previous
+dataclass layout (per-instance __dict__, two datetime.now() timestamps and
+a metadata dict per order, reproduced below), and reports creation time
+and retained memory measured with tracemalloc.
+
+Usage:
+    python -m tests.benchmarks.bench_orders
+"""
+
+import gc
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from src.modules.portfolio.trading.executor import Order, OrderStatus, OrderType
+
+ORDERS = 1_000_000
+
+
+@dataclass
+class LegacyOrder:
+    """The dataclass Order layout this benchmark compares against"""
+    order_id: str
+    symbol: str
+    quantity: float
+    order_type: OrderType
+    side: str
+    price: Optional[float] = None
+    stop_price: Optional[float] = None
+    time_in_force: str = "GTC"
+    created_time: datetime = None
+    updated_time: datetime = None
+    status: OrderStatus = OrderStatus.PENDING
+    filled_quantity: float = 0.0
+    average_fill_price: float = 0.0
+    commission: float = 0.0
+    metadata: Dict[str, Any] = None
+
+    def __post_init__(self):
+        if self.created_time is None:
+            self.created_time = datetime.now()
+        if self.updated_time is None:
+            self.updated_time = self.created_time
+        if self.metadata is None:
+            self.metadata = {}
+
+
+def _create(cls, count: int):
+    symbols = [f'SYM{i}' for i in range(100)]
+    return [cls(f'O{i}', symbols[i % 100], 10.0, OrderType.LIMIT, 'buy', price=100.0)
+            for i in range(count)]
+
+
+def _measure(cls, count: int, repeat: int = 3):
+    elapsed = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        orders = _create(cls, count)
+        elapsed = min(elapsed, time.perf_counter() - start)
+        del orders
+
+    gc.collect()
+    tracemalloc.start()
+    orders = _create(cls, count)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del orders
+    return elapsed, current
+
+
+def main():
+    legacy_time, legacy_memory = _measure(LegacyOrder, ORDERS)
+    compact_time, compact_memory = _measure(Order, ORDERS)
+    print(f"{ORDERS} orders, dataclass: {legacy_time:6.2f} s {legacy_memory / 2**20:8.1f} MiB "
+          f"({legacy_memory / ORDERS:5.0f} B/order)")
+    print(f"{ORDERS} orders, slotted:   {compact_time:6.2f} s {compact_memory / 2**20:8.1f} MiB "
+          f"({compact_memory / ORDERS:5.0f} B/order)")
+    print(f"creation speedup {legacy_time / compact_time:4.1f}x | memory {legacy_memory / compact_memory:4.1f}x smaller")
+
+    ids = {Order(None, 'SPY', 1.0, OrderType.MARKET, 'buy').order_id for _ in range(100_000)}
+    assert len(ids) == 100_000, "generated order ids collided"
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark for SimulationExecutor order handling.
+
+Compares submitting a large rebalance one order at a time against the
+vectorized submit_orders() batch API, and measures bar-driven matching of
+resting limit orders through the order book.
+
+Logging is disabled for the trading package while timing, so the numbers
+measure pricing and bookkeeping only (the batch path also saves one log
+line per order).
+
+Usage:
+    python -m tests.benchmarks.bench_trade_executor
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.modules.portfolio.trading.executor import Order, OrderType, SimulationExecutor
+from src.ui.app_logger import LOG
+
+SYMBOLS = 100
+ORDERS = 20_000
+BARS = 250
+RESTING_ORDERS = 20_000
+
+
+def _time(func, repeat: int = 3) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _market_data(rng):
+    dates = pd.bdate_range('2024-01-01', periods=BARS)
+    data = {}
+    for s in range(SYMBOLS):
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, BARS)))
+        data[f'SYM{s}'] = pd.DataFrame({
+            'open': close * (1 + rng.normal(0, 0.002, BARS)),
+            'high': close * 1.01,
+            'low': close * 0.99,
+            'close': close,
+            'volume': rng.integers(10_000, 100_000, BARS).astype(float),
+        }, index=dates)
+    return data
+
+
+def _orders(rng, count, order_type=OrderType.MARKET):
+    symbols = rng.integers(0, SYMBOLS, count)
+    sides = rng.integers(0, 2, count)
+    prices = rng.uniform(95, 105, count)
+    return [
+        Order(f'O{i}', f'SYM{symbols[i]}', float(rng.integers(1, 100)), order_type,
+              'buy' if sides[i] else 'sell',
+              price=None if order_type == OrderType.MARKET else float(prices[i]))
+        for i in range(count)
+    ]
+
+
+def main():
+    LOG.disable("src.modules.portfolio.trading")
+    rng = np.random.default_rng(7)
+    market_data = _market_data(rng)
+
+    def single():
+        executor = SimulationExecutor(market_data)
+        for order in _orders(np.random.default_rng(1), ORDERS):
+            executor.submit_order(order)
+        return executor
+
+    def batch():
+        executor = SimulationExecutor(market_data)
+        executor.submit_orders(_orders(np.random.default_rng(1), ORDERS))
+        return executor
+
+    assert abs(single().total_commission_paid - batch().total_commission_paid) < 1e-6
+    single_time = _time(single)
+    batch_time = _time(batch)
+    print(f"{ORDERS} market orders over {SYMBOLS} symbols: one-by-one {single_time * 1e3:8.2f} ms | "
+          f"batch {batch_time * 1e3:8.2f} ms | speedup {single_time / batch_time:6.1f}x")
+
+    def replay():
+        executor = SimulationExecutor(market_data, max_participation=0.1)
+        executor.submit_orders(_orders(np.random.default_rng(2), RESTING_ORDERS, OrderType.LIMIT))
+        executor.process_market_data(market_data)
+        return executor
+
+    replay_time = _time(replay, repeat=1)
+    executor = replay()
+    print(f"{RESTING_ORDERS} resting limit orders x {BARS} bars x {SYMBOLS} symbols: "
+          f"{replay_time * 1e3:8.2f} ms | {len(executor.execution_history)} fills, "
+          f"{len(executor.order_book)} still resting")
+
+
+if __name__ == '__main__':
+    main()
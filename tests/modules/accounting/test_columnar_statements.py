@@ -0,0 +1,157 @@
+"""
+Tests for columnar statement generation
+
+Income statement and cash flow generators accept the columnar transactions
+table and aggregate every line item in one grouped sum. The output must
+match generation from Transaction lists line for line, in the same order.
+Per-user statements and Combined come from a single aggregation.
+"""
+
+import pytest
+import pandas as pd
+
+from src.modules.accounting.models.business.transaction_classifier import (
+    encode, select_encoded, sum_entity_line_items, sum_line_items, transactions_to_table
+)
+from src.modules.accounting.models.business.income_statement_generator import IncomeStatementGenerator
+from src.modules.accounting.models.business.cash_flow_generator import CashFlowStatementGenerator
+from src.modules.accounting.models.domain.category import CategoryMapper
+from src.modules.accounting.models.domain.transaction import Transaction
+from src.modules.accounting.core import models as core_models
+from src.modules.accounting.core.income_statement import IncomeStatementGenerator as CoreIncomeStatementGenerator
+from src.modules.accounting.core.cash_flow import CashFlowStatementGenerator as CoreCashFlowStatementGenerator
+
+
+TRANSACTIONS = [
+    Transaction("Salary", 8000.0, "工资收入", "Bank", "Alice", "revenue", True),
+    Transaction("Rent", 2000.0, "房租", "Cash", "Alice"),
+    Transaction("Lunch", 35.5, "餐饮", "Cash", "Bob"),
+    Transaction("Dinner", 64.5, "餐饮", "Cash", "Bob"),
+    Transaction("Refund", -20.0, "餐饮", "Cash", "Bob"),
+    Transaction("Gym prepaid", 1200.0, "Prepaid Gym", "Cash", "Bob", "prepaid_asset", True),
+    Transaction("Gym used", 100.0, "健身", "Pre-paid Gym", "Bob", "prepaid_asset", False),
+    Transaction("Zero", 0.0, "餐饮", "Cash", "Alice"),
+]
+
+
+class TestSumLineItems:
+    """Grouped line totals"""
+
+    def test_first_appearance_order_and_mask(self):
+        sections = sum_line_items(
+            [['B', 'A', 'B', 'A', 'B'], ['x', 'y', 'x', 'z', 'y']],
+            [1.0, 2.0, 3.0, 4.0, 5.0],
+            [True, True, True, True, False],
+        )
+        assert sections == {('B',): {'x': 4.0}, ('A',): {'y': 2.0, 'z': 4.0}}
+        assert list(sections[('A',)]) == ['y', 'z']
+
+    def test_encoded_keys_with_repeated_labels(self):
+        # Codes 0 and 1 both map to 'Operating'
+        activity = (pd.Series([0, 1, 2]).to_numpy(), ['Operating', 'Operating', 'Investing'])
+        sections = sum_line_items([activity, ['a', 'a', 'b']], [1.0, 2.0, 3.0], [True, True, True])
+        assert sections == {('Operating',): {'a': 3.0}, ('Investing',): {'b': 3.0}}
+
+    def test_select_encoded(self):
+        codes, labels = encode(['x', 'y', 'x'])
+        selected, merged = select_encoded([pd.Series([True, False, False]).to_numpy()],
+                                          [(codes, labels)], default=(codes, ['X', 'Y']))
+        assert merged[selected].tolist() == ['x', 'Y', 'X']
+
+    def test_nothing_selected(self):
+        assert sum_line_items([['A'], ['x']], [1.0], [False]) == {}
+
+    def test_entity_and_combined_totals(self):
+        per_entity, combined = sum_entity_line_items(
+            ['bob', 'amy', 'bob', 'amy', 'cat'],
+            [['S', 'S', 'S', 'T', 'S'], ['y', 'x', 'x', 'z', 'x']],
+            [1.0, 2.0, 3.0, 4.0, 5.0],
+            [True, True, True, True, False],
+        )
+        assert per_entity == {'bob': {('S',): {'y': 1.0, 'x': 3.0}},
+                              'amy': {('S',): {'x': 2.0}, ('T',): {'z': 4.0}},
+                              'cat': {}}
+        assert combined == {('S',): {'y': 1.0, 'x': 5.0}, ('T',): {'z': 4.0}}
+        # Combined lines follow first appearance across all entities
+        assert list(combined[('S',)]) == ['y', 'x']
+
+
+class TestColumnarStatements:
+    """Table input gives the same statements as Transaction lists"""
+
+    def setup_method(self):
+        self.table = transactions_to_table(TRANSACTIONS)
+
+    @pytest.mark.parametrize("generator_cls", [IncomeStatementGenerator, CashFlowStatementGenerator])
+    def test_table_matches_list(self, generator_cls):
+        generator = generator_cls(CategoryMapper())
+        from_list = generator.generate_statement(TRANSACTIONS, "Combined")
+        from_table = generator.generate_statement(self.table, "Combined")
+        assert from_table == from_list
+
+    def test_income_statement_lines(self):
+        statement = IncomeStatementGenerator(CategoryMapper()).generate_statement(self.table, "Combined")
+        mapper = CategoryMapper()
+        food = mapper.get_expense_category("餐饮")
+
+        assert statement['Revenue'] == {"工资收入": 8000.0}
+        assert statement['Expenses'][food] == pytest.approx(80.0)
+        # Lines keep the order categories first appear in
+        assert list(statement['Expenses']) == [mapper.get_expense_category("房租"), food]
+        assert statement['Net Income'] == pytest.approx(8000.0 - 2080.0)
+
+    def test_cash_flow_lines(self):
+        statement = CashFlowStatementGenerator(CategoryMapper()).generate_statement(self.table, "Combined")
+        operating = statement['Operating Activities']['Details']
+
+        assert operating["工资收入"] == 8000.0
+        assert operating["Prepaid: Prepaid Gym"] == -1200.0
+        # Expenses flow out at their absolute amount
+        assert operating[CategoryMapper().get_expense_category("餐饮")] == pytest.approx(-120.0)
+        assert statement['Net Change in Cash'] == pytest.approx(8000.0 - 2000.0 - 120.0 - 1200.0)
+
+    def test_empty_table(self):
+        statement = IncomeStatementGenerator(CategoryMapper()).generate_statement(
+            transactions_to_table([]), "Combined")
+        assert statement['Revenue'] == {} and statement['Total Revenue'] == 0
+
+    @pytest.mark.parametrize("generator_cls", [CoreIncomeStatementGenerator, CoreCashFlowStatementGenerator])
+    def test_core_generators_accept_tables(self, generator_cls):
+        transactions = [core_models.Transaction(t.description, t.amount, t.debit_category, t.credit_account,
+                                                t.user, t.transaction_type, t.affects_cash_flow)
+                        for t in TRANSACTIONS]
+        generator = generator_cls(core_models.CategoryMapper())
+        assert generator.generate_statement(self.table, "X") == generator.generate_statement(transactions, "X")
+
+
+class TestMultiEntityStatements:
+    """Every user's statement plus Combined from one aggregation"""
+
+    def setup_method(self):
+        self.table = transactions_to_table(TRANSACTIONS + [
+            Transaction("Shared", 50.0, "餐饮", "Cash", "", "expense", True),
+        ])
+
+    @pytest.mark.parametrize("generator_cls,mapper_cls", [
+        (IncomeStatementGenerator, CategoryMapper),
+        (CashFlowStatementGenerator, CategoryMapper),
+        (CoreIncomeStatementGenerator, core_models.CategoryMapper),
+        (CoreCashFlowStatementGenerator, core_models.CategoryMapper),
+    ])
+    def test_matches_per_user_generation(self, generator_cls, mapper_cls):
+        generator = generator_cls(mapper_cls())
+        statements = generator.generate_statements(self.table, entity_label="User: {}")
+
+        # Blank users only count towards Combined
+        assert list(statements) == ['Alice', 'Bob', 'Combined']
+        for user in ('Alice', 'Bob'):
+            expected = generator.generate_statement(self.table[self.table['user'] == user], f"User: {user}")
+            assert statements[user] == expected
+        assert statements['Combined'] == generator.generate_statement(self.table, "Combined")
+
+    def test_user_without_statement_lines(self):
+        table = transactions_to_table([Transaction("Prepaid", 10.0, "Prepaid Gym", "Cash", "Cat",
+                                                   "prepaid_asset", True)])
+        statements = IncomeStatementGenerator(CategoryMapper()).generate_statements(table, combined_name="All")
+        assert statements['Cat']['Expenses'] == {} and statements['Cat']['Net Income'] == 0
+        assert list(statements) == ['Cat', 'All']
@@ -0,0 +1,132 @@
+"""
+Tests for streaming transaction CSV imports
+
+StreamingTransactionImporter reads large exports in chunks and writes them to
+per-month Parquet files, reporting the same cleaning actions and errors as
+DataCleaner does for the whole file.
+"""
+
+import io
+import shutil
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src.modules.accounting.core.csv_importer import StreamingTransactionImporter
+from src.modules.accounting.core.data_storage import MonthlyDataStorage
+from src.modules.accounting.models.business.data_cleaner import DataCleaner
+
+
+def _export(rows: int = 60, blank_debit_every: int = 0) -> pd.DataFrame:
+    records = []
+    for i in range(rows):
+        records.append({
+            'Date': f"2024-{i % 3 + 1:02d}-{i % 28 + 1:02d}",
+            'Description': f"  item {i} ",
+            'Amount': ['¥1,000', '12.5', '0', '', '30'][i % 5],
+            'Debit': '' if blank_debit_every and i % blank_debit_every == 0 else ['餐饮', '房租'][i % 2],
+            'Credit': 'Cash' if i % 7 else '工资收入',
+            'User': 'XH',
+            'Note': '',
+        })
+        if i % 11 == 0:
+            records[-1] = {key: '' for key in records[-1]}
+    return pd.DataFrame(records)
+
+
+def _as_tuples(report):
+    actions = [(a.action_type, a.count) for a in report.cleaning_actions]
+    errors = [(e.row_number, e.column, e.error_type, e.message) for e in report.errors]
+    return actions, errors
+
+
+class TestStreamingTransactionImporter:
+    """Chunked import into monthly storage"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.base = Path(self.temp_dir)
+        self.storage = MonthlyDataStorage(str(self.base / "monthly_data"))
+        self.importer = StreamingTransactionImporter(self.storage, chunk_size=7)
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _write(self, df: pd.DataFrame) -> Path:
+        path = self.base / "export.csv"
+        df.to_csv(path, index=False)
+        return path
+
+    @pytest.mark.parametrize("blank_debit_every", [0, 4])
+    def test_report_matches_whole_file_cleaning(self, blank_debit_every):
+        path = self._write(_export(blank_debit_every=blank_debit_every))
+        _, expected = DataCleaner(str(path)).clean_and_validate()
+
+        result = self.importer.import_csv(path)
+        assert _as_tuples(result.validation_report) == _as_tuples(expected)
+        assert result.succeeded == (not blank_debit_every)
+
+    def test_rows_are_split_by_month(self):
+        path = self._write(_export())
+        cleaned, _ = DataCleaner(str(path)).clean_and_validate()
+
+        result = self.importer.import_csv(path)
+        assert result.saved_months == ['2024-01', '2024-02', '2024-03']
+        assert sum(result.rows_by_month.values()) == len(cleaned)
+
+        january = self.storage.load_monthly_data('2024-01')[0]
+        assert len(january) == result.rows_by_month['2024-01']
+        assert 'Note' not in january.columns  # empty in the whole file
+        assert january['Description'].str.startswith('item').all()
+        assert january['Amount'].sum() == pytest.approx(sum(result.totals_by_month['2024-01'].values()))
+        assert result.totals_by_month['2024-01']['revenue'] > 0
+
+    def test_nothing_is_saved_on_errors(self):
+        path = self._write(_export(blank_debit_every=4))
+        result = self.importer.import_csv(path)
+
+        assert not result.succeeded
+        assert result.saved_months == [] and result.rows_by_month == {}
+        assert self.storage.list_available_months() == []
+        assert not list(self.base.rglob("*.importing"))
+
+    def test_missing_columns_and_months(self):
+        df = _export().drop(columns=['User', 'Date'])
+        result = self.importer.import_csv(self._write(df))
+        errors = result.validation_report.errors
+        assert [e.error_type for e in errors] == ['missing_column', 'missing_column']
+        assert errors[1].column == 'User'
+
+        # An explicit month makes the date column unnecessary
+        result = self.importer.import_csv(self._write(_export().drop(columns=['Date'])), year_month='2024-05')
+        assert result.saved_months == ['2024-05']
+
+    def test_invalid_dates_are_reported(self):
+        df = _export()
+        df.loc[1, 'Date'] = 'not a date'
+        result = self.importer.import_csv(self._write(df))
+
+        assert [(e.row_number, e.error_type) for e in result.validation_report.errors] == [(3, 'invalid_month')]
+        assert self.storage.list_available_months() == []
+
+    def test_progress_and_file_objects(self):
+        content = _export().to_csv(index=False).encode('utf-8')
+        progress = []
+        result = self.importer.import_csv(io.BytesIO(content), progress_callback=lambda p: progress.append(
+            (p.chunks, p.rows_read, p.fraction)))
+
+        assert len(progress) == 9
+        assert progress[-1] == (9, 60, 1.0)
+        assert all(earlier[2] <= later[2] for earlier, later in zip(progress, progress[1:]))
+        assert result.rows_read == 60
+
+    def test_existing_months_are_kept_without_overwrite(self):
+        path = self._write(_export())
+        self.importer.import_csv(path, year_month='2024-01')
+        before = self.storage.load_monthly_data('2024-01')[0]
+
+        result = self.importer.import_csv(path, overwrite=False)
+        assert result.saved_months == ['2024-02', '2024-03']
+        pd.testing.assert_frame_equal(self.storage.load_monthly_data('2024-01')[0], before)
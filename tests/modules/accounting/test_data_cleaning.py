@@ -0,0 +1,99 @@
+"""
+Tests for column-wise data cleaning and validation
+
+DataCleaner and BalanceSheetDataCleaner validate whole columns with boolean
+masks and only build ValidationErrors for the offending rows.
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.modules.accounting.models.business.data_cleaner import (
+    DataCleaner, blank_mask, non_numeric_mask, normalize_currency, strip_text_columns
+)
+from src.modules.accounting.models.business.balance_sheet_cleaner import BalanceSheetDataCleaner
+
+
+class TestCleaningHelpers:
+    """Whole-column cleaning operations"""
+
+    def test_strip_text_columns(self):
+        df = pd.DataFrame({'Text': [' a ', 'b', np.nan], 'Mixed': pd.Series([' x', 5, None], dtype=object),
+                           'Number': [1.0, 2.0, 3.0]})
+        assert strip_text_columns(df) == 2
+        assert df['Text'].tolist()[:2] == ['a', 'b']
+        assert df['Mixed'].tolist() == ['x', 5, None]
+
+    def test_normalize_currency(self):
+        values = pd.Series(['¥1,000.00', '$ 25', '12.5', 'abc', '', np.nan], dtype=object)
+        normalized, changed = normalize_currency(values)
+        assert changed == 2
+        assert normalized.tolist()[:4] == [1000.0, 25.0, 12.5, 'abc']
+        assert normalized.iloc[4] == '' and pd.isna(normalized.iloc[5])
+
+        normalized, _ = normalize_currency(pd.Series(['1', '2', np.nan], dtype=object))
+        assert normalized.dtype == float
+
+    def test_masks(self):
+        values = pd.Series(['x', ' ', '', np.nan, 3.0], dtype=object)
+        assert blank_mask(values).tolist() == [False, True, True, True, False]
+        assert non_numeric_mask(values).tolist() == [True, True, False, False, False]
+        assert not non_numeric_mask(pd.Series(['-', 1.0], dtype=object), skip=('', '-')).any()
+
+
+class TestDataCleaner:
+    """Transaction CSV cleaning and validation"""
+
+    def test_errors_only_for_offending_rows(self):
+        df = pd.DataFrame({
+            'Description': [' Lunch ', 'Rent', 'Taxi', 'Gift', 'Blank'],
+            'Amount': ['¥35.50', '2,000', 'abc', '10', np.nan],
+            'Debit': ['餐饮', '', '交通', np.nan, '餐饮'],
+            'Credit': ['Cash', ' ', 'Cash', 'Cash', 'Cash'],
+            'User': ['A', 'A', 'B', 'B', 'A'],
+        })
+        cleaned, report = DataCleaner(dataframe=df).clean_and_validate()
+
+        # Row 6 (no amount) is dropped before validation
+        assert len(cleaned) == 4
+        assert cleaned['Description'].iloc[0] == 'Lunch'
+        assert cleaned['Amount'].tolist()[:2] == [35.5, 2000.0]
+        assert [(e.row_number, e.column, e.error_type) for e in report.errors] == [
+            (3, 'Debit', 'missing_required_field'),
+            (3, 'Credit', 'missing_required_field'),
+            (5, 'Debit', 'missing_required_field'),
+            (4, 'Amount', 'invalid_data_type'),
+        ]
+        assert report.errors[0].message == "Row 3: Missing Debit account (required when Amount is present)"
+        assert report.errors[3].message == "Row 4: Amount must be a number (got 'abc')"
+
+    def test_clean_data_has_no_errors(self):
+        df = pd.DataFrame({'Description': ['Lunch'], 'Amount': [35.5], 'Debit': ['餐饮'],
+                           'Credit': ['Cash'], 'User': ['A']})
+        cleaned, report = DataCleaner(dataframe=df).clean_and_validate()
+        assert not report.has_errors()
+        assert cleaned['Amount'].dtype == float
+
+
+class TestBalanceSheetDataCleaner:
+    """Balance sheet CSV cleaning and validation"""
+
+    def test_validation(self):
+        df = pd.DataFrame({
+            'Account': ['Bank', '', 'Broker', 'Wallet'],
+            'Type': ['Cash CNY', 'Investment', 'Crypto ', np.nan],
+            'CNY': ['¥1,000', '-', '0', 'abc'],
+            'USD': [np.nan, '$10', '', np.nan],
+        })
+        cleaned, report = BalanceSheetDataCleaner(dataframe=df).clean_and_validate()
+
+        assert cleaned['CNY'].iloc[0] == 1000.0
+        assert [(e.row_number, e.column) for e in report.errors] == [
+            (3, 'Account Name'),
+            (5, 'Account Type'),
+            (5, 'CNY'),
+            (4, 'CNY/USD'),
+        ]
+        assert report.errors[2].message == "Row 5: CNY must be numeric (got 'abc')"
+        # Blank account types are reported as missing, not as unknown values
+        assert [w.message for w in report.warnings] == ["Row 4: Account Type 'Crypto' is not in allowed types"]
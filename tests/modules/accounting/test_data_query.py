@@ -0,0 +1,87 @@
+"""
+Tests for the cross-month query engine
+
+MonthlyDataQuery reads the monthly Parquet store as one partitioned dataset
+with month pruning, column projection and user/category predicates.
+"""
+
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.modules.accounting.core.data_query import MonthlyDataQuery
+
+
+def _transactions(month_number: int) -> pd.DataFrame:
+    return pd.DataFrame({
+        'Description': ['Lunch', 'Rent', 'Refund', 'Salary'],
+        'Amount': [10.0 * month_number, 3000.0, 5.0, 8000.0],
+        'Debit': ['餐饮', '房租', 'Cash', 'Bank'],
+        'Credit': ['Cash', 'Cash', '餐饮', '工资收入'],
+        'User': ['XH', 'YY', 'XH', 'XH'],
+    })
+
+
+class TestMonthlyDataQuery:
+    """Month pruning, projection and predicate pushdown"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.base = Path(self.temp_dir)
+        for month_number in range(1, 7):
+            month_dir = self.base / f"2024-{month_number:02d}"
+            month_dir.mkdir()
+            df = _transactions(month_number)
+            if month_number == 2:
+                # Column that is all-null in one month only
+                df['Note'] = np.nan
+            df.to_parquet(month_dir / "transactions.parquet", index=False)
+        pd.DataFrame({'Account': ['Bank'], 'CNY': [100.0]}).to_parquet(
+            self.base / "2024-03" / "assets.parquet", index=False)
+        (self.base / "notes").mkdir()
+        self.query = MonthlyDataQuery(str(self.base))
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_months(self):
+        assert self.query.months() == [f"2024-{m:02d}" for m in range(1, 7)]
+        assert self.query.months(start='2024-02', end='2024-04') == ['2024-02', '2024-03', '2024-04']
+        assert self.query.months('assets') == ['2024-03']
+        with pytest.raises(ValueError):
+            self.query.months(start='2024-13')
+
+    def test_filtered_projection(self):
+        df = self.query.transactions(columns=['Amount'], start='2024-04', users=['XH'], categories=['餐饮'])
+
+        assert list(df.columns) == ['Amount', 'month']
+        # Lunch (debit) and Refund (credit) match the category, per month in order
+        assert df['month'].tolist() == ['2024-04', '2024-04', '2024-05', '2024-05', '2024-06', '2024-06']
+        assert df['Amount'].tolist() == [40.0, 5.0, 50.0, 5.0, 60.0, 5.0]
+
+    def test_unrelated_months_are_not_opened(self):
+        # A corrupt file outside the range must not be touched
+        (self.base / "2024-01" / "transactions.parquet").write_bytes(b"not parquet")
+        df = self.query.transactions(months=['2024-05', '2024-06'], users=['YY'])
+        assert df['Amount'].tolist() == [3000.0, 3000.0]
+
+    def test_schemas_are_unified(self):
+        df = self.query.transactions()
+        assert len(df) == 24
+        assert df['Note'].isna().all()
+
+    def test_count_and_empty(self):
+        assert self.query.count() == 24
+        assert self.query.count(end='2024-02', users=['YY']) == 2
+        assert self.query.count(start='2025-01') == 0
+        assert self.query.transactions(start='2025-01', columns=['Amount']).empty
+
+    def test_assets(self):
+        df = self.query.assets()
+        assert df[['Account', 'month']].values.tolist() == [['Bank', '2024-03']]
+        with pytest.raises(ValueError):
+            self.query.assets(users=['XH'])
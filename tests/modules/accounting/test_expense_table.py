@@ -0,0 +1,86 @@
+"""
+Tests for bulk expense table parsing
+
+parse_user_expense_table reads a user x category x month matrix in one pass,
+and convert_parsed_data_to_transactions builds the monthly transaction
+frames from the parsed matrix.
+"""
+
+import pandas as pd
+import pytest
+
+from src.modules.accounting.core.data_storage_utils import (
+    convert_parsed_data_to_transactions,
+    parse_expense_matrix,
+    parse_user_expense_table,
+)
+
+EXPENSE_TABLE = """
+User  Category  Jan-25  02-25  2025-03
+YY    房租    ¥11,512.80    ¥11,512.80    ¥11,512.80
+XH    餐饮    ¥3,243.94    abc    ¥1,854.87
+YY    通勤    0    ¥120    ¥
+XH    宠物    ¥50
+YY    房租    ¥12,000.00    ¥0    ¥100    ¥999
+"""
+
+
+class TestExpenseTableParsing:
+    """Matrix parsing and the dictionary built from it"""
+
+    def test_months_and_amounts(self):
+        parsed = parse_expense_matrix(EXPENSE_TABLE)
+
+        assert parsed["months"] == ["2025-01", "2025-02", "2025-03"]
+        matrix = parsed["matrix"]
+        # Users in order of appearance; a repeated row keeps its place and its last amounts
+        assert matrix[["user", "category"]].values.tolist() == [
+            ["YY", "Rent"], ["YY", "Transportation"], ["XH", "Food & Dining"]]
+        assert matrix["2025-01"].tolist() == [12000.0, 0.0, 3243.94]
+        # Unparseable amounts count as zero and are not counted as records
+        assert matrix.loc[2, "2025-02"] == 0.0
+        assert parsed["total_records"] == 11
+
+    def test_parsed_dictionary(self):
+        parsed = parse_user_expense_table(EXPENSE_TABLE)
+
+        assert list(parsed["users"]) == ["YY", "XH"]
+        assert parsed["users"]["YY"]["Transportation"] == {"2025-01": 0.0, "2025-02": 120.0, "2025-03": 0.0}
+        assert parsed["categories"] == ["Food & Dining", "Rent", "Transportation"]
+
+    def test_invalid_tables(self):
+        with pytest.raises(ValueError):
+            parse_user_expense_table("  \n ")
+        with pytest.raises(ValueError):
+            parse_user_expense_table("User Category Month-99\nXH 餐饮 1")
+
+        parsed = parse_user_expense_table("User Category Jan-25")
+        assert parsed["users"] == {} and parsed["total_records"] == 0
+
+
+class TestExpenseTableTransactions:
+    """Monthly transaction frames"""
+
+    def test_monthly_frames(self):
+        monthly = dict(convert_parsed_data_to_transactions(parse_user_expense_table(EXPENSE_TABLE)))
+
+        assert list(monthly) == ["2025-01", "2025-02", "2025-03"]
+        february = monthly["2025-02"]
+        assert february["Description"].tolist() == ["Transportation - YY"]
+        assert february.iloc[0].to_dict() == {
+            "date": "2025-02-01", "Description": "Transportation - YY", "Amount": -120.0,
+            "Debit": "Transportation", "Credit": "YY_Account", "User": "YY",
+            "category": "Transportation", "account_name": "YY_Account", "account_type": "Cash",
+            "notes": "Bulk upload - YY Transportation", "year_month": "2025-02",
+        }
+        assert monthly["2025-01"]["Amount"].tolist() == [-12000.0, -3243.94]
+        assert monthly["2025-03"].index.tolist() == [0, 1]
+
+    def test_frames_from_parsed_dictionary(self):
+        parsed = parse_user_expense_table(EXPENSE_TABLE)
+        expected = convert_parsed_data_to_transactions(parsed)
+        # Parsed data without the matrix (e.g. built by hand) gives the same frames
+        del parsed["matrix"]
+        for (month, df), (expected_month, expected_df) in zip(convert_parsed_data_to_transactions(parsed), expected):
+            assert month == expected_month
+            pd.testing.assert_frame_equal(df, expected_df)
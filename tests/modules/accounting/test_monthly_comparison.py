@@ -0,0 +1,84 @@
+"""
+Tests for vectorized monthly comparisons
+
+MonthlyComparisonEngine flattens statements once into a month x metric
+frame and computes trends, tables and statistics as column operations.
+"""
+
+import numpy as np
+import pytest
+
+from src.modules.accounting.core.monthly_comparison import MonthlyComparisonEngine
+
+
+def _comparison_data() -> dict:
+    return {
+        "statement_type": "income_statement",
+        "months": ["2024-01", "2024-02", "2024-03", "2024-04"],
+        "data": {
+            "2024-03": {"Entity": "Combined", "Expenses": {"Rent": 150.0, "Food": 0.0}, "Net Income": 50.0},
+            "2024-01": {"Entity": "Combined", "Expenses": {"Rent": 100.0}, "Net Income": 0.0},
+            "2024-02": {"Entity": "Combined", "Expenses": {"Rent": 100.0, "Food": 20.0}, "Net Income": "40"},
+            # Sections holding only sub-sections are not extracted unless requested
+            "2024-04": {"Assets": {"Cash": {"CNY": 10.0}}, "Net Income": -10.0},
+        },
+    }
+
+
+class TestMonthlyComparisonEngine:
+    """Flattened frame and the comparisons computed from it"""
+
+    def setup_method(self):
+        self.engine = MonthlyComparisonEngine.__new__(MonthlyComparisonEngine)
+        self.data = _comparison_data()
+
+    def test_metrics_frame(self):
+        frame = self.engine.metrics_frame(self.data)
+
+        assert list(frame.index) == ["2024-01", "2024-02", "2024-03", "2024-04"]
+        assert list(frame.columns) == ["Assets > Cash > CNY", "Expenses > Food", "Expenses > Rent", "Net Income"]
+        assert frame.loc["2024-02", "Net Income"] == 40.0
+        assert np.isnan(frame.loc["2024-01", "Expenses > Food"])
+
+    def test_comparison_table(self):
+        table = self.engine.create_comparison_table(self.data)
+        assert list(table.index) == ["Expenses > Food", "Expenses > Rent", "Net Income"]
+        assert table.loc["Expenses > Rent"].tolist()[:3] == [100.0, 100.0, 150.0]
+
+        table = self.engine.create_comparison_table(self.data, [["Assets", "Cash", "CNY"], ["Missing"]])
+        assert table.loc["Assets > Cash > CNY", "2024-04"] == 10.0
+        assert table.loc["Missing"].isna().all()
+
+    def test_monthly_trends(self):
+        trends = self.engine.calculate_monthly_trends(self.data, ["Net Income"])
+
+        assert trends["trends"]["2024-02"]["percentage_change"] == 100.0  # from zero
+        assert trends["trends"]["2024-03"]["percentage_change"] == 25.0
+        assert trends["trends"]["2024-04"]["trend_direction"] == "decline"
+        assert trends["summary"]["growth_periods"] == 2 and trends["summary"]["decline_periods"] == 1
+        assert trends["summary"]["max_decline_pct"] == -120.0
+
+        # Pairs with a missing month are skipped
+        food = self.engine.calculate_monthly_trends(self.data, ["Expenses", "Food"])
+        assert list(food["trends"]) == ["2024-03"]
+        assert food["trends"]["2024-03"]["percentage_change"] == -100.0
+
+    def test_month_over_month_changes(self):
+        changes = self.engine.month_over_month_changes(self.data)
+        assert changes["Expenses > Rent"].tolist()[1:3] == [0.0, 50.0]
+        assert changes.loc["2024-01"].isna().all()
+
+    def test_summary_statistics(self):
+        self.engine.get_comparison_data = lambda statement_type, months=None: {
+            "data": self.data["data"],
+            "metadata": {"available_months": self.data["months"]},
+        }
+        summary = self.engine.get_summary_statistics("income_statement")
+
+        assert summary["period"] == "2024-01 to 2024-04"
+        assert summary["metrics"]["Net Income"] == {
+            "count": 4, "mean": 20.0, "min": -10.0, "max": 50.0,
+            "std": pytest.approx(29.44, abs=0.01), "total": 80.0,
+        }
+        assert summary["metrics"]["Expenses > Food"]["count"] == 2
+        assert "Assets > Cash > CNY" not in summary["metrics"]
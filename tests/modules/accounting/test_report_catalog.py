@@ -0,0 +1,129 @@
+"""
+Tests for the monthly report catalog
+
+MonthlyReportStorage indexes every saved statement in a SQLite catalog, so
+statements saved per entity can be listed and loaded back, including many
+months at once for the comparison engine.
+"""
+
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from src.modules.accounting.core.monthly_comparison import MonthlyComparisonEngine
+from src.modules.accounting.core.report_storage import MonthlyReportStorage
+
+
+def _income_statement(entity: str, revenue: float, expenses: float) -> dict:
+    return {
+        "Entity": entity,
+        "Revenue": {"工资收入": revenue},
+        "Total Revenue": revenue,
+        "Expenses": {"Rent": expenses},
+        "Total Expenses": expenses,
+        "Net Income": revenue - expenses,
+    }
+
+
+class TestReportCatalog:
+    """Save, list, load and delete through the catalog"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.base = Path(self.temp_dir)
+        self.storage = MonthlyReportStorage(str(self.base))
+        for month_number in range(1, 4):
+            month = f"2024-{month_number:02d}"
+            for entity in ("XH", "Combined"):
+                self.storage.save_statement(month, "income_statement",
+                                            _income_statement(entity, 1000.0 * month_number, 100.0))
+        self.storage.save_statement("2024-02", "cash_flow", {"Net Change in Cash": 5.0}, {"entity": "XH"})
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_saved_statements_load_back(self):
+        assert self.storage.load_statement("2024-01", "income_statement")["statement"]["Entity"] == "Combined"
+        assert self.storage.load_statement("2024-01", "income_statement", "XH")["statement"]["Entity"] == "XH"
+        # A month's only entity is loaded when there is no Combined statement
+        assert self.storage.load_statement("2024-02", "cash_flow")["metadata"]["entity"] == "XH"
+        assert self.storage.load_statement("2024-01", "cash_flow") is None
+
+    def test_list_and_bulk_load(self):
+        assert self.storage.list_available_statements() == {
+            "2024-01": ["income_statement"],
+            "2024-02": ["income_statement", "cash_flow"],
+            "2024-03": ["income_statement"],
+        }
+        loaded = self.storage.load_statements("income_statement", ["2024-03", "2024-01", "2023-12"])
+        assert list(loaded) == ["2024-01", "2024-03"]
+        assert loaded["2024-03"]["statement"]["Total Revenue"] == 3000.0
+
+    def test_statement_info(self):
+        info = self.storage.get_statement_info("2024-02", "cash_flow", "XH")
+        assert info["exists"] and info["path"].endswith("cash_flow_XH.json")
+        assert info["generated_at"] is not None
+        assert not self.storage.get_statement_info("2024-02", "balance_sheet")["exists"]
+
+    def test_delete_updates_catalog(self):
+        assert self.storage.delete_statement("2024-02", "income_statement", "Combined")
+        assert self.storage.load_statement("2024-02", "income_statement")["statement"]["Entity"] == "XH"
+
+        assert self.storage.delete_statement("2024-02")
+        assert "2024-02" not in self.storage.list_available_statements()
+        assert not (self.base / "2024-02").exists()
+
+    def test_existing_reports_are_cataloged(self):
+        # Older files have no entity in the name and keep the statement under 'data'
+        legacy_dir = self.base / "2023-12"
+        legacy_dir.mkdir()
+        (legacy_dir / "income_statement.json").write_text(json.dumps({
+            "year_month": "2023-12", "statement_type": "income_statement",
+            "generated_at": "2023-12-31T00:00:00", "data": _income_statement("Combined", 500.0, 50.0),
+            "metadata": {"entity": "Combined"},
+        }), encoding='utf-8')
+        (self.base / "catalog.db").unlink()
+
+        storage = MonthlyReportStorage(str(self.base))
+        assert storage.catalog_entries(months=["2023-12"]) == [{
+            "year_month": "2023-12", "statement_type": "income_statement", "entity": "Combined",
+            "path": "income_statement.json", "generated_at": "2023-12-31T00:00:00",
+        }]
+        assert len(storage.catalog_entries(statement_type="income_statement")) == 7
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            self.storage.load_statements("ledger")
+        with pytest.raises(ValueError):
+            self.storage.delete_statement("2024-13")
+
+
+class TestComparisonFromCatalog:
+    """The comparison engine reads stored statements in bulk"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.storage = MonthlyReportStorage(self.temp_dir)
+        for month_number in range(1, 13):
+            self.storage.save_statement(f"2024-{month_number:02d}", "income_statement",
+                                        _income_statement("Combined", 1000.0 + month_number, 100.0))
+        self.engine = MonthlyComparisonEngine(self.storage)
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_comparison_data(self):
+        comparison = self.engine.get_comparison_data("income_statement", count=6)
+
+        assert comparison["months"] == [f"2024-{m:02d}" for m in range(7, 13)]
+        assert comparison["metadata"]["missing_months"] == []
+        assert comparison["data"]["2024-12"]["Net Income"] == 1012.0 - 100.0
+
+    def test_year_over_year(self):
+        self.storage.save_statement("2023-06", "income_statement", _income_statement("Combined", 500.0, 100.0))
+        yoy = self.engine.calculate_year_over_year_comparison("income_statement", "2024-06")
+
+        assert yoy["comparisons"]["Total Revenue"]["absolute_change"] == 506.0
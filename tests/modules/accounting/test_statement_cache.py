@@ -0,0 +1,143 @@
+"""
+Tests for materialized monthly statements
+
+MonthlyStatementCache regenerates a month's statements only when the
+content of its transactions.parquet or of the category configuration
+changed since they were last materialized.
+"""
+
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+from src.modules.accounting.config.category_config import CategoryConfigLoader
+from src.modules.accounting.core.data_storage import MonthlyDataStorage
+from src.modules.accounting.core.report_storage import MonthlyReportStorage
+from src.modules.accounting.core.statement_cache import MonthlyStatementCache
+from src.modules.accounting.models.domain.category import CategoryMapper
+
+
+def _transactions(users=('XH', 'YY')) -> pd.DataFrame:
+    return pd.DataFrame({
+        'Description': ['Salary', 'Lunch', 'Rent'],
+        'Amount': [8000.0, 35.5, 3000.0],
+        'Debit': ['工资收入', '餐饮', '房租'],
+        'Credit': ['Bank', 'Cash', 'Cash'],
+        'User': [users[0], users[0], users[-1]],
+    })
+
+
+class TestMonthlyStatementCache:
+    """Staleness tracking and regeneration"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.base = Path(self.temp_dir)
+        self.data_storage = MonthlyDataStorage(str(self.base / "monthly_data"))
+        self.report_storage = MonthlyReportStorage(str(self.base / "monthly_reports"))
+        self.config_path = self.base / "category_mappings.json"
+        shutil.copy(CategoryConfigLoader().config_file_path, self.config_path)
+        for month in ('2024-01', '2024-02', '2024-03'):
+            self._store(month, _transactions())
+        self.cache = self._cache()
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _cache(self) -> MonthlyStatementCache:
+        mapper = CategoryMapper(CategoryConfigLoader(str(self.config_path)))
+        return MonthlyStatementCache(self.data_storage, self.report_storage, mapper)
+
+    def _store(self, month: str, df: pd.DataFrame):
+        month_dir = self.base / "monthly_data" / month
+        month_dir.mkdir(parents=True, exist_ok=True)
+        df.to_parquet(month_dir / "transactions.parquet", index=False)
+
+    def test_refresh_materializes_every_entity(self):
+        assert self.cache.is_stale('2024-01')
+        assert self.cache.refresh('2024-01')
+        assert not self.cache.is_stale('2024-01')
+
+        month_dir = self.base / "monthly_reports" / "2024-01"
+        saved = json.loads((month_dir / "income_statement_XH.json").read_text(encoding='utf-8'))
+        assert saved['statement']['Revenue'] == {'工资收入': 8000.0}
+        assert saved['metadata']['source_hash'] == self.cache.source_hash('2024-01')
+        assert {p.name for p in month_dir.glob("cash_flow_*.json")} == {
+            'cash_flow_XH.json', 'cash_flow_YY.json', 'cash_flow_Combined.json'}
+
+        # Up-to-date months are not regenerated
+        assert not self.cache.refresh('2024-01')
+        assert self.cache.refresh('2024-01', force=True)
+
+    def test_source_change_makes_month_stale(self):
+        self.cache.refresh_stale()
+        self._store('2024-02', _transactions(users=('XH',)))
+
+        assert self.cache.stale_months() == ['2024-02']
+        assert self.cache.refresh_stale() == {'2024-01': False, '2024-02': True, '2024-03': False}
+        # Statements of users no longer in the data are removed
+        month_dir = self.base / "monthly_reports" / "2024-02"
+        assert not (month_dir / "income_statement_YY.json").exists()
+        assert (month_dir / "income_statement_XH.json").exists()
+
+    def test_deleted_statements_make_month_stale(self):
+        self.cache.refresh('2024-01')
+        self.report_storage.delete_statement('2024-01', 'cash_flow', 'YY')
+        assert self.cache.is_stale('2024-01')
+
+        self.report_storage.delete_statement('2024-01')
+        assert self.cache.refresh('2024-01')
+        assert not self.cache.is_stale('2024-01')
+
+    def test_saved_statements_are_recorded_in_manifest(self):
+        statements = {
+            'income_statement': {'ZZ': {'Entity': 'ZZ', 'Revenue': {}}},
+            'cash_flow': {'ZZ': {'Entity': 'ZZ'}},
+        }
+        assert self.cache.save_statements('2023-12', statements) == {'income_statement': 1, 'cash_flow': 1}
+        manifest = self.cache.load_manifest('2023-12')
+        assert manifest['statements'] == {'income_statement': ['ZZ'], 'cash_flow': ['ZZ']}
+        assert manifest['source_hash'] is None
+
+    def test_saved_statements_are_kept_until_forced(self):
+        statements = {'income_statement': {'ZZ': {'Entity': 'ZZ', 'Revenue': {}}}}
+        self.cache.refresh('2024-01')
+        self.cache.save_statements('2024-01', statements)
+        month_dir = self.base / "monthly_reports" / "2024-01"
+
+        # Not derived from the stored transactions: never stale, and a refresh keeps them
+        assert self.cache.is_user_saved('2024-01')
+        assert not self.cache.is_stale('2024-01')
+        self._store('2024-01', _transactions(users=('XH',)))
+        assert self.cache.refresh_stale() == {'2024-01': False, '2024-02': True, '2024-03': True}
+        assert (month_dir / "income_statement_ZZ.json").exists()
+
+        assert self.cache.refresh('2024-01', force=True)
+        assert not self.cache.is_user_saved('2024-01')
+        assert not (month_dir / "income_statement_ZZ.json").exists()
+        assert (month_dir / "income_statement_XH.json").exists()
+
+    def test_config_change_makes_all_months_stale(self):
+        self.cache.refresh_stale()
+        config = json.loads(self.config_path.read_text(encoding='utf-8'))
+        config['_note'] = 'changed'
+        self.config_path.write_text(json.dumps(config, ensure_ascii=False), encoding='utf-8')
+
+        # A cache keeps the hash of the configuration its mapper was loaded from
+        assert self.cache.stale_months() == []
+        assert self._cache().stale_months() == ['2024-01', '2024-02', '2024-03']
+
+    def test_parallel_refresh_reports_failures(self):
+        (self.base / "monthly_data" / "2024-03" / "transactions.parquet").write_bytes(b"not parquet")
+        results = self.cache.refresh_stale(max_workers=3)
+
+        assert results['2024-01'] is True and results['2024-02'] is True
+        assert isinstance(results['2024-03'], str)
+        assert self.cache.stale_months() == ['2024-03']
+
+    def test_month_without_transactions_is_not_stale(self):
+        assert not self.cache.is_stale('2023-12')
+        assert not self.cache.refresh('2023-12')
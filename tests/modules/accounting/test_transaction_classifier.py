@@ -0,0 +1,93 @@
+"""
+Tests for vectorized transaction classification
+
+Covers the columnar classifier shared by both TransactionProcessor
+implementations: amount cleaning, classification rules, the transactions
+table and on-demand Transaction objects.
+"""
+
+import pandas as pd
+
+from src.modules.accounting.models.business.transaction_classifier import (
+    TRANSACTION_COLUMNS, classify_transaction, classify_transactions, clean_amounts
+)
+from src.modules.accounting.models.business.transaction_processor import TransactionProcessor
+from src.modules.accounting.models.domain.category import REVENUE_CATEGORIES
+from src.modules.accounting.models.domain.transaction import Transaction
+
+
+RAW_ROWS = pd.DataFrame({
+    'Description': ['Salary', 'Rent', 'Reimbursement', 'Prepaid gym', 'Gym used', '', 'Nothing', ' Lunch '],
+    'Amount': ['¥8,000.00', '$2,000', '1509', '1200', '100', '50', '0', 'abc'],
+    'Debit': ['Bank', '房租', 'Cash', 'Prepaid Gym', '健身', '', '餐饮', '餐饮'],
+    'Credit': ['工资收入', 'Cash', '通勤', '现金', 'Pre-paid Gym', '', 'Cash', 'Cash'],
+    'User': ['Alice', 'Alice', 'Bob', 'Bob', 'Bob', 'Bob', 'Alice', 'Alice'],
+})
+
+
+class TestCleanAmounts:
+    """Whole-column amount cleaning"""
+
+    def test_currency_symbols_and_separators(self):
+        cleaned = clean_amounts(pd.Series(['¥8,000.00', '￥5,500.50', '$2,500.50', ' -300 ', '', None, 'abc']))
+        assert cleaned.tolist() == [8000.0, 5500.5, 2500.5, -300.0, 0.0, 0.0, 0.0]
+
+    def test_numeric_column_passes_through(self):
+        assert clean_amounts(pd.Series([1.5, None, -2])).tolist() == [1.5, 0.0, -2.0]
+
+
+class TestClassifyTransactions:
+    """Classification rules over whole columns"""
+
+    def test_table_rules(self):
+        table = classify_transactions(RAW_ROWS, REVENUE_CATEGORIES)
+
+        assert tuple(table.columns) == TRANSACTION_COLUMNS
+        # Blank, zero and unparseable amounts are dropped
+        assert table['description'].tolist() == ['Salary', 'Rent', 'Reimbursement', 'Prepaid gym', 'Gym used']
+        assert table['transaction_type'].tolist() == ['revenue', 'expense', 'expense', 'prepaid_asset', 'expense']
+        assert table['debit_category'].tolist() == ['工资收入', '房租', '通勤', 'Prepaid Gym', '健身']
+        assert table['amount'].tolist() == [8000.0, 2000.0, -1509.0, 1200.0, 100.0]
+        assert table['affects_cash_flow'].tolist() == [False, True, True, True, False]
+        assert table['affects_cash_flow'].dtype == bool
+
+    def test_table_matches_row_rules(self):
+        table = classify_transactions(RAW_ROWS, REVENUE_CATEGORIES)
+        raw = RAW_ROWS.set_index('Description')
+        for row in table.itertuples(index=False):
+            source = raw.loc[row.description]
+            amount = clean_amounts(pd.Series([source['Amount']])).iloc[0]
+            expected = classify_transaction(source['Debit'], source['Credit'], amount, REVENUE_CATEGORIES)
+            assert (row.transaction_type, row.debit_category, row.affects_cash_flow, row.amount) == expected
+
+    def test_blank_rows_kept_when_requested(self):
+        table = classify_transactions(RAW_ROWS, REVENUE_CATEGORIES, drop_blank=False)
+        assert len(table) == 6
+
+    def test_empty_and_missing_columns(self):
+        assert classify_transactions(pd.DataFrame(), REVENUE_CATEGORIES).empty
+        table = classify_transactions(pd.DataFrame({'Amount': [10.0], 'Debit': ['餐饮']}), REVENUE_CATEGORIES)
+        assert table[['debit_category', 'credit_account', 'user']].values.tolist() == [['餐饮', '', '']]
+
+
+class TestProcessorTable:
+    """TransactionProcessor exposes the table and builds objects on demand"""
+
+    def test_transactions_materialized_lazily(self):
+        processor = TransactionProcessor(dataframe=RAW_ROWS)
+        processor.load_transactions()
+
+        assert len(processor.table) == 5
+        assert processor._transactions is None
+        transactions = processor.transactions
+        assert isinstance(transactions[0], Transaction)
+        assert transactions[2].amount == -1509.0
+        assert processor.transactions is transactions
+
+    def test_users(self):
+        processor = TransactionProcessor(dataframe=RAW_ROWS)
+        processor.load_transactions()
+
+        assert sorted(processor.get_all_users()) == ['Alice', 'Bob']
+        bob = processor.get_transactions_by_user('Bob')
+        assert [t.description for t in bob] == ['Reimbursement', 'Prepaid gym', 'Gym used']
@@ -0,0 +1,198 @@
+"""
+Tests for Parquet persistence of attribution results.
+"""
+import unittest
+import sys
+import tempfile
+import pandas as pd
+import numpy as np
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.modules.portfolio.performance.attribution import (
+    PerformanceAttributor,
+    attribution_results_to_frame,
+    attribution_frame_to_results,
+)
+from src.modules.portfolio.performance.attribution_store import AttributionStore
+from src.modules.portfolio.performance.sector_attribution import (
+    SectorAttributor,
+    SectorAttributionResult,
+)
+
+
+def _attribution_inputs(start: str, periods: int):
+    dates = pd.date_range(start, periods=periods, freq='D')
+    rng = np.random.default_rng(0)
+    asset_returns = pd.DataFrame({
+        'SP500': rng.normal(0.001, 0.01, periods),
+        'TLT': rng.normal(0.0005, 0.005, periods),
+    }, index=dates)
+    weights_data = pd.DataFrame({'SP500': [0.6] * periods, 'TLT': [0.4] * periods}, index=dates)
+    portfolio_returns = (asset_returns * weights_data).sum(axis=1)
+    portfolio_data = pd.DataFrame({
+        'value': 1000 * (1 + portfolio_returns).cumprod(),
+        'returns': portfolio_returns
+    }, index=dates)
+    return portfolio_data, asset_returns, weights_data
+
+
+class TestAttributionStore(unittest.TestCase):
+    """Columnar attribution dataset: partitioning, append and overwrite."""
+
+    def setUp(self):
+        self.store = AttributionStore(tempfile.mkdtemp())
+        self.frame = pd.DataFrame({
+            'Date': pd.date_range('2024-01-01', periods=10, freq='D'),
+            'Total_Return': np.linspace(-0.01, 0.01, 10),
+        })
+
+    def test_write_and_read_partitioned_by_period(self):
+        self.store.write('60/40 Portfolio', 'daily', self.frame)
+        self.store.write('60/40 Portfolio', 'weekly', self.frame.iloc[::7])
+
+        self.assertEqual(self.store.list_periods('60/40 Portfolio'), ['daily', 'weekly'])
+        self.assertTrue((self.store.dataset_path('60/40 Portfolio') / 'period=daily').is_dir())
+
+        daily = self.store.read('60/40 Portfolio', 'daily')
+        pd.testing.assert_frame_equal(daily, self.frame)
+
+        combined = self.store.read('60/40 Portfolio')
+        self.assertEqual(sorted(combined['Period'].unique()), ['daily', 'weekly'])
+
+    def test_append_supersedes_rows_from_first_new_date(self):
+        self.store.write('S', 'daily', self.frame.iloc[:6])
+        extension = self.frame.iloc[4:].copy()
+        extension['Total_Return'] = 1.0
+        self.store.write('S', 'daily', extension)
+
+        stored = self.store.read('S', 'daily')
+        self.assertEqual(len(stored), 10)
+        self.assertTrue(stored['Date'].is_unique)
+        self.assertTrue((stored['Total_Return'].iloc[4:] == 1.0).all())
+        np.testing.assert_allclose(stored['Total_Return'].iloc[:4], self.frame['Total_Return'].iloc[:4])
+
+    def test_append_of_earlier_window_keeps_later_rows(self):
+        later = pd.DataFrame({'Date': pd.date_range('2020-01-01', '2024-12-31', freq='B'), 'Total_Return': 0.0})
+        earlier = pd.DataFrame({'Date': pd.date_range('2010-01-01', '2011-12-31', freq='B'), 'Total_Return': 1.0})
+        self.store.write('S', 'daily', later)
+        self.store.write('S', 'daily', earlier)
+
+        stored = self.store.read('S', 'daily')
+        self.assertEqual(len(stored), len(later) + len(earlier))
+        self.assertTrue(stored['Date'].is_unique)
+        self.assertEqual(stored['Date'].max(), later['Date'].max())
+
+        # A window inside the stored history replaces only its own dates
+        middle = pd.DataFrame({'Date': pd.date_range('2022-01-03', '2022-01-07', freq='B'), 'Total_Return': 2.0})
+        self.store.write('S', 'daily', middle)
+        stored = self.store.read('S', 'daily')
+        self.assertEqual(len(stored), len(later) + len(earlier))
+        self.assertEqual((stored['Total_Return'] == 2.0).sum(), 5)
+
+    def test_overwrite_and_date_filter(self):
+        self.store.write('S', 'daily', self.frame)
+        self.store.write('S', 'daily', self.frame.iloc[:3], mode='overwrite')
+        self.assertEqual(len(self.store.read('S', 'daily')), 3)
+
+        filtered = self.store.read('S', 'daily', start_date='2024-01-02', end_date='2024-01-02')
+        self.assertEqual(len(filtered), 1)
+
+    def test_missing_strategy_reads_empty(self):
+        self.assertTrue(self.store.read('Unknown').empty)
+        self.assertFalse(self.store.has_results('Unknown'))
+
+
+class TestAttributorPersistence(unittest.TestCase):
+    """Attribution results round-trip through the store without rerunning the analysis."""
+
+    def setUp(self):
+        self.results_dir = tempfile.mkdtemp()
+        self.attributor = PerformanceAttributor(results_dir=self.results_dir)
+
+    def test_frame_round_trip(self):
+        portfolio_data, asset_returns, weights_data = _attribution_inputs('2024-01-01', 15)
+        daily = self.attributor.calculate_daily_attribution(portfolio_data, asset_returns, weights_data)
+        frame = attribution_results_to_frame(daily)
+
+        self.assertEqual(list(frame.columns[:3]), ['Date', 'Total_Return', 'Weight_Change_Impact'])
+        self.assertIn('Asset_Contrib_SP500', frame.columns)
+        self.assertIn('Rebal_Impact_TLT', frame.columns)
+
+        restored = attribution_frame_to_results(frame, 'daily')
+        self.assertEqual(len(restored), len(daily))
+        self.assertAlmostEqual(restored[3].total_return, daily[3].total_return)
+        self.assertEqual(restored[3].asset_contributions.keys(), daily[3].asset_contributions.keys())
+
+    def test_report_is_stored_and_reloaded(self):
+        inputs = _attribution_inputs('2024-01-01', 40)
+        report = self.attributor.generate_attribution_report('Test Strategy', *inputs, store_results=True)
+        self.assertNotIn('error', report)
+        self.assertIn('daily_parquet', report['stored_files'])
+
+        reloaded = self.attributor.load_attribution_report('Test Strategy')
+        self.assertEqual(reloaded['source'], 'stored')
+        self.assertAlmostEqual(
+            reloaded['daily_analysis']['summary_statistics']['total_portfolio_return'],
+            report['daily_analysis']['summary_statistics']['total_portfolio_return']
+        )
+        self.assertEqual(reloaded['monthly_analysis']['total_periods'],
+                         report['monthly_analysis']['total_periods'])
+
+    def test_report_is_not_stored_by_default(self):
+        report = self.attributor.generate_attribution_report('Test Strategy', *_attribution_inputs('2024-01-01', 20))
+        self.assertNotIn('stored_files', report)
+        self.assertFalse(self.attributor.store.has_results('Test Strategy'))
+
+    def test_extended_backtest_appends(self):
+        self.attributor.generate_attribution_report('Test Strategy', *_attribution_inputs('2024-01-01', 20), store_results=True)
+        self.attributor.generate_attribution_report('Test Strategy', *_attribution_inputs('2024-01-01', 45), store_results=True)
+
+        daily = self.attributor.store.read('Test Strategy', 'daily')
+        self.assertTrue(daily['Date'].is_unique)
+        self.assertEqual(daily['Date'].max(), pd.Timestamp('2024-02-14'))
+
+    def test_export_from_store(self):
+        self.attributor.generate_attribution_report('Test Strategy', *_attribution_inputs('2024-01-01', 20), store_results=True)
+        export_dir = Path(tempfile.mkdtemp())
+        saved = self.attributor.export_attribution_data('Test Strategy', output_dir=str(export_dir), periods=['daily'])
+
+        self.assertIn('daily_csv', saved)
+        self.assertIn('excel_comprehensive', saved)
+        exported = pd.read_csv(saved['daily_csv'])
+        self.assertEqual(exported['Date'].iloc[0], '2024-01-02')
+
+    def test_sector_results_round_trip(self):
+        sector_attributor = SectorAttributor(results_dir=self.results_dir)
+        results = [
+            SectorAttributionResult(pd.Timestamp('2024-01-31'), sector, 0.5, 0.4, 0.02, 0.01,
+                                    0.001, 0.004, 0.001, 0.006)
+            for sector in ('US Equity', 'Fixed Income')
+        ]
+        saved = sector_attributor.save_attribution_results('Test Strategy', results, {}, period='monthly')
+        self.assertIn('monthly_parquet', saved)
+
+        loaded = sector_attributor.load_attribution_results('Test Strategy', period='monthly')
+        self.assertEqual([r.sector for r in loaded], ['US Equity', 'Fixed Income'])
+        self.assertAlmostEqual(loaded[0].total_effect, 0.006)
+
+    def test_sector_results_are_stored_per_benchmark(self):
+        sector_attributor = SectorAttributor(results_dir=self.results_dir)
+        results = [SectorAttributionResult(pd.Timestamp('2024-01-31'), 'US Equity', 0.5, 0.4, 0.02, 0.01,
+                                           0.001, 0.004, 0.001, 0.006)]
+        sector_attributor.save_attribution_results('Test Strategy', results, {}, period='monthly',
+                                                   benchmark='60/40 Portfolio')
+
+        loaded = sector_attributor.load_attribution_results('Test Strategy', period='monthly',
+                                                            benchmark='60/40 Portfolio')
+        self.assertEqual([r.sector for r in loaded], ['US Equity'])
+        # Results computed against another benchmark are not reused
+        self.assertEqual(sector_attributor.load_attribution_results(
+            'Test Strategy', period='monthly', benchmark='Equal Weight'), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,167 @@
+"""
+Tests for the multi-account holdings store and its presenter integration.
+"""
+import unittest
+import json
+import sys
+import tempfile
+import shutil
+from pathlib import Path
+
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.modules.portfolio.trading.holdings import HoldingsStore, latest_prices
+from src.modules.portfolio.presenters.portfolio_presenter import PortfolioPresenter
+
+PRICES = {'SP500': 100.0, 'TLT': 50.0, 'CSI300': 40.0}
+
+
+class TestHoldingsStore(unittest.TestCase):
+    """Lots, positions, weights and valuation."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = HoldingsStore(str(Path(self.temp_dir) / "accounts" / "holdings.db"))
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_lots_aggregate_across_accounts(self):
+        self.store.add_lot('brokerage', 'SP500', 10, cost_basis=900.0, acquired='2024-01-02')
+        self.store.add_lot('brokerage', 'SP500', 5, cost_basis=550.0)
+        self.store.add_lot('ira', 'TLT', 20, cost_basis=1100.0)
+
+        self.assertEqual(self.store.accounts()['account_id'].tolist(), ['brokerage', 'ira'])
+        positions = self.store.positions().set_index('symbol')
+        self.assertEqual(positions.loc['SP500', 'quantity'], 15)
+        self.assertEqual(positions.loc['SP500', 'cost_basis'], 1450.0)
+        self.assertEqual(positions.loc['SP500', 'lots'], 2)
+        by_account = self.store.positions(by_account=True)
+        self.assertEqual(by_account[['account_id', 'symbol']].values.tolist(),
+                         [['brokerage', 'SP500'], ['ira', 'TLT']])
+        self.assertEqual(self.store.positions('ira')['symbol'].tolist(), ['TLT'])
+
+    def test_incremental_lot_updates(self):
+        lot_id = self.store.add_lot('brokerage', 'SP500', 10, cost_basis=900.0)
+        other = self.store.add_lot('brokerage', 'TLT', 20, cost_basis=1000.0)
+
+        self.assertTrue(self.store.update_lot(lot_id, quantity=12, cost_basis=1100.0))
+        self.assertTrue(self.store.remove_lot(other))
+        self.assertFalse(self.store.remove_lot(other))
+        with self.assertRaises(ValueError):
+            self.store.update_lot(lot_id, price=1.0)
+
+        lots = self.store.lots_frame()
+        self.assertEqual(lots['lot_id'].tolist(), [lot_id])
+        self.assertEqual(lots.loc[0, 'quantity'], 12)
+        self.assertEqual(lots.loc[0, 'cost_basis'], 1100.0)
+
+    def test_bulk_insert(self):
+        lots = pd.DataFrame({'account_id': ['a', 'a', 'b'], 'symbol': ['SP500', 'TLT', 'SP500'],
+                             'quantity': [1, 2, 3], 'acquired': pd.to_datetime(['2024-01-02'] * 3)})
+        self.assertEqual(self.store.add_lots(lots), 3)
+        frame = self.store.lots_frame('a')
+        self.assertEqual(frame['symbol'].tolist(), ['SP500', 'TLT'])
+        self.assertEqual(frame['currency'].unique().tolist(), ['USD'])
+        self.assertTrue(frame['acquired'].str.startswith('2024-01-02').all())
+
+    def test_valuation_and_weights(self):
+        self.store.add_lot('brokerage', 'SP500', 10, cost_basis=900.0)
+        self.store.add_lot('ira', 'TLT', 20, cost_basis=1100.0)
+
+        valued = self.store.valuation(PRICES)
+        self.assertEqual(valued.loc['SP500', 'market_value'], 1000.0)
+        self.assertEqual(valued.loc['TLT', 'unrealized_pnl'], -100.0)
+        self.assertEqual(self.store.current_weights(PRICES), {'SP500': 0.5, 'TLT': 0.5})
+        self.assertEqual(self.store.current_weights(PRICES, account_id='ira'), {'TLT': 1.0})
+
+    def test_currency_conversion(self):
+        self.store.add_lot('brokerage', 'SP500', 10, cost_basis=900.0)
+        self.store.add_lot('china', 'CSI300', 175, cost_basis=7000.0, currency='CNY')
+
+        weights = self.store.current_weights(PRICES, fx_rates={'CNY': 1 / 7.0})
+        self.assertAlmostEqual(weights['SP500'], 0.5)
+        self.assertAlmostEqual(weights['CSI300'], 0.5)
+        # Without a rate for CNY the lot cannot be valued
+        self.assertEqual(self.store.current_weights(PRICES, fx_rates={}), {'SP500': 1.0})
+
+    def test_gap_analysis(self):
+        self.store.add_lot('brokerage', 'SP500', 10)
+        self.store.add_lot('brokerage', 'TLT', 20)
+
+        gaps = self.store.gap_analysis({'SP500': 0.6, 'TLT': 0.2, 'CSI300': 0.2}, PRICES)
+        self.assertAlmostEqual(gaps.loc['SP500', 'gap'], 0.1)
+        self.assertAlmostEqual(gaps.loc['CSI300', 'current'], 0.0)
+        self.assertAlmostEqual(gaps.loc['TLT', 'target_value'], 400.0)
+        self.assertEqual(gaps.loc['CSI300', 'market_value'], 0.0)
+
+    def test_set_weights_writes_only_changes(self):
+        self.assertEqual(self.store.set_weights({'SP500': 0.6, 'TLT': 0.4}), 2)
+        self.assertEqual(self.store.set_weights({'SP500': 0.6, 'TLT': 0.4}), 0)
+        self.assertEqual(self.store.set_weights({'SP500': 0.5, 'GLD': 0.5}), 3)
+        self.assertEqual(self.store.weights(), {'SP500': 0.5, 'GLD': 0.5})
+
+    def test_latest_prices(self):
+        dates = pd.bdate_range('2024-01-01', periods=3)
+        market_data = {'SP500': pd.DataFrame({'close': [1.0, 2.0, None]}, index=dates),
+                       'US10Y': pd.DataFrame({'yield': [4.0, 4.1, 4.2]}, index=dates),
+                       'TLT': pd.DataFrame()}
+        self.assertEqual(latest_prices(market_data), {'SP500': 2.0})
+
+
+class TestPresenterHoldings(unittest.TestCase):
+    """PortfolioPresenter holdings backed by the store."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.legacy = Path(self.temp_dir) / "holdings.json"
+        self.legacy.write_text(json.dumps({'SP500': 0.6, 'TLT': 0.4}))
+        self.db = str(Path(self.temp_dir) / "holdings.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _presenter(self):
+        return PortfolioPresenter(holdings_file=str(self.legacy), holdings_db=self.db)
+
+    def test_legacy_json_is_imported_once(self):
+        presenter = self._presenter()
+        self.assertEqual(presenter.load_holdings(), {'SP500': 0.6, 'TLT': 0.4})
+        self.assertEqual(presenter.save_holdings({'SP500': 1.0}), "Holdings saved successfully!")
+        presenter.holdings_store.close()
+
+        # The saved allocation wins over the legacy file on the next start
+        presenter = self._presenter()
+        self.assertEqual(presenter.load_holdings(), {'SP500': 1.0})
+        presenter.holdings_store.close()
+
+    def test_lots_drive_current_weights(self):
+        presenter = self._presenter()
+        presenter.holdings_store.add_lot('brokerage', 'SP500', 10)
+        presenter.holdings_store.add_lot('ira', 'TLT', 60)
+        presenter._latest_prices = PRICES
+        self.assertEqual(presenter.load_holdings(), {'SP500': 0.25, 'TLT': 0.75})
+        self.assertTrue(presenter.holdings_from_lots())
+
+        # Weights derived from lots can't be overwritten by a saved allocation
+        self.assertTrue(presenter.save_holdings({'SP500': 0.2, 'TLT': 0.8}).startswith("Error"))
+        self.assertEqual(presenter.load_holdings(), {'SP500': 0.25, 'TLT': 0.75})
+        presenter.close()
+
+    def test_close_reopens_on_next_access(self):
+        presenter = self._presenter()
+        store = presenter.holdings_store
+        presenter.close()
+        with self.assertRaises(Exception):
+            store.has_lots()
+        self.assertEqual(presenter.load_holdings(), {'SP500': 0.6, 'TLT': 0.4})
+        presenter.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+"""
+Tests for the SQLite order journal and executor crash recovery.
+"""
+import unittest
+import asyncio
+import sys
+import tempfile
+import shutil
+from pathlib import Path
+
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.modules.portfolio.trading.executor import (
+    OrderStatus, PaperTradingExecutor, SimulationExecutor
+)
+from src.modules.portfolio.trading.journal import OrderJournal
+from src.modules.portfolio.trading.paper import PaperTradingSession, ReplayMarketDataServer
+
+
+def _market_data():
+    dates = pd.bdate_range('2024-01-01', periods=3)
+    return {'SPY': pd.DataFrame({'close': [100.0, 101.0, 102.0], 'volume': 1e6}, index=dates),
+            'TLT': pd.DataFrame({'close': [50.0, 50.5, 51.0]}, index=dates)}
+
+
+class TestOrderJournal(unittest.TestCase):
+    """Orders and fills survive an executor restart."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = str(Path(self.temp_dir) / "journal" / "orders.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_simulation_state_is_restored(self):
+        executor = SimulationExecutor(_market_data(), journal_path=self.path)
+        executor.submit_orders([
+            executor.create_market_order('SPY', 10, 'buy', order_id='m1'),
+            executor.create_market_order('TLT', 20, 'sell', order_id='m2'),
+        ])
+        limit = executor.create_limit_order('SPY', 5, 'buy', 90.0, order_id='l1')
+        executor.submit_order(limit)
+        executor.cancel_order('l1')
+        executor.submit_order(executor.create_limit_order('SPY', 3, 'buy', 95.0, order_id='l2'))
+        summary = executor.get_execution_summary()
+        executor.close()
+
+        restored = SimulationExecutor(_market_data(), journal_path=self.path)
+        self.assertEqual(restored.get_execution_summary(), summary)
+        self.assertEqual(restored.orders['l1'].status, OrderStatus.CANCELLED)
+        self.assertAlmostEqual(restored.orders['m1'].average_fill_price, 102.0 * 1.001)
+        self.assertEqual([o.order_id for o in restored.order_book.resting_orders()], ['l2'])
+        self.assertEqual(len(restored.execution_history), 2)
+        self.assertEqual(restored.execution_history[1]['symbol'], 'TLT')
+
+        # The resting order still fills after the restart
+        restored.process_bar('SPY', pd.Timestamp('2024-01-04'), 96.0, 97.0, 94.0, 95.0)
+        self.assertEqual(restored.orders['l2'].status, OrderStatus.FILLED)
+        restored.close()
+        self.assertEqual(len(OrderJournal(self.path).fills_frame(symbol='SPY')), 2)
+
+    def test_bounded_history_reloads_tail(self):
+        executor = SimulationExecutor(_market_data(), journal_path=self.path, history_limit=4)
+        executor.submit_orders([executor.create_market_order('SPY', 1, 'buy', order_id=f'o{i}')
+                                for i in range(10)])
+        executor.close()
+
+        restored = SimulationExecutor(_market_data(), journal_path=self.path, history_limit=4)
+        self.assertEqual(restored.execution_count, 10)
+        self.assertEqual([r['order_id'] for r in restored.execution_history], ['o6', 'o7', 'o8', 'o9'])
+        self.assertEqual(restored.execution_history.evicted_records, 6)
+
+    def test_bulk_frames_and_batched_sync(self):
+        journal = OrderJournal(self.path, sync_every=1000, sync_interval=3600)
+        executor = SimulationExecutor(_market_data())
+        executor.journal = journal
+        executor.submit_order(executor.create_market_order('SPY', 10, 'buy', order_id='m1'))
+        # Nothing committed yet: a second reader sees an empty journal
+        self.assertTrue(OrderJournal(self.path).is_empty)
+        journal.flush()
+
+        orders = OrderJournal(self.path).orders_frame()
+        self.assertEqual(list(orders['status']), ['filled'])
+        fills = journal.fills_frame(start_time=pd.Timestamp('2000-01-01'))
+        self.assertEqual(list(fills.columns),
+                         ['timestamp', 'order_id', 'symbol', 'side', 'quantity', 'price', 'commission', 'slippage_cost'])
+        self.assertEqual(journal.fill_totals()['count'], 1)
+        journal.close()
+
+    def test_paper_session_resumes_positions(self):
+        weights = lambda as_of: {'SPY': 0.5, 'TLT': 0.5}
+        executor = PaperTradingExecutor(journal_path=self.path, enforce_risk_limits=False)
+        session = PaperTradingSession(executor, weights, initial_cash=10_000)
+        asyncio.run(session.run(ReplayMarketDataServer(_market_data())))
+        pending = [o.order_id for o in executor.orders.values() if o.status == OrderStatus.SUBMITTED]
+        executor.close()
+
+        executor = PaperTradingExecutor(journal_path=self.path, enforce_risk_limits=False)
+        resumed = PaperTradingSession(executor, weights, initial_cash=10_000)
+        self.assertEqual(resumed.positions, session.positions)
+        self.assertAlmostEqual(resumed.cash, session.cash)
+        self.assertEqual(resumed._order_seq, session._order_seq)
+        self.assertEqual(sorted(o.order_id for orders in executor.pending_market_orders.values() for o in orders),
+                         sorted(pending))
+        executor.close()
+
+    def test_restarted_session_skips_traded_bars(self):
+        # Targets alternate daily, so replaying traded bars would trade them again
+        weights = lambda as_of: {'SPY': 0.2, 'TLT': 0.8} if as_of.day % 2 else {'SPY': 0.8, 'TLT': 0.2}
+        dates = pd.bdate_range('2024-01-01', periods=6)
+        data = {'SPY': pd.DataFrame({'close': [100.0, 101.0, 102.0, 103.0, 104.0, 105.0]}, index=dates),
+                'TLT': pd.DataFrame({'close': [50.0] * 6}, index=dates)}
+
+        uninterrupted = PaperTradingSession(PaperTradingExecutor(enforce_risk_limits=False), weights, initial_cash=10_000)
+        asyncio.run(uninterrupted.run(ReplayMarketDataServer(data)))
+
+        executor = PaperTradingExecutor(journal_path=self.path, enforce_risk_limits=False)
+        session = PaperTradingSession(executor, weights, initial_cash=10_000)
+        asyncio.run(session.run(ReplayMarketDataServer({name: df.iloc[:3] for name, df in data.items()})))
+        executor.close()
+
+        # The restarted feed replays from the first bar; traded bars are skipped
+        executor = PaperTradingExecutor(journal_path=self.path, enforce_risk_limits=False)
+        resumed = PaperTradingSession(executor, weights, initial_cash=10_000)
+        summary = asyncio.run(resumed.run(ReplayMarketDataServer(data)))
+        self.assertEqual(summary['trading_days'], 6)
+        self.assertEqual(executor.execution_count, uninterrupted.executor.execution_count)
+        self.assertEqual(resumed.positions, uninterrupted.positions)
+        self.assertAlmostEqual(resumed.cash, uninterrupted.cash)
+        executor.close()
+
+        # Fills and order events are stamped with bar times, not wall-clock time
+        journal = OrderJournal(self.path)
+        fills = journal.fills_frame()
+        self.assertTrue(fills['timestamp'].isin(dates).all())
+        self.assertTrue(fills['timestamp'].is_monotonic_increasing)
+        self.assertTrue(journal.orders_frame()['updated_time'].isin(dates).all())
+        self.assertEqual(journal.load_checkpoint('PaperTrading'),
+                         {'bar_time': dates[-1], 'trading_days': 5, 'closed': False})
+        journal.close()
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,232 @@
+"""
+Tests for the vectorized, batch and streaming metrics and lazy report charts
+in the performance module.
+"""
+import unittest
+import json
+import sys
+import tempfile
+import pandas as pd
+import numpy as np
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.modules.portfolio.performance.analytics import (
+    PerformanceAnalyzer,
+    _max_drawdown_duration,
+)
+from src.modules.portfolio.performance.charts import PerformanceCharts
+from src.modules.portfolio.performance.streaming import StreamingMetrics
+
+
+class TestVectorizedPerformanceMetrics(unittest.TestCase):
+    """Vectorized metrics must match the original loop-based results."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.analyzer = PerformanceAnalyzer(results_dir=self.temp_dir)
+        rng = np.random.default_rng(7)
+        dates = pd.bdate_range('2015-01-01', periods=1500)
+        self.returns = pd.Series(rng.normal(0.0004, 0.012, len(dates)), index=dates)
+
+    def test_max_drawdown_duration_counts_completed_runs_only(self):
+        """Open drawdowns at the end of the series are ignored, as before."""
+        drawdown = np.array([0, -0.1, -0.2, 0, -0.05, 0, -0.1, -0.1, -0.1, -0.1])
+        self.assertEqual(_max_drawdown_duration(drawdown), 2)
+        self.assertEqual(_max_drawdown_duration(np.array([-0.1, -0.1, 0.0])), 2)
+        self.assertEqual(_max_drawdown_duration(np.array([0.0, -0.1, -0.1])), 0)
+        self.assertEqual(_max_drawdown_duration(np.array([])), 0)
+
+    def test_max_drawdown_duration_matches_loop(self):
+        cumulative = (1 + self.returns).cumprod()
+        running_max = cumulative.expanding().max()
+        drawdown = (cumulative - running_max) / running_max
+
+        periods, in_drawdown, start = [], False, None
+        for i, dd in enumerate(drawdown):
+            if dd < 0 and not in_drawdown:
+                in_drawdown, start = True, i
+            elif dd == 0 and in_drawdown:
+                in_drawdown = False
+                periods.append(i - start)
+        expected = max(periods) if periods else 0
+
+        metrics = self.analyzer._calculate_comprehensive_metrics(self.returns, "Test")
+        self.assertEqual(metrics['max_drawdown_duration'], expected)
+
+    def test_rolling_return_matches_compounded_product(self):
+        rolling = self.analyzer.rolling_performance_analysis(self.returns, windows=[252, 504])
+        self.assertEqual(set(rolling.keys()), {'252d', '504d'})
+
+        for window in (252, 504):
+            expected = self.returns.rolling(window=window).apply(lambda x: (1 + x).prod() - 1, raw=True)
+            actual = rolling[f'{window}d'][f'return_{window}d']
+            np.testing.assert_allclose(actual.to_numpy(), expected.to_numpy(), rtol=1e-9, equal_nan=True)
+
+    def test_rolling_windows_longer_than_series_are_skipped(self):
+        rolling = self.analyzer.rolling_performance_analysis(self.returns.iloc[:300], windows=[252, 504])
+        self.assertEqual(list(rolling.keys()), ['252d'])
+
+
+class TestLazyPerformanceCharts(unittest.TestCase):
+    """Report charts are rendered only when a chart path is requested."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.analyzer = PerformanceAnalyzer(results_dir=self.temp_dir)
+        dates = pd.bdate_range('2023-01-02', periods=60)
+        values = 1000 * np.cumprod(1 + np.random.default_rng(3).normal(0, 0.01, len(dates)))
+        portfolio_df = pd.DataFrame({'value': values}, index=dates)
+        portfolio_df['returns'] = portfolio_df['value'].pct_change()
+        self.strategy_results = {'strategy_name': 'Lazy Test', 'portfolio_evolution': portfolio_df}
+
+    def _pngs(self):
+        return sorted(Path(self.temp_dir).glob('*.png'))
+
+    def test_report_does_not_render_charts(self):
+        report = self.analyzer.generate_performance_report(self.strategy_results, save_charts=True)
+        self.assertIsInstance(report['charts'], PerformanceCharts)
+        self.assertIn('sharpe_ratio', report['performance_metrics'])
+        self.assertEqual(self._pngs(), [])
+        self.assertEqual(report['charts'].rendered, {})
+        report_files = list(Path(self.temp_dir).glob('*.json'))
+        self.assertEqual(len(report_files), 1)
+        # The saved report lists every available chart, even though none is rendered yet
+        saved = json.loads(report_files[0].read_text())
+        self.assertEqual(saved['charts'], {'portfolio_evolution': None, 'returns_analysis': None, 'drawdown': None})
+
+    def test_chart_renders_once_on_first_access(self):
+        report = self.analyzer.generate_performance_report(self.strategy_results, save_charts=True)
+        charts = report['charts']
+
+        drawdown_path = charts['drawdown']
+        self.assertTrue(Path(drawdown_path).exists())
+        self.assertEqual(list(charts.rendered), ['drawdown'])
+        self.assertEqual(len(self._pngs()), 1)
+
+        self.assertEqual(charts['drawdown'], drawdown_path)
+        self.assertEqual(len(self._pngs()), 1)
+
+    def test_save_charts_disabled(self):
+        report = self.analyzer.generate_performance_report(self.strategy_results, save_charts=False)
+        self.assertEqual(report['charts'], {})
+
+
+class TestStreamingMetrics(unittest.TestCase):
+    """Online accumulator must agree with the full-history calculation at any point."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.analyzer = PerformanceAnalyzer(results_dir=self.temp_dir)
+        rng = np.random.default_rng(5)
+        self.values = 1_000_000 * np.cumprod(1 + rng.normal(0.0003, 0.012, 900))
+
+    def _assert_matches(self, accumulator, values):
+        returns = pd.Series(values).pct_change()
+        expected = self.analyzer._calculate_comprehensive_metrics(returns, "Streaming")
+        actual = accumulator.metrics()
+        self.assertEqual(set(actual), set(expected))
+        for key, value in expected.items():
+            if key == 'name':
+                continue
+            self.assertAlmostEqual(float(actual[key]), float(value), places=8, msg=key)
+
+    def test_matches_batch_metrics_at_every_checkpoint(self):
+        accumulator = StreamingMetrics("Streaming")
+        for i, value in enumerate(self.values, start=1):
+            accumulator.add_value(value)
+            if i in (50, 333, len(self.values)):
+                self._assert_matches(accumulator, self.values[:i])
+
+    def test_reset_clears_last_value(self):
+        accumulator = StreamingMetrics()
+        accumulator.add_value(100.0)
+        accumulator.add_value(110.0)
+        accumulator.reset()
+        self.assertIsNone(accumulator.add_value(50.0))
+        self.assertEqual(accumulator.count, 0)
+
+    def test_quantiles_use_bounded_window(self):
+        accumulator = StreamingMetrics("Window", quantile_window=100)
+        for value in self.values:
+            accumulator.add_value(value)
+        returns = pd.Series(self.values).pct_change().dropna().to_numpy()
+        metrics = accumulator.metrics()
+        self.assertAlmostEqual(metrics['var_95'], float(np.quantile(returns[-100:], 0.05)))
+        self.assertEqual(accumulator._window.size, 100)
+        # Moments and drawdown still cover the whole history
+        self._assert_matches_fields(metrics, returns, ('total_return', 'volatility', 'max_drawdown'))
+
+    def _assert_matches_fields(self, actual, returns, fields):
+        expected = self.analyzer._calculate_comprehensive_metrics(pd.Series(returns), "Streaming")
+        for key in fields:
+            self.assertAlmostEqual(float(actual[key]), float(expected[key]), places=8, msg=key)
+
+    def test_invalid_values_are_skipped(self):
+        accumulator = StreamingMetrics()
+        self.assertIsNone(accumulator.add_value(100.0))
+        self.assertIsNone(accumulator.add_value(float('nan')))
+        self.assertIsNone(accumulator.add_value(0.0))
+        self.assertAlmostEqual(accumulator.add_value(110.0), 0.1)
+        self.assertEqual(accumulator.count, 1)
+
+    def test_insufficient_data(self):
+        accumulator = StreamingMetrics("Flat")
+        self.assertEqual(accumulator.metrics(), {})
+        for _ in range(5):
+            accumulator.add_value(100.0)
+        self.assertEqual(accumulator.metrics()['error'], 'Insufficient or invalid data')
+
+
+class TestBatchPerformanceMetrics(unittest.TestCase):
+    """Batch metrics must agree with the per-series calculation column by column."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.analyzer = PerformanceAnalyzer(results_dir=self.temp_dir)
+        rng = np.random.default_rng(11)
+        dates = pd.bdate_range('2018-01-01', periods=800)
+        self.matrix = pd.DataFrame(
+            rng.normal(0.0003, 0.01, (len(dates), 5)),
+            index=dates,
+            columns=[f'sweep_{i}' for i in range(5)]
+        )
+        # Later inception and a gap, as when aligning strategies on a shared calendar
+        self.matrix.iloc[:120, 1] = np.nan
+        self.matrix.iloc[300:310, 2] = np.nan
+
+    def test_batch_matches_single_series_metrics(self):
+        batch = self.analyzer.calculate_batch_metrics(self.matrix)
+        self.assertEqual(list(batch.index), list(self.matrix.columns))
+
+        for column in self.matrix.columns:
+            expected = self.analyzer._calculate_comprehensive_metrics(self.matrix[column], column)
+            row = batch.loc[column]
+            self.assertTrue(pd.isna(row['error']))
+            for key, value in expected.items():
+                if key == 'name':
+                    continue
+                self.assertAlmostEqual(float(row[key]), float(value), places=9,
+                                       msg=f"{column}: {key}")
+
+    def test_batch_accepts_dict_of_series(self):
+        series = {name: self.matrix[name].dropna() for name in self.matrix.columns[:2]}
+        batch = self.analyzer.calculate_batch_metrics(series)
+        self.assertEqual(batch.loc['sweep_1', 'total_periods'], 680)
+
+    def test_batch_flags_invalid_columns(self):
+        matrix = self.matrix.copy()
+        matrix['flat'] = 0.0
+        matrix['empty'] = np.nan
+        batch = self.analyzer.calculate_batch_metrics(matrix)
+        self.assertEqual(batch.loc['flat', 'error'], 'Insufficient or invalid data')
+        self.assertEqual(batch.loc['empty', 'error'], 'Insufficient or invalid data')
+        self.assertTrue(np.isnan(batch.loc['flat', 'sharpe_ratio']))
+        self.assertTrue(pd.isna(batch.loc['sweep_0', 'error']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+"""
+Tests for the vectorized rebalance planner and its strategy and presenter use.
+"""
+import unittest
+import sys
+from pathlib import Path
+
+import backtrader as bt
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.modules.portfolio.trading.rebalance import RebalancePlanner
+from src.modules.portfolio.trading.risk import PreTradeRiskEngine
+from src.modules.portfolio.trading.executor import SimulationExecutor
+from src.modules.portfolio.strategies.base import BaseStrategy
+from src.modules.portfolio.presenters.portfolio_presenter import PortfolioPresenter
+
+
+class TestRebalancePlanner(unittest.TestCase):
+    """Minimal trade lists from target weights."""
+
+    def test_plan_from_cash(self):
+        plan = RebalancePlanner.unconstrained().plan(
+            ['A', 'B'], [0, 0], [10.0, 30.0], {'A': 0.5, 'B': 0.5}, cash=1000.0
+        )
+        np.testing.assert_array_equal(plan.target_shares, [50, 16])
+        self.assertEqual(plan.trades(), [('A', 'buy', 50.0), ('B', 'buy', 16.0)])
+        self.assertAlmostEqual(plan.ending_cash, 1000.0 - 500.0 - 480.0)
+
+    def test_sells_first_and_closes(self):
+        plan = RebalancePlanner.unconstrained().plan(
+            ['A', 'B', 'C'], [100, 0, 10], [10.0, 10.0, 10.0], {'B': 1.0}, cash=0.0
+        )
+        self.assertEqual([side for _, side, _ in plan.trades()], ['sell', 'sell', 'buy'])
+        self.assertEqual(plan.descriptions(), ['Close A', 'Close C', 'Buy 110 of B'])
+
+    def test_descriptions_avoid_scientific_notation(self):
+        plan = RebalancePlanner.unconstrained().plan(
+            ['A', 'B'], [0, 0], [1.0, 8.0], {'A': 0.9, 'B': 0.1}, cash=2_000_000.0
+        )
+        self.assertEqual(plan.descriptions(), ['Buy 1,800,000 of A', 'Buy 25,000 of B'])
+        plan.trade_shares = np.array([0.125, 2.5])
+        self.assertEqual(plan.descriptions(), ['Buy 0.1250 of A', 'Buy 2.5000 of B'])
+
+    def test_lot_sizes_round_down(self):
+        planner = RebalancePlanner.unconstrained(lot_sizes={'A': 100})
+        plan = planner.plan(['A', 'B'], [0, 0], [1.0, 1.0], [0.5, 0.5], cash=1050.0)
+        np.testing.assert_array_equal(plan.trade_shares, [500, 525])
+
+    def test_no_trade_band(self):
+        planner = RebalancePlanner.unconstrained(no_trade_band=0.05)
+        plan = planner.plan(['A', 'B'], [48, 52], [10.0, 10.0], [0.5, 0.5], cash=0.0)
+        self.assertEqual(plan.trades(), [])
+        plan = planner.plan(['A', 'B'], [40, 60], [10.0, 10.0], [0.5, 0.5], cash=0.0)
+        self.assertEqual(plan.trades(), [('B', 'sell', 10.0), ('A', 'buy', 10.0)])
+
+    def test_buys_scaled_to_available_cash(self):
+        # Portfolio value is stale relative to cash: buys cannot exceed what is on hand
+        plan = RebalancePlanner.unconstrained().plan(
+            ['A', 'B'], [0, 0], [10.0, 10.0], [0.5, 0.5], cash=500.0, portfolio_value=1000.0
+        )
+        self.assertLessEqual(float(plan.trade_shares @ plan.prices), 500.0)
+        self.assertGreaterEqual(plan.ending_cash, 0.0)
+
+    def test_position_and_sector_limits(self):
+        planner = RebalancePlanner(max_position_size=0.25, max_sector_allocation=0.40)
+        weights = planner.apply_limits(['TLT', 'IEF', 'SP500', 'CASH'], [0.3, 0.3, 0.1, 0.3])
+        # TLT/IEF capped at 0.25 each, then the bond sector scaled from 0.5 to 0.4; CASH exempt
+        np.testing.assert_allclose(weights, [0.2, 0.2, 0.1, 0.3])
+
+    def test_unmapped_assets_have_no_sector_limit(self):
+        # Same policy as the pre-trade risk engine: the planner's targets pass its checks
+        planner = RebalancePlanner(max_position_size=None, max_sector_allocation=0.40)
+        weights = planner.apply_limits(['AAA', 'BBB', 'TLT'], [0.3, 0.3, 0.5])
+        np.testing.assert_allclose(weights, [0.3, 0.3, 0.4])
+
+        engine = PreTradeRiskEngine(max_position_size=None, max_sector_allocation=0.40)
+        engine.update_portfolio(cash=1000.0)
+        result = engine.check_orders(['AAA', 'BBB', 'TLT'], ['buy'] * 3, weights * 100, [10.0] * 3)
+        self.assertTrue(result.all_approved)
+
+    def test_unpriced_assets_are_not_traded(self):
+        plan = RebalancePlanner.unconstrained().plan_from_holdings(
+            {'A': 5}, {'A': 10.0}, {'A': 0.5, 'CASH': 0.5}, cash=50.0
+        )
+        self.assertEqual(plan.trades(), [])
+
+    def test_to_orders(self):
+        dates = pd.date_range('2024-01-01', periods=1)
+        executor = SimulationExecutor({'A': pd.DataFrame({'close': [10.0]}, index=dates)})
+        plan = RebalancePlanner.unconstrained().plan(['A'], [0], [10.0], [1.0], cash=100.0)
+        orders = plan.to_orders(executor)
+        self.assertEqual([(o.symbol, o.side, o.quantity) for o in orders], [('A', 'buy', 10.0)])
+
+
+class TestPlannerIntegration(unittest.TestCase):
+    """Backtest strategies and the holdings page use the planner."""
+
+    def test_strategy_rebalance_uses_planner(self):
+        dates = pd.bdate_range('2024-01-01', periods=5)
+        frames = {
+            'A': pd.DataFrame({'open': 10.0, 'high': 10.0, 'low': 10.0, 'close': 10.0, 'volume': 1e6}, index=dates),
+            'B': pd.DataFrame({'open': 20.0, 'high': 20.0, 'low': 20.0, 'close': 20.0, 'volume': 1e6}, index=dates),
+        }
+
+        class HalfHalf(BaseStrategy):
+            def next(self):
+                super().next()
+                if len(self) == 1:
+                    self.rebalance_portfolio({'A': 0.5, 'B': 0.5})
+
+        cerebro = bt.Cerebro()
+        cerebro.broker.setcash(10_000)
+        for name, frame in frames.items():
+            cerebro.adddata(bt.feeds.PandasData(dataname=frame), name=name)
+        cerebro.addstrategy(HalfHalf)
+        strategy = cerebro.run()[0]
+
+        self.assertEqual(strategy.getpositionbyname('A').size, 500)
+        self.assertEqual(strategy.getpositionbyname('B').size, 250)
+        self.assertEqual(strategy.rebalance_log[0]['transactions'], 'Buy 500 of A, Buy 250 of B')
+
+    def test_gap_analysis(self):
+        presenter = PortfolioPresenter()
+        presenter.get_strategy_weights = lambda name: {'SP500': 0.6, 'TLT': 0.4}
+        rows = presenter.get_portfolio_gap_analysis({'SP500': 0.595, 'TLT': 0.3, 'GLD': 0.105}, 'Test')
+        by_asset = {row['Gap']: row['Status'] for row in rows}
+        self.assertEqual(len(rows), 3)
+        self.assertIn('Balanced', by_asset['+0.5%'])
+        self.assertIn('Under-weighted', by_asset['+10.0%'])
+        self.assertIn('Over-weighted', by_asset['-10.5%'])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
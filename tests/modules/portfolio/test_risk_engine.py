@@ -0,0 +1,168 @@
+"""
+Tests for pre-trade position and sector limit checks in executors and strategies.
+"""
+import unittest
+import sys
+from unittest.mock import patch
+from pathlib import Path
+
+import backtrader as bt
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.modules.portfolio.trading.risk import PreTradeRiskEngine
+from src.modules.portfolio.trading.executor import (
+    OrderStatus, PaperTradingExecutor, SimulationExecutor
+)
+from src.modules.portfolio.strategies.base import BaseStrategy
+
+
+def _engine(**kwargs):
+    engine = PreTradeRiskEngine(max_position_size=0.25, max_sector_allocation=0.40, **kwargs)
+    engine.update_portfolio(positions={'TLT': 100}, prices={'TLT': 100.0, 'IEF': 100.0, 'SP500': 100.0},
+                            cash=90_000.0)
+    return engine
+
+
+class TestPreTradeRiskEngine(unittest.TestCase):
+    """Batch limit checks against the portfolio snapshot."""
+
+    def test_position_limit(self):
+        engine = _engine()
+        result = engine.check_orders(['SP500', 'SP500'], ['buy', 'buy'], [200, 100])
+        # 300 shares = 30% of a 100k portfolio; the whole batch breaches the 25% cap
+        self.assertFalse(result.approved.any())
+        self.assertIn('SP500 position 30.0% exceeds max 25.0%', result.reasons[0])
+        self.assertAlmostEqual(result.asset_weights['SP500'], 0.30)
+
+    def test_sector_limit_counts_existing_holdings(self):
+        engine = _engine()
+        # TLT 10% held + IEF 20% + TLT 15% -> Government_Bonds 45%
+        result = engine.check_orders(['IEF', 'TLT'], ['buy', 'buy'], [200, 150])
+        self.assertFalse(result.approved.any())
+        self.assertIn('Government_Bonds sector 45.0% exceeds max 40.0%', result.reasons[0])
+        self.assertTrue(engine.check_orders(['IEF'], ['buy'], [200]).all_approved)
+
+    def test_reducing_orders_and_cash_always_pass(self):
+        engine = _engine()
+        engine.update_portfolio(positions={'TLT': 500})
+        result = engine.check_orders(['TLT', 'CASH'], ['sell', 'buy'], [100, 900], [100.0, 100.0])
+        self.assertTrue(result.all_approved)
+
+    def test_report_only_mode(self):
+        engine = _engine(enforce=False)
+        result = engine.check_orders(['SP500'], ['buy'], [300])
+        self.assertTrue(result.all_approved)
+        self.assertIsNotNone(result.reasons[0])
+        self.assertEqual(engine.rejected_count, 1)
+
+    def test_unmapped_assets_have_no_sector_limit(self):
+        engine = PreTradeRiskEngine(max_position_size=None, max_sector_allocation=0.4)
+        engine.update_portfolio(cash=1000.0)
+        result = engine.check_orders(['AAA', 'BBB'], ['buy', 'buy'], [30, 30], [10.0, 10.0])
+        self.assertTrue(result.all_approved)
+
+    def test_empty_snapshot_warns(self):
+        engine = PreTradeRiskEngine(max_position_size=0.25, max_sector_allocation=None)
+        with patch('src.modules.portfolio.trading.risk.LOG') as log:
+            result = engine.check_orders(['SP500'], ['buy'], [10], [100.0])
+        self.assertTrue(result.all_approved)
+        self.assertIn('update_portfolio', log.warning.call_args[0][0])
+
+    def test_large_batch(self):
+        engine = PreTradeRiskEngine(max_position_size=0.01, max_sector_allocation=None)
+        engine.update_portfolio(cash=1e9)
+        symbols = [f'S{i % 500}' for i in range(100_000)]
+        result = engine.check_orders(symbols, np.ones(100_000), np.full(100_000, 10.0), np.full(100_000, 100.0))
+        self.assertTrue(result.all_approved)
+
+
+class TestRiskEngineIntegration(unittest.TestCase):
+    """Executors reject and strategies report limit breaches."""
+
+    def _market_data(self):
+        dates = pd.date_range('2024-01-01', periods=2)
+        return {name: pd.DataFrame({'close': [100.0, 100.0]}, index=dates) for name in ('SP500', 'TLT')}
+
+    def test_simulation_executor_rejects_with_reason(self):
+        engine = PreTradeRiskEngine(max_position_size=0.25, max_sector_allocation=None)
+        engine.update_portfolio(cash=100_000.0)
+        executor = SimulationExecutor(self._market_data(), risk_engine=engine)
+
+        ok = executor.create_market_order('SP500', 200, 'buy', order_id='ok')
+        self.assertTrue(executor.submit_order(ok))
+        # Fills update the snapshot: another 100 shares would take SP500 to 30%
+        too_big = executor.create_market_order('SP500', 100, 'buy', order_id='big')
+        results = executor.submit_orders([too_big, executor.create_market_order('TLT', 100, 'buy', order_id='tlt')])
+        self.assertEqual(results, [False, True])
+        self.assertEqual(too_big.status, OrderStatus.REJECTED)
+        self.assertIn('exceeds max', too_big.metadata['risk_check'])
+        self.assertEqual(executor.get_execution_summary()['orders_by_status']['rejected'], 1)
+        self.assertEqual(engine.positions['SP500'], 200)
+
+    def test_executors_enforce_limits_by_default(self):
+        executor = SimulationExecutor(self._market_data(), initial_cash=100_000.0)
+        self.assertTrue(executor.risk_engine.enforce)
+        self.assertFalse(executor.submit_order(executor.create_market_order('SP500', 300, 'buy')))
+        self.assertTrue(executor.submit_order(executor.create_market_order('TLT', 200, 'buy')))
+
+        report_only = SimulationExecutor(self._market_data(), initial_cash=100_000.0, enforce_risk_limits=False)
+        order = report_only.create_market_order('SP500', 300, 'buy')
+        self.assertTrue(report_only.submit_order(order))
+        self.assertIn('exceeds max', order.metadata['risk_check'])
+
+    def test_paper_executor_checks_batches(self):
+        engine = PreTradeRiskEngine(max_position_size=0.25, max_sector_allocation=None)
+        engine.update_portfolio(prices={'SP500': 100.0}, cash=10_000.0)
+        executor = PaperTradingExecutor(risk_engine=engine)
+        order = executor.create_market_order('SP500', 50, 'buy')
+        self.assertEqual(executor.submit_orders([order]), [False])
+        self.assertEqual(executor.pending_market_orders, {})
+
+    def _run_strategy(self, enforce, weights=({'SP500': 0.6, 'TLT': 0.4},)):
+        dates = pd.bdate_range('2024-01-01', periods=3)
+        frame = pd.DataFrame({'open': 100.0, 'high': 100.0, 'low': 100.0, 'close': 100.0, 'volume': 1e6}, index=dates)
+
+        class SixtyForty(BaseStrategy):
+            def __init__(self):
+                super().__init__()
+                self.risk_engine.enforce = enforce
+
+            def next(self):
+                super().next()
+                if len(self) <= len(weights):
+                    self.rebalance_portfolio(weights[len(self) - 1])
+
+        cerebro = bt.Cerebro()
+        cerebro.broker.setcash(100_000)
+        for name in ('SP500', 'TLT'):
+            cerebro.adddata(bt.feeds.PandasData(dataname=frame.copy()), name=name)
+        cerebro.addstrategy(SixtyForty)
+        return cerebro.run()[0]
+
+    def test_strategy_reports_violations_without_rejecting(self):
+        strategy = self._run_strategy(enforce=False)
+        entry = strategy.rebalance_log[0]
+        self.assertEqual(strategy.getpositionbyname('SP500').size, 600)
+        self.assertEqual([v['order'] for v in entry['risk_violations']], ['SP500', 'TLT'])
+
+    def test_rebalance_log_entries_share_columns(self):
+        strategy = self._run_strategy(enforce=False, weights=[{'SP500': 0.2, 'TLT': 0.2}, {'SP500': 0.6, 'TLT': 0.4}])
+        self.assertEqual(len(strategy.rebalance_log), 2)
+        self.assertEqual(strategy.rebalance_log[0]['risk_violations'], [])
+        self.assertEqual(strategy.rebalance_log[0].keys(), strategy.rebalance_log[1].keys())
+
+    def test_strategy_enforcement_drops_violating_buys(self):
+        strategy = self._run_strategy(enforce=True)
+        self.assertEqual(strategy.getpositionbyname('SP500').size, 0)
+        entry = strategy.rebalance_log[0]
+        self.assertEqual(entry['transactions'], '')
+        self.assertEqual([r['order'] for r in entry['risk_rejections']], ['SP500', 'TLT'])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
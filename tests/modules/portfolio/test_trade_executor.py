@@ -0,0 +1,344 @@
+"""
+Tests for SimulationExecutor order handling, the bar-driven order book and
+the compact Order record.
+"""
+import unittest
+import sys
+import tempfile
+from pathlib import Path
+from datetime import datetime
+
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.modules.portfolio.trading.executor import (
+    SimulationExecutor, Order, OrderType, OrderStatus
+)
+
+
+def _market_data():
+    dates = pd.date_range('2024-01-01', periods=3, freq='D')
+    frame = pd.DataFrame({'close': [100.0, 101.0, 102.0]}, index=dates)
+    return {'SPY': frame, 'TLT': frame.copy()}
+
+
+class TestSimulationOrderBook(unittest.TestCase):
+    """Limit, stop and stop-limit matching against OHLCV bars."""
+
+    def setUp(self):
+        self.executor = SimulationExecutor(_market_data(), commission_rate=0.001, slippage_rate=0.001)
+
+    def _bar(self, day, open_, high, low, close, volume=None, symbol='SPY'):
+        return self.executor.process_bar(symbol, datetime(2024, 1, day), open_, high, low, close, volume)
+
+    def test_market_order_fills_immediately(self):
+        order = self.executor.create_market_order('SPY', 10, 'buy', order_id='m1')
+        self.assertTrue(self.executor.submit_order(order))
+        self.assertEqual(order.status, OrderStatus.FILLED)
+        self.assertAlmostEqual(order.average_fill_price, 102.0 * 1.001)
+        self.assertEqual(self.executor.execution_count, 1)
+
+    def test_limit_orders_rest_until_price_reached(self):
+        buy = self.executor.create_limit_order('SPY', 10, 'buy', 99.0, order_id='b1')
+        sell = self.executor.create_limit_order('SPY', 5, 'sell', 105.0, order_id='s1')
+        self.executor.submit_order(buy)
+        self.executor.submit_order(sell)
+        self.assertEqual(buy.status, OrderStatus.SUBMITTED)
+
+        self.assertEqual(self._bar(4, 102, 103, 100, 101), [])
+        records = self._bar(5, 100, 101, 98, 99)
+        self.assertEqual([r['order_id'] for r in records], ['b1'])
+        self.assertEqual(buy.status, OrderStatus.FILLED)
+        self.assertAlmostEqual(buy.average_fill_price, 99.0)
+        self.assertEqual(sell.status, OrderStatus.SUBMITTED)
+
+        # Gap through the sell limit fills at the better open price
+        self._bar(6, 107, 108, 106, 107)
+        self.assertAlmostEqual(sell.average_fill_price, 107.0)
+        self.assertEqual(len(self.executor.order_book), 0)
+
+    def test_best_priced_limit_fills_first_under_volume_cap(self):
+        executor = SimulationExecutor(_market_data(), max_participation=0.5)
+        low = executor.create_limit_order('SPY', 100, 'buy', 99.0, order_id='low')
+        high = executor.create_limit_order('SPY', 100, 'buy', 100.0, order_id='high')
+        executor.submit_order(low)
+        executor.submit_order(high)
+
+        records = executor.process_bar('SPY', datetime(2024, 1, 4), 100.5, 101, 98, 99, volume=300)
+        self.assertEqual([(r['order_id'], r['quantity']) for r in records], [('high', 100), ('low', 50)])
+        self.assertEqual(high.status, OrderStatus.FILLED)
+        self.assertEqual(low.status, OrderStatus.PARTIAL_FILLED)
+        self.assertEqual(low.filled_quantity, 50)
+
+        executor.process_bar('SPY', datetime(2024, 1, 5), 98.5, 99, 98, 98.5, volume=300)
+        self.assertEqual(low.status, OrderStatus.FILLED)
+        # Second half filled at the lower open
+        self.assertAlmostEqual(low.average_fill_price, (99.0 + 98.5) / 2)
+
+    def test_stop_triggers_and_pays_slippage(self):
+        stop = self.executor.create_stop_order('SPY', 10, 'sell', stop_price=95.0, order_id='st')
+        self.executor.submit_order(stop)
+        self._bar(4, 100, 101, 96, 97)
+        self.assertEqual(stop.status, OrderStatus.SUBMITTED)
+
+        # Gap below the stop fills at the open, minus slippage
+        self._bar(5, 93, 94, 90, 91)
+        self.assertEqual(stop.status, OrderStatus.FILLED)
+        self.assertAlmostEqual(stop.average_fill_price, 93.0 * 0.999)
+        self.assertAlmostEqual(self.executor.total_slippage_cost, 10 * 93.0 * 0.001)
+
+    def test_stop_limit_becomes_resting_limit(self):
+        order = self.executor.create_stop_order('SPY', 10, 'buy', stop_price=105.0,
+                                                limit_price=106.0, order_id='sl')
+        self.executor.submit_order(order)
+        # Triggered, but the bar opened above the limit and never came back down
+        self._bar(4, 107, 110, 106.5, 109)
+        self.assertEqual(order.status, OrderStatus.SUBMITTED)
+        self.assertEqual(len(self.executor.order_book), 1)
+
+        self._bar(5, 107, 108, 105.5, 106)
+        self.assertEqual(order.status, OrderStatus.FILLED)
+        self.assertAlmostEqual(order.average_fill_price, 106.0)
+
+    def test_time_in_force_expiry(self):
+        day = Order('day', 'SPY', 10, OrderType.LIMIT, 'buy', price=90.0, time_in_force='DAY')
+        ioc = Order('ioc', 'SPY', 10, OrderType.LIMIT, 'buy', price=90.0, time_in_force='IOC')
+        gtc = Order('gtc', 'SPY', 10, OrderType.LIMIT, 'buy', price=90.0)
+        for order in (day, ioc, gtc):
+            self.executor.submit_order(order)
+
+        self._bar(4, 100, 101, 99, 100)
+        self.assertEqual(ioc.status, OrderStatus.EXPIRED)
+        self.assertEqual(day.status, OrderStatus.SUBMITTED)
+
+        self._bar(5, 100, 101, 99, 100)
+        self.assertEqual(day.status, OrderStatus.EXPIRED)
+        self.assertEqual(gtc.status, OrderStatus.SUBMITTED)
+        self.assertEqual(len(self.executor.order_book), 1)
+
+    def test_fill_or_kill_needs_full_quantity(self):
+        executor = SimulationExecutor(_market_data(), max_participation=0.1)
+        fok = Order('fok', 'SPY', 100, OrderType.LIMIT, 'buy', price=100.0, time_in_force='FOK')
+        executor.submit_order(fok)
+        records = executor.process_bar('SPY', datetime(2024, 1, 4), 99, 100, 98, 99, volume=500)
+        self.assertEqual(records, [])
+        self.assertEqual(fok.status, OrderStatus.EXPIRED)
+        self.assertEqual(fok.filled_quantity, 0)
+
+    def test_stop_remainder_fills_within_later_bar(self):
+        executor = SimulationExecutor(_market_data(), slippage_rate=0.0, max_participation=0.1)
+        stop = Order('st', 'SPY', 100, OrderType.STOP, 'buy', stop_price=100.0)
+        executor.submit_order(stop)
+        executor.process_bar('SPY', datetime(2024, 1, 4), 99, 101, 98, 100, volume=500)
+        self.assertEqual(stop.filled_quantity, 50)
+
+        # The remainder trades at market on a bar that never reaches the stop again
+        executor.process_bar('SPY', datetime(2024, 1, 5), 85, 90, 80, 88, volume=500)
+        self.assertEqual(stop.status, OrderStatus.FILLED)
+        self.assertAlmostEqual(stop.average_fill_price, (50 * 100.0 + 50 * 90.0) / 100)
+
+    def test_single_bar_stops(self):
+        executor = SimulationExecutor(_market_data(), max_participation=0.1)
+        fok = Order('fok', 'SPY', 100, OrderType.STOP, 'sell', stop_price=95.0, time_in_force='FOK')
+        ioc = Order('ioc', 'SPY', 100, OrderType.STOP, 'sell', stop_price=95.0, time_in_force='IOC')
+        executor.submit_order(fok)
+        executor.submit_order(ioc)
+
+        executor.process_bar('SPY', datetime(2024, 1, 4), 96, 97, 90, 91, volume=500)
+        self.assertEqual(fok.status, OrderStatus.EXPIRED)
+        self.assertEqual(fok.filled_quantity, 0)
+        self.assertEqual(ioc.status, OrderStatus.EXPIRED)
+        self.assertEqual(ioc.filled_quantity, 50)
+        self.assertEqual(len(executor.order_book), 0)
+
+    def test_cancel_removes_resting_order(self):
+        order = self.executor.create_limit_order('SPY', 10, 'buy', 99.0, order_id='c1')
+        self.executor.submit_order(order)
+        self.assertTrue(self.executor.cancel_order('c1'))
+        self.assertEqual(self._bar(4, 100, 101, 95, 96), [])
+        self.assertEqual(order.status, OrderStatus.CANCELLED)
+
+    def test_invalid_resting_order_rejected(self):
+        order = Order('bad', 'SPY', 10, OrderType.LIMIT, 'buy')
+        self.assertFalse(self.executor.submit_order(order))
+        self.assertEqual(order.status, OrderStatus.REJECTED)
+
+    def test_process_market_data_replay(self):
+        buy = self.executor.create_limit_order('TLT', 10, 'buy', 98.0, order_id='r1')
+        self.executor.submit_order(buy)
+        bars = pd.DataFrame({
+            'open': [100.0, 99.0, 97.5],
+            'high': [101.0, 99.5, 98.0],
+            'low': [99.0, 98.5, 97.0],
+            'close': [100.0, 99.0, 97.5],
+        }, index=pd.date_range('2024-01-04', periods=3, freq='D'))
+
+        records = self.executor.process_market_data({'TLT': bars})
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]['timestamp'], datetime(2024, 1, 6))
+        self.assertAlmostEqual(buy.average_fill_price, 97.5)
+        self.assertEqual(self.executor.last_prices['TLT'], 97.5)
+
+
+class TestBatchSubmission(unittest.TestCase):
+    """Vectorized batch pricing and columnar execution history."""
+
+    def setUp(self):
+        self.executor = SimulationExecutor(_market_data(), commission_rate=0.001, slippage_rate=0.001)
+
+    def test_batch_matches_single_order_pricing(self):
+        single = SimulationExecutor(_market_data(), commission_rate=0.001, slippage_rate=0.001)
+        specs = [('SPY', 10, 'buy'), ('TLT', 4, 'sell'), ('SPY', 3, 'sell')]
+        for n, (symbol, qty, side) in enumerate(specs):
+            single.submit_order(single.create_market_order(symbol, qty, side, order_id=f'o{n}'))
+
+        batch = [self.executor.create_market_order(symbol, qty, side, order_id=f'o{n}')
+                 for n, (symbol, qty, side) in enumerate(specs)]
+        self.assertEqual(self.executor.submit_orders(batch), [True, True, True])
+
+        for n in range(len(specs)):
+            expected = single.get_order_status(f'o{n}')
+            actual = self.executor.get_order_status(f'o{n}')
+            self.assertEqual(actual.status, OrderStatus.FILLED)
+            self.assertAlmostEqual(actual.average_fill_price, expected.average_fill_price)
+            self.assertAlmostEqual(actual.commission, expected.commission)
+        self.assertAlmostEqual(self.executor.total_commission_paid, single.total_commission_paid)
+        self.assertAlmostEqual(self.executor.total_slippage_cost, single.total_slippage_cost)
+        self.assertEqual(self.executor.execution_count, 3)
+
+    def test_batch_mixed_and_rejected_orders(self):
+        batch = [
+            self.executor.create_market_order('SPY', 10, 'buy', order_id='m'),
+            self.executor.create_market_order('QQQ', 10, 'buy', order_id='unknown'),
+            self.executor.create_limit_order('TLT', 5, 'buy', 90.0, order_id='l'),
+        ]
+        self.assertEqual(self.executor.submit_orders(batch), [True, False, True])
+        self.assertEqual(batch[1].status, OrderStatus.REJECTED)
+        self.assertEqual(batch[2].status, OrderStatus.SUBMITTED)
+        self.assertEqual(len(self.executor.order_book), 1)
+        self.assertEqual(len(self.executor.execution_history), 1)
+
+    def test_execution_history_is_columnar(self):
+        batch = [self.executor.create_market_order('SPY', q, 'buy', order_id=f'h{q}') for q in (1, 2, 3)]
+        self.executor.submit_orders(batch)
+        self.executor.submit_order(self.executor.create_market_order('TLT', 5, 'sell', order_id='single'))
+
+        history = self.executor.execution_history
+        self.assertEqual(len(history), 4)
+        self.assertEqual(history[-1]['order_id'], 'single')
+        self.assertEqual([r['quantity'] for r in history], [1.0, 2.0, 3.0, 5.0])
+
+        frame = history.to_frame()
+        self.assertEqual(list(frame['symbol']), ['SPY', 'SPY', 'SPY', 'TLT'])
+        self.assertAlmostEqual(frame['commission'].sum(), self.executor.total_commission_paid)
+
+
+class TestOrderIndexAndHistory(unittest.TestCase):
+    """Incremental order indexes and bounded execution history."""
+
+    def setUp(self):
+        self.executor = SimulationExecutor(_market_data())
+
+    def _order(self, order_id, symbol, order_type=OrderType.MARKET, day=1, price=None):
+        return Order(order_id, symbol, 10, order_type, 'buy', price=price,
+                     created_time=datetime(2024, 1, day))
+
+    def test_summary_counts_follow_status_changes(self):
+        self.executor.submit_orders([
+            self._order('m1', 'SPY'),
+            self._order('m2', 'TLT'),
+            self._order('l1', 'SPY', OrderType.LIMIT, price=90.0),
+            self._order('l2', 'TLT', OrderType.LIMIT, price=90.0),
+        ])
+        self.executor.cancel_order('l2')
+
+        summary = self.executor.get_execution_summary()
+        self.assertEqual(summary['total_orders'], 4)
+        self.assertEqual(summary['filled_orders'], 2)
+        self.assertEqual(summary['orders_by_status'], {'filled': 2, 'submitted': 1, 'cancelled': 1})
+        self.assertAlmostEqual(summary['success_rate'], 0.5)
+
+        self.executor.process_bar('SPY', datetime(2024, 1, 4), 91, 92, 89, 90)
+        summary = self.executor.get_execution_summary()
+        self.assertEqual(summary['filled_orders'], 3)
+        self.assertNotIn('submitted', summary['orders_by_status'])
+
+    def test_order_queries(self):
+        orders = [
+            self._order('a', 'SPY', day=1),
+            self._order('b', 'TLT', day=2),
+            self._order('c', 'SPY', OrderType.LIMIT, day=3, price=90.0),
+            self._order('d', 'SPY', day=4),
+        ]
+        self.executor.submit_orders(orders)
+
+        ids = lambda result: [order.order_id for order in result]
+        self.assertEqual(ids(self.executor.get_orders(symbol='SPY')), ['a', 'c', 'd'])
+        self.assertEqual(ids(self.executor.get_orders(status=OrderStatus.SUBMITTED)), ['c'])
+        self.assertEqual(ids(self.executor.get_orders(symbol='SPY', status=OrderStatus.FILLED)), ['a', 'd'])
+        self.assertEqual(ids(self.executor.get_orders(start_time=datetime(2024, 1, 2),
+                                                      end_time=datetime(2024, 1, 3))), ['b', 'c'])
+        self.assertEqual(ids(self.executor.get_orders(symbol='SPY', start_time=datetime(2024, 1, 2))), ['c', 'd'])
+        self.assertEqual(self.executor.get_orders(symbol='QQQ'), [])
+
+    def test_bounded_history_drops_oldest(self):
+        executor = SimulationExecutor(_market_data(), history_limit=4)
+        executor.submit_orders([self._order(f'o{i}', 'SPY') for i in range(10)])
+        history = executor.execution_history
+        self.assertLessEqual(len(history), 4)
+        self.assertEqual(history[-1]['order_id'], 'o9')
+        self.assertEqual(len(history) + history.evicted_records, 10)
+        self.assertEqual(executor.execution_count, 10)
+
+    def test_bounded_history_spills_to_parquet(self):
+        with tempfile.TemporaryDirectory() as spill_dir:
+            executor = SimulationExecutor(_market_data(), history_limit=8, history_spill_dir=spill_dir)
+            for i in range(25):
+                executor.submit_order(self._order(f'o{i}', 'SPY' if i % 2 else 'TLT'))
+
+            self.assertLessEqual(len(executor.execution_history), 8)
+            everything = executor.get_executions(include_spilled=True)
+            self.assertEqual(list(everything['order_id']), [f'o{i}' for i in range(25)])
+            self.assertEqual(len(executor.get_executions(symbol='SPY', include_spilled=True)), 12)
+
+
+class TestCompactOrder(unittest.TestCase):
+    """Slotted orders with monotonic ids, lazy metadata and cheap timestamps."""
+
+    def test_generated_ids_are_unique_and_monotonic(self):
+        executor = SimulationExecutor(_market_data())
+        orders = [executor.create_market_order('SPY', 1, 'buy') for _ in range(1000)]
+        self.assertEqual(len({order.order_id for order in orders}), 1000)
+        self.assertEqual([order.seq for order in orders], sorted(order.seq for order in orders))
+        self.assertEqual(orders[0].order_id, f"MKT_SPY_{orders[0].seq}")
+
+    def test_orders_are_slotted_with_lazy_fields(self):
+        order = Order('o1', 'SPY', 10.0, OrderType.LIMIT, 'buy', price=99.0)
+        self.assertFalse(hasattr(order, '__dict__'))
+        self.assertFalse(order.has_metadata)
+        order.metadata['strategy'] = 'test'
+        self.assertTrue(order.has_metadata)
+
+        self.assertIsInstance(order.created_time, datetime)
+        self.assertLess(abs((datetime.now() - order.created_time).total_seconds()), 5)
+        self.assertEqual(order.updated_time, order.created_time)
+        order.updated_time = datetime(2030, 1, 1)
+        self.assertEqual(order.updated_time, datetime(2030, 1, 1))
+
+    def test_equality_and_time_queries(self):
+        created = datetime(2024, 1, 2, 9, 30)
+        a = Order('o1', 'SPY', 10.0, OrderType.MARKET, 'buy', created_time=created)
+        b = Order('o1', 'SPY', 10.0, OrderType.MARKET, 'buy', created_time=created)
+        self.assertEqual(a, b)
+
+        executor = SimulationExecutor(_market_data())
+        executor.submit_orders([a, executor.create_market_order('TLT', 1, 'buy')])
+        self.assertEqual(executor.get_orders(end_time=datetime(2024, 1, 3)), [a])
+        self.assertEqual(len(executor.get_orders(start_time=datetime(2024, 1, 3))), 1)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,160 @@
+"""
+Tests for the vectorized transaction cost models and their executor,
+backtrader and data loader integration.
+"""
+import unittest
+import sys
+import tempfile
+import shutil
+from pathlib import Path
+
+import backtrader as bt
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.modules.portfolio.trading.costs import (
+    FixedCostModel, SpreadCostModel, SquareRootImpactCostModel, side_sign
+)
+from src.modules.portfolio.trading.executor import SimulationExecutor
+from src.modules.portfolio.backtesting.costs import CostModelCommissionInfo, apply_cost_model
+from src.modules.data_management.data_center.data_loader import DataLoader
+
+
+class TestCostModels(unittest.TestCase):
+    """Vectorized cost estimates."""
+
+    def test_fixed_model_matches_flat_rates(self):
+        costs = FixedCostModel(commission_rate=0.001, slippage_rate=0.002).estimate(
+            [100.0, 50.0], [10, 4], ['buy', 'sell']
+        )
+        np.testing.assert_allclose(costs.execution_price, [100.2, 49.9])
+        np.testing.assert_allclose(costs.commission, [10 * 100.2 * 0.001, 4 * 49.9 * 0.001])
+        np.testing.assert_allclose(costs.slippage_cost, [10 * 100 * 0.002, 4 * 50 * 0.002])
+
+    def test_side_sign_accepts_labels_and_numbers(self):
+        np.testing.assert_array_equal(side_sign(['buy', 'SELL']), [1.0, -1.0])
+        np.testing.assert_array_equal(side_sign([5, -2]), [1.0, -1.0])
+
+    def test_minimum_commission(self):
+        model = FixedCostModel(commission_rate=0.001, slippage_rate=0.0, min_commission=1.0)
+        np.testing.assert_allclose(model.commission([100.0, 5000.0, 0.0]), [1.0, 5.0, 0.0])
+
+    def test_spread_model_uses_observed_spread(self):
+        model = SpreadCostModel(commission_rate=0.0, spread=0.002)
+        impact = model.price_impact(np.array([10.0, 10.0]), np.array([1.0, 1.0]),
+                                    spread=np.array([0.01, np.nan]))
+        np.testing.assert_allclose(impact, [0.005, 0.001])
+
+    def test_square_root_impact_scales_with_participation(self):
+        model = SquareRootImpactCostModel(commission_rate=0.0, spread=0.0, impact_coefficient=1.0,
+                                          volatility=0.02, fallback_impact=0.003)
+        impact = model.price_impact(np.full(4, 100.0), np.array([100.0, 400.0, 100.0, 100.0]),
+                                    volume=np.array([10_000.0, 10_000.0, np.nan, 0.0]))
+        np.testing.assert_allclose(impact, [0.002, 0.004, 0.003, 0.003])
+
+    def test_cost_drag_for_weight_path(self):
+        dates = pd.date_range('2024-01-01', periods=3, freq='D')
+        weights = pd.DataFrame({'A': [0.5, 0.5, 0.3], 'B': [0.5, 0.5, 0.7]}, index=dates)
+        prices = pd.DataFrame({'A': [10.0, 10.0, 10.0], 'B': [20.0, 20.0, 20.0]}, index=dates)
+        value = pd.Series(1000.0, index=dates)
+
+        drag = FixedCostModel(commission_rate=0.001, slippage_rate=0.001).cost_drag(weights, prices, value)
+        # Full initial purchase, no trade, then 40% turnover, each at 0.2% all-in
+        np.testing.assert_allclose(drag.to_numpy(), [0.002, 0.0, 0.4 * 0.002])
+
+
+class TestCostModelIntegration(unittest.TestCase):
+    """Executor and backtrader broker use the same model."""
+
+    def test_executor_uses_cost_model_with_bar_volume(self):
+        dates = pd.date_range('2024-01-01', periods=2, freq='D')
+        market_data = {'SPY': pd.DataFrame({'close': [100.0, 100.0], 'volume': [5_000.0, 10_000.0]}, index=dates)}
+        model = SquareRootImpactCostModel(commission_rate=0.0, spread=0.0, volatility=0.02)
+        executor = SimulationExecutor(market_data, cost_model=model)
+
+        order = executor.create_market_order('SPY', 100, 'buy', order_id='m')
+        executor.submit_orders([order])
+        expected = 100.0 * (1 + 0.02 * np.sqrt(100 / 10_000))
+        self.assertAlmostEqual(order.average_fill_price, expected)
+        self.assertAlmostEqual(executor.total_slippage_cost, 100 * 100.0 * 0.02 * np.sqrt(0.01))
+
+    def test_backtrader_commission_charges_model_costs(self):
+        model = FixedCostModel(commission_rate=0.001, slippage_rate=0.002)
+        comminfo = CostModelCommissionInfo(cost_model=model)
+        charged = comminfo.getcommission(-10, 100.0)
+        expected = model.estimate(100.0, 10, 'sell')
+        self.assertAlmostEqual(charged, float(expected.commission + expected.slippage_cost))
+
+    def test_backtest_with_cost_model(self):
+        dates = pd.bdate_range('2024-01-01', periods=30)
+        frame = pd.DataFrame({'open': 100.0, 'high': 101.0, 'low': 99.0, 'close': 100.0,
+                              'volume': 50_000.0}, index=dates)
+
+        class BuyOnce(bt.Strategy):
+            def next(self):
+                if len(self) == 1:
+                    self.buy(size=100)
+
+        def final_value(cost_model):
+            cerebro = bt.Cerebro()
+            cerebro.broker.setcash(100_000)
+            feed = bt.feeds.PandasData(dataname=frame)
+            cerebro.adddata(feed, name='SPY')
+            if cost_model is not None:
+                apply_cost_model(cerebro.broker, cost_model, {'SPY': feed})
+            cerebro.addstrategy(BuyOnce)
+            cerebro.run()
+            return cerebro.broker.getvalue()
+
+        model = FixedCostModel(commission_rate=0.001, slippage_rate=0.001)
+        expected_cost = float(sum(model.estimate(100.0, 100, 'buy')[1:]))
+        self.assertAlmostEqual(final_value(None) - final_value(model), expected_cost, places=6)
+
+
+class TestDataFeedOHLCV(unittest.TestCase):
+    """Data feeds keep real OHLCV columns instead of fabricating them."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.price_dir = Path(self.temp_dir) / "raw" / "price"
+        self.price_dir.mkdir(parents=True)
+        self.loader = DataLoader(data_root=self.temp_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_real_ohlcv_columns_are_used(self):
+        pd.DataFrame({
+            'date': ['2024-01-02', '2024-01-03'],
+            'Open': [99.0, 101.0], 'High': [102.0, 103.0], 'Low': [98.0, 100.0],
+            'Close': [101.0, 102.0], 'Volume': [12_345, 23_456],
+        }).to_csv(self.price_dir / "YF_price.csv", index=False)
+        df = self.loader.load_data_feed('YF', 'YF')._dataname
+        self.assertEqual(list(df['open']), [99.0, 101.0])
+        self.assertEqual(list(df['high']), [102.0, 103.0])
+        self.assertEqual(list(df['volume']), [12_345, 23_456])
+
+    def test_akshare_columns_are_used(self):
+        pd.DataFrame({
+            '日期': ['2024-01-02', '2024-01-03'],
+            '开盘': [3.0, 3.1], '收盘': [3.1, 3.2], '最高': [3.2, 3.3], '最低': [2.9, 3.0],
+            '成交量': [1000, 2000],
+        }).to_csv(self.price_dir / "AK_price.csv", index=False)
+        df = self.loader.load_data_feed('AK', 'AK')._dataname
+        self.assertEqual(list(df['low']), [2.9, 3.0])
+        self.assertEqual(list(df['volume']), [1000, 2000])
+
+    def test_missing_columns_fall_back_to_close(self):
+        pd.DataFrame({'date': ['2024-01-02', '2024-01-03'], 'close': [10.0, 11.0]}).to_csv(
+            self.price_dir / "CLOSE_price.csv", index=False)
+        df = self.loader.load_data_feed('CLOSE', 'CLOSE')._dataname
+        self.assertEqual(list(df['high']), [10.0, 11.0])
+        self.assertTrue(df['volume'].isna().all())
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)